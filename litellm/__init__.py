@@ -305,6 +305,8 @@ cache: Optional["Cache"] = (
 default_in_memory_ttl: Optional[float] = None
 default_redis_ttl: Optional[float] = None
 default_redis_batch_cache_expiry: Optional[float] = None
+redis_client_side_caching_prefixes: Optional[List[str]] = None
+redis_coalesce_writes: bool = False
 model_alias_map: Dict[str, str] = {}
 model_group_settings: Optional["ModelGroupSettings"] = None
 max_budget: float = 0.0  # set the max budget across all providers
@@ -417,6 +419,7 @@ output_parse_pii: bool = False
 from litellm.litellm_core_utils.get_model_cost_map import get_model_cost_map
 
 model_cost = get_model_cost_map(url=model_cost_map_url)
+model_cost_version: int = 0  # bumped by register_model - e.g. the router's routing tables recompile on changes
 cost_discount_config: Dict[str, float] = (
     {}
 )  # Provider-specific cost discounts {"vertex_ai": 0.05} = 5% discount
@@ -3,9 +3,12 @@ from .caching import Cache, LiteLLMCacheType
 from .disk_cache import DiskCache
 from .dual_cache import DualCache
 from .in_memory_cache import InMemoryCache
+from .local_semantic_cache import LocalSemanticCache
+from .mmap_disk_cache import MmapDiskCache
 from .qdrant_semantic_cache import QdrantSemanticCache
 from .redis_cache import RedisCache
 from .redis_cluster_cache import RedisClusterCache
 from .redis_semantic_cache import RedisSemanticCache
 from .s3_cache import S3Cache
 from .gcs_cache import GCSCache
+from .tiered_cache import TieredCache
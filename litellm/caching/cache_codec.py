@@ -0,0 +1,235 @@
+"""
+Cache payload codec - a compact, binary format for response cache entries.
+
+Layout:
+    magic (b"\\xffLC") | version (1 byte) | serializer id (1 byte) | compression id (1 byte) | body
+
+body, after decompression:
+    doc length (4 bytes, big endian) | serialized doc | packed vector buffers
+
+- lists of floats under an "embedding" key are moved out of the doc, into little endian float32 (or float16) buffers
+- the body is compressed when it's larger than `compression_threshold_bytes`
+
+Entries written without a codec (JSON strings / dicts) aren't encoded, and are read as before.
+"""
+
+import json
+import struct
+import zlib
+from typing import Any, Callable, Dict, Literal, Optional, Tuple
+
+from litellm.constants import DEFAULT_CACHE_COMPRESSION_THRESHOLD_BYTES
+
+CACHE_CODEC_MAGIC = b"\xffLC"
+CACHE_CODEC_VERSION = 1
+_HEADER_SIZE = len(CACHE_CODEC_MAGIC) + 3
+_DOC_LENGTH = struct.Struct(">I")
+_PACKED_VECTOR_KEY = "__litellm_packed_vector__"
+
+CacheCodecSerializer = Literal["orjson", "msgpack", "json"]
+CacheCodecCompression = Literal["zlib", "zstd", "lz4"]
+CacheCodecEmbeddingDtype = Literal["float32", "float16"]
+
+_EMBEDDING_DTYPE_FORMATS: Dict[str, str] = {"float32": "f", "float16": "e"}
+
+_SERIALIZER_IDS: Dict[str, int] = {"json": 0, "orjson": 1, "msgpack": 2}
+_SERIALIZER_NAMES = {v: k for k, v in _SERIALIZER_IDS.items()}
+_COMPRESSION_IDS: Dict[Optional[str], int] = {None: 0, "zlib": 1, "zstd": 2, "lz4": 3}
+_COMPRESSION_NAMES = {v: k for k, v in _COMPRESSION_IDS.items()}
+
+
+def _get_serializer(
+    serializer: str,
+) -> Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]:
+    if serializer == "json":
+        return (
+            lambda value: json.dumps(value, separators=(",", ":")).encode("utf-8"),
+            json.loads,
+        )
+    if serializer == "orjson":
+        try:
+            import orjson
+        except ModuleNotFoundError as e:
+            raise ModuleNotFoundError(
+                "Please install orjson to use the 'orjson' cache codec serializer - `pip install orjson`"
+            ) from e
+        return orjson.dumps, orjson.loads
+    if serializer == "msgpack":
+        try:
+            import msgpack  # type: ignore
+        except ModuleNotFoundError as e:
+            raise ModuleNotFoundError(
+                "Please install msgpack to use the 'msgpack' cache codec serializer - `pip install msgpack`"
+            ) from e
+        return msgpack.packb, lambda data: msgpack.unpackb(data, strict_map_key=False)
+    raise ValueError(
+        f"Unsupported cache codec serializer={serializer}. Supported: {list(_SERIALIZER_IDS)}"
+    )
+
+
+def _get_compressor(
+    compression: str,
+) -> Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]:
+    if compression == "zlib":
+        return zlib.compress, zlib.decompress
+    if compression == "zstd":
+        try:
+            import zstandard  # type: ignore
+        except ModuleNotFoundError as e:
+            raise ModuleNotFoundError(
+                "Please install zstandard to use 'zstd' cache compression - `pip install zstandard`"
+            ) from e
+        return (
+            zstandard.ZstdCompressor().compress,
+            zstandard.ZstdDecompressor().decompress,
+        )
+    if compression == "lz4":
+        try:
+            import lz4.frame  # type: ignore
+        except ModuleNotFoundError as e:
+            raise ModuleNotFoundError(
+                "Please install lz4 to use 'lz4' cache compression - `pip install lz4`"
+            ) from e
+        return lz4.frame.compress, lz4.frame.decompress
+    raise ValueError(
+        f"Unsupported cache compression={compression}. Supported: {[c for c in _COMPRESSION_IDS if c]}"
+    )
+
+
+def _is_float_list(value: Any) -> bool:
+    return (
+        isinstance(value, list)
+        and len(value) > 0
+        and all(isinstance(item, float) for item in value)
+    )
+
+
+def _pack_vector(value: list, vector_format: str) -> Tuple[bytes, str]:
+    try:
+        return struct.pack(f"<{len(value)}{vector_format}", *value), vector_format
+    except (OverflowError, struct.error):  # out of float16 range
+        return struct.pack(f"<{len(value)}f", *value), "f"
+
+
+def _unpack_vector(data: memoryview, vector_format: str) -> list:
+    length = len(data) // struct.calcsize(vector_format)
+    return list(struct.unpack(f"<{length}{vector_format}", data))
+
+
+class CacheCodec:
+    def __init__(
+        self,
+        serializer: Optional[CacheCodecSerializer] = None,
+        compression: Optional[CacheCodecCompression] = "zlib",
+        compression_threshold_bytes: int = DEFAULT_CACHE_COMPRESSION_THRESHOLD_BYTES,
+        pack_embeddings: bool = True,
+        embedding_dtype: CacheCodecEmbeddingDtype = "float32",
+    ):
+        """
+        serializer: "orjson", "msgpack" or "json". Defaults to "orjson" if it's installed, else "json".
+        compression: "zlib", "zstd", "lz4" or None.
+        compression_threshold_bytes: payloads larger than this are compressed.
+        pack_embeddings: store embedding vectors as packed buffers, instead of serialized floats.
+        embedding_dtype: "float32" or "float16" - half the size, at ~3 significant digits.
+        """
+        if serializer is None:
+            try:
+                import orjson  # noqa: F401
+
+                serializer = "orjson"
+            except ModuleNotFoundError:
+                serializer = "json"
+        self.serializer = serializer
+        self.compression = compression
+        self.compression_threshold_bytes = compression_threshold_bytes
+        self.pack_embeddings = pack_embeddings
+        if embedding_dtype not in _EMBEDDING_DTYPE_FORMATS:
+            raise ValueError(
+                f"Unsupported cache codec embedding_dtype={embedding_dtype}. Supported: {list(_EMBEDDING_DTYPE_FORMATS)}"
+            )
+        self.embedding_dtype = embedding_dtype
+        self._vector_format = _EMBEDDING_DTYPE_FORMATS[embedding_dtype]
+        self._dumps, _ = _get_serializer(serializer)
+        self._compress: Optional[Callable[[bytes], bytes]] = None
+        if compression is not None:
+            self._compress, _ = _get_compressor(compression)
+
+    @staticmethod
+    def is_encoded(value: Any) -> bool:
+        return isinstance(value, (bytes, bytearray)) and value.startswith(
+            CACHE_CODEC_MAGIC
+        )
+
+    def _pack(self, value: Any, buffers: bytearray) -> Any:
+        if isinstance(value, dict):
+            packed = {}
+            for k, v in value.items():
+                if k == "embedding" and _is_float_list(v):
+                    vector, vector_format = _pack_vector(v, self._vector_format)
+                    packed[k] = {
+                        _PACKED_VECTOR_KEY: [len(buffers), len(vector), vector_format]
+                    }
+                    buffers.extend(vector)
+                else:
+                    packed[k] = self._pack(v, buffers)
+            return packed
+        if isinstance(value, (list, tuple)):
+            return [self._pack(item, buffers) for item in value]
+        return value
+
+    @staticmethod
+    def _unpack(value: Any, buffers: memoryview) -> Any:
+        if isinstance(value, dict):
+            if len(value) == 1 and _PACKED_VECTOR_KEY in value:
+                offset, length, vector_format = value[_PACKED_VECTOR_KEY]
+                return _unpack_vector(buffers[offset : offset + length], vector_format)
+            return {k: CacheCodec._unpack(v, buffers) for k, v in value.items()}
+        if isinstance(value, list):
+            return [CacheCodec._unpack(item, buffers) for item in value]
+        return value
+
+    def encode(self, value: Any) -> bytes:
+        buffers = bytearray()
+        if self.pack_embeddings:
+            value = self._pack(value, buffers)
+        doc = self._dumps(value)
+        body = _DOC_LENGTH.pack(len(doc)) + doc + buffers
+        compression = None
+        if self._compress is not None and len(body) > self.compression_threshold_bytes:
+            body = self._compress(body)
+            compression = self.compression
+        header = CACHE_CODEC_MAGIC + bytes(
+            [
+                CACHE_CODEC_VERSION,
+                _SERIALIZER_IDS[self.serializer],
+                _COMPRESSION_IDS[compression],
+            ]
+        )
+        return header + body
+
+    @staticmethod
+    def decode(data: bytes) -> Any:
+        """
+        Decode an encoded payload. The header says how it was written, so any codec config can read it.
+        """
+        if not CacheCodec.is_encoded(data):
+            raise ValueError("Not an encoded cache payload")
+        version, serializer_id, compression_id = data[
+            len(CACHE_CODEC_MAGIC) : _HEADER_SIZE
+        ]
+        if version > CACHE_CODEC_VERSION:
+            raise ValueError(
+                f"Cache payload version={version} is newer than the supported version={CACHE_CODEC_VERSION}"
+            )
+        body = bytes(data[_HEADER_SIZE:])
+        compression = _COMPRESSION_NAMES[compression_id]
+        if compression is not None:
+            _, decompress = _get_compressor(compression)
+            body = decompress(body)
+        _, loads = _get_serializer(_SERIALIZER_NAMES[serializer_id])
+        (doc_length,) = _DOC_LENGTH.unpack_from(body)
+        doc_end = _DOC_LENGTH.size + doc_length
+        value = loads(body[_DOC_LENGTH.size : doc_end])
+        if doc_end < len(body):
+            value = CacheCodec._unpack(value, memoryview(body)[doc_end:])
+        return value
@@ -0,0 +1,118 @@
+"""
+Cache key hasher - hashes the cache key params without building the cache key string.
+
+Each param is fed into a fast 128-bit hash as one type + length prefixed chunk:
+- strings / bytes as they are
+- anything else (e.g. messages) serialized by orjson, with sorted dict keys - key order doesn't change the hash
+- `"1"` and `1` hash differently, unlike in the cache key string
+"""
+
+import hashlib
+from typing import Any, Callable, Iterable, Literal, Tuple, Union
+
+from pydantic import BaseModel
+
+CacheKeyHashAlgorithm = Literal["xxh3_128", "blake3", "blake2b"]
+
+_DIGEST_SIZE = 16  # 128-bit
+
+
+def _get_hasher_factory(algorithm: str) -> Callable[[], Any]:
+    """
+    Returns a factory for hash objects with `update()` and `hexdigest()`.
+    """
+    if algorithm == "blake2b":
+        return lambda: hashlib.blake2b(digest_size=_DIGEST_SIZE)
+    if algorithm == "xxh3_128":
+        try:
+            import xxhash  # type: ignore
+        except ModuleNotFoundError as e:
+            raise ModuleNotFoundError(
+                "Please install xxhash to use the 'xxh3_128' cache key hash algorithm - `pip install xxhash`"
+            ) from e
+        return xxhash.xxh3_128
+    if algorithm == "blake3":
+        try:
+            import blake3  # type: ignore
+        except ModuleNotFoundError as e:
+            raise ModuleNotFoundError(
+                "Please install blake3 to use the 'blake3' cache key hash algorithm - `pip install blake3`"
+            ) from e
+        return blake3.blake3
+    raise ValueError(
+        f"Unsupported cache_key_hash_algorithm={algorithm}. Supported: ['xxh3_128', 'blake3', 'blake2b']"
+    )
+
+
+def _to_json_value(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    return str(value)
+
+
+def _get_serializer() -> Callable[[Any], bytes]:
+    """
+    orjson, with sorted dict keys - key order doesn't change the hash.
+
+    Required, not optional - instances sharing a cache must serialize params identically.
+    """
+    try:
+        import orjson
+    except ModuleNotFoundError as e:
+        raise ModuleNotFoundError(
+            "Please install orjson to use cache_key_hash_algorithm - `pip install orjson`"
+        ) from e
+    option = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+
+    def _serialize(value: Any) -> bytes:
+        return orjson.dumps(value, default=_to_json_value, option=option)
+
+    return _serialize
+
+
+def _update(
+    update: Callable[[Union[bytes, bytearray]], Any],
+    serialize: Callable[[Any], bytes],
+    value: Any,
+) -> None:
+    """
+    Feed one value into the hash - strings / bytes as they are, anything else as one serialized chunk.
+    """
+    if isinstance(value, str):
+        data = value.encode("utf-8", "surrogatepass")
+        tag = b"s"
+    elif isinstance(value, (bytes, bytearray)):
+        data = bytes(value)
+        tag = b"b"
+    else:
+        try:
+            data = serialize(value)
+            tag = b"j"
+        except TypeError:  # e.g. ints past 64 bits
+            data = str(value).encode("utf-8", "surrogatepass")
+            tag = b"o"
+    update(tag + b"%d:" % len(data))
+    update(data)
+
+
+class CacheKeyHasher:
+    def __init__(self, algorithm: CacheKeyHashAlgorithm = "blake2b"):
+        """
+        algorithm: "xxh3_128", "blake3" or "blake2b" (stdlib).
+        """
+        self.algorithm = algorithm
+        self._new_hasher = _get_hasher_factory(algorithm)
+        self._serialize = _get_serializer()
+
+    def hash_params(self, params: Iterable[Tuple[str, Any]]) -> str:
+        """
+        Hash (param name, param value) pairs, in order. Returns a 32 char hex digest.
+        """
+        hasher = self._new_hasher()
+        update = hasher.update
+        for param, value in params:
+            _update(update, self._serialize, param)
+            _update(update, self._serialize, value)
+        if self.algorithm == "blake3":
+            return hasher.hexdigest(length=_DIGEST_SIZE)
+        return hasher.hexdigest()
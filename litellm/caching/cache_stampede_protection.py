@@ -0,0 +1,244 @@
+"""
+Cache stampede protection for the response cache.
+
+- stale-while-revalidate: entries are kept `stale_while_revalidate` seconds past their ttl. A stale entry is refreshed
+  by the one request that takes its refresh lock, the others are served the stale entry meanwhile.
+- probabilistic early refresh (XFetch): a request may refresh an entry before it expires - more likely the closer it is
+  to expiring, and the longer its response took to compute. Hot entries are refreshed one by one, instead of expiring together.
+- on a miss, the request that takes the refresh lock computes the response, the others wait for it (up to CACHE_REFRESH_LOCK_WAIT_SECONDS).
+  Its lock is released when it writes the entry, or when it ends without writing it (failed, cancelled, not stored).
+
+Refresh locks are kept in Redis for Redis caches - shared by every instance - and in memory for the other caches.
+This covers the DualCache the response cache reads through for Redis caches - its entries carry the same refresh
+metadata, and its locks are the Redis cache's. Standalone DualCaches (router / proxy state) hold counters and config,
+not recomputable responses, so they have nothing to refresh.
+"""
+
+import asyncio
+import math
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from litellm._logging import verbose_logger
+from litellm.constants import (
+    CACHE_REFRESH_LOCK_TTL_SECONDS,
+    CACHE_REFRESH_LOCK_WAIT_SECONDS,
+)
+
+from .base_cache import BaseCache
+from .dual_cache import LimitedSizeOrderedDict
+from .redis_cache import RedisCache
+
+_LOCK_POLL_INTERVAL_SECONDS = 0.1
+_MAX_TRACKED_MISSES = 10000
+
+
+def should_refresh_early(
+    expires_at: float, compute_time: float, beta: float, now: float
+) -> bool:
+    """
+    XFetch - Vattani et al., "Optimal Probabilistic Cache Stampede Prevention".
+    """
+    return now - compute_time * beta * math.log(1.0 - random.random()) >= expires_at
+
+
+class CacheStampedeProtection:
+    def __init__(
+        self,
+        cache: BaseCache,
+        stale_while_revalidate: Optional[float] = None,
+        early_refresh_beta: Optional[float] = None,
+    ):
+        """
+        cache: the cache entries are stored in - refresh locks are kept in it if it's a Redis cache.
+        stale_while_revalidate: seconds a stale entry is still served, while one request refreshes it.
+        early_refresh_beta: XFetch beta - higher refreshes earlier. 1.0 is a good default. None disables early refresh.
+        """
+        self.cache = cache
+        self.stale_while_revalidate = stale_while_revalidate
+        self.early_refresh_beta = early_refresh_beta
+        # lock key -> lock expiry, for caches that aren't shared across instances
+        self._local_locks: Dict[str, float] = {}
+        # locks taken by this instance -> the request (litellm_call_id) holding it. Released once the entry is
+        # written, or when the request ends without writing it
+        self._held_locks: Dict[str, Optional[str]] = {}
+        # cache key -> when the miss happened, to measure how long the response took to compute
+        self._miss_times: LimitedSizeOrderedDict = LimitedSizeOrderedDict(
+            max_size=_MAX_TRACKED_MISSES
+        )
+
+    @staticmethod
+    def _get_lock_key(cache_key: str) -> str:
+        return f"{cache_key}:refresh-lock"
+
+    def should_refresh(self, cached_result: Any) -> bool:
+        """
+        True if the entry is stale, or due for an early refresh.
+        """
+        if not isinstance(cached_result, dict) or "expires_at" not in cached_result:
+            return False
+        now = time.time()
+        expires_at = cached_result["expires_at"]
+        if now >= expires_at:
+            return True
+        if self.early_refresh_beta is None:
+            return False
+        return should_refresh_early(
+            expires_at=expires_at,
+            compute_time=cached_result.get("compute_time") or 0.0,
+            beta=self.early_refresh_beta,
+            now=now,
+        )
+
+    def add_refresh_metadata(
+        self, cache_key: str, cached_data: dict, ttl: Optional[float]
+    ) -> Optional[float]:
+        """
+        Stores when the entry goes stale, and how long it took to compute. Returns the ttl to store the entry with.
+        """
+        if ttl is None:
+            return ttl
+        cached_data["expires_at"] = cached_data["timestamp"] + float(ttl)
+        miss_time = self._miss_times.pop(cache_key, None)
+        if miss_time is not None:
+            cached_data["compute_time"] = cached_data["timestamp"] - miss_time
+        if self.stale_while_revalidate:
+            return float(ttl) + self.stale_while_revalidate
+        return ttl
+
+    def _record_miss(self, cache_key: str) -> None:
+        self._miss_times[cache_key] = time.time()
+
+    def _acquire_local_lock(self, lock_key: str) -> bool:
+        now = time.time()
+        lock_expires_at = self._local_locks.get(lock_key)
+        if lock_expires_at is not None and lock_expires_at > now:
+            return False
+        if len(self._local_locks) >= _MAX_TRACKED_MISSES:
+            self._local_locks = {
+                key: expires_at
+                for key, expires_at in self._local_locks.items()
+                if expires_at > now
+            }
+        self._local_locks[lock_key] = now + CACHE_REFRESH_LOCK_TTL_SECONDS
+        return True
+
+    def _holds_lock(self, lock_key: str, owner: Optional[str]) -> bool:
+        return owner is not None and self._held_locks.get(lock_key) == owner
+
+    def acquire_lock(self, cache_key: str, owner: Optional[str] = None) -> bool:
+        """
+        Take the refresh lock for an entry, in memory. The sync lookups use these.
+        """
+        lock_key = self._get_lock_key(cache_key)
+        if self._holds_lock(lock_key, owner):
+            return True
+        acquired = self._acquire_local_lock(lock_key)
+        if acquired:
+            self._held_locks[lock_key] = owner
+            self._record_miss(cache_key)
+        return acquired
+
+    async def async_acquire_lock(
+        self, cache_key: str, owner: Optional[str] = None
+    ) -> bool:
+        """
+        Take the refresh lock for an entry. Only one request holds it at a time - re-entrant for the request holding it.
+
+        owner: the request's litellm_call_id, to release its locks when it ends (`async_release_owner_locks`).
+        """
+        lock_key = self._get_lock_key(cache_key)
+        if self._holds_lock(lock_key, owner):
+            return True
+        if isinstance(self.cache, RedisCache):
+            acquired = bool(
+                await self.cache.async_set_cache(
+                    lock_key, 1, nx=True, ttl=CACHE_REFRESH_LOCK_TTL_SECONDS
+                )
+            )
+        else:
+            acquired = self._acquire_local_lock(lock_key)
+        if acquired:
+            self._held_locks[lock_key] = owner
+            self._record_miss(cache_key)
+        return acquired
+
+    async def _async_is_locked(self, cache_key: str) -> bool:
+        lock_key = self._get_lock_key(cache_key)
+        if isinstance(self.cache, RedisCache):
+            return await self.cache.async_get_cache(lock_key) is not None
+        lock_expires_at = self._local_locks.get(lock_key)
+        return lock_expires_at is not None and lock_expires_at > time.time()
+
+    def release_lock(self, cache_key: str) -> None:
+        lock_key = self._get_lock_key(cache_key)
+        if lock_key in self._held_locks:
+            self._held_locks.pop(lock_key, None)
+            self._local_locks.pop(lock_key, None)
+
+    async def async_release_lock(self, cache_key: str) -> None:
+        """
+        Release the refresh lock, if this instance holds it.
+        """
+        await self._async_release_lock_key(self._get_lock_key(cache_key))
+
+    def release_owner_locks(self, owner: str) -> None:
+        """
+        Sync `async_release_owner_locks` - for the locks taken by sync lookups, which are in memory.
+        """
+        for lock_key in [
+            lock_key
+            for lock_key, lock_owner in self._held_locks.items()
+            if lock_owner == owner
+        ]:
+            self._held_locks.pop(lock_key, None)
+            self._local_locks.pop(lock_key, None)
+
+    async def async_release_owner_locks(self, owner: str) -> None:
+        """
+        Release the locks a request still holds - it ended (failed, cancelled, or its response wasn't stored) without writing the entry.
+        """
+        for lock_key in [
+            lock_key
+            for lock_key, lock_owner in self._held_locks.items()
+            if lock_owner == owner
+        ]:
+            await self._async_release_lock_key(lock_key)
+
+    async def _async_release_lock_key(self, lock_key: str) -> None:
+        if lock_key not in self._held_locks:
+            return
+        self._held_locks.pop(lock_key, None)
+        if isinstance(self.cache, RedisCache):
+            try:
+                await self.cache.async_delete_cache(lock_key)
+            except Exception as e:
+                verbose_logger.debug(
+                    f"LiteLLM Cache: failed to release refresh lock {lock_key} - {str(e)}"
+                )
+        else:
+            self._local_locks.pop(lock_key, None)
+
+    async def async_wait_for_entry(
+        self,
+        cache_key: str,
+        get_entry: Callable[[], Awaitable[Any]],
+        owner: Optional[str] = None,
+    ) -> Any:
+        """
+        On a miss - returns None if this request should compute the entry, else waits for the request computing it.
+        """
+        if await self.async_acquire_lock(cache_key, owner=owner):
+            return None
+        deadline = time.time() + CACHE_REFRESH_LOCK_WAIT_SECONDS
+        while time.time() < deadline:
+            await asyncio.sleep(_LOCK_POLL_INTERVAL_SECONDS)
+            cached_result = await get_entry()
+            if cached_result is not None:
+                return cached_result
+            if not await self._async_is_locked(cache_key):
+                # the request computing it failed, or didn't store it
+                break
+        self._record_miss(cache_key)
+        return None
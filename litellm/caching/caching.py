@@ -8,33 +8,61 @@
 #  Thank you users! We ❤️ you! - Krrish & Ishaan
 
 import ast
+import asyncio
 import hashlib
 import json
 import time
 import traceback
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from pydantic import BaseModel
 
 import litellm
 from litellm._logging import verbose_logger
 from litellm.constants import CACHED_STREAMING_CHUNK_DELAY
+from litellm.exceptions import (
+    ContextWindowExceededError,
+    NotFoundError,
+    UnsupportedParamsError,
+)
 from litellm.litellm_core_utils.model_param_helper import ModelParamHelper
 from litellm.types.caching import *
 from litellm.types.utils import EmbeddingResponse, all_litellm_params
 
 from .azure_blob_cache import AzureBlobCache
 from .base_cache import BaseCache
+from .cache_codec import CacheCodec
+from .cache_key_hasher import CacheKeyHashAlgorithm, CacheKeyHasher
+from .cache_stampede_protection import CacheStampedeProtection
 from .disk_cache import DiskCache
 from .dual_cache import DualCache  # noqa
 from .gcs_cache import GCSCache
 from .in_memory_cache import InMemoryCache
+from .local_semantic_cache import LocalSemanticCache
+from .mmap_disk_cache import MmapDiskCache
 from .qdrant_semantic_cache import QdrantSemanticCache
 from .redis_cache import RedisCache
 from .redis_cluster_cache import RedisClusterCache
 from .redis_semantic_cache import RedisSemanticCache
 from .s3_cache import S3Cache
+from .segment_object_cache import (
+    GCSSegmentStore,
+    S3SegmentStore,
+    SegmentObjectCache,
+    SegmentObjectStore,
+)
+from .tiered_cache import TieredCache
 
 
 def print_verbose(print_statement):
@@ -51,6 +79,14 @@ class CacheMode(str, Enum):
     default_off = "default_off"
 
 
+# deterministic provider errors - the same request fails the same way again, so they can be cached
+NEGATIVE_CACHEABLE_EXCEPTIONS = (
+    ContextWindowExceededError,
+    NotFoundError,
+    UnsupportedParamsError,
+)
+
+
 #### LiteLLM.Completion / Embedding Cache ####
 class Cache:
     def __init__(
@@ -96,26 +132,44 @@ class Cache:
         gcs_bucket_name: Optional[str] = None,
         gcs_path_service_account: Optional[str] = None,
         gcs_path: Optional[str] = None,
+        segment_cache_index: Literal["local", "redis"] = "local",
+        segment_cache_flush_interval_ms: Optional[float] = None,
+        segment_cache_max_segment_bytes: Optional[int] = None,
         redis_semantic_cache_embedding_model: str = "text-embedding-ada-002",
         redis_semantic_cache_index_name: Optional[str] = None,
         redis_flush_size: Optional[int] = None,
         redis_startup_nodes: Optional[List] = None,
         disk_cache_dir: Optional[str] = None,
+        disk_cache_max_size_bytes: Optional[int] = None,
+        disk_cache_fsync_interval_ms: Optional[float] = None,
         qdrant_api_base: Optional[str] = None,
         qdrant_api_key: Optional[str] = None,
         qdrant_collection_name: Optional[str] = None,
         qdrant_quantization_config: Optional[str] = None,
         qdrant_semantic_cache_embedding_model: str = "text-embedding-ada-002",
+        local_semantic_cache_embedding_model: str = "text-embedding-ada-002",
+        local_semantic_cache_max_size: Optional[int] = None,
+        local_semantic_cache_persist_dir: Optional[str] = None,
         # GCP IAM authentication parameters
         gcp_service_account: Optional[str] = None,
         gcp_ssl_ca_certs: Optional[str] = None,
+        # Tiered Cache
+        cache_tiers: Optional[List[Union[str, dict]]] = None,
+        # Cache payload codec
+        cache_codec: Optional[dict] = None,
+        # Cache key hashing
+        cache_key_hash_algorithm: Optional[CacheKeyHashAlgorithm] = None,
+        # Stampede protection + negative caching
+        stale_while_revalidate: Optional[float] = None,
+        early_refresh_beta: Optional[float] = None,
+        negative_cache_ttl: Optional[float] = None,
         **kwargs,
     ):
         """
         Initializes the cache based on the given type.
 
         Args:
-            type (str, optional): The type of cache to initialize. Can be "local", "redis", "redis-semantic", "qdrant-semantic", "s3" or "disk". Defaults to "local".
+            type (str, optional): The type of cache to initialize. Can be "local", "redis", "redis-semantic", "qdrant-semantic", "local-semantic", "s3", "s3-segments", "gcs", "gcs-segments", "disk", "disk-mmap" or "tiered". Defaults to "local".
 
             # Redis Cache Args
             host (str, optional): The host address for the Redis cache. Required if type is "redis".
@@ -130,10 +184,17 @@ class Cache:
             qdrant_api_base (str, optional): The url for your qdrant cluster. Required if type is "qdrant-semantic".
             qdrant_api_key (str, optional): The api_key for the local or cloud qdrant cluster.
             qdrant_collection_name (str, optional): The name for your qdrant collection. Required if type is "qdrant-semantic".
-            similarity_threshold (float, optional): The similarity threshold for semantic-caching, Required if type is "redis-semantic" or "qdrant-semantic".
+            similarity_threshold (float, optional): The similarity threshold for semantic-caching, Required if type is "redis-semantic", "qdrant-semantic" or "local-semantic".
+
+            # Local Semantic Cache Args
+            local_semantic_cache_embedding_model (str, optional): The model used to embed prompts. Defaults to "text-embedding-ada-002".
+            local_semantic_cache_max_size (int, optional): Max entries per namespace. The oldest entries are evicted past it. Defaults to LOCAL_SEMANTIC_CACHE_MAX_SIZE.
+            local_semantic_cache_persist_dir (str, optional): If set, the cache is loaded from this directory, and saved to it on disconnect. Defaults to None.
 
             # Disk Cache Args
             disk_cache_dir (str, optional): The directory for the disk cache. Defaults to None.
+            disk_cache_max_size_bytes (int, optional): "disk-mmap" only - size past which the oldest segment files are deleted. Defaults to DISK_CACHE_MAX_SIZE_BYTES.
+            disk_cache_fsync_interval_ms (float, optional): "disk-mmap" only - how often writes are fsync'd, in one batch. 0 fsyncs every write. Defaults to DISK_CACHE_FSYNC_INTERVAL_MS.
 
             # S3 Cache Args
             s3_bucket_name (str, optional): The bucket name for the s3 cache. Defaults to None.
@@ -152,6 +213,25 @@ class Cache:
             gcs_path_service_account (str, optional): Path to the service account json.
             gcs_path (str, optional): Folder path inside the bucket to store cache files.
 
+            # Segment Cache Args ("s3-segments" / "gcs-segments" - entries packed into segment objects. Use the s3_* / gcs_* args)
+            segment_cache_index (str, optional): Where cache key -> segment locations are kept - "local", or "redis" to share them across instances (uses the redis args). Defaults to "local".
+            segment_cache_flush_interval_ms (float, optional): How long a write waits for others, to upload them in one segment. Defaults to SEGMENT_CACHE_FLUSH_INTERVAL_MS.
+            segment_cache_max_segment_bytes (int, optional): Buffered bytes at which a segment is uploaded early. Defaults to SEGMENT_CACHE_MAX_SEGMENT_BYTES.
+
+            # Tiered Cache Args
+            cache_tiers (list, optional): The tiers, fastest first. Each is a cache type (e.g. "local") or a dict of Cache params for the tier (e.g. {"type": "redis", "host": ..., "ttl": 3600}). Required if type is "tiered".
+
+            # Cache Codec Args
+            cache_codec (dict, optional): Store responses in a compact binary format, e.g. {"serializer": "orjson", "compression": "zlib", "compression_threshold_bytes": 1024}. Embedding vectors are stored as float32. Supported by the "local", "redis", "disk", "disk-mmap", "s3-segments", "gcs-segments" and "tiered" (of these) caches. Defaults to None (JSON).
+
+            # Cache Key Args
+            cache_key_hash_algorithm (str, optional): Hash the cache key params with "xxh3_128", "blake3" or "blake2b" - each param serialized by orjson, instead of building the cache key string first. Needs orjson. Changes every cache key. Defaults to None (SHA-256 of the cache key string).
+
+            # Stampede Protection Args
+            stale_while_revalidate (float, optional): Seconds an expired response is still served, while one request refreshes it. Concurrent misses also wait for the one request computing the response. Defaults to None.
+            early_refresh_beta (float, optional): Refresh hot responses before they expire, probabilistically (XFetch). Higher refreshes earlier, 1.0 is a good default. Defaults to None.
+            negative_cache_ttl (float, optional): Cache deterministic provider errors (context window exceeded, model not found, unsupported params) for this many seconds. Defaults to None.
+
             # Common Cache Args
             supported_call_types (list, optional): List of call types to cache for. Defaults to cache == on for all call types.
             **kwargs: Additional keyword arguments for redis.Redis() cache
@@ -187,24 +267,28 @@ class Cache:
                     redis_flush_size=redis_flush_size,
                     **kwargs,
                 )
-        elif type == LiteLLMCacheType.REDIS_SEMANTIC:
-            self.cache = RedisSemanticCache(
+        elif type in (
+            LiteLLMCacheType.REDIS_SEMANTIC,
+            LiteLLMCacheType.QDRANT_SEMANTIC,
+            LiteLLMCacheType.LOCAL_SEMANTIC,
+        ):
+            self.cache = Cache._init_semantic_cache(
+                type=type,
+                similarity_threshold=similarity_threshold,
                 host=host,
                 port=port,
                 password=password,
-                similarity_threshold=similarity_threshold,
-                embedding_model=redis_semantic_cache_embedding_model,
-                index_name=redis_semantic_cache_index_name,
-                **kwargs,
-            )
-        elif type == LiteLLMCacheType.QDRANT_SEMANTIC:
-            self.cache = QdrantSemanticCache(
+                redis_semantic_cache_embedding_model=redis_semantic_cache_embedding_model,
+                redis_semantic_cache_index_name=redis_semantic_cache_index_name,
                 qdrant_api_base=qdrant_api_base,
                 qdrant_api_key=qdrant_api_key,
-                collection_name=qdrant_collection_name,
-                similarity_threshold=similarity_threshold,
-                quantization_config=qdrant_quantization_config,
-                embedding_model=qdrant_semantic_cache_embedding_model,
+                qdrant_collection_name=qdrant_collection_name,
+                qdrant_quantization_config=qdrant_quantization_config,
+                qdrant_semantic_cache_embedding_model=qdrant_semantic_cache_embedding_model,
+                local_semantic_cache_embedding_model=local_semantic_cache_embedding_model,
+                local_semantic_cache_max_size=local_semantic_cache_max_size,
+                local_semantic_cache_persist_dir=local_semantic_cache_persist_dir,
+                **kwargs,
             )
         elif type == LiteLLMCacheType.LOCAL:
             self.cache = InMemoryCache()
@@ -229,13 +313,43 @@ class Cache:
                 path_service_account=gcs_path_service_account,
                 gcs_path=gcs_path,
             )
+        elif type in (LiteLLMCacheType.S3_SEGMENTS, LiteLLMCacheType.GCS_SEGMENTS):
+            self.cache = Cache._init_segment_object_cache(
+                type=type,
+                segment_cache_index=segment_cache_index,
+                segment_cache_flush_interval_ms=segment_cache_flush_interval_ms,
+                segment_cache_max_segment_bytes=segment_cache_max_segment_bytes,
+                s3_bucket_name=s3_bucket_name,
+                s3_region_name=s3_region_name,
+                s3_endpoint_url=s3_endpoint_url,
+                s3_verify=s3_verify,
+                s3_aws_access_key_id=s3_aws_access_key_id,
+                s3_aws_secret_access_key=s3_aws_secret_access_key,
+                s3_aws_session_token=s3_aws_session_token,
+                s3_path=s3_path,
+                gcs_bucket_name=gcs_bucket_name,
+                gcs_path_service_account=gcs_path_service_account,
+                gcs_path=gcs_path,
+                host=host,
+                port=port,
+                password=password,
+                namespace=namespace,
+                **kwargs,
+            )
         elif type == LiteLLMCacheType.AZURE_BLOB:
             self.cache = AzureBlobCache(
                 account_url=azure_account_url,
                 container=azure_blob_container,
             )
-        elif type == LiteLLMCacheType.DISK:
-            self.cache = DiskCache(disk_cache_dir=disk_cache_dir)
+        elif type in (LiteLLMCacheType.DISK, LiteLLMCacheType.DISK_MMAP):
+            self.cache = Cache._init_disk_cache(
+                type=type,
+                disk_cache_dir=disk_cache_dir,
+                disk_cache_max_size_bytes=disk_cache_max_size_bytes,
+                disk_cache_fsync_interval_ms=disk_cache_fsync_interval_ms,
+            )
+        elif type == LiteLLMCacheType.TIERED:
+            self.cache = Cache._init_tiered_cache(cache_tiers=cache_tiers)
         if "cache" not in litellm.input_callback:
             litellm.input_callback.append("cache")
         if "cache" not in litellm.success_callback:
@@ -248,6 +362,8 @@ class Cache:
         self.redis_flush_size = redis_flush_size
         self.ttl = ttl
         self.mode: CacheMode = mode or CacheMode.default_on
+        # cache key -> background write of it - batch reads of the key wait for it
+        self._pending_writes: Dict[str, asyncio.Task] = {}
 
         if self.type == LiteLLMCacheType.LOCAL and default_in_memory_ttl is not None:
             self.ttl = default_in_memory_ttl
@@ -261,6 +377,227 @@ class Cache:
         if self.namespace is not None and isinstance(self.cache, RedisCache):
             self.cache.namespace = self.namespace
 
+        self._init_cache_extensions(
+            cache_tiers=cache_tiers,
+            cache_codec=cache_codec,
+            cache_key_hash_algorithm=cache_key_hash_algorithm,
+            stale_while_revalidate=stale_while_revalidate,
+            early_refresh_beta=early_refresh_beta,
+            negative_cache_ttl=negative_cache_ttl,
+        )
+
+    def _init_cache_extensions(
+        self,
+        cache_tiers: Optional[List[Union[str, dict]]],
+        cache_codec: Optional[dict],
+        cache_key_hash_algorithm: Optional[CacheKeyHashAlgorithm],
+        stale_while_revalidate: Optional[float],
+        early_refresh_beta: Optional[float],
+        negative_cache_ttl: Optional[float],
+    ) -> None:
+        """
+        Set up the payload codec, cache key hasher and stampede protection - once `self.cache` is initialized.
+        """
+        self.cache_codec: Optional[CacheCodec] = None
+        if cache_codec is not None:
+            Cache._validate_cache_codec_support(type=self.type, cache_tiers=cache_tiers)
+            self.cache_codec = CacheCodec(**cache_codec)
+
+        self.cache_key_hasher: Optional[CacheKeyHasher] = None
+        if cache_key_hash_algorithm is not None:
+            self.cache_key_hasher = CacheKeyHasher(algorithm=cache_key_hash_algorithm)
+
+        self.negative_cache_ttl = negative_cache_ttl
+        self.stampede_protection: Optional[CacheStampedeProtection] = None
+        if stale_while_revalidate is not None or early_refresh_beta is not None:
+            self.stampede_protection = CacheStampedeProtection(
+                cache=self.cache,
+                stale_while_revalidate=stale_while_revalidate,
+                early_refresh_beta=early_refresh_beta,
+            )
+
+    @staticmethod
+    def _init_semantic_cache(
+        type: LiteLLMCacheType,
+        similarity_threshold: Optional[float],
+        host: Optional[str],
+        port: Optional[str],
+        password: Optional[str],
+        redis_semantic_cache_embedding_model: str,
+        redis_semantic_cache_index_name: Optional[str],
+        qdrant_api_base: Optional[str],
+        qdrant_api_key: Optional[str],
+        qdrant_collection_name: Optional[str],
+        qdrant_quantization_config: Optional[str],
+        qdrant_semantic_cache_embedding_model: str,
+        local_semantic_cache_embedding_model: str,
+        local_semantic_cache_max_size: Optional[int],
+        local_semantic_cache_persist_dir: Optional[str],
+        **kwargs,
+    ) -> BaseCache:
+        """
+        "redis-semantic", "qdrant-semantic" or "local-semantic".
+        """
+        if type == LiteLLMCacheType.REDIS_SEMANTIC:
+            return RedisSemanticCache(
+                host=host,
+                port=port,
+                password=password,
+                similarity_threshold=similarity_threshold,
+                embedding_model=redis_semantic_cache_embedding_model,
+                index_name=redis_semantic_cache_index_name,
+                **kwargs,
+            )
+        if type == LiteLLMCacheType.QDRANT_SEMANTIC:
+            return QdrantSemanticCache(
+                qdrant_api_base=qdrant_api_base,
+                qdrant_api_key=qdrant_api_key,
+                collection_name=qdrant_collection_name,
+                similarity_threshold=similarity_threshold,
+                quantization_config=qdrant_quantization_config,
+                embedding_model=qdrant_semantic_cache_embedding_model,
+            )
+        return LocalSemanticCache(
+            similarity_threshold=similarity_threshold,
+            embedding_model=local_semantic_cache_embedding_model,
+            max_size=local_semantic_cache_max_size,
+            persist_dir=local_semantic_cache_persist_dir,
+        )
+
+    @staticmethod
+    def _init_disk_cache(
+        type: LiteLLMCacheType,
+        disk_cache_dir: Optional[str],
+        disk_cache_max_size_bytes: Optional[int],
+        disk_cache_fsync_interval_ms: Optional[float],
+    ) -> BaseCache:
+        """
+        "disk" - diskcache (sqlite). "disk-mmap" - memory-mapped segment files, with async I/O.
+        """
+        if type == LiteLLMCacheType.DISK_MMAP:
+            return MmapDiskCache(
+                disk_cache_dir=disk_cache_dir,
+                max_size_bytes=disk_cache_max_size_bytes,
+                fsync_interval_ms=disk_cache_fsync_interval_ms,
+            )
+        return DiskCache(disk_cache_dir=disk_cache_dir)
+
+    @staticmethod
+    def _init_segment_object_cache(
+        type: LiteLLMCacheType,
+        segment_cache_index: Literal["local", "redis"],
+        segment_cache_flush_interval_ms: Optional[float],
+        segment_cache_max_segment_bytes: Optional[int],
+        s3_bucket_name: Optional[str],
+        s3_region_name: Optional[str],
+        s3_endpoint_url: Optional[str],
+        s3_verify: Optional[Union[bool, str]],
+        s3_aws_access_key_id: Optional[str],
+        s3_aws_secret_access_key: Optional[str],
+        s3_aws_session_token: Optional[str],
+        s3_path: Optional[str],
+        gcs_bucket_name: Optional[str],
+        gcs_path_service_account: Optional[str],
+        gcs_path: Optional[str],
+        host: Optional[str],
+        port: Optional[str],
+        password: Optional[str],
+        namespace: Optional[str],
+        **kwargs,
+    ) -> SegmentObjectCache:
+        """
+        "s3-segments" / "gcs-segments" - the index is kept in redis if segment_cache_index="redis".
+        """
+        segment_store: SegmentObjectStore
+        if type == LiteLLMCacheType.S3_SEGMENTS:
+            segment_store = S3SegmentStore(
+                s3_bucket_name=s3_bucket_name,  # type: ignore
+                s3_region_name=s3_region_name,
+                s3_endpoint_url=s3_endpoint_url,
+                s3_verify=s3_verify,  # type: ignore
+                s3_aws_access_key_id=s3_aws_access_key_id,
+                s3_aws_secret_access_key=s3_aws_secret_access_key,
+                s3_aws_session_token=s3_aws_session_token,
+            )
+        else:
+            segment_store = GCSSegmentStore(
+                bucket_name=gcs_bucket_name,
+                path_service_account=gcs_path_service_account,
+            )
+        return SegmentObjectCache(
+            store=segment_store,
+            index_cache=(
+                RedisCache(
+                    host=host,
+                    port=port,
+                    password=password,
+                    namespace=namespace,
+                    **kwargs,
+                )
+                if segment_cache_index == "redis"
+                else None
+            ),
+            key_prefix=(s3_path if type == LiteLLMCacheType.S3_SEGMENTS else gcs_path),
+            flush_interval_ms=segment_cache_flush_interval_ms,
+            max_segment_bytes=segment_cache_max_segment_bytes,
+        )
+
+    @staticmethod
+    def _validate_cache_codec_support(
+        type: Optional[LiteLLMCacheType], cache_tiers: Optional[List[Union[str, dict]]]
+    ) -> None:
+        """
+        Encoded payloads are bytes - only caches that store bytes as-is can hold them.
+        """
+        supported_types = [
+            LiteLLMCacheType.LOCAL,
+            LiteLLMCacheType.REDIS,
+            LiteLLMCacheType.DISK,
+            LiteLLMCacheType.DISK_MMAP,
+            LiteLLMCacheType.S3_SEGMENTS,
+            LiteLLMCacheType.GCS_SEGMENTS,
+        ]
+        # tiers are given as plain strings - LiteLLMCacheType is a str enum, so they compare equal
+        cache_types: List[Optional[str]] = [type]
+        if type == LiteLLMCacheType.TIERED:
+            cache_types = [
+                cache_tier if isinstance(cache_tier, str) else cache_tier.get("type")
+                for cache_tier in cache_tiers or []
+            ]
+        for cache_type in cache_types:
+            if cache_type not in supported_types:
+                raise ValueError(
+                    f"cache_codec is not supported for type={cache_type}. Supported types: {[t.value for t in supported_types]}, or 'tiered' of these"
+                )
+
+    @staticmethod
+    def _init_tiered_cache(
+        cache_tiers: Optional[List[Union[str, dict]]]
+    ) -> TieredCache:
+        """
+        Initialize each tier of a tiered cache, from its cache type / Cache params.
+
+        A tier's "ttl" is the max ttl of values in that tier.
+        """
+        if not cache_tiers:
+            raise ValueError(
+                "cache_tiers is required for type='tiered'. e.g. cache_tiers=['local', 'disk', 'redis']"
+            )
+        caches: List[BaseCache] = []
+        tier_ttls: List[Optional[float]] = []
+        for cache_tier in cache_tiers:
+            tier_params: dict = (
+                {"type": cache_tier}
+                if isinstance(cache_tier, str)
+                else dict(cache_tier)
+            )
+            if tier_params.get("type") == LiteLLMCacheType.TIERED:
+                raise ValueError("cache_tiers can't contain a 'tiered' cache")
+            tier_ttl = tier_params.pop("ttl", None)
+            tier_ttls.append(float(tier_ttl) if tier_ttl is not None else None)
+            caches.append(Cache(**tier_params).cache)
+        return TieredCache(caches=caches, tier_ttls=tier_ttls)
+
     def get_cache_key(self, **kwargs) -> str:
         """
         Get the cache key for the given arguments.
@@ -271,7 +608,6 @@ class Cache:
         Returns:
             str: The cache key generated from the arguments, or None if no cache key could be generated.
         """
-        cache_key = ""
         # verbose_logger.debug("\nGetting Cache key. Kwargs: %s", kwargs)
 
         preset_cache_key = self._get_preset_cache_key_from_kwargs(**kwargs)
@@ -279,13 +615,44 @@ class Cache:
             verbose_logger.debug("\nReturning preset cache key: %s", preset_cache_key)
             return preset_cache_key
 
+        if self.cache_key_hasher is not None:
+            hashed_cache_key = self.cache_key_hasher.hash_params(
+                Cache._get_cache_key_params(**kwargs)
+            )
+        else:
+            cache_key = Cache._get_unhashed_cache_key(**kwargs)
+            verbose_logger.debug("\nCreated cache key: %s", cache_key)
+            hashed_cache_key = Cache._get_hashed_cache_key(cache_key)
+        hashed_cache_key = self._add_namespace_to_cache_key(hashed_cache_key, **kwargs)
+        self._set_preset_cache_key_in_kwargs(
+            preset_cache_key=hashed_cache_key, **kwargs
+        )
+        return hashed_cache_key
+
+    @staticmethod
+    def _get_unhashed_cache_key(**kwargs) -> str:
+        """
+        Get the cache key for the given arguments, before hashing + namespacing.
+
+        Doesn't depend on the cache instance, so other request keying (e.g. the router's request coalescing) can share it.
+        """
+        cache_key = ""
+        for param, param_value in Cache._get_cache_key_params(**kwargs):
+            cache_key += f"{str(param)}: {str(param_value)}"
+        return cache_key
+
+    @staticmethod
+    def _get_cache_key_params(**kwargs) -> Iterator[Tuple[str, Any]]:
+        """
+        Yields the (param, value) pairs that make up the cache key, in order.
+        """
         combined_kwargs = ModelParamHelper._get_all_llm_api_params()
         litellm_param_kwargs = all_litellm_params
         for param in kwargs:
             if param in combined_kwargs:
-                param_value: Optional[str] = self._get_param_value(param, kwargs)
+                param_value: Optional[str] = Cache._get_param_value(param, kwargs)
                 if param_value is not None:
-                    cache_key += f"{str(param)}: {str(param_value)}"
+                    yield param, param_value
             elif (
                 param not in litellm_param_kwargs
             ):  # check if user passed in optional param - e.g. top_k
@@ -294,19 +661,10 @@ class Cache:
                 ):  # feature flagged for now
                     if kwargs[param] is None:
                         continue  # ignore None params
-                    param_value = kwargs[param]
-                    cache_key += f"{str(param)}: {str(param_value)}"
-
-        verbose_logger.debug("\nCreated cache key: %s", cache_key)
-        hashed_cache_key = Cache._get_hashed_cache_key(cache_key)
-        hashed_cache_key = self._add_namespace_to_cache_key(hashed_cache_key, **kwargs)
-        self._set_preset_cache_key_in_kwargs(
-            preset_cache_key=hashed_cache_key, **kwargs
-        )
-        return hashed_cache_key
+                    yield param, kwargs[param]
 
+    @staticmethod
     def _get_param_value(
-        self,
         param: str,
         kwargs: dict,
     ) -> Optional[str]:
@@ -314,12 +672,13 @@ class Cache:
         Get the value for the given param from kwargs
         """
         if param == "model":
-            return self._get_model_param_value(kwargs)
+            return Cache._get_model_param_value(kwargs)
         elif param == "file":
-            return self._get_file_param_value(kwargs)
+            return Cache._get_file_param_value(kwargs)
         return kwargs[param]
 
-    def _get_model_param_value(self, kwargs: dict) -> str:
+    @staticmethod
+    def _get_model_param_value(kwargs: dict) -> str:
         """
         Handles getting the value for the 'model' param from kwargs
 
@@ -333,12 +692,11 @@ class Cache:
         model_group: Optional[str] = metadata.get(
             "model_group"
         ) or metadata_in_litellm_params.get("model_group")
-        caching_group = self._get_caching_group(metadata, model_group)
+        caching_group = Cache._get_caching_group(metadata, model_group)
         return caching_group or model_group or kwargs["model"]
 
-    def _get_caching_group(
-        self, metadata: dict, model_group: Optional[str]
-    ) -> Optional[str]:
+    @staticmethod
+    def _get_caching_group(metadata: dict, model_group: Optional[str]) -> Optional[str]:
         caching_groups: Optional[List] = metadata.get("caching_groups", [])
         if caching_groups:
             for group in caching_groups:
@@ -346,7 +704,8 @@ class Cache:
                     return str(group)
         return None
 
-    def _get_file_param_value(self, kwargs: dict) -> str:
+    @staticmethod
+    def _get_file_param_value(kwargs: dict) -> str:
         """
         Handles getting the value for the 'file' param from kwargs. Used for `transcription` requests
         """
@@ -450,6 +809,14 @@ class Cache:
         """
         Common get cache logic across sync + async implementations
         """
+        if CacheCodec.is_encoded(cached_result):
+            cached_result = CacheCodec.decode(cached_result)  # type: ignore
+        if (
+            isinstance(cached_result, dict)
+            and "error" in cached_result
+            and "response" not in cached_result
+        ):
+            raise Cache._get_negative_cache_exception(cached_result["error"])
         # Check if a timestamp was stored with the cached response
         if (
             cached_result is not None
@@ -513,10 +880,18 @@ class Cache:
                     )
                 else:
                     cached_result = self.cache.get_cache(cache_key, messages=messages)
+                if self._should_protect_from_stampede(**kwargs):
+                    cached_result = self._check_refresh(
+                        cache_key=cache_key,
+                        cached_result=cached_result,
+                        owner=kwargs.get("litellm_call_id"),
+                    )
                 return self._get_cache_logic(
                     cached_result=cached_result, max_age=max_age
                 )
-        except Exception:
+        except Exception as e:
+            if getattr(e, "litellm_negative_cache_hit", False) is True:
+                raise e
             print_verbose(f"An exception occurred: {traceback.format_exc()}")
             return None
 
@@ -543,24 +918,159 @@ class Cache:
                 max_age = cache_control_args.get(
                     "s-max-age", cache_control_args.get("s-maxage", float("inf"))
                 )
-                if dynamic_cache_object is not None:
-                    cached_result = await dynamic_cache_object.async_get_cache(
-                        cache_key, **kwargs
-                    )
-                else:
-                    cached_result = await self.cache.async_get_cache(
-                        cache_key, **kwargs
+                cache_obj = dynamic_cache_object or self.cache
+                cached_result = await cache_obj.async_get_cache(cache_key, **kwargs)
+                if self._should_protect_from_stampede(**kwargs):
+                    cached_result = await self._async_check_refresh(
+                        cache_key=cache_key,
+                        cached_result=cached_result,
+                        get_entry=lambda: cache_obj.async_get_cache(
+                            cache_key, **kwargs
+                        ),
+                        owner=kwargs.get("litellm_call_id"),
                     )
                 return self._get_cache_logic(
                     cached_result=cached_result, max_age=max_age
                 )
-        except Exception:
+        except Exception as e:
+            if getattr(e, "litellm_negative_cache_hit", False) is True:
+                raise e
             print_verbose(f"An exception occurred: {traceback.format_exc()}")
             return None
 
-    def _add_cache_logic(self, result, **kwargs):
+    def _should_protect_from_stampede(self, **kwargs) -> bool:
+        """
+        Requests that won't store their response can't refresh an entry for others.
+        """
+        if self.stampede_protection is None:
+            return False
+        cache_control_args = kwargs.get("cache") or {}
+        return cache_control_args.get("no-store", False) is not True
+
+    def _check_refresh(
+        self, cache_key: str, cached_result: Any, owner: Optional[str] = None
+    ) -> Any:
+        """
+        Returns None if this request should refresh the entry. Sync lookups only coordinate with this instance.
+
+        owner: the request's litellm_call_id - `release_refresh_locks` releases its lock when it ends.
+        """
+        assert self.stampede_protection is not None
+        if CacheCodec.is_encoded(cached_result):
+            cached_result = CacheCodec.decode(cached_result)
+        if cached_result is None:
+            self.stampede_protection.acquire_lock(cache_key, owner=owner)
+            return None
+        if self.stampede_protection.should_refresh(
+            cached_result
+        ) and self.stampede_protection.acquire_lock(cache_key, owner=owner):
+            return None
+        return cached_result
+
+    async def _async_check_refresh(
+        self,
+        cache_key: str,
+        cached_result: Any,
+        get_entry: Callable[[], Any],
+        owner: Optional[str] = None,
+    ) -> Any:
+        """
+        Returns None if this request should compute / refresh the entry.
+
+        - miss: wait for the request computing it, unless this is that request
+        - stale, or due for an early refresh: refresh it, if no other request is
+
+        owner: the request's litellm_call_id - `async_release_refresh_locks` releases its lock when it ends.
+        """
+        assert self.stampede_protection is not None
+        if CacheCodec.is_encoded(cached_result):
+            cached_result = CacheCodec.decode(cached_result)
+        if cached_result is None:
+            cached_result = await self.stampede_protection.async_wait_for_entry(
+                cache_key=cache_key, get_entry=get_entry, owner=owner
+            )
+            if CacheCodec.is_encoded(cached_result):
+                cached_result = CacheCodec.decode(cached_result)
+            return cached_result
+        if self.stampede_protection.should_refresh(
+            cached_result
+        ) and await self.stampede_protection.async_acquire_lock(cache_key, owner=owner):
+            return None
+        return cached_result
+
+    def release_refresh_locks(self, litellm_call_id: str) -> None:
+        """
+        Sync `async_release_refresh_locks` - for requests made through the sync wrapper.
+        """
+        if self.stampede_protection is None:
+            return
+        self.stampede_protection.release_owner_locks(owner=litellm_call_id)
+
+    async def async_release_refresh_locks(self, litellm_call_id: str) -> None:
+        """
+        Release the refresh locks a request still holds, once it ended - e.g. it was cancelled, or its response wasn't stored.
+        """
+        if self.stampede_protection is None:
+            return
+        try:
+            await self.stampede_protection.async_release_owner_locks(
+                owner=litellm_call_id
+            )
+        except Exception as e:
+            verbose_logger.debug(
+                f"LiteLLM Cache: failed to release refresh locks - {str(e)}"
+            )
+
+    async def async_batch_get_cache(
+        self,
+        cache_keys: List[str],
+        dynamic_cache_object: Optional[BaseCache] = None,
+        **kwargs,
+    ) -> List[Optional[Any]]:
+        """
+        Get the cached results for a list of cache keys, in order - in one round trip (e.g. redis MGET) if the cache supports batch reads.
+
+        Used for the per-input lookups of embedding calls.
+        """
+        try:  # never block execution
+            if self.should_use_cache(**kwargs) is not True:
+                return [None] * len(cache_keys)
+            cache_control_args = kwargs.get("cache", {})
+            max_age = cache_control_args.get(
+                "s-max-age", cache_control_args.get("s-maxage", float("inf"))
+            )
+            pending_writes = {
+                self._pending_writes[key]
+                for key in cache_keys
+                if key in self._pending_writes
+            }
+            if pending_writes:
+                # read-your-write - the entries may still be written in the background
+                await asyncio.wait(pending_writes)
+            cache_obj = dynamic_cache_object or self.cache
+            if hasattr(cache_obj, "async_batch_get_cache"):
+                cached_results = await cache_obj.async_batch_get_cache(cache_keys)
+                if isinstance(cached_results, dict):  # redis - {key: value}
+                    cached_results = [cached_results.get(key) for key in cache_keys]
+            else:
+                cached_results = await asyncio.gather(
+                    *[cache_obj.async_get_cache(key) for key in cache_keys]
+                )
+            if cached_results is None:
+                return [None] * len(cache_keys)
+            return [
+                self._get_cache_logic(cached_result=cached_result, max_age=max_age)
+                for cached_result in cached_results
+            ]
+        except Exception:
+            print_verbose(f"An exception occurred: {traceback.format_exc()}")
+            return [None] * len(cache_keys)
+
+    def _add_cache_logic(self, result, refreshable: bool = False, **kwargs):
         """
         Common implementation across sync + async add_cache functions
+
+        refreshable: store when the entry goes stale, for stampede protection. Set for entries read by `get_cache` / `async_get_cache`.
         """
         try:
             if "cache_key" in kwargs:
@@ -569,7 +1079,10 @@ class Cache:
                 cache_key = self.get_cache_key(**kwargs)
             if cache_key is not None:
                 if isinstance(result, BaseModel):
-                    result = result.model_dump_json()
+                    if self.cache_codec is not None:
+                        result = result.model_dump(mode="json")
+                    else:
+                        result = result.model_dump_json()
 
                 ## DEFAULT TTL ##
                 if self.ttl is not None:
@@ -581,7 +1094,18 @@ class Cache:
                         if k == "ttl":
                             kwargs["ttl"] = v
 
-                cached_data = {"timestamp": time.time(), "response": result}
+                cached_data: Union[dict, bytes] = {
+                    "timestamp": time.time(),
+                    "response": result,
+                }
+                if refreshable and self.stampede_protection is not None:
+                    kwargs["ttl"] = self.stampede_protection.add_refresh_metadata(
+                        cache_key=cache_key,
+                        cached_data=cached_data,  # type: ignore
+                        ttl=self.cache.get_ttl(**kwargs),
+                    )
+                if self.cache_codec is not None:
+                    cached_data = self.cache_codec.encode(cached_data)
                 return cache_key, cached_data, kwargs
             else:
                 raise Exception("cache key is None")
@@ -603,9 +1127,11 @@ class Cache:
             if self.should_use_cache(**kwargs) is not True:
                 return
             cache_key, cached_data, kwargs = self._add_cache_logic(
-                result=result, **kwargs
+                result=result, refreshable=True, **kwargs
             )
             self.cache.set_cache(cache_key, cached_data, **kwargs)
+            if self.stampede_protection is not None:
+                self.stampede_protection.release_lock(cache_key)
         except Exception as e:
             verbose_logger.exception(f"LiteLLM Cache: Excepton add_cache: {str(e)}")
 
@@ -623,7 +1149,7 @@ class Cache:
                 await self.batch_cache_write(result, **kwargs)
             else:
                 cache_key, cached_data, kwargs = self._add_cache_logic(
-                    result=result, **kwargs
+                    result=result, refreshable=True, **kwargs
                 )
                 if dynamic_cache_object is not None:
                     await dynamic_cache_object.async_set_cache(
@@ -631,9 +1157,102 @@ class Cache:
                     )
                 else:
                     await self.cache.async_set_cache(cache_key, cached_data, **kwargs)
+                if self.stampede_protection is not None:
+                    await self.stampede_protection.async_release_lock(cache_key)
         except Exception as e:
             verbose_logger.exception(f"LiteLLM Cache: Excepton add_cache: {str(e)}")
 
+    def _add_error_cache_logic(
+        self, exception: Exception, **kwargs
+    ) -> Optional[Tuple[str, Union[dict, bytes], dict]]:
+        """
+        Returns the negative cache entry for a deterministic provider error, or None if it shouldn't be cached.
+        """
+        if (
+            self.negative_cache_ttl is None
+            or not isinstance(exception, NEGATIVE_CACHEABLE_EXCEPTIONS)
+            or getattr(exception, "litellm_negative_cache_hit", False) is True
+        ):
+            return None
+        cache_key = kwargs.get("cache_key") or self.get_cache_key(**kwargs)
+        cached_data: Union[dict, bytes] = {
+            "timestamp": time.time(),
+            "error": {
+                "type": type(exception).__name__,
+                "message": getattr(exception, "message", str(exception)),
+                "model": getattr(exception, "model", None),
+                "llm_provider": getattr(exception, "llm_provider", None),
+            },
+        }
+        if self.cache_codec is not None:
+            cached_data = self.cache_codec.encode(cached_data)
+        kwargs["ttl"] = self.negative_cache_ttl
+        return cache_key, cached_data, kwargs
+
+    @staticmethod
+    def _get_negative_cache_exception(error: dict) -> Exception:
+        exception_types = {
+            exception_type.__name__: exception_type
+            for exception_type in NEGATIVE_CACHEABLE_EXCEPTIONS
+        }
+        exception = exception_types[error["type"]](
+            message="", model=error.get("model"), llm_provider=error.get("llm_provider")
+        )
+        exception.message = error["message"]
+        setattr(exception, "litellm_negative_cache_hit", True)
+        return exception
+
+    def add_error_cache(self, exception: Exception, **kwargs) -> None:
+        """
+        Negative-cache a deterministic provider error, and release the request's refresh lock.
+        """
+        try:
+            if self.should_use_cache(**kwargs) is not True:
+                return
+            error_cache_entry = self._add_error_cache_logic(
+                exception=exception, **kwargs
+            )
+            if error_cache_entry is not None:
+                cache_key, cached_data, kwargs = error_cache_entry
+                self.cache.set_cache(cache_key, cached_data, **kwargs)
+            if self.stampede_protection is not None:
+                self.stampede_protection.release_lock(
+                    kwargs.get("cache_key") or self.get_cache_key(**kwargs)
+                )
+        except Exception as e:
+            verbose_logger.exception(
+                f"LiteLLM Cache: Excepton add_error_cache: {str(e)}"
+            )
+
+    async def async_add_error_cache(
+        self,
+        exception: Exception,
+        dynamic_cache_object: Optional[BaseCache] = None,
+        **kwargs,
+    ) -> None:
+        """
+        Async implementation of add_error_cache
+        """
+        try:
+            if self.should_use_cache(**kwargs) is not True:
+                return
+            error_cache_entry = self._add_error_cache_logic(
+                exception=exception, **kwargs
+            )
+            if error_cache_entry is not None:
+                cache_key, cached_data, kwargs = error_cache_entry
+                await (dynamic_cache_object or self.cache).async_set_cache(
+                    cache_key, cached_data, **kwargs
+                )
+            if self.stampede_protection is not None:
+                await self.stampede_protection.async_release_lock(
+                    kwargs.get("cache_key") or self.get_cache_key(**kwargs)
+                )
+        except Exception as e:
+            verbose_logger.exception(
+                f"LiteLLM Cache: Excepton add_error_cache: {str(e)}"
+            )
+
     def _convert_to_cached_embedding(
         self, embedding_response: Any, model: Optional[str]
     ) -> CachedEmbedding:
@@ -673,7 +1292,7 @@ class Cache:
         input: str,
         kwargs: dict,
         idx_in_result_data: int = 0,
-    ) -> Tuple[str, dict, dict]:
+    ) -> Tuple[str, Union[dict, bytes], dict]:
         preset_cache_key = self.get_cache_key(**{**kwargs, "input": input})
         kwargs["cache_key"] = preset_cache_key
         embedding_response = result.data[idx_in_result_data]
@@ -690,6 +1309,50 @@ class Cache:
         )
         return cache_key, cached_data, kwargs
 
+    def _get_embedding_cache_list(
+        self, result, **kwargs
+    ) -> Tuple[List[Tuple[str, Any]], dict]:
+        """
+        Returns the (cache key, cached data) entries of each embedding input, and the kwargs to write them with.
+        """
+        # set default ttl if not set
+        if self.ttl is not None:
+            kwargs["ttl"] = self.ttl
+
+        cache_list = []
+        if isinstance(kwargs["input"], list):
+            for idx, i in enumerate(kwargs["input"]):
+                (
+                    cache_key,
+                    cached_data,
+                    kwargs,
+                ) = self.add_embedding_response_to_cache(result, i, kwargs, idx)
+                cache_list.append((cache_key, cached_data))
+        elif isinstance(kwargs["input"], str):
+            cache_key, cached_data, kwargs = self.add_embedding_response_to_cache(
+                result, kwargs["input"], kwargs
+            )
+            cache_list.append((cache_key, cached_data))
+        return cache_list, kwargs
+
+    async def _async_set_cache_list(
+        self,
+        cache_list: List[Tuple[str, Any]],
+        dynamic_cache_object: Optional[BaseCache] = None,
+        **kwargs,
+    ):
+        try:
+            if dynamic_cache_object is not None:
+                await dynamic_cache_object.async_set_cache_pipeline(
+                    cache_list=cache_list, **kwargs
+                )
+            else:
+                await self.cache.async_set_cache_pipeline(
+                    cache_list=cache_list, **kwargs
+                )
+        except Exception as e:
+            verbose_logger.exception(f"LiteLLM Cache: Excepton add_cache: {str(e)}")
+
     async def async_add_cache_pipeline(
         self, result, dynamic_cache_object: Optional[BaseCache] = None, **kwargs
     ):
@@ -701,36 +1364,45 @@ class Cache:
         try:
             if self.should_use_cache(**kwargs) is not True:
                 return
+            cache_list, kwargs = self._get_embedding_cache_list(result, **kwargs)
+        except Exception as e:
+            verbose_logger.exception(f"LiteLLM Cache: Excepton add_cache: {str(e)}")
+            return
+        await self._async_set_cache_list(
+            cache_list, dynamic_cache_object=dynamic_cache_object, **kwargs
+        )
 
-            # set default ttl if not set
-            if self.ttl is not None:
-                kwargs["ttl"] = self.ttl
-
-            cache_list = []
-            if isinstance(kwargs["input"], list):
-                for idx, i in enumerate(kwargs["input"]):
-                    (
-                        cache_key,
-                        cached_data,
-                        kwargs,
-                    ) = self.add_embedding_response_to_cache(result, i, kwargs, idx)
-                    cache_list.append((cache_key, cached_data))
-            elif isinstance(kwargs["input"], str):
-                cache_key, cached_data, kwargs = self.add_embedding_response_to_cache(
-                    result, kwargs["input"], kwargs
-                )
-                cache_list.append((cache_key, cached_data))
+    def add_cache_pipeline_in_background(
+        self, result, dynamic_cache_object: Optional[BaseCache] = None, **kwargs
+    ) -> Optional[asyncio.Task]:
+        """
+        Start `async_add_cache_pipeline` as a background task.
 
-            if dynamic_cache_object is not None:
-                await dynamic_cache_object.async_set_cache_pipeline(
-                    cache_list=cache_list, **kwargs
-                )
-            else:
-                await self.cache.async_set_cache_pipeline(
-                    cache_list=cache_list, **kwargs
-                )
+        Batch reads of its cache keys wait for the task, so a lookup right after the call still sees the entries.
+        """
+        try:
+            if self.should_use_cache(**kwargs) is not True:
+                return None
+            cache_list, kwargs = self._get_embedding_cache_list(result, **kwargs)
         except Exception as e:
             verbose_logger.exception(f"LiteLLM Cache: Excepton add_cache: {str(e)}")
+            return None
+        task = asyncio.create_task(
+            self._async_set_cache_list(
+                cache_list, dynamic_cache_object=dynamic_cache_object, **kwargs
+            )
+        )
+        cache_keys = [cache_key for cache_key, _ in cache_list]
+        for cache_key in cache_keys:
+            self._pending_writes[cache_key] = task
+
+        def _done(_: asyncio.Task) -> None:
+            for cache_key in cache_keys:
+                if self._pending_writes.get(cache_key) is task:
+                    self._pending_writes.pop(cache_key)
+
+        task.add_done_callback(_done)
+        return task
 
     def should_use_cache(self, **kwargs):
         """
@@ -99,6 +99,8 @@ class LLMCachingHandler:
         self.request_kwargs = request_kwargs
         self.original_function = original_function
         self.start_time = start_time
+        # the request's pending cache write - its refresh lock is released once the write is done
+        self._cache_write_task: Optional[asyncio.Task] = None
         if litellm.cache is not None and isinstance(litellm.cache.cache, RedisCache):
             self.dual_cache: Optional[DualCache] = DualCache(
                 redis_cache=litellm.cache.cache,
@@ -597,18 +599,16 @@ class LLMCachingHandler:
                 new_kwargs["input"] = [new_kwargs["input"]]
             elif not isinstance(new_kwargs["input"], list):
                 raise ValueError("input must be a string or a list")
-            tasks = []
-            for idx, i in enumerate(new_kwargs["input"]):
-                preset_cache_key = litellm.cache.get_cache_key(
-                    **{**new_kwargs, "input": i}
-                )
-                tasks.append(
-                    litellm.cache.async_get_cache(
-                        cache_key=preset_cache_key,
-                        dynamic_cache_object=self.dual_cache,
-                    )
-                )
-            cached_result = await asyncio.gather(*tasks)
+            cache_keys = [
+                litellm.cache.get_cache_key(**{**new_kwargs, "input": i})
+                for i in new_kwargs["input"]
+            ]
+            # one batch read (e.g. redis MGET) for all inputs
+            cached_result = await litellm.cache.async_batch_get_cache(
+                cache_keys=cache_keys,
+                dynamic_cache_object=self.dual_cache,
+                cache=new_kwargs.get("cache") or {},
+            )
             ## check if cached result is None ##
             if cached_result is not None and isinstance(cached_result, list):
                 # set cached_result to None if all elements are None
@@ -834,13 +834,13 @@ class LLMCachingHandler:
                         litellm.cache.cache, S3Cache
                     )  # s3 doesn't support bulk writing. Exclude.
                 ):
-                    asyncio.create_task(
-                        litellm.cache.async_add_cache_pipeline(
+                    self._cache_write_task = (
+                        litellm.cache.add_cache_pipeline_in_background(
                             result, dynamic_cache_object=self.dual_cache, **new_kwargs
                         )
                     )
                 else:
-                    asyncio.create_task(
+                    self._cache_write_task = asyncio.create_task(
                         litellm.cache.async_add_cache(
                             result.model_dump_json(),
                             dynamic_cache_object=self.dual_cache,
@@ -848,7 +848,52 @@ class LLMCachingHandler:
                         )
                     )
             else:
-                asyncio.create_task(litellm.cache.async_add_cache(result, **new_kwargs))
+                self._cache_write_task = asyncio.create_task(
+                    litellm.cache.async_add_cache(result, **new_kwargs)
+                )
+
+    def release_refresh_locks(
+        self, kwargs: Dict[str, Any], result: Optional[Any] = None
+    ) -> None:
+        """
+        Release the cache refresh lock the request took on a miss, when the request ends - after its cache write, if any.
+
+        Covers the requests that never write the entry (cancelled, failed, responses not stored), so identical requests
+        don't wait on the lock until it expires.
+
+        Streams hold the lock until they're consumed and their entry is written - see `_add_streaming_response_to_cache`.
+        """
+        if litellm.cache is None or litellm.cache.stampede_protection is None:
+            return
+        if isinstance(result, CustomStreamWrapper):
+            return
+        litellm_call_id = kwargs.get("litellm_call_id")
+        if litellm_call_id is None:
+            return
+        cache = litellm.cache
+
+        def _release(_: Optional[asyncio.Future] = None) -> None:
+            asyncio.ensure_future(cache.async_release_refresh_locks(litellm_call_id))
+
+        if self._cache_write_task is not None and not self._cache_write_task.done():
+            self._cache_write_task.add_done_callback(_release)
+        else:
+            _release()
+
+    def sync_release_refresh_locks(
+        self, kwargs: Dict[str, Any], result: Optional[Any] = None
+    ) -> None:
+        """
+        Sync `release_refresh_locks` - the sync cache write is done by the time the request ends.
+        """
+        if litellm.cache is None or litellm.cache.stampede_protection is None:
+            return
+        if isinstance(result, CustomStreamWrapper):
+            return
+        litellm_call_id = kwargs.get("litellm_call_id")
+        if litellm_call_id is None:
+            return
+        litellm.cache.release_refresh_locks(litellm_call_id)
 
     def sync_set_cache(
         self,
@@ -877,6 +922,83 @@ class LLMCachingHandler:
 
         return
 
+    def _should_store_error_in_cache(
+        self, original_function: Callable, kwargs: Dict[str, Any]
+    ) -> bool:
+        """
+        Embedding responses are cached per input - their errors aren't cached.
+        """
+        return self._should_store_result_in_cache(
+            original_function=original_function, kwargs=kwargs
+        ) and str(original_function.__name__) not in (
+            CallTypes.embedding.value,
+            CallTypes.aembedding.value,
+        )
+
+    async def async_set_error_cache(
+        self,
+        exception: Exception,
+        original_function: Callable,
+        kwargs: Dict[str, Any],
+        args: Optional[Tuple[Any, ...]] = None,
+    ):
+        """
+        Internal method to negative-cache deterministic provider errors, and release the request's cache refresh lock
+
+        Returns:
+            None
+        Raises:
+            None
+        """
+        if litellm.cache is None or (
+            litellm.cache.negative_cache_ttl is None
+            and litellm.cache.stampede_protection is None
+        ):
+            return
+
+        new_kwargs = kwargs.copy()
+        new_kwargs.update(
+            convert_args_to_kwargs(
+                original_function,
+                args,
+            )
+        )
+        if self._should_store_error_in_cache(
+            original_function=original_function, kwargs=new_kwargs
+        ):
+            self._cache_write_task = asyncio.create_task(
+                litellm.cache.async_add_error_cache(
+                    exception, dynamic_cache_object=self.dual_cache, **new_kwargs
+                )
+            )
+
+    def sync_set_error_cache(
+        self,
+        exception: Exception,
+        kwargs: Dict[str, Any],
+        args: Optional[Tuple[Any, ...]] = None,
+    ):
+        """
+        Sync internal method to negative-cache deterministic provider errors
+        """
+        if litellm.cache is None or (
+            litellm.cache.negative_cache_ttl is None
+            and litellm.cache.stampede_protection is None
+        ):
+            return
+
+        new_kwargs = kwargs.copy()
+        new_kwargs.update(
+            convert_args_to_kwargs(
+                self.original_function,
+                args,
+            )
+        )
+        if self._should_store_error_in_cache(
+            original_function=self.original_function, kwargs=new_kwargs
+        ):
+            litellm.cache.add_error_cache(exception, **new_kwargs)
+
     def _should_store_result_in_cache(
         self, original_function: Callable, kwargs: Dict[str, Any]
     ) -> bool:
@@ -942,6 +1064,8 @@ class LLMCachingHandler:
                 original_function=self.original_function,
                 kwargs=self.request_kwargs,
             )
+            # the stream is done - release the refresh lock the request's wrapper left for it
+            self.release_refresh_locks(kwargs=self.request_kwargs)
 
     def _sync_add_streaming_response_to_cache(self, processed_chunk: ModelResponse):
         """
@@ -964,6 +1088,7 @@ class LLMCachingHandler:
                 result=complete_streaming_response,
                 kwargs=self.request_kwargs,
             )
+            self.sync_release_refresh_locks(kwargs=self.request_kwargs)
 
     def _update_litellm_logging_obj_environment(
         self,
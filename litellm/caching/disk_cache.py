@@ -1,4 +1,5 @@
 import json
+import time
 from typing import TYPE_CHECKING, Any, Optional, Union
 
 from .base_cache import BaseCache
@@ -52,6 +53,15 @@ class DiskCache(BaseCache):
             return cached_response
         return None
 
+    def get_remaining_ttl(self, key) -> Optional[float]:
+        """
+        Seconds until the key expires. None if it has no ttl, or isn't cached.
+        """
+        _, expire_time = self.disk_cache.get(key, expire_time=True)  # type: ignore
+        if expire_time is None:
+            return None
+        return max(expire_time - time.time(), 0.0)
+
     def batch_get_cache(self, keys: list, **kwargs):
         return_val = []
         for k in keys:
@@ -12,14 +12,18 @@ import asyncio
 import time
 import traceback
 from concurrent.futures import ThreadPoolExecutor
-from typing import TYPE_CHECKING, Any, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Union, cast
 
 if TYPE_CHECKING:
     from litellm.types.caching import RedisPipelineIncrementOperation
 
 import litellm
 from litellm._logging import print_verbose, verbose_logger
-from litellm.constants import DEFAULT_MAX_REDIS_BATCH_CACHE_SIZE
+from litellm.constants import (
+    DEFAULT_MAX_REDIS_BATCH_CACHE_SIZE,
+    REDIS_CLIENT_SIDE_CACHE_TTL,
+)
+from litellm.litellm_core_utils.core_helpers import _get_parent_otel_span_from_kwargs
 
 from .base_cache import BaseCache
 from .in_memory_cache import InMemoryCache
@@ -52,6 +56,12 @@ class DualCache(BaseCache):
     DualCache is a cache implementation that updates both Redis and an in-memory cache simultaneously.
     When data is updated or inserted, it is written to both the in-memory cache + Redis.
     This ensures that even if Redis hasn't been updated yet, the in-memory cache reflects the most recent data.
+
+    With `client_side_caching_prefixes`, keys under those prefixes are kept in memory until Redis says they changed
+    (server-assisted client-side caching), instead of for the in-memory ttl.
+
+    With `coalesce_redis_writes`, Redis writes and increments are batched into pipelines with concurrent ones,
+    see `RedisWriteCoalescer`.
     """
 
     def __init__(
@@ -62,6 +72,8 @@ class DualCache(BaseCache):
         default_redis_ttl: Optional[float] = None,
         default_redis_batch_cache_expiry: Optional[float] = None,
         default_max_redis_batch_cache_size: int = DEFAULT_MAX_REDIS_BATCH_CACHE_SIZE,
+        client_side_caching_prefixes: Optional[List[str]] = None,
+        coalesce_redis_writes: Optional[bool] = None,
     ) -> None:
         super().__init__()
         # If in_memory_cache is not provided, use the default InMemoryCache
@@ -81,6 +93,110 @@ class DualCache(BaseCache):
         )
         self.default_redis_ttl = default_redis_ttl or litellm.default_redis_ttl
 
+        # server-assisted client-side caching
+        self.client_side_caching_prefixes = (
+            client_side_caching_prefixes
+            if client_side_caching_prefixes is not None
+            else litellm.redis_client_side_caching_prefixes
+        )
+        self._client_side_caching_task: Optional[asyncio.Task] = None
+        self._client_side_caching_active = False
+        self._client_side_cached_keys: Set[str] = set()
+        # keys being read from redis -> invalidated during the read
+        self._client_side_reads: Dict[str, bool] = {}
+
+        self.coalesce_redis_writes = (
+            coalesce_redis_writes
+            if coalesce_redis_writes is not None
+            else litellm.redis_coalesce_writes
+        )
+
+    def _start_client_side_caching(self) -> None:
+        if (
+            not self.client_side_caching_prefixes
+            or self.redis_cache is None
+            or self._client_side_caching_task is not None
+        ):
+            return
+        self._client_side_caching_task = asyncio.create_task(
+            self._client_side_caching_listener()
+        )
+
+    async def _client_side_caching_listener(self) -> None:
+        """
+        Apply Redis invalidation messages to the in-memory cache. Reconnects on failure - while disconnected, nothing is client-side cached.
+        """
+        assert self.redis_cache is not None
+        prefixes = cast(List[str], self.client_side_caching_prefixes)
+        while True:
+            try:
+                async for keys in self.redis_cache.async_client_tracking_invalidations(
+                    prefixes=prefixes
+                ):
+                    if keys is None:
+                        self._invalidate_client_side_cache(keys=None)
+                        self._client_side_caching_active = True
+                    else:
+                        self._invalidate_client_side_cache(keys=keys)
+            except ValueError as e:
+                verbose_logger.warning(
+                    f"LiteLLM DualCache: client-side caching disabled - {str(e)}"
+                )
+                return
+            except Exception as e:
+                verbose_logger.debug(
+                    f"LiteLLM DualCache: client-side caching connection lost, reconnecting - {str(e)}"
+                )
+            finally:
+                self._client_side_caching_active = False
+                self._invalidate_client_side_cache(keys=None)
+            await asyncio.sleep(1)
+
+    def _invalidate_client_side_cache(self, keys: Optional[List[str]]) -> None:
+        """
+        Drop the in-memory copies of `keys`. None drops every client-side cached key.
+        """
+        if keys is None:
+            keys = list(self._client_side_cached_keys)
+            self._client_side_cached_keys.clear()
+            for key in self._client_side_reads:
+                self._client_side_reads[key] = True
+        for key in keys:
+            self.in_memory_cache.delete_cache(key)
+            self._client_side_cached_keys.discard(key)
+            if key in self._client_side_reads:
+                self._client_side_reads[key] = True
+
+    def _is_client_side_cacheable(self, key: str) -> bool:
+        return self._client_side_caching_active and key.startswith(
+            tuple(cast(List[str], self.client_side_caching_prefixes))
+        )
+
+    def _start_client_side_reads(self, keys: List[str]) -> None:
+        for key in keys:
+            if self._is_client_side_cacheable(key):
+                self._client_side_reads.setdefault(key, False)
+
+    async def _async_set_in_memory_from_redis(
+        self, key: str, value: Any, **kwargs
+    ) -> None:
+        """
+        Keep a value read from redis in memory. Tracked keys are kept until invalidated -
+        unless they were invalidated during the read, since the read value may be stale.
+        """
+        invalidated_during_read = self._client_side_reads.pop(key, True)
+        if (
+            not invalidated_during_read
+            and kwargs.get("ttl") is None
+            and self._is_client_side_cacheable(key)
+        ):
+            await self.in_memory_cache.async_set_cache(
+                key, value, **{**kwargs, "ttl": REDIS_CLIENT_SIDE_CACHE_TTL}
+            )
+            self._client_side_cached_keys.add(key)
+        else:
+            await self.in_memory_cache.async_set_cache(key, value, **kwargs)
+
     def update_cache_ttl(
         self, default_in_memory_ttl: Optional[float], default_redis_ttl: Optional[float]
     ):
@@ -218,6 +334,8 @@ class DualCache(BaseCache):
                     result = in_memory_result
 
             if result is None and self.redis_cache is not None and local_only is False:
+                self._start_client_side_caching()
+                self._start_client_side_reads([key])
                 # If not found in in-memory cache, try fetching from Redis
                 redis_result = await self.redis_cache.async_get_cache(
                     key, parent_otel_span=parent_otel_span
@@ -225,9 +343,11 @@ class DualCache(BaseCache):
 
                 if redis_result is not None:
                     # Update in-memory cache with the value from Redis
-                    await self.in_memory_cache.async_set_cache(
+                    await self._async_set_in_memory_from_redis(
                         key, redis_result, **kwargs
                     )
+                else:
+                    self._client_side_reads.pop(key, None)
 
                 result = redis_result
 
@@ -280,6 +400,8 @@ class DualCache(BaseCache):
 
                 # Only hit Redis if the last access time was more than 5 seconds ago
                 if len(sublist_keys) > 0:
+                    self._start_client_side_caching()
+                    self._start_client_side_reads(sublist_keys)
                     # If not found in in-memory cache, try fetching from Redis
                     redis_result = await self.redis_cache.async_batch_get_cache(
                         sublist_keys, parent_otel_span=parent_otel_span
@@ -292,6 +414,8 @@ class DualCache(BaseCache):
                     
                     # Short-circuit if redis_result is None or contains only None values
                     if redis_result is None or all(v is None for v in redis_result.values()):
+                        for key in sublist_keys:
+                            self._client_side_reads.pop(key, None)
                         return result
 
                     # Pre-compute key-to-index mapping for O(1) lookup
@@ -302,9 +426,11 @@ class DualCache(BaseCache):
                         result[key_to_index[key]] = value
                         
                         if value is not None and self.in_memory_cache is not None:
-                            await self.in_memory_cache.async_set_cache(
+                            await self._async_set_in_memory_from_redis(
                                 key, value, **kwargs
                             )
+                        else:
+                            self._client_side_reads.pop(key, None)
 
             return result
         except Exception:
@@ -319,7 +445,16 @@ class DualCache(BaseCache):
                 await self.in_memory_cache.async_set_cache(key, value, **kwargs)
 
             if self.redis_cache is not None and local_only is False:
-                await self.redis_cache.async_set_cache(key, value, **kwargs)
+                if self.coalesce_redis_writes:
+                    await self.redis_cache.get_write_coalescer().async_set(
+                        key,
+                        value,
+                        ttl=self.redis_cache.get_ttl(**kwargs),
+                        nx=kwargs.get("nx", False),
+                        parent_otel_span=_get_parent_otel_span_from_kwargs(kwargs),
+                    )
+                else:
+                    await self.redis_cache.async_set_cache(key, value, **kwargs)
         except Exception as e:
             verbose_logger.exception(
                 f"LiteLLM Cache: Excepton async add_cache: {str(e)}"
@@ -342,9 +477,25 @@ class DualCache(BaseCache):
                 )
 
             if self.redis_cache is not None and local_only is False:
-                await self.redis_cache.async_set_cache_pipeline(
-                    cache_list=cache_list, ttl=kwargs.pop("ttl", None), **kwargs
-                )
+                if self.coalesce_redis_writes:
+                    coalescer = self.redis_cache.get_write_coalescer()
+                    ttl = self.redis_cache.get_ttl(ttl=kwargs.get("ttl"))
+                    parent_otel_span = _get_parent_otel_span_from_kwargs(kwargs)
+                    await asyncio.gather(
+                        *[
+                            coalescer.async_set(
+                                cache_key,
+                                cache_value,
+                                ttl=ttl,
+                                parent_otel_span=parent_otel_span,
+                            )
+                            for cache_key, cache_value in cache_list
+                        ]
+                    )
+                else:
+                    await self.redis_cache.async_set_cache_pipeline(
+                        cache_list=cache_list, ttl=kwargs.pop("ttl", None), **kwargs
+                    )
         except Exception as e:
             verbose_logger.exception(
                 f"LiteLLM Cache: Excepton async add_cache: {str(e)}"
@@ -373,12 +524,21 @@ class DualCache(BaseCache):
                 )
 
             if self.redis_cache is not None and local_only is False:
-                result = await self.redis_cache.async_increment(
-                    key,
-                    value,
-                    parent_otel_span=parent_otel_span,
-                    ttl=kwargs.get("ttl", None),
-                )
+                if self.coalesce_redis_writes:
+                    coalescer = self.redis_cache.get_write_coalescer()
+                    result = await coalescer.async_increment(
+                        key,
+                        value,
+                        ttl=self.redis_cache.get_ttl(ttl=kwargs.get("ttl", None)),
+                        parent_otel_span=parent_otel_span,
+                    )
+                else:
+                    result = await self.redis_cache.async_increment(
+                        key,
+                        value,
+                        parent_otel_span=parent_otel_span,
+                        ttl=kwargs.get("ttl", None),
+                    )
 
             return result
         except Exception as e:
@@ -400,10 +560,27 @@ class DualCache(BaseCache):
                 )
 
             if self.redis_cache is not None and local_only is False:
-                result = await self.redis_cache.async_increment_pipeline(
-                    increment_list=increment_list,
-                    parent_otel_span=parent_otel_span,
-                )
+                if self.coalesce_redis_writes and len(increment_list) > 0:
+                    coalescer = self.redis_cache.get_write_coalescer()
+                    result = list(
+                        await asyncio.gather(
+                            *[
+                                coalescer.async_increment(
+                                    increment_op["key"],
+                                    increment_op["increment_value"],
+                                    ttl=increment_op["ttl"],
+                                    refresh_ttl=True,
+                                    parent_otel_span=parent_otel_span,
+                                )
+                                for increment_op in increment_list
+                            ]
+                        )
+                    )
+                else:
+                    result = await self.redis_cache.async_increment_pipeline(
+                        increment_list=increment_list,
+                        parent_otel_span=parent_otel_span,
+                    )
 
             return result
         except Exception as e:
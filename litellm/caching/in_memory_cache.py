@@ -8,86 +8,174 @@ Has 4 methods:
     - async_get_cache
 """
 
+import heapq
 import json
 import sys
 import time
-import heapq
-from typing import TYPE_CHECKING, Any, List, Optional
+from collections import OrderedDict
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 if TYPE_CHECKING:
     from litellm.types.caching import RedisPipelineIncrementOperation
 
 from pydantic import BaseModel
 
-from litellm.constants import MAX_SIZE_PER_ITEM_IN_MEMORY_CACHE_IN_KB
+from litellm.constants import (
+    MAX_ITEMS_IN_MEMORY_CACHE,
+    MAX_SIZE_IN_MEMORY_CACHE_IN_KB,
+    MAX_SIZE_PER_ITEM_IN_MEMORY_CACHE_IN_KB,
+)
 
 from .base_cache import BaseCache
 
+_PRIMITIVE_TYPES = (str, bytes, bool, int, float, type(None))
+# items of a container that are measured, to estimate its size. Mappings' values are less uniform, so more are measured
+_SIZE_SAMPLE_ITEMS = 8
+_SIZE_SAMPLE_MAPPING_ITEMS = 128
+_MAX_SIZE_ESTIMATE_DEPTH = (
+    4  # nested values past this depth get their type's average size
+)
+
+
+class ValueSizeEstimator:
+    """
+    Cheap size estimates for cache values, without serializing them.
+
+    - primitives: sys.getsizeof
+    - containers: a few items are measured, and the rest extrapolated
+    - pydantic models: the fields that were set (defaults are ~constant per model, and counted via the field dict)
+    - values nested past _MAX_SIZE_ESTIMATE_DEPTH: the average size of values of their type, measured so far
+    """
+
+    def __init__(self):
+        # {type: (average size in bytes, number of values measured)}
+        self.type_sizes: Dict[type, Tuple[float, int]] = {}
+
+    def get_size_in_bytes(self, value: Any, depth: int = 0) -> float:
+        if isinstance(value, _PRIMITIVE_TYPES):
+            return sys.getsizeof(value)
+
+        value_type = type(value)
+        if depth >= _MAX_SIZE_ESTIMATE_DEPTH:
+            type_size = self.type_sizes.get(value_type)
+            return type_size[0] if type_size is not None else sys.getsizeof(value)
+
+        if isinstance(value, dict):
+            size = sys.getsizeof(value) + self._get_items_size(
+                items=value.items(), num_items=len(value), depth=depth, is_mapping=True
+            )
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            size = sys.getsizeof(value) + self._get_items_size(
+                items=value, num_items=len(value), depth=depth
+            )
+        elif isinstance(value, BaseModel):
+            fields = value.__dict__
+            fields_set = [
+                (field, fields[field])
+                for field in value.model_fields_set
+                if field in fields
+            ]
+            size = (
+                sys.getsizeof(value)
+                + sys.getsizeof(fields)
+                + self._get_items_size(
+                    items=fields_set,
+                    num_items=len(fields_set),
+                    depth=depth,
+                    is_mapping=True,
+                )
+            )
+        else:
+            size = sys.getsizeof(value)
+
+        self._record_type_size(value_type, size)
+        return size
+
+    def _get_items_size(
+        self, items: Any, num_items: int, depth: int, is_mapping: bool = False
+    ) -> float:
+        if num_items == 0:
+            return 0.0
+        sampled_size = 0.0
+        num_sampled = 0
+        for item in islice(
+            items, _SIZE_SAMPLE_MAPPING_ITEMS if is_mapping else _SIZE_SAMPLE_ITEMS
+        ):
+            if is_mapping:
+                key, item = item
+                sampled_size += sys.getsizeof(key)
+            sampled_size += self.get_size_in_bytes(item, depth + 1)
+            num_sampled += 1
+        return sampled_size * num_items / num_sampled
+
+    def _record_type_size(self, value_type: type, size: float) -> None:
+        avg_size, count = self.type_sizes.get(value_type, (0.0, 0))
+        count = min(count + 1, 100)  # moving average over ~the last 100 values
+        self.type_sizes[value_type] = (avg_size + (size - avg_size) / count, count)
+
+
+value_size_estimator = ValueSizeEstimator()
+
 
 class InMemoryCache(BaseCache):
     def __init__(
         self,
-        max_size_in_memory: Optional[int] = 200,
+        max_size_in_memory: Optional[int] = None,
         default_ttl: Optional[
             int
         ] = 600,  # default ttl is 10 minutes. At maximum litellm rate limiting logic requires objects to be in memory for 1 minute
         max_size_per_item: Optional[int] = 1024,  # 1MB = 1024KB
+        max_size_in_memory_in_kb: Optional[float] = None,
     ):
         """
-        max_size_in_memory [int]: Maximum number of items in cache. done to prevent memory leaks. Use 200 items as a default
+        max_size_in_memory [int]: Maximum number of items in cache. done to prevent memory leaks. Defaults to MAX_ITEMS_IN_MEMORY_CACHE (50,000)
+        max_size_in_memory_in_kb [float]: Maximum total size of the items in cache. Defaults to MAX_SIZE_IN_MEMORY_CACHE_IN_KB (100MB)
+
+        Past either limit, expired items are evicted first, then the least recently used items.
         """
         self.max_size_in_memory = (
-            max_size_in_memory if max_size_in_memory is not None else 200
-        )  # set an upper bound of 200 items in-memory
+            max_size_in_memory
+            if max_size_in_memory is not None
+            else MAX_ITEMS_IN_MEMORY_CACHE
+        )
+        self.max_size_in_memory_in_kb = (
+            max_size_in_memory_in_kb
+            if max_size_in_memory_in_kb is not None
+            else MAX_SIZE_IN_MEMORY_CACHE_IN_KB
+        )
         self.default_ttl = default_ttl or 600
         self.max_size_per_item = (
             max_size_per_item or MAX_SIZE_PER_ITEM_IN_MEMORY_CACHE_IN_KB
         )  # 1MB = 1024KB
 
-        # in-memory cache
-        self.cache_dict: dict = {}
+        # in-memory cache, least recently used first
+        self.cache_dict: OrderedDict = OrderedDict()
         self.ttl_dict: dict = {}
         self.expiration_heap: list[tuple[float, str]] = []
+        # size (KB) of each item, as measured by check_value_size
+        self.item_size_dict: Dict[str, float] = {}
+        self.total_size_in_kb: float = 0.0
 
     def check_value_size(self, value: Any):
         """
         Check if value size exceeds max_size_per_item (1MB)
         Returns True if value size is acceptable, False otherwise
         """
-        try:
-            # Fast path for common primitive types that are typically small
-            if (
-                isinstance(value, (bool, int, float, str))
-                and len(str(value))
-                < self.max_size_per_item * MAX_SIZE_PER_ITEM_IN_MEMORY_CACHE_IN_KB
-            ):  # Conservative estimate
-                return True
-
-            # Direct size check for bytes objects
-            if isinstance(value, bytes):
-                return sys.getsizeof(value) / 1024 <= self.max_size_per_item
-
-            # Handle special types without full conversion when possible
-            if hasattr(value, "__sizeof__"):  # Use __sizeof__ if available
-                size = value.__sizeof__() / 1024
-                return size <= self.max_size_per_item
-
-            # Fallback for complex types
-            if isinstance(value, BaseModel) and hasattr(
-                value, "model_dump"
-            ):  # Pydantic v2
-                value = value.model_dump()
-            elif hasattr(value, "isoformat"):  # datetime objects
-                return True  # datetime strings are always small
-
-            # Only convert to JSON if absolutely necessary
-            if not isinstance(value, (str, bytes)):
-                value = json.dumps(value, default=str)
-
-            return sys.getsizeof(value) / 1024 <= self.max_size_per_item
+        size_in_kb = self.get_value_size_in_kb(value)
+        return size_in_kb is not None and size_in_kb <= self.max_size_per_item
 
+    def get_value_size_in_kb(self, value: Any) -> Optional[float]:
+        """
+        Estimated size of the value in KB. None if it can't be measured.
+        """
+        try:
+            # Fast path for common primitive types
+            if isinstance(value, (str, bytes, bool, int, float)):
+                return sys.getsizeof(value) / 1024
+            return value_size_estimator.get_size_in_bytes(value) / 1024
         except Exception:
-            return False
+            return None
 
     def _is_key_expired(self, key: str) -> bool:
         """
@@ -101,12 +189,32 @@ class InMemoryCache(BaseCache):
         """
         self.cache_dict.pop(key, None)
         self.ttl_dict.pop(key, None)
+        self.total_size_in_kb -= self.item_size_dict.pop(key, 0.0)
+
+    def _is_full(self, new_item_size_in_kb: float = 0.0) -> bool:
+        return (
+            len(self.cache_dict) >= self.max_size_in_memory
+            or self.total_size_in_kb + new_item_size_in_kb
+            > self.max_size_in_memory_in_kb
+        )
+
+    def _compact_expiration_heap(self) -> None:
+        """
+        Drop outdated heap entries (of updated / removed keys), once they outnumber the valid ones.
 
-    def evict_cache(self):
+        Amortized O(1) per set - the heap is rebuilt at most once per len(ttl_dict) pushes.
+        """
+        if len(self.expiration_heap) > 2 * len(self.ttl_dict) + 64:
+            self.expiration_heap = [
+                (expiration_time, key) for key, expiration_time in self.ttl_dict.items()
+            ]
+            heapq.heapify(self.expiration_heap)
+
+    def evict_cache(self, new_item_size_in_kb: float = 0.0):
         """
         Eviction policy:
         1. First, remove expired items from ttl_dict and cache_dict
-        2. If cache is still at or above max_size_in_memory, evict items with earliest expiration times
+        2. If cache is still at or above max_size_in_memory / max_size_in_memory_in_kb, evict the least recently used items
 
 
         This guarantees the following:
@@ -114,6 +222,7 @@ class InMemoryCache(BaseCache):
         - 2. When ttl is set: the item will remain in memory for at least that amount of time, unless cache size requires eviction
         - 3. the size of in-memory cache is bounded
 
+        Each eviction is O(1) (amortized O(log n) for expired items) - no scans over the cache.
         """
         current_time = time.time()
 
@@ -132,12 +241,9 @@ class InMemoryCache(BaseCache):
                 # Case 3: Entry is valid and not expired
                 break
 
-        # Step 2: Evict if cache is still full
-        while len(self.cache_dict) >= self.max_size_in_memory:
-            expiration_time, key = heapq.heappop(self.expiration_heap)
-            # Skip if key was removed or updated
-            if self.ttl_dict.get(key) == expiration_time:
-                self._remove_key(key)
+        # Step 2: Evict least recently used items, if cache is still full
+        while self.cache_dict and self._is_full(new_item_size_in_kb):
+            self._remove_key(next(iter(self.cache_dict)))
 
         # de-reference the removed item
         # https://www.geeksforgeeks.org/diagnosing-and-fixing-memory-leaks-in-python/
@@ -161,13 +267,20 @@ class InMemoryCache(BaseCache):
         if self.max_size_in_memory == 0:
             return  # Don't cache anything if max size is 0
 
-        if len(self.cache_dict) >= self.max_size_in_memory:
-            # only evict when cache is full
-            self.evict_cache()
-        if not self.check_value_size(value):
+        size_in_kb = self.get_value_size_in_kb(value)
+        if size_in_kb is None or size_in_kb > self.max_size_per_item:
             return
 
+        # replaced items don't count towards the limits
+        self.total_size_in_kb -= self.item_size_dict.pop(key, 0.0)
+        if key not in self.cache_dict and self._is_full(size_in_kb):
+            # only evict when cache is full
+            self.evict_cache(new_item_size_in_kb=size_in_kb)
+
         self.cache_dict[key] = value
+        self.cache_dict.move_to_end(key)
+        self.item_size_dict[key] = size_in_kb
+        self.total_size_in_kb += size_in_kb
         if self.allow_ttl_override(key):  # if ttl is not set, set it to default ttl
             if "ttl" in kwargs and kwargs["ttl"] is not None:
                 self.ttl_dict[key] = time.time() + float(kwargs["ttl"])
@@ -175,6 +288,7 @@ class InMemoryCache(BaseCache):
             else:
                 self.ttl_dict[key] = time.time() + self.default_ttl
                 heapq.heappush(self.expiration_heap, (self.ttl_dict[key], key))
+            self._compact_expiration_heap()
 
     async def async_set_cache(self, key, value, **kwargs):
         self.set_cache(key=key, value=value, **kwargs)
@@ -212,6 +326,7 @@ class InMemoryCache(BaseCache):
         if key in self.cache_dict:
             if self.evict_element_if_expired(key):
                 return None
+            self.cache_dict.move_to_end(key)
             original_cached_response = self.cache_dict[key]
             try:
                 cached_response = json.loads(original_cached_response)
@@ -266,6 +381,8 @@ class InMemoryCache(BaseCache):
         self.cache_dict.clear()
         self.ttl_dict.clear()
         self.expiration_heap.clear()
+        self.item_size_dict.clear()
+        self.total_size_in_kb = 0.0
 
     async def disconnect(self):
         pass
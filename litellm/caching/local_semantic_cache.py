@@ -0,0 +1,543 @@
+"""
+Local Semantic Cache implementation - an in-process semantic cache, no vector database needed.
+
+Prompt embeddings are kept in numpy arrays, one partition per cache namespace.
+- small partitions are searched exhaustively
+- larger partitions are searched with an IVF index - the vectors are clustered (k-means), and only the clusters nearest the query are searched.
+  The index is rebuilt as a partition doubles - off the event loop for async writes, then swapped in under the lock.
+
+Optionally persisted to `persist_dir` - vectors as .npy files (memory-mapped on load), entries as json.
+
+Has 4 methods:
+    - set_cache
+    - get_cache
+    - async_set_cache
+    - async_get_cache
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple, cast
+
+import litellm
+from litellm._logging import print_verbose, verbose_logger
+from litellm.constants import (
+    LOCAL_SEMANTIC_CACHE_IVF_MIN_SIZE,
+    LOCAL_SEMANTIC_CACHE_IVF_NPROBE,
+    LOCAL_SEMANTIC_CACHE_MAX_SIZE,
+)
+from litellm.litellm_core_utils.asyncify import asyncify
+from litellm.litellm_core_utils.prompt_templates.common_utils import (
+    get_str_from_messages,
+)
+from litellm.types.utils import EmbeddingResponse
+
+from .base_cache import BaseCache
+from .semantic_cache_embedding_batcher import SemanticCacheEmbeddingBatcher
+
+try:
+    import numpy as np
+except ModuleNotFoundError:
+    np = None  # type: ignore
+
+_INITIAL_CAPACITY = 64
+_KMEANS_ITERATIONS = 8
+_KMEANS_SAMPLES_PER_CLUSTER = 64
+_IVF_ASSIGN_BATCH_SIZE = 4096
+_ENTRIES_FILE_NAME = "entries.json"
+
+
+def _train_ivf(vectors: Any) -> Tuple[Any, Any]:
+    """
+    Cluster the vectors with spherical k-means (on a sample), and assign every row to its nearest cluster.
+
+    Returns (centroids, cluster id per row). Doesn't touch the partition - safe to run in a worker thread.
+    """
+    size = len(vectors)
+    n_clusters = max(1, int(math.sqrt(size)))
+    rng = np.random.default_rng(0)
+    sample = vectors[
+        rng.choice(
+            size,
+            min(size, n_clusters * _KMEANS_SAMPLES_PER_CLUSTER),
+            replace=False,
+        )
+    ]
+    centroids = sample[rng.choice(len(sample), n_clusters, replace=False)].copy()
+    for _ in range(_KMEANS_ITERATIONS):
+        assignments = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, sample)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        non_empty = norms[:, 0] > 0
+        centroids[non_empty] = sums[non_empty] / norms[non_empty]
+    cluster_ids = np.empty(size, dtype=np.int32)
+    for start in range(0, size, _IVF_ASSIGN_BATCH_SIZE):
+        end = min(start + _IVF_ASSIGN_BATCH_SIZE, size)
+        cluster_ids[start:end] = np.argmax(vectors[start:end] @ centroids.T, axis=1)
+    return centroids, cluster_ids
+
+
+class _SemanticCachePartition:
+    """
+    The entries of one namespace. Rows are appended, and expired / evicted rows are dropped by `compact`.
+    """
+
+    def __init__(
+        self,
+        dimensions: int,
+        max_size: int,
+        ivf_min_size: int,
+        ivf_nprobe: int,
+        vectors: Optional[Any] = None,
+        expires_at: Optional[Any] = None,
+        prompts: Optional[List[str]] = None,
+        responses: Optional[List[Any]] = None,
+    ):
+        self.dimensions = dimensions
+        self.max_size = max_size
+        self.ivf_min_size = ivf_min_size
+        self.ivf_nprobe = ivf_nprobe
+        self.prompts: List[str] = prompts or []
+        self.responses: List[Any] = responses or []
+        size = len(self.prompts)
+        # loaded vectors can be a read-only memory map - they're copied on the first write
+        self.vectors = (
+            vectors
+            if vectors is not None
+            else np.empty((_INITIAL_CAPACITY, dimensions), dtype=np.float32)
+        )
+        self.expires_at = (
+            np.asarray(expires_at, dtype=np.float64)
+            if expires_at is not None
+            else np.empty(len(self.vectors), dtype=np.float64)
+        )
+        # IVF index
+        self.centroids: Optional[Any] = None
+        self.cluster_ids = np.full(len(self.vectors), -1, dtype=np.int32)
+        self.indexed_size = 0
+        self.ivf_rebuilding = False
+        # bumped when rows are dropped - an index trained before that no longer matches the rows
+        self.generation = 0
+        if size >= self.ivf_min_size:
+            self._build_ivf()
+
+    @property
+    def size(self) -> int:
+        return len(self.prompts)
+
+    def _resize(self, capacity: int) -> None:
+        size = self.size
+        vectors = np.empty((capacity, self.dimensions), dtype=np.float32)
+        vectors[:size] = self.vectors[:size]
+        expires_at = np.empty(capacity, dtype=np.float64)
+        expires_at[:size] = self.expires_at[:size]
+        cluster_ids = np.full(capacity, -1, dtype=np.int32)
+        cluster_ids[:size] = self.cluster_ids[:size]
+        self.vectors, self.expires_at, self.cluster_ids = (
+            vectors,
+            expires_at,
+            cluster_ids,
+        )
+
+    def add(self, vector: Any, prompt: str, response: Any, expires_at: float) -> bool:
+        """
+        Returns True if the IVF index is due for a rebuild - see `start_ivf_rebuild`.
+        """
+        if self.size >= len(self.vectors) or self.size >= self.max_size:
+            self.compact(now=time.time())
+        if self.size >= len(self.vectors) or not self.vectors.flags.writeable:
+            self._resize(max(_INITIAL_CAPACITY, min(2 * self.size, self.max_size)))
+        row = self.size
+        self.vectors[row] = vector
+        self.expires_at[row] = expires_at
+        if self.centroids is not None:
+            self.cluster_ids[row] = int(np.argmax(self.centroids @ vector))
+        self.prompts.append(prompt)
+        self.responses.append(response)
+        return (
+            not self.ivf_rebuilding
+            and self.size >= self.ivf_min_size
+            and self.size >= 2 * self.indexed_size
+        )
+
+    def compact(self, now: float) -> None:
+        """
+        Drop expired rows. If still full, drop the oldest rows - down to 90% of max_size, so evictions are batched.
+        """
+        size = self.size
+        keep = np.flatnonzero(self.expires_at[:size] > now)
+        if len(keep) >= self.max_size:
+            max_kept = self.max_size - max(1, self.max_size // 10)
+            keep = keep[len(keep) - max_kept :]
+        if len(keep) == size:
+            return
+        self.vectors = self.vectors[keep]
+        self.expires_at = self.expires_at[keep]
+        self.cluster_ids = self.cluster_ids[keep]
+        self.prompts = [self.prompts[row] for row in keep]
+        self.responses = [self.responses[row] for row in keep]
+        self.generation += 1
+        if self.size < self.ivf_min_size:
+            self.centroids = None
+            self.indexed_size = 0
+
+    def _build_ivf(self) -> None:
+        vectors = self.vectors[: self.size]
+        centroids, cluster_ids = _train_ivf(vectors)
+        self.finish_ivf_rebuild(
+            centroids=centroids, cluster_ids=cluster_ids, generation=self.generation
+        )
+
+    def start_ivf_rebuild(self) -> Optional[Tuple[Any, int]]:
+        """
+        Returns the rows to train the index on, or None if a rebuild is already running. Call under the cache lock.
+
+        Rows are never written in place - appends go past the snapshot, resizes / compactions copy - so the snapshot can
+        be read without the lock.
+        """
+        if self.ivf_rebuilding:
+            return None
+        self.ivf_rebuilding = True
+        return self.vectors[: self.size], self.generation
+
+    def finish_ivf_rebuild(
+        self, centroids: Optional[Any], cluster_ids: Optional[Any], generation: int
+    ) -> None:
+        """
+        Swap in a trained index, and assign the rows added while it trained. Call under the cache lock.
+
+        Dropped if rows were compacted meanwhile - the current index stays, and a later add retries.
+        """
+        self.ivf_rebuilding = False
+        if (
+            centroids is None
+            or cluster_ids is None
+            or generation != self.generation
+            or self.size < self.ivf_min_size
+        ):
+            return
+        indexed_size = len(cluster_ids)
+        self.cluster_ids[:indexed_size] = cluster_ids
+        for start in range(indexed_size, self.size, _IVF_ASSIGN_BATCH_SIZE):
+            end = min(start + _IVF_ASSIGN_BATCH_SIZE, self.size)
+            self.cluster_ids[start:end] = np.argmax(
+                self.vectors[start:end] @ centroids.T, axis=1
+            )
+        self.centroids = centroids
+        self.indexed_size = indexed_size
+
+    def search(self, query: Any, now: float) -> Tuple[Optional[int], float]:
+        """
+        Returns the row of the most similar unexpired vector, and its cosine similarity
+        """
+        size = self.size
+        if size == 0:
+            return None, 0.0
+        if self.centroids is None:
+            rows = None
+            scores = self.vectors[:size] @ query
+            expires_at = self.expires_at[:size]
+        else:
+            nprobe = min(self.ivf_nprobe, len(self.centroids))
+            nearest_clusters = np.argpartition(-(self.centroids @ query), nprobe - 1)[
+                :nprobe
+            ]
+            rows = np.flatnonzero(np.isin(self.cluster_ids[:size], nearest_clusters))
+            if len(rows) == 0:
+                return None, 0.0
+            scores = self.vectors[rows] @ query
+            expires_at = self.expires_at[rows]
+        scores = np.where(expires_at > now, scores, -np.inf)
+        best = int(np.argmax(scores))
+        if scores[best] == -np.inf:
+            return None, 0.0
+        row = best if rows is None else int(rows[best])
+        return row, float(scores[best])
+
+
+class LocalSemanticCache(BaseCache):
+    def __init__(
+        self,
+        similarity_threshold: Optional[float] = None,
+        embedding_model: str = "text-embedding-ada-002",
+        max_size: Optional[int] = None,
+        persist_dir: Optional[str] = None,
+        ivf_min_size: Optional[int] = None,
+        ivf_nprobe: Optional[int] = None,
+    ):
+        """
+        similarity_threshold: min cosine similarity of a cache hit (0.0 to 1.0).
+        embedding_model: model used to embed prompts.
+        max_size: max entries per namespace. The oldest entries are evicted past it.
+        persist_dir: if set, the cache is loaded from / saved to this directory.
+        ivf_min_size: partitions with at least this many entries are searched with an IVF index, instead of exhaustively.
+        ivf_nprobe: number of IVF clusters searched per lookup.
+        """
+        if np is None:
+            raise ModuleNotFoundError(
+                "Please install numpy to use the local semantic cache - `pip install numpy`"
+            )
+        if similarity_threshold is None:
+            raise ValueError("similarity_threshold must be provided, passed None")
+        super().__init__()
+        self.similarity_threshold = similarity_threshold
+        self.embedding_model = embedding_model
+        self._embedding_batcher = SemanticCacheEmbeddingBatcher(
+            embedding_model=embedding_model
+        )
+        self.max_size = max_size or LOCAL_SEMANTIC_CACHE_MAX_SIZE
+        self.persist_dir = persist_dir
+        self.ivf_min_size = ivf_min_size or LOCAL_SEMANTIC_CACHE_IVF_MIN_SIZE
+        self.ivf_nprobe = ivf_nprobe or LOCAL_SEMANTIC_CACHE_IVF_NPROBE
+        self.partitions: Dict[Optional[str], _SemanticCachePartition] = {}
+        self._lock = threading.Lock()
+        if self.persist_dir is not None:
+            self._load()
+
+    @staticmethod
+    def _get_namespace(key: str) -> Optional[str]:
+        """
+        Cache keys are '<namespace>:<hash>' when a namespace is set
+        """
+        namespace, _, _ = str(key).rpartition(":")
+        return namespace or None
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> Any:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def _get_expires_at(self, **kwargs) -> float:
+        ttl = kwargs.get("ttl")
+        return time.time() + float(ttl) if ttl is not None else math.inf
+
+    def _get_embedding(self, prompt: str) -> List[float]:
+        embedding_response = cast(
+            EmbeddingResponse,
+            litellm.embedding(
+                model=self.embedding_model,
+                input=prompt,
+                cache={"no-store": True, "no-cache": True},
+            ),
+        )
+        return embedding_response["data"][0]["embedding"]
+
+    async def _get_async_embedding(self, prompt: str, **kwargs) -> List[float]:
+        # batched with concurrent lookups, and reused from the lookup on set
+        return await self._embedding_batcher.get_embedding(prompt, **kwargs)
+
+    def _add(
+        self, key: str, prompt: str, embedding: List[float], value: Any, **kwargs
+    ) -> Optional[_SemanticCachePartition]:
+        """
+        Returns the partition if its IVF index is due for a rebuild - see `_rebuild_ivf`.
+        """
+        vector = self._normalize(embedding)
+        namespace = self._get_namespace(key)
+        with self._lock:
+            partition = self.partitions.get(namespace)
+            if partition is None or partition.dimensions != len(vector):
+                # new namespace, or the embedding model changed
+                partition = _SemanticCachePartition(
+                    dimensions=len(vector),
+                    max_size=self.max_size,
+                    ivf_min_size=self.ivf_min_size,
+                    ivf_nprobe=self.ivf_nprobe,
+                )
+                self.partitions[namespace] = partition
+            needs_ivf_rebuild = partition.add(
+                vector=vector,
+                prompt=prompt,
+                response=value,
+                expires_at=self._get_expires_at(**kwargs),
+            )
+        return partition if needs_ivf_rebuild else None
+
+    def _rebuild_ivf(self, partition: _SemanticCachePartition) -> None:
+        """
+        Train the partition's IVF index without holding the lock - lookups and writes continue meanwhile.
+        """
+        with self._lock:
+            snapshot = partition.start_ivf_rebuild()
+        if snapshot is None:
+            return
+        vectors, generation = snapshot
+        centroids, cluster_ids = None, None
+        try:
+            centroids, cluster_ids = _train_ivf(vectors)
+        except Exception as e:
+            verbose_logger.exception(
+                f"LiteLLM Local Semantic Cache: Error building IVF index: {str(e)}"
+            )
+        finally:
+            with self._lock:
+                partition.finish_ivf_rebuild(
+                    centroids=centroids, cluster_ids=cluster_ids, generation=generation
+                )
+
+    def _search(
+        self, key: str, prompt: str, embedding: List[float]
+    ) -> Tuple[Any, float]:
+        """
+        Returns the cached response (or None on a miss), and the similarity of the closest cached prompt
+        """
+        vector = self._normalize(embedding)
+        with self._lock:
+            partition = self.partitions.get(self._get_namespace(key))
+            if partition is None or partition.dimensions != len(vector):
+                return None, 0.0
+            row, similarity = partition.search(query=vector, now=time.time())
+            if row is None:
+                return None, 0.0
+            cached_prompt = partition.prompts[row]
+            cached_response = partition.responses[row]
+        print_verbose(
+            f"semantic cache: similarity threshold: {self.similarity_threshold}, similarity: {similarity}, prompt: {prompt}, closest_cached_prompt: {cached_prompt}"
+        )
+        if similarity >= self.similarity_threshold:
+            return cached_response, similarity
+        return None, similarity
+
+    def set_cache(self, key, value, **kwargs):
+        print_verbose(f"local semantic-cache set_cache, kwargs: {kwargs}")
+        messages = kwargs.get("messages", [])
+        if not messages:
+            print_verbose("No messages provided for semantic caching")
+            return
+        prompt = get_str_from_messages(messages)
+        partition = self._add(key, prompt, self._get_embedding(prompt), value, **kwargs)
+        if partition is not None:
+            self._rebuild_ivf(partition)
+
+    def get_cache(self, key, **kwargs):
+        print_verbose(f"local semantic-cache get_cache, kwargs: {kwargs}")
+        messages = kwargs.get("messages", [])
+        if not messages:
+            print_verbose("No messages provided for semantic cache lookup")
+            return None
+        prompt = get_str_from_messages(messages)
+        cached_response, _ = self._search(key, prompt, self._get_embedding(prompt))
+        return cached_response
+
+    async def async_set_cache(self, key, value, **kwargs):
+        print_verbose(f"async local semantic-cache set_cache, kwargs: {kwargs}")
+        messages = kwargs.get("messages", [])
+        if not messages:
+            print_verbose("No messages provided for semantic caching")
+            return
+        prompt = get_str_from_messages(messages)
+        embedding = await self._get_async_embedding(prompt, **kwargs)
+        partition = self._add(key, prompt, embedding, value, **kwargs)
+        if partition is not None:
+            # k-means over up to ~20k vectors - keep it off the event loop
+            await asyncify(self._rebuild_ivf)(partition)
+
+    async def async_get_cache(self, key, **kwargs):
+        print_verbose(f"async local semantic-cache get_cache, kwargs: {kwargs}")
+        messages = kwargs.get("messages", [])
+        if not messages:
+            print_verbose("No messages provided for semantic cache lookup")
+            kwargs.setdefault("metadata", {})["semantic-similarity"] = 0.0
+            return None
+        prompt = get_str_from_messages(messages)
+        embedding = await self._get_async_embedding(prompt, **kwargs)
+        cached_response, similarity = self._search(key, prompt, embedding)
+        # update kwargs["metadata"] with similarity, don't rewrite the original metadata
+        kwargs.setdefault("metadata", {})["semantic-similarity"] = similarity
+        return cached_response
+
+    async def async_set_cache_pipeline(self, cache_list, **kwargs):
+        tasks = []
+        for val in cache_list:
+            tasks.append(self.async_set_cache(val[0], val[1], **kwargs))
+        await asyncio.gather(*tasks)
+
+    def flush_cache(self):
+        with self._lock:
+            self.partitions = {}
+
+    @staticmethod
+    def _get_partition_file_name(namespace: Optional[str]) -> str:
+        if namespace is None:
+            return "default.npy"
+        return "{}.npy".format(hashlib.sha256(namespace.encode("utf-8")).hexdigest())
+
+    def save(self) -> None:
+        """
+        Write the cache to persist_dir. Expired entries are dropped.
+        """
+        if self.persist_dir is None:
+            return
+        os.makedirs(self.persist_dir, exist_ok=True)
+        entries = []
+        with self._lock:
+            now = time.time()
+            for namespace, partition in self.partitions.items():
+                partition.compact(now=now)
+                file_name = self._get_partition_file_name(namespace)
+                # write + rename, loaded partitions may still be memory-mapping the old file
+                file_path = os.path.join(self.persist_dir, file_name)
+                with open(file_path + ".tmp", "wb") as f:
+                    np.save(f, partition.vectors[: partition.size])
+                os.replace(file_path + ".tmp", file_path)
+                entries.append(
+                    {
+                        "namespace": namespace,
+                        "file_name": file_name,
+                        "prompts": partition.prompts,
+                        "responses": partition.responses,
+                        "expires_at": [
+                            None if math.isinf(expires_at) else expires_at
+                            for expires_at in partition.expires_at[
+                                : partition.size
+                            ].tolist()
+                        ],
+                    }
+                )
+        entries_path = os.path.join(self.persist_dir, _ENTRIES_FILE_NAME)
+        with open(entries_path + ".tmp", "w") as f:
+            json.dump(entries, f)
+        os.replace(entries_path + ".tmp", entries_path)
+
+    def _load(self) -> None:
+        entries_path = os.path.join(cast(str, self.persist_dir), _ENTRIES_FILE_NAME)
+        if not os.path.exists(entries_path):
+            return
+        try:
+            with open(entries_path) as f:
+                entries = json.load(f)
+            for entry in entries:
+                vectors = np.load(
+                    os.path.join(cast(str, self.persist_dir), entry["file_name"]),
+                    mmap_mode="r",
+                )
+                if len(vectors) == 0:
+                    continue
+                self.partitions[entry["namespace"]] = _SemanticCachePartition(
+                    dimensions=vectors.shape[1],
+                    max_size=self.max_size,
+                    ivf_min_size=self.ivf_min_size,
+                    ivf_nprobe=self.ivf_nprobe,
+                    vectors=vectors,
+                    expires_at=[
+                        math.inf if expires_at is None else expires_at
+                        for expires_at in entry["expires_at"]
+                    ],
+                    prompts=entry["prompts"],
+                    responses=entry["responses"],
+                )
+        except Exception as e:
+            verbose_logger.exception(
+                f"LiteLLM Local Semantic Cache: Error loading from {self.persist_dir}: {str(e)}"
+            )
+            self.partitions = {}
+
+    async def disconnect(self):
+        self.save()
@@ -0,0 +1,472 @@
+"""
+Mmap Disk Cache - a native disk cache backend, built on append-only memory-mapped segment files.
+
+`DiskCache` wraps `diskcache` (sqlite) with sync calls - its async methods block the event loop. Here:
+- entries are appended to segment files, and an in-memory index maps each key to (segment, offset, length)
+- the async methods run the file I/O in a worker thread. Batch lookups / pipelines use one thread hop.
+- writes are fsync'd in batches, every `fsync_interval_ms` (0 = fsync every write)
+- past `max_size_bytes`, the oldest segment file is deleted - its entries drop out of the index
+- each segment gets an index file when it is sealed / on disconnect, so a warm start reads the index files instead of scanning the segments
+
+Segment file record: header (crc32, key length, value length, expires at, flags) + key + value.
+Index file: covered segment length + (value offset, value length, expires at, flags, key length) + key per record.
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from litellm._logging import print_verbose, verbose_logger
+from litellm.constants import (
+    DISK_CACHE_FSYNC_INTERVAL_MS,
+    DISK_CACHE_MAX_SEGMENT_BYTES,
+    DISK_CACHE_MAX_SIZE_BYTES,
+)
+from litellm.litellm_core_utils.asyncify import asyncify
+
+from .base_cache import BaseCache
+from .segment_object_cache import _decode_value, _encode_value
+
+# (segment id, value offset, value length, expires at - 0 if no ttl)
+IndexEntry = Tuple[int, int, int, float]
+
+_RECORD_CRC = struct.Struct("<I")
+# key length, value length, expires at, flags
+_RECORD_HEADER = struct.Struct("<IIdB")
+_INDEX_HEADER = struct.Struct("<Q")
+_INDEX_RECORD = struct.Struct("<QIdBI")
+_TOMBSTONE = 1
+_SEGMENT_SUFFIX = ".seg"
+_INDEX_SUFFIX = ".idx"
+
+
+class MmapDiskCache(BaseCache):
+    def __init__(
+        self,
+        disk_cache_dir: Optional[str] = None,
+        max_size_bytes: Optional[int] = None,
+        max_segment_bytes: Optional[int] = None,
+        fsync_interval_ms: Optional[float] = None,
+    ):
+        self.disk_cache_dir = disk_cache_dir or ".litellm_cache"
+        self.max_size_bytes = max_size_bytes or DISK_CACHE_MAX_SIZE_BYTES
+        self.max_segment_bytes = max_segment_bytes or DISK_CACHE_MAX_SEGMENT_BYTES
+        self.fsync_interval_ms = (
+            fsync_interval_ms
+            if fsync_interval_ms is not None
+            else DISK_CACHE_FSYNC_INTERVAL_MS
+        )
+        self._lock = threading.RLock()
+        self._index: Dict[str, IndexEntry] = {}
+        # keys indexed to each segment - evicting a segment drops only its keys
+        self._segment_keys: Dict[int, Set[str]] = {}
+        # records appended to the active segment, written to its index file
+        self._active_index_records: List[bytes] = []
+        self._segment_sizes: Dict[int, int] = {}
+        self._mmaps: Dict[int, mmap.mmap] = {}
+        self._active_segment_id = 0
+        self._active_fd: Optional[int] = None
+        self._fsync_timer: Optional[threading.Timer] = None
+        # writes after the cache is closed are dropped - warned about once
+        self._warned_closed = False
+        os.makedirs(self.disk_cache_dir, exist_ok=True)
+        self._load()
+
+    def _segment_path(self, segment_id: int, suffix: str = _SEGMENT_SUFFIX) -> str:
+        return os.path.join(self.disk_cache_dir, f"{segment_id:010d}{suffix}")
+
+    def _load(self):
+        """
+        Rebuild the index - from each segment's index file, scanning only the bytes appended after it was written.
+        """
+        segment_ids = sorted(
+            int(name[: -len(_SEGMENT_SUFFIX)])
+            for name in os.listdir(self.disk_cache_dir)
+            if name.endswith(_SEGMENT_SUFFIX)
+            and name[: -len(_SEGMENT_SUFFIX)].isdigit()
+        )
+        # the last segment stays active - its records are kept, to rewrite its index file
+        for segment_id in segment_ids:
+            self._active_segment_id = segment_id
+            self._active_index_records = []
+            covered_bytes = self._load_index_file(segment_id)
+            self._segment_sizes[segment_id] = self._scan_segment(
+                segment_id, start=covered_bytes
+            )
+        if not segment_ids:
+            self._active_segment_id = 1
+            self._segment_sizes[self._active_segment_id] = 0
+        self._active_fd = os.open(
+            self._segment_path(self._active_segment_id),
+            os.O_RDWR | os.O_APPEND | os.O_CREAT,
+        )
+
+    def _load_index_file(self, segment_id: int) -> int:
+        """
+        Apply a segment's index file to the index. Returns the segment length it covers.
+        """
+        try:
+            with open(self._segment_path(segment_id, _INDEX_SUFFIX), "rb") as f:
+                data = f.read()
+            (covered_bytes,) = _INDEX_HEADER.unpack_from(data, 0)
+            for offset, length, expires_at, flags, key in self._iter_index_records(
+                data
+            ):
+                self._apply_record(segment_id, key, offset, length, expires_at, flags)
+            return covered_bytes
+        except FileNotFoundError:
+            return 0
+        except Exception as e:
+            verbose_logger.warning(
+                "MmapDiskCache: unreadable index file for segment %s, scanning it - %s",
+                segment_id,
+                str(e),
+            )
+            self._active_index_records = []
+            return 0
+
+    @staticmethod
+    def _iter_index_records(
+        data: bytes,
+    ) -> Iterator[Tuple[int, int, float, int, str]]:
+        position = _INDEX_HEADER.size
+        while position < len(data):
+            offset, length, expires_at, flags, key_length = _INDEX_RECORD.unpack_from(
+                data, position
+            )
+            position += _INDEX_RECORD.size
+            key = data[position : position + key_length].decode("utf-8")
+            position += key_length
+            yield offset, length, expires_at, flags, key
+
+    @staticmethod
+    def _encode_index_record(
+        key: str, offset: int, length: int, expires_at: float, flags: int
+    ) -> bytes:
+        key_bytes = key.encode("utf-8")
+        return (
+            _INDEX_RECORD.pack(offset, length, expires_at, flags, len(key_bytes))
+            + key_bytes
+        )
+
+    def _scan_segment(self, segment_id: int, start: int) -> int:
+        """
+        Apply the records of a segment from `start` to the index. A torn / corrupt tail (e.g. a crash mid-write) is truncated.
+
+        Returns the segment's valid length.
+        """
+        path = self._segment_path(segment_id)
+        with open(path, "rb") as f:
+            f.seek(start)
+            data = f.read()
+        position = 0
+        header_size = _RECORD_CRC.size + _RECORD_HEADER.size
+        while position + header_size <= len(data):
+            (crc,) = _RECORD_CRC.unpack_from(data, position)
+            key_length, value_length, expires_at, flags = _RECORD_HEADER.unpack_from(
+                data, position + _RECORD_CRC.size
+            )
+            key_start = position + header_size
+            record_end = key_start + key_length + value_length
+            if record_end > len(data) or crc != zlib.crc32(
+                data[position + _RECORD_CRC.size : record_end]
+            ):
+                break
+            key = data[key_start : key_start + key_length].decode("utf-8")
+            self._apply_record(
+                segment_id,
+                key,
+                start + key_start + key_length,
+                value_length,
+                expires_at,
+                flags,
+            )
+            position = record_end
+        if position < len(data):
+            verbose_logger.warning(
+                "MmapDiskCache: truncating %s corrupt bytes from %s",
+                len(data) - position,
+                path,
+            )
+            os.truncate(path, start + position)
+        return start + position
+
+    def _apply_record(
+        self,
+        segment_id: int,
+        key: str,
+        offset: int,
+        length: int,
+        expires_at: float,
+        flags: int,
+    ):
+        self._drop_index_entry(key)
+        if not flags & _TOMBSTONE:
+            self._index[key] = (segment_id, offset, length, expires_at)
+            self._segment_keys.setdefault(segment_id, set()).add(key)
+        if segment_id == self._active_segment_id:
+            self._active_index_records.append(
+                self._encode_index_record(key, offset, length, expires_at, flags)
+            )
+
+    def _drop_index_entry(self, key: str):
+        entry = self._index.pop(key, None)
+        if entry is not None:
+            self._segment_keys.get(entry[0], set()).discard(key)
+
+    def _append(self, records: List[Tuple[str, Optional[bytes], float]]):
+        """
+        Append (key, encoded value - None to delete, expires at) records to the active segment.
+        """
+        with self._lock:
+            if self._active_fd is None:
+                if not self._warned_closed:
+                    self._warned_closed = True
+                    verbose_logger.warning(
+                        "MmapDiskCache: %s is closed, dropping writes",
+                        self.disk_cache_dir,
+                    )
+                return
+            offset = self._segment_sizes[self._active_segment_id]
+            buffer = bytearray()
+            applied: List[Tuple[str, int, int, float, int]] = []
+            for key, value, expires_at in records:
+                key_bytes = key.encode("utf-8")
+                flags = _TOMBSTONE if value is None else 0
+                value = value or b""
+                body = (
+                    _RECORD_HEADER.pack(len(key_bytes), len(value), expires_at, flags)
+                    + key_bytes
+                    + value
+                )
+                value_offset = (
+                    offset + len(buffer) + _RECORD_CRC.size + len(body) - len(value)
+                )
+                buffer += _RECORD_CRC.pack(zlib.crc32(body)) + body
+                applied.append((key, value_offset, len(value), expires_at, flags))
+            os.write(self._active_fd, bytes(buffer))
+            self._segment_sizes[self._active_segment_id] = offset + len(buffer)
+            for key, value_offset, length, expires_at, flags in applied:
+                self._apply_record(
+                    self._active_segment_id,
+                    key,
+                    value_offset,
+                    length,
+                    expires_at,
+                    flags,
+                )
+            if self._segment_sizes[self._active_segment_id] >= self.max_segment_bytes:
+                self._seal_active_segment()
+                self._evict()
+            else:
+                self._schedule_fsync()
+
+    def _schedule_fsync(self):
+        if self.fsync_interval_ms <= 0:
+            self._fsync()
+        elif self._fsync_timer is None:
+            self._fsync_timer = threading.Timer(
+                self.fsync_interval_ms / 1000, self._fsync
+            )
+            self._fsync_timer.daemon = True
+            self._fsync_timer.start()
+
+    def _fsync(self):
+        with self._lock:
+            self._fsync_timer = None
+            if self._active_fd is not None:
+                try:
+                    os.fsync(self._active_fd)
+                except OSError as e:
+                    verbose_logger.error("MmapDiskCache: fsync failed - %s", str(e))
+
+    def _write_index_file(self, segment_id: int):
+        path = self._segment_path(segment_id, _INDEX_SUFFIX)
+        with open(path + ".tmp", "wb") as f:
+            f.write(_INDEX_HEADER.pack(self._segment_sizes[segment_id]))
+            f.write(b"".join(self._active_index_records))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path + ".tmp", path)
+
+    def _seal_active_segment(self):
+        if self._active_fd is not None:
+            os.fsync(self._active_fd)
+            os.close(self._active_fd)
+        self._write_index_file(self._active_segment_id)
+        self._active_segment_id += 1
+        self._segment_sizes[self._active_segment_id] = 0
+        self._active_index_records = []
+        self._active_fd = os.open(
+            self._segment_path(self._active_segment_id),
+            os.O_RDWR | os.O_APPEND | os.O_CREAT,
+        )
+
+    def _evict(self):
+        """
+        Delete the oldest sealed segments until the cache fits in `max_size_bytes`.
+        """
+        while (
+            sum(self._segment_sizes.values()) > self.max_size_bytes
+            and len(self._segment_sizes) > 1
+        ):
+            segment_id = min(self._segment_sizes)
+            for key in self._segment_keys.pop(segment_id, set()):
+                self._index.pop(key, None)
+            segment_mmap = self._mmaps.pop(segment_id, None)
+            if segment_mmap is not None:
+                segment_mmap.close()
+            del self._segment_sizes[segment_id]
+            for suffix in (_SEGMENT_SUFFIX, _INDEX_SUFFIX):
+                try:
+                    os.remove(self._segment_path(segment_id, suffix))
+                except FileNotFoundError:
+                    pass
+            print_verbose(f"MmapDiskCache: evicted segment {segment_id}")
+
+    def _read(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                return None
+            segment_id, offset, length, expires_at = entry
+            if expires_at and expires_at <= time.time():
+                self._drop_index_entry(key)
+                return None
+            if segment_id == self._active_segment_id:
+                return os.pread(self._active_fd, length, offset)  # type: ignore
+            segment_mmap = self._mmaps.get(segment_id)
+            if segment_mmap is None:
+                with open(self._segment_path(segment_id), "rb") as f:
+                    segment_mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._mmaps[segment_id] = segment_mmap
+            return segment_mmap[offset : offset + length]
+
+    def get_remaining_ttl(self, key: str) -> Optional[float]:
+        """
+        Seconds until the key expires. None if it has no ttl, or isn't cached.
+        """
+        with self._lock:
+            entry = self._index.get(key)
+        if entry is None or not entry[3]:
+            return None
+        return max(entry[3] - time.time(), 0.0)
+
+    @staticmethod
+    def _get_expires_at(**kwargs) -> float:
+        ttl = kwargs.get("ttl")
+        return time.time() + float(ttl) if ttl is not None else 0
+
+    def _set_cache_list(self, cache_list, **kwargs):
+        expires_at = self._get_expires_at(**kwargs)
+        self._append(
+            [
+                (cache_key, _encode_value(cache_value), expires_at)
+                for cache_key, cache_value in cache_list
+            ]
+        )
+
+    def set_cache(self, key, value, **kwargs):
+        try:
+            self._set_cache_list([(key, value)], **kwargs)
+        except Exception as e:
+            verbose_logger.error(
+                "MmapDiskCache: set_cache failed for key %s - %s", key, str(e)
+            )
+
+    async def async_set_cache(self, key, value, **kwargs):
+        await self.async_set_cache_pipeline([(key, value)], **kwargs)
+
+    async def async_set_cache_pipeline(self, cache_list, **kwargs):
+        try:
+            await asyncify(self._set_cache_list)(cache_list, **kwargs)
+        except Exception as e:
+            verbose_logger.error(
+                "MmapDiskCache: async_set_cache_pipeline failed - %s", str(e)
+            )
+
+    def _get_cache(self, key):
+        data = self._read(key)
+        if data is None:
+            return None
+        cached_response = _decode_value(data)
+        if isinstance(cached_response, str):
+            try:
+                cached_response = json.loads(cached_response)
+            except Exception:
+                pass
+        return cached_response
+
+    def get_cache(self, key, **kwargs):
+        try:
+            return self._get_cache(key)
+        except Exception as e:
+            verbose_logger.error(
+                "MmapDiskCache: get_cache failed for key %s - %s", key, str(e)
+            )
+            return None
+
+    def batch_get_cache(self, keys: list, **kwargs):
+        return [self.get_cache(key=k, **kwargs) for k in keys]
+
+    async def async_get_cache(self, key, **kwargs):
+        return (await self.async_batch_get_cache([key], **kwargs))[0]
+
+    async def async_batch_get_cache(self, keys: list, **kwargs):
+        return await asyncify(self.batch_get_cache)(keys, **kwargs)
+
+    def increment_cache(self, key, value: int, **kwargs) -> int:
+        with self._lock:
+            init_value = self.get_cache(key=key) or 0
+            value = init_value + value  # type: ignore
+            self.set_cache(key, value, **kwargs)
+        return value
+
+    async def async_increment(self, key, value: int, **kwargs) -> int:
+        return await asyncify(self.increment_cache)(key, value, **kwargs)
+
+    def delete_cache(self, key):
+        self._append([(key, None, 0)])
+
+    async def async_delete_cache(self, key):
+        await asyncify(self.delete_cache)(key)
+
+    def _close(self):
+        with self._lock:
+            if self._fsync_timer is not None:
+                self._fsync_timer.cancel()
+                self._fsync_timer = None
+            if self._active_fd is not None:
+                os.fsync(self._active_fd)
+                os.close(self._active_fd)
+                self._active_fd = None
+                self._write_index_file(self._active_segment_id)
+            for segment_mmap in self._mmaps.values():
+                segment_mmap.close()
+            self._mmaps = {}
+
+    def flush_cache(self):
+        with self._lock:
+            self._close()
+            for segment_id in self._segment_sizes:
+                for suffix in (_SEGMENT_SUFFIX, _INDEX_SUFFIX):
+                    try:
+                        os.remove(self._segment_path(segment_id, suffix))
+                    except FileNotFoundError:
+                        pass
+            self._index = {}
+            self._segment_keys = {}
+            self._segment_sizes = {}
+            self._active_index_records = []
+            self._load()
+
+    async def disconnect(self):
+        """
+        fsync + write the active segment's index file, for a fast warm start.
+        """
+        await asyncify(self._close)()
@@ -15,7 +15,16 @@ import inspect
 import json
 import time
 from datetime import timedelta
-from typing import TYPE_CHECKING, Any, List, Optional, Tuple, Union, cast
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncGenerator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+)
 
 import litellm
 from litellm._logging import print_verbose, verbose_logger
@@ -26,6 +35,7 @@ from litellm.types.caching import RedisPipelineIncrementOperation
 from litellm.types.services import ServiceTypes
 
 from .base_cache import BaseCache
+from .cache_codec import CacheCodec
 
 if TYPE_CHECKING:
     from opentelemetry.trace import Span as _Span
@@ -33,6 +43,8 @@ if TYPE_CHECKING:
     from redis.asyncio.client import Pipeline
     from redis.asyncio.cluster import ClusterPipeline
 
+    from .redis_write_coalescer import RedisWriteCoalescer
+
     pipeline = Pipeline
     cluster_pipeline = ClusterPipeline
     async_redis_client = Redis
@@ -44,6 +56,11 @@ else:
     async_redis_client = Any
     async_redis_cluster_client = Any
     Span = Any
+    RedisWriteCoalescer = Any
+
+REDIS_INVALIDATION_CHANNEL = "__redis__:invalidate"
+# how often an idle client tracking subscriber checks its tracking connection
+_CLIENT_TRACKING_HEALTH_CHECK_INTERVAL_SECONDS = 5.0
 
 
 def _get_call_stack_info(num_frames: int = 2) -> str:
@@ -139,6 +156,8 @@ class RedisCache(BaseCache):
             self.redis_flush_size: int = 100
         else:
             self.redis_flush_size = redis_flush_size
+        # shared by every caller coalescing writes to this redis - see `get_write_coalescer`
+        self._write_coalescer: Optional["RedisWriteCoalescer"] = None
         self.redis_version = "Unknown"
         try:
             if not coroutine_checker.is_async_callable(self.redis_client):
@@ -252,6 +271,16 @@ class RedisCache(BaseCache):
         self.redis_async_client = redis_async_client  # type: ignore
         return redis_async_client
 
+    def get_write_coalescer(self) -> "RedisWriteCoalescer":
+        """
+        Returns the write coalescer for this redis - small writes submitted to it are batched into pipelines.
+        """
+        if self._write_coalescer is None:
+            from .redis_write_coalescer import RedisWriteCoalescer
+
+            self._write_coalescer = RedisWriteCoalescer(redis_cache=self)
+        return self._write_coalescer
+
     def check_and_fix_namespace(self, key: str) -> str:
         """
         Make sure each key starts with the given namespace
@@ -298,7 +327,11 @@ class RedisCache(BaseCache):
         key = self.check_and_fix_namespace(key=key)
         try:
             start_time = time.time()
-            self.redis_client.set(name=key, value=str(value), ex=ttl)
+            self.redis_client.set(
+                name=key,
+                value=value if isinstance(value, bytes) else str(value),
+                ex=ttl,
+            )
             end_time = time.time()
             _duration = end_time - start_time
             self.service_logger_obj.service_success_hook(
@@ -484,7 +517,7 @@ class RedisCache(BaseCache):
                 raise Exception("Redis client cannot set cache. Attribute not found.")
             result = await _redis_client.set(
                 name=key,
-                value=json.dumps(value),
+                value=value if isinstance(value, bytes) else json.dumps(value),
                 nx=nx,
                 ex=ttl,
             )
@@ -542,7 +575,11 @@ class RedisCache(BaseCache):
             print_verbose(
                 f"Set ASYNC Redis Cache PIPELINE: key: {cache_key}\nValue {cache_value}\nttl={ttl}"
             )
-            json_cache_value = json.dumps(cache_value)
+            json_cache_value = (
+                cache_value
+                if isinstance(cache_value, bytes)
+                else json.dumps(cache_value)
+            )
             # Set the value with a TTL if it's provided.
             _td: Optional[timedelta] = None
             if ttl is not None:
@@ -785,6 +822,9 @@ class RedisCache(BaseCache):
         """
         if cached_response is None:
             return cached_response
+        if CacheCodec.is_encoded(cached_response):
+            # decoded by the response cache - `Cache._get_cache_logic`
+            return cached_response
         # cached_response is in `b{} convert it to ModelResponse
         cached_response = cached_response.decode("utf-8")  # Convert bytes to string
         try:
@@ -1265,6 +1305,91 @@ class RedisCache(BaseCache):
             verbose_logger.debug(f"Redis TTL Error: {e}")
             return None
 
+    def _strip_namespace(self, key: str) -> str:
+        if self.namespace is not None and key.startswith(self.namespace + ":"):
+            return key[len(self.namespace) + 1 :]
+        return key
+
+    async def async_client_tracking_invalidations(
+        self, prefixes: List[str]
+    ) -> AsyncGenerator[Optional[List[str]], None]:
+        """
+        Server-assisted client-side caching - https://redis.io/docs/latest/develop/reference/client-side-caching/
+
+        Turns on CLIENT TRACKING in broadcasting mode for keys under `prefixes`, with the
+        invalidation messages redirected to a connection subscribed to `__redis__:invalidate`.
+
+        Yields:
+            - None once tracking is on, and when the server is flushed - every local copy is stale
+            - after that, the keys (without namespace) changed, expired or evicted
+
+        Raises when the subscriber or tracking connection is lost - local copies can't be trusted after.
+        """
+        from redis.asyncio import Redis
+
+        _redis_client = self.init_async_client()
+        if not isinstance(_redis_client, Redis):
+            raise ValueError(
+                "Redis client-side caching is not supported for redis cluster"
+            )
+        namespaced_prefixes = [
+            self.check_and_fix_namespace(key=prefix) for prefix in prefixes
+        ]
+        pubsub = _redis_client.pubsub()
+        tracking_client = Redis(
+            connection_pool=_redis_client.connection_pool,
+            single_connection_client=True,
+        )
+        try:
+            # get the subscriber's id before subscribing, RESP2 only allows pub/sub commands after
+            await pubsub.execute_command("CLIENT", "ID")
+            subscriber_id = int(await pubsub.parse_response(block=True))
+            await pubsub.subscribe(REDIS_INVALIDATION_CHANNEL)
+            await tracking_client.client_tracking_on(
+                clientid=subscriber_id, bcast=True, prefix=namespaced_prefixes
+            )
+            yield None
+            while True:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=_CLIENT_TRACKING_HEALTH_CHECK_INTERVAL_SECONDS,
+                )
+                if message is None:
+                    await self._check_client_tracking(tracking_client)
+                    continue
+                if message["type"] != "message":
+                    continue
+                if message["data"] is None:
+                    yield None
+                    continue
+                yield [
+                    self._strip_namespace(
+                        key.decode("utf-8") if isinstance(key, bytes) else key
+                    )
+                    for key in message["data"]
+                ]
+        finally:
+            try:
+                await tracking_client.client_tracking_off()
+            except Exception:
+                pass
+            await tracking_client.aclose()
+            await pubsub.aclose()
+
+    async def _check_client_tracking(self, tracking_client: Any) -> None:
+        """
+        Raise if tracking was turned off (the tracking connection reconnected), or the subscriber connection is gone
+        """
+        tracking_info = await tracking_client.execute_command("CLIENT", "TRACKINGINFO")
+        if isinstance(tracking_info, list):  # RESP2 replies with a flat list
+            tracking_info = dict(zip(tracking_info[::2], tracking_info[1::2]))
+        flags = {
+            flag.decode("utf-8") if isinstance(flag, bytes) else flag
+            for flag in tracking_info.get(b"flags", tracking_info.get("flags", []))
+        }
+        if "off" in flags or "broken_redirect" in flags:
+            raise ConnectionError(f"Redis client tracking stopped, flags={flags}")
+
     async def async_rpush(
         self,
         key: str,
@@ -23,6 +23,7 @@ from litellm.litellm_core_utils.prompt_templates.common_utils import (
 from litellm.types.utils import EmbeddingResponse
 
 from .base_cache import BaseCache
+from .semantic_cache_embedding_batcher import SemanticCacheEmbeddingBatcher
 
 
 class RedisSemanticCache(BaseCache):
@@ -86,6 +87,9 @@ class RedisSemanticCache(BaseCache):
         # While similarity: 1 = most similar, 0 = least similar
         self.distance_threshold = 1 - similarity_threshold
         self.embedding_model = embedding_model
+        self._embedding_batcher = SemanticCacheEmbeddingBatcher(
+            embedding_model=embedding_model
+        )
 
         # Set up Redis connection
         if redis_url is None:
@@ -272,6 +276,9 @@ class RedisSemanticCache(BaseCache):
         """
         Asynchronously generate an embedding for the given prompt.
 
+        Concurrent lookups are batched into one embedding request, and the
+        embedding of a looked up prompt is reused when its response is cached.
+
         Args:
             prompt: The text to generate an embedding for
             **kwargs: Additional arguments that may contain metadata
@@ -279,39 +286,8 @@ class RedisSemanticCache(BaseCache):
         Returns:
             List[float]: The embedding vector
         """
-        from litellm.proxy.proxy_server import llm_model_list, llm_router
-
-        # Route the embedding request through the proxy if appropriate
-        router_model_names = (
-            [m["model_name"] for m in llm_model_list]
-            if llm_model_list is not None
-            else []
-        )
-
         try:
-            if llm_router is not None and self.embedding_model in router_model_names:
-                # Use the router for embedding generation
-                user_api_key = kwargs.get("metadata", {}).get("user_api_key", "")
-                embedding_response = await llm_router.aembedding(
-                    model=self.embedding_model,
-                    input=prompt,
-                    cache={"no-store": True, "no-cache": True},
-                    metadata={
-                        "user_api_key": user_api_key,
-                        "semantic-cache-embedding": True,
-                        "trace_id": kwargs.get("metadata", {}).get("trace_id", None),
-                    },
-                )
-            else:
-                # Generate embedding directly
-                embedding_response = await litellm.aembedding(
-                    model=self.embedding_model,
-                    input=prompt,
-                    cache={"no-store": True, "no-cache": True},
-                )
-
-            # Extract and return the embedding vector
-            return embedding_response["data"][0]["embedding"]
+            return await self._embedding_batcher.get_embedding(prompt, **kwargs)
         except Exception as e:
             print_verbose(f"Error generating async embedding: {str(e)}")
             raise ValueError(f"Failed to generate embedding: {str(e)}") from e
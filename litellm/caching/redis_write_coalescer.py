@@ -0,0 +1,327 @@
+"""
+Redis Write Coalescer - batches small Redis writes (SET / INCRBYFLOAT / EXPIRE) from many callers into pipelines.
+
+- writes are flushed in one pipeline every `flush_interval_ms`, or as soon as `max_batch_size` are queued
+- back-to-back increments of the same key are merged into a single INCRBYFLOAT
+- each caller awaits its own result - increments get the value the key had right after their own increment
+
+ttls are used as given - callers apply their cache's default ttl.
+"""
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Coroutine,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from litellm._logging import verbose_logger
+from litellm.constants import (
+    REDIS_WRITE_COALESCER_FLUSH_INTERVAL_MS,
+    REDIS_WRITE_COALESCER_MAX_BATCH_SIZE,
+)
+from litellm.types.services import ServiceTypes
+
+if TYPE_CHECKING:
+    from opentelemetry.trace import Span as _Span
+
+    from .redis_cache import RedisCache
+
+    Span = Union[_Span, Any]
+else:
+    RedisCache = Any
+    Span = Any
+
+
+@dataclass
+class _RedisWriteOperation:
+    op: Literal["set", "incrbyfloat", "expire"]
+    key: str
+    value: Any = None
+    ttl: Optional[float] = None
+    nx: bool = False
+    # increments - expire on every write, instead of only when the key has no expiry
+    refresh_ttl: bool = False
+    # merged increments - (increment, future) per caller
+    increments: List[Tuple[float, "asyncio.Future[Any]"]] = field(default_factory=list)
+    future: Optional["asyncio.Future[Any]"] = None
+    # spans of every caller writing through this operation - the flush is traced under each of them
+    parent_otel_spans: List[Span] = field(default_factory=list)
+
+
+def _get_spans(parent_otel_span: Optional[Span]) -> List[Span]:
+    return [parent_otel_span] if parent_otel_span is not None else []
+
+
+class RedisWriteCoalescer:
+    def __init__(
+        self,
+        redis_cache: RedisCache,
+        flush_interval_ms: Optional[float] = None,
+        max_batch_size: Optional[int] = None,
+    ):
+        """
+        redis_cache: the RedisCache to write to.
+        flush_interval_ms: how long a write waits for others to batch with.
+        max_batch_size: max queued writes before flushing early.
+        """
+        self.redis_cache = redis_cache
+        self.flush_interval_ms = (
+            flush_interval_ms
+            if flush_interval_ms is not None
+            else REDIS_WRITE_COALESCER_FLUSH_INTERVAL_MS
+        )
+        self.max_batch_size = max_batch_size or REDIS_WRITE_COALESCER_MAX_BATCH_SIZE
+        self._pending: List[_RedisWriteOperation] = []
+        # last queued operation per key - increments are only merged into an increment queued right before them
+        self._last_pending_op: Dict[str, _RedisWriteOperation] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        # early flushes + service hooks - kept referenced until done, so they aren't garbage collected mid-run
+        self._background_tasks: Set[asyncio.Task] = set()
+
+    def _create_background_task(self, coro: Coroutine[Any, Any, Any]) -> None:
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    def _enqueue(self, operation: _RedisWriteOperation) -> None:
+        self._pending.append(operation)
+        self._last_pending_op[operation.key] = operation
+        if len(self._pending) >= self.max_batch_size:
+            if self._flush_task is not None:
+                self._flush_task.cancel()
+                self._flush_task = None
+            self._create_background_task(self.flush())
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_interval())
+
+    async def async_set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[float] = None,
+        nx: bool = False,
+        parent_otel_span: Optional[Span] = None,
+    ) -> Any:
+        """
+        Queue a SET. Returns the SET result.
+        """
+        future: "asyncio.Future[Any]" = asyncio.get_running_loop().create_future()
+        self._enqueue(
+            _RedisWriteOperation(
+                op="set",
+                key=self.redis_cache.check_and_fix_namespace(key=key),
+                value=value if isinstance(value, bytes) else json.dumps(value),
+                ttl=ttl,
+                nx=nx,
+                future=future,
+                parent_otel_spans=_get_spans(parent_otel_span),
+            )
+        )
+        return await future
+
+    async def async_increment(
+        self,
+        key: str,
+        value: float,
+        ttl: Optional[float] = None,
+        refresh_ttl: bool = False,
+        parent_otel_span: Optional[Span] = None,
+    ) -> float:
+        """
+        Queue an INCRBYFLOAT.
+
+        If `ttl` is set, it's applied when the key has no expiry - like `RedisCache.async_increment`.
+        With `refresh_ttl`, it's applied on every increment - like `RedisCache.async_increment_pipeline`.
+        """
+        future: "asyncio.Future[Any]" = asyncio.get_running_loop().create_future()
+        key = self.redis_cache.check_and_fix_namespace(key=key)
+        last_op = self._last_pending_op.get(key)
+        if (
+            last_op is not None
+            and last_op.op == "incrbyfloat"
+            and last_op.refresh_ttl == refresh_ttl
+            and (last_op.ttl is None or ttl is None or last_op.ttl == ttl)
+        ):
+            last_op.increments.append((value, future))
+            last_op.parent_otel_spans.extend(_get_spans(parent_otel_span))
+            if ttl is not None:
+                last_op.ttl = ttl
+        else:
+            self._enqueue(
+                _RedisWriteOperation(
+                    op="incrbyfloat",
+                    key=key,
+                    ttl=ttl,
+                    refresh_ttl=refresh_ttl,
+                    increments=[(value, future)],
+                    parent_otel_spans=_get_spans(parent_otel_span),
+                )
+            )
+        return await future
+
+    async def async_expire(
+        self, key: str, ttl: float, parent_otel_span: Optional[Span] = None
+    ) -> Any:
+        """
+        Queue an EXPIRE. Returns the EXPIRE result.
+        """
+        future: "asyncio.Future[Any]" = asyncio.get_running_loop().create_future()
+        self._enqueue(
+            _RedisWriteOperation(
+                op="expire",
+                key=self.redis_cache.check_and_fix_namespace(key=key),
+                ttl=ttl,
+                future=future,
+                parent_otel_spans=_get_spans(parent_otel_span),
+            )
+        )
+        return await future
+
+    async def _flush_after_interval(self) -> None:
+        await asyncio.sleep(self.flush_interval_ms / 1000)
+        self._flush_task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """
+        Write every queued operation, in one pipeline.
+        """
+        operations, self._pending = self._pending, []
+        self._last_pending_op = {}
+        if not operations:
+            return
+
+        start_time = time.time()
+        try:
+            results = await self._execute(operations)
+        except Exception as e:
+            end_time = time.time()
+            for parent_otel_span in self._get_parent_otel_spans(operations):
+                self._create_background_task(
+                    self.redis_cache.service_logger_obj.async_service_failure_hook(
+                        service=ServiceTypes.REDIS,
+                        duration=end_time - start_time,
+                        error=e,
+                        call_type="redis_write_coalescer_flush",
+                        start_time=start_time,
+                        end_time=end_time,
+                        parent_otel_span=parent_otel_span,
+                    )
+                )
+            verbose_logger.error(
+                "LiteLLM Redis Caching: write coalescer flush of %s operations - Got exception from REDIS %s",
+                len(operations),
+                str(e),
+            )
+            for operation in operations:
+                for future in self._get_futures(operation):
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        end_time = time.time()
+        for parent_otel_span in self._get_parent_otel_spans(operations):
+            self._create_background_task(
+                self.redis_cache.service_logger_obj.async_service_success_hook(
+                    service=ServiceTypes.REDIS,
+                    duration=end_time - start_time,
+                    call_type="redis_write_coalescer_flush",
+                    start_time=start_time,
+                    end_time=end_time,
+                    parent_otel_span=parent_otel_span,
+                    event_metadata={"operations": len(operations)},
+                )
+            )
+        for operation, result in zip(operations, results):
+            if operation.op != "incrbyfloat":
+                if operation.future is not None and not operation.future.done():
+                    operation.future.set_result(result)
+                continue
+            # each caller gets the value right after its own increment
+            remaining = sum(increment for increment, _ in operation.increments)
+            for increment, future in operation.increments:
+                if not future.done():
+                    future.set_result(result - remaining + increment)
+                remaining -= increment
+
+    @staticmethod
+    def _get_parent_otel_spans(
+        operations: List[_RedisWriteOperation],
+    ) -> List[Optional[Span]]:
+        """
+        One service event per caller span - or a single untraced one if no caller has a span.
+        """
+        parent_otel_spans: Dict[int, Span] = {}
+        for operation in operations:
+            for parent_otel_span in operation.parent_otel_spans:
+                parent_otel_spans[id(parent_otel_span)] = parent_otel_span
+        if not parent_otel_spans:
+            return [None]
+        return list(parent_otel_spans.values())
+
+    @staticmethod
+    def _get_futures(operation: _RedisWriteOperation) -> List["asyncio.Future[Any]"]:
+        if operation.op == "incrbyfloat":
+            return [future for _, future in operation.increments]
+        return [operation.future] if operation.future is not None else []
+
+    async def _execute(self, operations: List[_RedisWriteOperation]) -> List[Any]:
+        """
+        Returns one result per operation. Increments with a ttl also read the key's ttl,
+        and keys without one are expired in a second pipeline - unless they refresh their ttl on every write.
+        """
+        _redis_client: Any = self.redis_cache.init_async_client()
+        async with _redis_client.pipeline(transaction=False) as pipe:
+            for operation in operations:
+                if operation.op == "set":
+                    pipe.set(
+                        name=operation.key,
+                        value=operation.value,
+                        nx=operation.nx,
+                        ex=(
+                            timedelta(seconds=operation.ttl)
+                            if operation.ttl is not None
+                            else None
+                        ),
+                    )
+                elif operation.op == "incrbyfloat":
+                    pipe.incrbyfloat(
+                        operation.key,
+                        sum(increment for increment, _ in operation.increments),
+                    )
+                    if operation.ttl is not None and operation.refresh_ttl:
+                        pipe.expire(operation.key, timedelta(seconds=operation.ttl))
+                    elif operation.ttl is not None:
+                        pipe.ttl(operation.key)
+                else:
+                    pipe.expire(operation.key, timedelta(seconds=operation.ttl or 0))
+            pipeline_results = await pipe.execute()
+
+        results: List[Any] = []
+        keys_without_ttl: Dict[str, float] = {}
+        pipeline_results_iter = iter(pipeline_results)
+        for operation in operations:
+            results.append(next(pipeline_results_iter))
+            if operation.op == "incrbyfloat" and operation.ttl is not None:
+                current_ttl = next(pipeline_results_iter)
+                if not operation.refresh_ttl and current_ttl == -1:
+                    keys_without_ttl[operation.key] = operation.ttl
+
+        if keys_without_ttl:
+            async with _redis_client.pipeline(transaction=False) as pipe:
+                for key, ttl in keys_without_ttl.items():
+                    pipe.expire(key, timedelta(seconds=ttl))
+                await pipe.execute()
+        return results
@@ -0,0 +1,901 @@
+"""
+Segment Object Cache - an S3 / GCS cache that packs entries into append-only segment objects.
+
+`S3Cache` / `GCSCache` store one object per cache key - a warm-up or lookup storm costs one request per key. Here:
+- writes are buffered, and uploaded as one segment object every `flush_interval_ms`, or once `max_segment_bytes` are buffered
+- an index maps each cache key to (segment, offset, length) - in memory, or in Redis to share it across instances.
+  The in-memory index is also written to the bucket as one index object per segment, and rebuilt from them on start.
+- lookups are ranged GETs over the pooled async httpx client. Batch lookups read nearby entries of a segment with one GET.
+
+Segments are never rewritten - expired keys drop out of the index. Use a bucket lifecycle rule to delete segments older than the max ttl.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+import uuid
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import quote, urlencode
+
+from litellm._logging import print_verbose, verbose_logger
+from litellm.constants import (
+    SEGMENT_CACHE_FLUSH_INTERVAL_MS,
+    SEGMENT_CACHE_MAX_INDEX_SIZE,
+    SEGMENT_CACHE_MAX_SEGMENT_BYTES,
+    SEGMENT_CACHE_RANGE_MERGE_GAP_BYTES,
+)
+from litellm.integrations.gcs_bucket.gcs_bucket_base import GCSBucketBase
+from litellm.llms.custom_httpx.http_handler import (
+    _get_httpx_client,
+    get_async_httpx_client,
+    httpxSpecialProvider,
+)
+
+from .base_cache import BaseCache
+
+# (segment name, offset, length)
+SegmentLocation = Tuple[str, int, int]
+
+_JSON_VALUE = b"j"
+_BYTES_VALUE = b"b"
+
+
+def _encode_value(value: Any) -> bytes:
+    if isinstance(value, bytes):
+        return _BYTES_VALUE + value
+    return _JSON_VALUE + json.dumps(value).encode("utf-8")
+
+
+def _decode_value(data: bytes) -> Any:
+    if data[:1] == _BYTES_VALUE:
+        return data[1:]
+    return json.loads(data[1:])
+
+
+class SegmentObjectStore:
+    """
+    Object store segments are uploaded to, and read from with ranged GETs.
+    """
+
+    def put_segment(self, name: str, data: bytes) -> None:
+        raise NotImplementedError
+
+    async def async_put_segment(self, name: str, data: bytes) -> None:
+        raise NotImplementedError
+
+    def get_range(self, name: str, start: int, end: int) -> bytes:
+        """
+        Read bytes [start, end) of a segment.
+        """
+        raise NotImplementedError
+
+    async def async_get_range(self, name: str, start: int, end: int) -> bytes:
+        raise NotImplementedError
+
+    def get_object(self, name: str) -> bytes:
+        raise NotImplementedError
+
+    async def async_get_object(self, name: str) -> bytes:
+        raise NotImplementedError
+
+    def list_objects(self, prefix: str) -> List[str]:
+        """
+        Names of the objects under prefix, in lexicographic order.
+        """
+        raise NotImplementedError
+
+    async def async_list_objects(self, prefix: str) -> List[str]:
+        raise NotImplementedError
+
+    @staticmethod
+    def _get_range_header(start: int, end: int) -> Dict[str, str]:
+        return {"Range": f"bytes={start}-{end - 1}"}
+
+    @staticmethod
+    def _check_range_response(response: Any, name: str) -> bytes:
+        if response.status_code not in (200, 206):
+            raise ValueError(
+                f"Failed to read segment {name}, status_code={response.status_code}"
+            )
+        return response.content
+
+
+class S3SegmentStore(SegmentObjectStore):
+    """
+    S3 segment store - SigV4 signed requests over the shared httpx clients, no boto3 calls on the request path.
+    """
+
+    def __init__(
+        self,
+        s3_bucket_name: str,
+        s3_region_name: Optional[str] = None,
+        s3_endpoint_url: Optional[str] = None,
+        s3_verify: Optional[bool] = None,
+        s3_aws_access_key_id: Optional[str] = None,
+        s3_aws_secret_access_key: Optional[str] = None,
+        s3_aws_session_token: Optional[str] = None,
+    ):
+        # imported here - litellm.llms imports the caching module
+        from litellm.llms.bedrock.base_aws_llm import BaseAWSLLM
+
+        self.aws_llm = BaseAWSLLM()
+        self.bucket_name = s3_bucket_name
+        self.region_name = self.aws_llm.get_aws_region_name_for_non_llm_api_calls(
+            aws_region_name=s3_region_name
+        )
+        self.endpoint_url = s3_endpoint_url
+        self.aws_access_key_id = s3_aws_access_key_id
+        self.aws_secret_access_key = s3_aws_secret_access_key
+        self.aws_session_token = s3_aws_session_token
+        params = {"ssl_verify": s3_verify} if s3_verify is not None else None
+        self.async_client = get_async_httpx_client(
+            llm_provider=httpxSpecialProvider.LoggingCallback, params=params
+        )
+        self.sync_client = _get_httpx_client(params=params)
+
+    def _get_url(self, name: str) -> str:
+        if self.endpoint_url:
+            return f"{self.endpoint_url.rstrip('/')}/{self.bucket_name}/{quote(name)}"
+        return f"https://{self.bucket_name}.s3.{self.region_name}.amazonaws.com/{quote(name)}"
+
+    def _get_aws_credentials(self):
+        return self.aws_llm.get_credentials(
+            aws_access_key_id=self.aws_access_key_id,
+            aws_secret_access_key=self.aws_secret_access_key,
+            aws_session_token=self.aws_session_token,
+            aws_region_name=self.region_name,
+        )
+
+    def _sign_request(
+        self,
+        credentials: Any,
+        method: str,
+        url: str,
+        data: bytes = b"",
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, str]:
+        try:
+            from botocore.auth import SigV4Auth
+            from botocore.awsrequest import AWSRequest
+        except ImportError:
+            raise ImportError("Missing boto3 to call S3. Run 'pip install boto3'.")
+
+        headers = {
+            **(headers or {}),
+            "x-amz-content-sha256": hashlib.sha256(data).hexdigest(),
+        }
+        aws_request = AWSRequest(method=method, url=url, data=data, headers=headers)
+        SigV4Auth(credentials, "s3", self.region_name).add_auth(aws_request)
+        return dict(aws_request.headers.items())
+
+    def put_segment(self, name: str, data: bytes) -> None:
+        url = self._get_url(name)
+        headers = self._sign_request(
+            credentials=self._get_aws_credentials(),
+            method="PUT",
+            url=url,
+            data=data,
+            headers={"Content-Type": "application/octet-stream"},
+        )
+        self.sync_client.put(url=url, data=data, headers=headers)
+
+    async def async_put_segment(self, name: str, data: bytes) -> None:
+        from litellm.litellm_core_utils.asyncify import asyncify
+
+        credentials = await asyncify(self._get_aws_credentials)()
+        url = self._get_url(name)
+        headers = self._sign_request(
+            credentials=credentials,
+            method="PUT",
+            url=url,
+            data=data,
+            headers={"Content-Type": "application/octet-stream"},
+        )
+        await self.async_client.put(url=url, data=data, headers=headers)
+
+    def get_range(self, name: str, start: int, end: int) -> bytes:
+        url = self._get_url(name)
+        headers = self._sign_request(
+            credentials=self._get_aws_credentials(),
+            method="GET",
+            url=url,
+            headers=self._get_range_header(start, end),
+        )
+        response = self.sync_client.get(url=url, headers=headers)
+        return self._check_range_response(response, name)
+
+    async def async_get_range(self, name: str, start: int, end: int) -> bytes:
+        from litellm.litellm_core_utils.asyncify import asyncify
+
+        credentials = await asyncify(self._get_aws_credentials)()
+        url = self._get_url(name)
+        headers = self._sign_request(
+            credentials=credentials,
+            method="GET",
+            url=url,
+            headers=self._get_range_header(start, end),
+        )
+        response = await self.async_client.get(url=url, headers=headers)
+        return self._check_range_response(response, name)
+
+    def get_object(self, name: str) -> bytes:
+        url = self._get_url(name)
+        headers = self._sign_request(
+            credentials=self._get_aws_credentials(), method="GET", url=url
+        )
+        response = self.sync_client.get(url=url, headers=headers)
+        return self._check_range_response(response, name)
+
+    async def async_get_object(self, name: str) -> bytes:
+        from litellm.litellm_core_utils.asyncify import asyncify
+
+        credentials = await asyncify(self._get_aws_credentials)()
+        url = self._get_url(name)
+        headers = self._sign_request(credentials=credentials, method="GET", url=url)
+        response = await self.async_client.get(url=url, headers=headers)
+        return self._check_range_response(response, name)
+
+    def _get_list_url(self, prefix: str, continuation_token: Optional[str]) -> str:
+        params = {"list-type": "2", "prefix": prefix}
+        if continuation_token is not None:
+            params["continuation-token"] = continuation_token
+        if self.endpoint_url:
+            bucket_url = f"{self.endpoint_url.rstrip('/')}/{self.bucket_name}"
+        else:
+            bucket_url = (
+                f"https://{self.bucket_name}.s3.{self.region_name}.amazonaws.com/"
+            )
+        # SigV4 signs the query string %-encoded
+        return f"{bucket_url}?{urlencode(params, quote_via=quote)}"
+
+    @staticmethod
+    def _parse_list_response(response: Any) -> Tuple[List[str], Optional[str]]:
+        """
+        Returns the object names of a ListObjectsV2 page, and the token of the next page.
+        """
+        if response.status_code != 200:
+            raise ValueError(
+                f"Failed to list segment objects, status_code={response.status_code}"
+            )
+        root = ET.fromstring(response.content)
+        names = [key.text for key in root.iterfind("{*}Contents/{*}Key") if key.text]
+        return names, root.findtext("{*}NextContinuationToken")
+
+    def list_objects(self, prefix: str) -> List[str]:
+        names: List[str] = []
+        continuation_token: Optional[str] = None
+        while True:
+            url = self._get_list_url(prefix, continuation_token)
+            headers = self._sign_request(
+                credentials=self._get_aws_credentials(), method="GET", url=url
+            )
+            page, continuation_token = self._parse_list_response(
+                self.sync_client.get(url=url, headers=headers)
+            )
+            names.extend(page)
+            if continuation_token is None:
+                return names
+
+    async def async_list_objects(self, prefix: str) -> List[str]:
+        from litellm.litellm_core_utils.asyncify import asyncify
+
+        credentials = await asyncify(self._get_aws_credentials)()
+        names: List[str] = []
+        continuation_token: Optional[str] = None
+        while True:
+            url = self._get_list_url(prefix, continuation_token)
+            headers = self._sign_request(credentials=credentials, method="GET", url=url)
+            page, continuation_token = self._parse_list_response(
+                await self.async_client.get(url=url, headers=headers)
+            )
+            names.extend(page)
+            if continuation_token is None:
+                return names
+
+
+class GCSSegmentStore(SegmentObjectStore):
+    def __init__(
+        self,
+        bucket_name: Optional[str] = None,
+        path_service_account: Optional[str] = None,
+    ):
+        self.gcs_base = GCSBucketBase(bucket_name=bucket_name)
+        self.bucket_name = self.gcs_base.BUCKET_NAME
+        if path_service_account is not None:
+            self.gcs_base.path_service_account_json = path_service_account
+        self.async_client = get_async_httpx_client(
+            llm_provider=httpxSpecialProvider.LoggingCallback
+        )
+        self.sync_client = _get_httpx_client()
+
+    def _get_upload_url(self, name: str) -> str:
+        return f"https://storage.googleapis.com/upload/storage/v1/b/{self.bucket_name}/o?uploadType=media&name={quote(name, safe='')}"
+
+    def _get_download_url(self, name: str) -> str:
+        return f"https://storage.googleapis.com/storage/v1/b/{self.bucket_name}/o/{quote(name, safe='')}?alt=media"
+
+    async def _async_get_headers(self) -> Dict[str, str]:
+        return await self.gcs_base.construct_request_headers(
+            service_account_json=self.gcs_base.path_service_account_json
+        )
+
+    def put_segment(self, name: str, data: bytes) -> None:
+        headers = self.gcs_base.sync_construct_request_headers()
+        headers["Content-Type"] = "application/octet-stream"
+        self.sync_client.post(
+            url=self._get_upload_url(name), data=data, headers=headers
+        )
+
+    async def async_put_segment(self, name: str, data: bytes) -> None:
+        headers = await self._async_get_headers()
+        headers["Content-Type"] = "application/octet-stream"
+        await self.async_client.post(
+            url=self._get_upload_url(name), data=data, headers=headers
+        )
+
+    def get_range(self, name: str, start: int, end: int) -> bytes:
+        headers = self.gcs_base.sync_construct_request_headers()
+        headers.update(self._get_range_header(start, end))
+        response = self.sync_client.get(
+            url=self._get_download_url(name), headers=headers
+        )
+        return self._check_range_response(response, name)
+
+    async def async_get_range(self, name: str, start: int, end: int) -> bytes:
+        headers = await self._async_get_headers()
+        headers.update(self._get_range_header(start, end))
+        response = await self.async_client.get(
+            url=self._get_download_url(name), headers=headers
+        )
+        return self._check_range_response(response, name)
+
+    def get_object(self, name: str) -> bytes:
+        response = self.sync_client.get(
+            url=self._get_download_url(name),
+            headers=self.gcs_base.sync_construct_request_headers(),
+        )
+        return self._check_range_response(response, name)
+
+    async def async_get_object(self, name: str) -> bytes:
+        response = await self.async_client.get(
+            url=self._get_download_url(name), headers=await self._async_get_headers()
+        )
+        return self._check_range_response(response, name)
+
+    def _get_list_url(self, prefix: str, page_token: Optional[str]) -> str:
+        params = {"prefix": prefix, "fields": "items(name),nextPageToken"}
+        if page_token is not None:
+            params["pageToken"] = page_token
+        return f"https://storage.googleapis.com/storage/v1/b/{self.bucket_name}/o?{urlencode(params)}"
+
+    @staticmethod
+    def _parse_list_response(response: Any) -> Tuple[List[str], Optional[str]]:
+        if response.status_code != 200:
+            raise ValueError(
+                f"Failed to list segment objects, status_code={response.status_code}"
+            )
+        page = response.json()
+        return [item["name"] for item in page.get("items", [])], page.get(
+            "nextPageToken"
+        )
+
+    def list_objects(self, prefix: str) -> List[str]:
+        names: List[str] = []
+        page_token: Optional[str] = None
+        while True:
+            page, page_token = self._parse_list_response(
+                self.sync_client.get(
+                    url=self._get_list_url(prefix, page_token),
+                    headers=self.gcs_base.sync_construct_request_headers(),
+                )
+            )
+            names.extend(page)
+            if page_token is None:
+                return names
+
+    async def async_list_objects(self, prefix: str) -> List[str]:
+        headers = await self._async_get_headers()
+        names: List[str] = []
+        page_token: Optional[str] = None
+        while True:
+            page, page_token = self._parse_list_response(
+                await self.async_client.get(
+                    url=self._get_list_url(prefix, page_token), headers=headers
+                )
+            )
+            names.extend(page)
+            if page_token is None:
+                return names
+
+
+class LocalSegmentIndex(BaseCache):
+    """
+    In-memory segment index. Entries without a ttl don't expire - past max_size, the least recently used are evicted.
+    """
+
+    def __init__(self, max_size: Optional[int] = None):
+        super().__init__()
+        self.max_size = max_size or SEGMENT_CACHE_MAX_INDEX_SIZE
+        # cache key -> (location, expires at)
+        self.entries: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
+
+    def set_cache(self, key, value, **kwargs):
+        ttl = kwargs.get("ttl")
+        expires_at = time.time() + float(ttl) if ttl is not None else None
+        self.entries[key] = (value, expires_at)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    async def async_set_cache(self, key, value, **kwargs):
+        self.set_cache(key, value, **kwargs)
+
+    async def async_set_cache_pipeline(self, cache_list, **kwargs):
+        for key, value in cache_list:
+            self.set_cache(key, value, **kwargs)
+
+    def get_cache(self, key, **kwargs):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return value
+
+    async def async_get_cache(self, key, **kwargs):
+        return self.get_cache(key)
+
+    async def async_batch_get_cache(self, keys: List[str], **kwargs) -> List[Any]:
+        return [self.get_cache(key) for key in keys]
+
+    def delete_cache(self, key):
+        self.entries.pop(key, None)
+
+    def flush_cache(self):
+        self.entries.clear()
+
+    async def disconnect(self):
+        pass
+
+
+class SegmentObjectCache(BaseCache):
+    def __init__(
+        self,
+        store: SegmentObjectStore,
+        index_cache: Optional[BaseCache] = None,
+        key_prefix: Optional[str] = None,
+        flush_interval_ms: Optional[float] = None,
+        max_segment_bytes: Optional[int] = None,
+    ):
+        """
+        store: the S3 / GCS segment store.
+        index_cache: where cache key -> segment locations are kept. Use a RedisCache to share the index across instances. Defaults to a LocalSegmentIndex, written to the bucket as index objects and rebuilt from them on start.
+        key_prefix: folder path inside the bucket to store segments in.
+        flush_interval_ms: how long a write waits for others, to upload them in one segment.
+        max_segment_bytes: buffered bytes at which a segment is uploaded early.
+        """
+        super().__init__()
+        self.store = store
+        self.index_cache: BaseCache = index_cache or LocalSegmentIndex()
+        # a local index is lost on restart - keep a copy of it in the bucket
+        self.persist_index = index_cache is None
+        self._index_loaded = not self.persist_index
+        self._index_load_task: Optional[asyncio.Task] = None
+        self.key_prefix = key_prefix.rstrip("/") + "/" if key_prefix else ""
+        self.flush_interval_ms = (
+            flush_interval_ms
+            if flush_interval_ms is not None
+            else SEGMENT_CACHE_FLUSH_INTERVAL_MS
+        )
+        self.max_segment_bytes = max_segment_bytes or SEGMENT_CACHE_MAX_SEGMENT_BYTES
+        # buffered writes - cache key -> (encoded value, ttl)
+        self._pending: Dict[str, Tuple[bytes, Optional[float]]] = {}
+        self._pending_bytes = 0
+        self._pending_waiters: List["asyncio.Future[None]"] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        # early flushes at max_segment_bytes - kept referenced until done, so they aren't garbage collected mid-run
+        self._background_tasks: Set[asyncio.Task] = set()
+        # entries of segments being uploaded - readable before they're indexed
+        self._uploading: Dict[str, bytes] = {}
+
+    def _get_index_key(self, key: str) -> str:
+        return f"segment-index:{self.key_prefix}{key}"
+
+    def _get_index_object_prefix(self) -> str:
+        return f"{self.key_prefix}index/"
+
+    def _new_segment_name(self) -> str:
+        # time-ordered - index objects are replayed in the order they were written
+        return f"{self.key_prefix}segments/{time.time_ns():020d}-{uuid.uuid4().hex}"
+
+    def _get_index_object_name(self, segment_name: Optional[str] = None) -> str:
+        """
+        segment_name: the segment the index object is for. None for deletes / flushes.
+        """
+        object_name = (
+            segment_name.rsplit("/", 1)[-1]
+            if segment_name is not None
+            else f"{time.time_ns():020d}-{uuid.uuid4().hex}"
+        )
+        return f"{self._get_index_object_prefix()}{object_name}"
+
+    @staticmethod
+    def _build_index_object(
+        segment_name: Optional[str] = None,
+        index_entries: Optional[
+            Dict[Optional[float], List[Tuple[str, SegmentLocation]]]
+        ] = None,
+        deleted_keys: Optional[List[str]] = None,
+        flush: bool = False,
+    ) -> bytes:
+        """
+        Index object - {"segment": ..., "entries": {key: [offset, length, expires at] | None if deleted}, "flush": ...}
+        """
+        entries: Dict[str, Optional[List[Any]]] = {
+            key: None for key in deleted_keys or []
+        }
+        now = time.time()
+        for ttl, cache_list in (index_entries or {}).items():
+            expires_at = now + float(ttl) if ttl is not None else None
+            for key, (_, offset, length) in cache_list:
+                entries[key] = [offset, length, expires_at]
+        return json.dumps(
+            {"segment": segment_name, "entries": entries, "flush": flush}
+        ).encode("utf-8")
+
+    def _apply_index_object(self, data: bytes) -> None:
+        index_object = json.loads(data)
+        if index_object.get("flush"):
+            self.index_cache.flush_cache()  # type: ignore
+        segment_name = index_object.get("segment")
+        now = time.time()
+        for key, entry in index_object.get("entries", {}).items():
+            index_key = self._get_index_key(key)
+            if entry is None or (entry[2] is not None and entry[2] <= now):
+                # drop the entries of earlier index objects
+                self.index_cache.delete_cache(index_key)  # type: ignore
+                continue
+            offset, length, expires_at = entry
+            self.index_cache.set_cache(
+                index_key,
+                [segment_name, offset, length],
+                ttl=expires_at - now if expires_at is not None else None,
+            )
+
+    def _load_index(self) -> None:
+        """
+        Rebuild the local index from the bucket's index objects. Runs once, on first use.
+        """
+        if self._index_loaded:
+            return
+        self._index_loaded = True
+        try:
+            for name in self.store.list_objects(self._get_index_object_prefix()):
+                self._apply_index_object(self.store.get_object(name))
+        except Exception as e:
+            verbose_logger.error(
+                f"Segment Caching: failed to load the segment index: {e}"
+            )
+
+    async def _async_read_index_objects(self) -> None:
+        try:
+            names = await self.store.async_list_objects(self._get_index_object_prefix())
+            index_objects = await asyncio.gather(
+                *[self.store.async_get_object(name) for name in names]
+            )
+            if not self._index_loaded:
+                for data in index_objects:
+                    self._apply_index_object(data)
+        except Exception as e:
+            verbose_logger.error(
+                f"Segment Caching: failed to load the segment index: {e}"
+            )
+        finally:
+            self._index_loaded = True
+
+    async def _async_load_index(self) -> None:
+        if self._index_loaded:
+            return
+        if self._index_load_task is None:
+            self._index_load_task = asyncio.create_task(
+                self._async_read_index_objects()
+            )
+        await asyncio.shield(self._index_load_task)
+
+    @staticmethod
+    def _build_segment(
+        segment_name: str, entries: Dict[str, Tuple[bytes, Optional[float]]]
+    ) -> Tuple[bytes, Dict[Optional[float], List[Tuple[str, SegmentLocation]]]]:
+        """
+        Returns the segment, and the index entries to write - grouped by ttl.
+        """
+        index_entries: Dict[Optional[float], List[Tuple[str, SegmentLocation]]] = {}
+        offset = 0
+        for key, (data, ttl) in entries.items():
+            index_entries.setdefault(ttl, []).append(
+                (key, (segment_name, offset, len(data)))
+            )
+            offset += len(data)
+        return b"".join(data for data, _ in entries.values()), index_entries
+
+    def _get_unindexed_value(self, key: str) -> Optional[bytes]:
+        pending_entry = self._pending.get(key)
+        if pending_entry is not None:
+            return pending_entry[0]
+        return self._uploading.get(key)
+
+    @staticmethod
+    def _parse_location(location: Any) -> Optional[SegmentLocation]:
+        if not isinstance(location, (list, tuple)) or len(location) != 3:
+            return None
+        return location[0], int(location[1]), int(location[2])
+
+    def _buffer(
+        self, key: str, value: Any, ttl: Optional[float]
+    ) -> "asyncio.Future[None]":
+        data = _encode_value(value)
+        previous_entry = self._pending.get(key)
+        if previous_entry is not None:
+            self._pending_bytes -= len(previous_entry[0])
+        self._pending[key] = (data, ttl)
+        self._pending_bytes += len(data)
+        future: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        self._pending_waiters.append(future)
+        if self._pending_bytes >= self.max_segment_bytes:
+            if self._flush_task is not None:
+                self._flush_task.cancel()
+                self._flush_task = None
+            task = asyncio.create_task(self.async_flush())
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_interval())
+        return future
+
+    async def _flush_after_interval(self) -> None:
+        await asyncio.sleep(self.flush_interval_ms / 1000)
+        self._flush_task = None
+        await self.async_flush()
+
+    async def async_flush(self) -> None:
+        """
+        Upload the buffered writes as one segment, then index them.
+        """
+        entries, waiters = self._pending, self._pending_waiters
+        self._pending, self._pending_waiters, self._pending_bytes = {}, [], 0
+        error: Optional[Exception] = None
+        if entries:
+            segment_name = self._new_segment_name()
+            segment, index_entries = self._build_segment(segment_name, entries)
+            self._uploading.update({key: data for key, (data, _) in entries.items()})
+            try:
+                await self._async_load_index()
+                await self.store.async_put_segment(segment_name, segment)
+                # entries deleted or rewritten while uploading are stale - don't index them
+                index_entries = {
+                    ttl: [
+                        (key, location)
+                        for key, location in cache_list
+                        if self._uploading.get(key) is entries[key][0]
+                    ]
+                    for ttl, cache_list in index_entries.items()
+                }
+                if self.persist_index:
+                    await self.store.async_put_segment(
+                        self._get_index_object_name(segment_name),
+                        self._build_index_object(segment_name, index_entries),
+                    )
+                for ttl, cache_list in index_entries.items():
+                    if not cache_list:
+                        continue
+                    await self.index_cache.async_set_cache_pipeline(
+                        cache_list=[
+                            (self._get_index_key(key), list(location))
+                            for key, location in cache_list
+                        ],
+                        ttl=ttl,
+                    )
+            except Exception as e:
+                error = e
+                verbose_logger.error(
+                    f"Segment Caching: async_flush() - Got exception writing segment {segment_name}: {e}"
+                )
+            finally:
+                for key, (data, _) in entries.items():
+                    if self._uploading.get(key) is data:
+                        self._uploading.pop(key)
+        for waiter in waiters:
+            if waiter.done():
+                continue
+            if error is not None:
+                waiter.set_exception(error)
+            else:
+                waiter.set_result(None)
+
+    def set_cache(self, key, value, **kwargs):
+        """
+        Sync writes aren't buffered - each is uploaded as its own segment.
+        """
+        try:
+            print_verbose(f"LiteLLM SET Cache - Segments. Key={key}. Value={value}")
+            segment_name = self._new_segment_name()
+            segment, index_entries = self._build_segment(
+                segment_name, {key: (_encode_value(value), kwargs.get("ttl"))}
+            )
+            self._load_index()
+            self.store.put_segment(segment_name, segment)
+            if self.persist_index:
+                self.store.put_segment(
+                    self._get_index_object_name(segment_name),
+                    self._build_index_object(segment_name, index_entries),
+                )
+            for ttl, cache_list in index_entries.items():
+                for index_key, location in cache_list:
+                    self.index_cache.set_cache(
+                        self._get_index_key(index_key), list(location), ttl=ttl
+                    )
+        except Exception as e:
+            print_verbose(
+                f"Segment Caching: set_cache() - Got exception writing segment: {e}"
+            )
+
+    async def async_set_cache(self, key, value, **kwargs):
+        try:
+            verbose_logger.debug(f"Set ASYNC Segment Cache: Key={key}. Value={value}")
+            await self._buffer(key, value, ttl=kwargs.get("ttl"))
+        except Exception as e:
+            verbose_logger.error(
+                f"Segment Caching: async_set_cache() - Got exception: {e}"
+            )
+
+    async def async_set_cache_pipeline(self, cache_list, **kwargs):
+        """
+        Written to as few segments as fit them.
+        """
+        try:
+            waiters = [
+                self._buffer(key, value, ttl=kwargs.get("ttl"))
+                for key, value in cache_list
+            ]
+            await asyncio.gather(*waiters)
+        except Exception as e:
+            verbose_logger.error(
+                f"Segment Caching: async_set_cache_pipeline() - Got exception: {e}"
+            )
+
+    def get_cache(self, key, **kwargs):
+        try:
+            data = self._get_unindexed_value(key)
+            if data is None:
+                self._load_index()
+                location = self._parse_location(
+                    self.index_cache.get_cache(self._get_index_key(key))
+                )
+                if location is None:
+                    return None
+                segment_name, offset, length = location
+                data = self.store.get_range(segment_name, offset, offset + length)
+            return _decode_value(data)
+        except Exception as e:
+            verbose_logger.error(f"Segment Caching: get_cache() - Got exception: {e}")
+            return None
+
+    async def async_get_cache(self, key, **kwargs):
+        return (await self.async_batch_get_cache([key]))[0]
+
+    async def _async_get_index_entries(self, keys: List[str]) -> List[Any]:
+        index_keys = [self._get_index_key(key) for key in keys]
+        results = await self.index_cache.async_batch_get_cache(index_keys)  # type: ignore
+        if isinstance(results, dict):  # redis - {key: value}
+            return [results.get(index_key) for index_key in index_keys]
+        return list(results or [None] * len(keys))
+
+    @staticmethod
+    def _merge_ranges(
+        locations: List[Tuple[int, int, int]]
+    ) -> List[Tuple[int, int, List[Tuple[int, int, int]]]]:
+        """
+        Group (result index, offset, length) reads of a segment into ranges - reads within SEGMENT_CACHE_RANGE_MERGE_GAP_BYTES share one.
+        """
+        ranges: List[Tuple[int, int, List[Tuple[int, int, int]]]] = []
+        for location in sorted(locations, key=lambda location: location[1]):
+            _, offset, length = location
+            if ranges and offset - ranges[-1][1] <= SEGMENT_CACHE_RANGE_MERGE_GAP_BYTES:
+                start, end, members = ranges[-1]
+                ranges[-1] = (start, max(end, offset + length), members + [location])
+            else:
+                ranges.append((offset, offset + length, [location]))
+        return ranges
+
+    async def async_batch_get_cache(self, keys: List[str], **kwargs) -> List[Any]:
+        """
+        Get values for a list of keys, in order - one index read, and one ranged GET per group of nearby entries.
+        """
+        results: List[Any] = [None] * len(keys)
+        try:
+            segment_reads: Dict[str, List[Tuple[int, int, int]]] = {}
+            unbuffered: List[int] = []
+            for i, key in enumerate(keys):
+                data = self._get_unindexed_value(key)
+                if data is not None:
+                    results[i] = _decode_value(data)
+                else:
+                    unbuffered.append(i)
+            if not unbuffered:
+                return results
+            await self._async_load_index()
+            index_entries = await self._async_get_index_entries(
+                [keys[i] for i in unbuffered]
+            )
+            for i, index_entry in zip(unbuffered, index_entries):
+                location = self._parse_location(index_entry)
+                if location is not None:
+                    segment_name, offset, length = location
+                    segment_reads.setdefault(segment_name, []).append(
+                        (i, offset, length)
+                    )
+
+            async def _read_range(
+                segment_name: str,
+                start: int,
+                end: int,
+                members: List[Tuple[int, int, int]],
+            ) -> None:
+                try:
+                    data = await self.store.async_get_range(segment_name, start, end)
+                    for i, offset, length in members:
+                        results[i] = _decode_value(
+                            data[offset - start : offset - start + length]
+                        )
+                except Exception as e:
+                    verbose_logger.error(
+                        f"Segment Caching: failed to read segment {segment_name}: {e}"
+                    )
+
+            await asyncio.gather(
+                *[
+                    _read_range(segment_name, start, end, members)
+                    for segment_name, locations in segment_reads.items()
+                    for start, end, members in self._merge_ranges(locations)
+                ]
+            )
+        except Exception as e:
+            verbose_logger.error(
+                f"Segment Caching: async_batch_get_cache() - Got exception: {e}"
+            )
+        return results
+
+    def _put_index_object(self, data: bytes) -> None:
+        if not self.persist_index:
+            return
+        try:
+            self.store.put_segment(self._get_index_object_name(), data)
+        except Exception as e:
+            verbose_logger.error(
+                f"Segment Caching: failed to write segment index object: {e}"
+            )
+
+    def delete_cache(self, key):
+        pending_entry = self._pending.pop(key, None)
+        if pending_entry is not None:
+            self._pending_bytes -= len(pending_entry[0])
+        # a segment being uploaded won't index it
+        self._uploading.pop(key, None)
+        self._put_index_object(self._build_index_object(deleted_keys=[key]))
+        self.index_cache.delete_cache(self._get_index_key(key))  # type: ignore
+
+    def flush_cache(self):
+        """
+        Drops the index - segments are left to the bucket lifecycle rule.
+        """
+        self._put_index_object(self._build_index_object(flush=True))
+        self.index_cache.flush_cache()  # type: ignore
+
+    async def disconnect(self):
+        await self.async_flush()
@@ -0,0 +1,171 @@
+"""
+Embedding batcher for the semantic caches.
+
+- concurrent lookups are micro-batched - prompts arriving within `batch_window_ms` are embedded in a single embedding request
+- recently embedded prompts are remembered, so the `async_set_cache` after a lookup doesn't embed the same prompt again
+
+Embeddings are shared per user_api_key only - one key's lookups never reuse an embedding another key paid for.
+"""
+
+import asyncio
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import litellm
+from litellm._logging import verbose_logger
+from litellm.constants import (
+    SEMANTIC_CACHE_EMBEDDING_BATCH_WINDOW_MS,
+    SEMANTIC_CACHE_EMBEDDING_MAX_BATCH_SIZE,
+)
+
+_MAX_RECENT_EMBEDDINGS = 512
+
+_PendingPrompt = Tuple[str, "asyncio.Future[List[float]]", dict]
+# (user_api_key, prompt)
+_EmbeddingKey = Tuple[str, str]
+
+
+class SemanticCacheEmbeddingBatcher:
+    def __init__(
+        self,
+        embedding_model: str,
+        batch_window_ms: Optional[float] = None,
+        max_batch_size: Optional[int] = None,
+    ):
+        """
+        embedding_model: model used to embed prompts.
+        batch_window_ms: how long a lookup waits for others to batch with. 0 batches only lookups made in the same event loop iteration.
+        max_batch_size: max prompts per embedding request.
+        """
+        self.embedding_model = embedding_model
+        self.batch_window_ms = (
+            batch_window_ms
+            if batch_window_ms is not None
+            else SEMANTIC_CACHE_EMBEDDING_BATCH_WINDOW_MS
+        )
+        self.max_batch_size = max_batch_size or SEMANTIC_CACHE_EMBEDDING_MAX_BATCH_SIZE
+        self._pending: List[_PendingPrompt] = []
+        self._in_flight: Dict[_EmbeddingKey, "asyncio.Future[List[float]]"] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        # early flushes at max_batch_size - kept referenced until done, so they aren't garbage collected mid-run
+        self._background_tasks: Set[asyncio.Task] = set()
+        # packed, a python list of floats is ~4x larger
+        self._recent_embeddings: "OrderedDict[_EmbeddingKey, array]" = OrderedDict()
+
+    @staticmethod
+    def _get_user_api_key(metadata: dict) -> str:
+        return metadata.get("user_api_key") or ""
+
+    def _remember(self, embedding_key: _EmbeddingKey, embedding: List[float]) -> None:
+        self._recent_embeddings[embedding_key] = array("d", embedding)
+        self._recent_embeddings.move_to_end(embedding_key)
+        while len(self._recent_embeddings) > _MAX_RECENT_EMBEDDINGS:
+            self._recent_embeddings.popitem(last=False)
+
+    async def get_embedding(self, prompt: str, **kwargs) -> List[float]:
+        """
+        Embed a prompt. Waits up to `batch_window_ms`, so concurrent calls share one embedding request.
+        """
+        metadata = kwargs.get("metadata") or {}
+        embedding_key = (self._get_user_api_key(metadata), prompt)
+        recent_embedding = self._recent_embeddings.get(embedding_key)
+        if recent_embedding is not None:
+            self._recent_embeddings.move_to_end(embedding_key)
+            return recent_embedding.tolist()
+
+        future = self._in_flight.get(embedding_key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._in_flight[embedding_key] = future
+            self._pending.append((prompt, future, metadata))
+            if len(self._pending) >= self.max_batch_size:
+                if self._flush_task is not None:
+                    self._flush_task.cancel()
+                    self._flush_task = None
+                task = asyncio.create_task(self._flush())
+                self._background_tasks.add(task)
+                task.add_done_callback(self._background_tasks.discard)
+            elif self._flush_task is None:
+                self._flush_task = asyncio.create_task(self._flush_after_window())
+        # shielded - a cancelled caller mustn't fail the other callers waiting on this prompt
+        return await asyncio.shield(future)
+
+    async def _flush_after_window(self) -> None:
+        await asyncio.sleep(self.batch_window_ms / 1000)
+        self._flush_task = None
+        await self._flush()
+
+    async def _flush(self) -> None:
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        # router embedding requests are attributed to a user_api_key, batch per key
+        batches: Dict[str, List[_PendingPrompt]] = {}
+        for item in pending:
+            batches.setdefault(self._get_user_api_key(item[2]), []).append(item)
+        await asyncio.gather(
+            *[
+                self._embed_batch(batch[start : start + self.max_batch_size])
+                for batch in batches.values()
+                for start in range(0, len(batch), self.max_batch_size)
+            ]
+        )
+
+    async def _embed_batch(self, batch: List[_PendingPrompt]) -> None:
+        prompts = [prompt for prompt, _, _ in batch]
+        user_api_key = self._get_user_api_key(batch[0][2])
+        try:
+            embeddings = await self._aembedding(prompts, metadata=batch[0][2])
+            for prompt, embedding in zip(prompts, embeddings):
+                self._remember((user_api_key, prompt), embedding)
+            for (prompt, future, _), embedding in zip(batch, embeddings):
+                if not future.done():
+                    future.set_result(embedding)
+        except Exception as e:
+            verbose_logger.debug(
+                f"Semantic cache embedding batch of {len(prompts)} prompts failed: {str(e)}"
+            )
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            for prompt in prompts:
+                self._in_flight.pop((user_api_key, prompt), None)
+
+    async def _aembedding(
+        self, prompts: List[str], metadata: dict
+    ) -> List[List[float]]:
+        from litellm.proxy.proxy_server import llm_model_list, llm_router
+
+        router_model_names = (
+            [m["model_name"] for m in llm_model_list]
+            if llm_model_list is not None
+            else []
+        )
+        embedding_response: Any
+        if llm_router is not None and self.embedding_model in router_model_names:
+            embedding_response = await llm_router.aembedding(
+                model=self.embedding_model,
+                input=prompts,
+                cache={"no-store": True, "no-cache": True},
+                metadata={
+                    "user_api_key": metadata.get("user_api_key", ""),
+                    "semantic-cache-embedding": True,
+                    "trace_id": metadata.get("trace_id", None)
+                    if len(prompts) == 1
+                    else None,
+                },
+            )
+        else:
+            embedding_response = await litellm.aembedding(
+                model=self.embedding_model,
+                input=prompts,
+                cache={"no-store": True, "no-cache": True},
+            )
+        data = sorted(embedding_response["data"], key=lambda item: item.get("index", 0))
+        if len(data) != len(prompts):
+            raise ValueError(
+                f"Expected {len(prompts)} embeddings from {self.embedding_model}, got {len(data)}"
+            )
+        return [item["embedding"] for item in data]
@@ -0,0 +1,281 @@
+"""
+Tiered Cache implementation - N caches, checked fastest first.
+
+e.g. L1 in-memory (per process) -> L2 disk (shared by the workers on a host) -> L3 redis -> L4 s3
+
+- get: falls through the tiers, and promotes hits to the faster tiers - with the ttl they have left in the tier they were found in
+- set: writes the first tier, and the slower tiers in the background (async) / in order (sync)
+
+Has 4 primary methods:
+    - set_cache
+    - get_cache
+    - async_set_cache
+    - async_get_cache
+"""
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Union
+
+from litellm._logging import print_verbose, verbose_logger
+from litellm.constants import TIERED_CACHE_STATS_EMIT_INTERVAL_SECONDS
+from litellm.types.services import ServiceTypes
+
+from .base_cache import BaseCache
+from .in_memory_cache import InMemoryCache
+from .redis_cache import RedisCache
+
+if TYPE_CHECKING:
+    from opentelemetry.trace import Span as _Span
+
+    Span = Union[_Span, Any]
+else:
+    Span = Any
+
+
+class CacheTierStats:
+    __slots__ = ("hits", "misses", "total_latency")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.total_latency = 0.0
+
+    def record(self, hit: bool, latency: float) -> None:
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        self.total_latency += latency
+
+    def to_dict(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "avg_latency": self.total_latency / lookups if lookups else 0.0,
+        }
+
+
+class TieredCache(BaseCache):
+    def __init__(
+        self,
+        caches: List[BaseCache],
+        tier_ttls: Optional[List[Optional[float]]] = None,
+    ):
+        """
+        caches: the tiers, fastest first.
+        tier_ttls: optional max ttl per tier. Also used for values promoted to the tier.
+        """
+        from litellm._service_logger import ServiceLogging
+
+        if len(caches) == 0:
+            raise ValueError("TieredCache requires at least 1 cache tier")
+        super().__init__()
+        self.caches = caches
+        self.tier_ttls: List[Optional[float]] = tier_ttls or [None] * len(caches)
+        self.tier_names = [
+            "L{}:{}".format(idx + 1, type(cache).__name__)
+            for idx, cache in enumerate(caches)
+        ]
+        self.tier_stats = [CacheTierStats() for _ in caches]
+        self.service_logger_obj = ServiceLogging()
+        self._last_stats_emit_time = 0.0
+        # keep references to background writes, so they're not garbage collected
+        self._background_tasks: Set[asyncio.Task] = set()
+
+    def get_tier_stats(self) -> Dict[str, dict]:
+        """
+        Hits, misses, hit ratio and avg lookup latency (seconds) per tier
+        """
+        return {
+            tier_name: stats.to_dict()
+            for tier_name, stats in zip(self.tier_names, self.tier_stats)
+        }
+
+    def _get_tier_kwargs(self, tier: int, kwargs: dict) -> dict:
+        tier_ttl = self.tier_ttls[tier]
+        if tier_ttl is None:
+            return kwargs
+        ttl = kwargs.get("ttl")
+        return {**kwargs, "ttl": tier_ttl if ttl is None else min(ttl, tier_ttl)}
+
+    def _get_remaining_ttl(self, tier: int, key) -> Optional[float]:
+        """
+        Remaining ttl of a value in a tier. None if it doesn't expire, or the tier doesn't track it.
+        """
+        cache = self.caches[tier]
+        if isinstance(cache, InMemoryCache):
+            expires_at = cache.ttl_dict.get(key)
+            if expires_at is None:
+                return None
+            return max(expires_at - time.time(), 0.0)
+        if hasattr(cache, "get_remaining_ttl"):
+            return cache.get_remaining_ttl(key)
+        return None
+
+    async def _async_get_remaining_ttl(self, tier: int, key) -> Optional[float]:
+        cache = self.caches[tier]
+        if isinstance(cache, RedisCache):
+            return await cache.async_get_ttl(cache.check_and_fix_namespace(key=key))
+        return self._get_remaining_ttl(tier, key)
+
+    @staticmethod
+    def _get_promote_kwargs(remaining_ttl: Optional[float]) -> dict:
+        return {"ttl": remaining_ttl} if remaining_ttl is not None else {}
+
+    def _record_lookup(self, tier: int, hit: bool, latency: float) -> None:
+        """
+        Stats are recorded inline. They're emitted at most once per TIERED_CACHE_STATS_EMIT_INTERVAL_SECONDS - not per lookup.
+        """
+        self.tier_stats[tier].record(hit=hit, latency=latency)
+        now = time.monotonic()
+        if now - self._last_stats_emit_time < TIERED_CACHE_STATS_EMIT_INTERVAL_SECONDS:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:  # no running event loop - sync call
+            return
+        self._last_stats_emit_time = now
+        self._track_background_task(loop.create_task(self._async_emit_tier_stats()))
+
+    async def _async_emit_tier_stats(self) -> None:
+        for tier_name, stats in self.get_tier_stats().items():
+            await self.service_logger_obj.async_service_success_hook(
+                service=ServiceTypes.TIERED_CACHE,
+                duration=stats["avg_latency"],
+                call_type="get_cache",
+                event_metadata={
+                    "gauge_labels": tier_name,
+                    "gauge_value": stats["hit_ratio"],
+                },
+            )
+
+    def _track_background_task(self, task: asyncio.Task) -> None:
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _async_set_tier(self, tier: int, key, value, **kwargs) -> None:
+        try:
+            await self.caches[tier].async_set_cache(
+                key, value, **self._get_tier_kwargs(tier, kwargs)
+            )
+        except Exception as e:
+            verbose_logger.exception(
+                f"LiteLLM Cache: Exception writing to {self.tier_names[tier]}: {str(e)}"
+            )
+
+    def _write_back(self, tiers: range, key, value, **kwargs) -> None:
+        for tier in tiers:
+            task = asyncio.create_task(self._async_set_tier(tier, key, value, **kwargs))
+            self._track_background_task(task)
+
+    def set_cache(self, key, value, **kwargs):
+        for tier, cache in enumerate(self.caches):
+            try:
+                cache.set_cache(key, value, **self._get_tier_kwargs(tier, kwargs))
+            except Exception as e:
+                verbose_logger.exception(
+                    f"LiteLLM Cache: Exception writing to {self.tier_names[tier]}: {str(e)}"
+                )
+
+    async def async_set_cache(self, key, value, **kwargs):
+        await self._async_set_tier(0, key, value, **kwargs)
+        self._write_back(range(1, len(self.caches)), key, value, **kwargs)
+
+    async def async_set_cache_pipeline(self, cache_list, **kwargs):
+        for tier, cache in enumerate(self.caches):
+            tier_kwargs = self._get_tier_kwargs(tier, kwargs)
+            if tier == 0:
+                await cache.async_set_cache_pipeline(cache_list, **tier_kwargs)
+            else:
+                task = asyncio.create_task(
+                    cache.async_set_cache_pipeline(cache_list, **tier_kwargs)
+                )
+                self._track_background_task(task)
+
+    def get_cache(self, key, **kwargs):
+        for tier, cache in enumerate(self.caches):
+            start_time = time.perf_counter()
+            try:
+                result = cache.get_cache(key, **kwargs)
+            except Exception as e:
+                verbose_logger.exception(
+                    f"LiteLLM Cache: Exception reading from {self.tier_names[tier]}: {str(e)}"
+                )
+                result = None
+            self._record_lookup(
+                tier=tier,
+                hit=result is not None,
+                latency=time.perf_counter() - start_time,
+            )
+            if result is not None:
+                print_verbose(f"get cache: hit in {self.tier_names[tier]}")
+                # promote to the faster tiers
+                promote_kwargs = self._get_promote_kwargs(
+                    self._get_remaining_ttl(tier, key) if tier > 0 else None
+                )
+                for upper_tier in range(tier):
+                    try:
+                        self.caches[upper_tier].set_cache(
+                            key,
+                            result,
+                            **self._get_tier_kwargs(upper_tier, promote_kwargs),
+                        )
+                    except Exception as e:
+                        verbose_logger.exception(
+                            f"LiteLLM Cache: Exception writing to {self.tier_names[upper_tier]}: {str(e)}"
+                        )
+                return result
+        return None
+
+    async def async_get_cache(self, key, **kwargs):
+        for tier, cache in enumerate(self.caches):
+            start_time = time.perf_counter()
+            try:
+                result = await cache.async_get_cache(key, **kwargs)
+            except Exception as e:
+                verbose_logger.exception(
+                    f"LiteLLM Cache: Exception reading from {self.tier_names[tier]}: {str(e)}"
+                )
+                result = None
+            self._record_lookup(
+                tier=tier,
+                hit=result is not None,
+                latency=time.perf_counter() - start_time,
+            )
+            if result is not None:
+                print_verbose(f"async get cache: hit in {self.tier_names[tier]}")
+                if tier > 0:
+                    # promote - the first tier right away, the others in the background
+                    promote_kwargs = self._get_promote_kwargs(
+                        await self._async_get_remaining_ttl(tier, key)
+                    )
+                    await self._async_set_tier(0, key, result, **promote_kwargs)
+                    self._write_back(range(1, tier), key, result, **promote_kwargs)
+                return result
+        return None
+
+    async def async_batch_get_cache(self, keys: list, **kwargs):
+        return [await self.async_get_cache(key, **kwargs) for key in keys]
+
+    def batch_get_cache(self, keys: list, **kwargs):
+        return [self.get_cache(key, **kwargs) for key in keys]
+
+    def flush_cache(self):
+        for cache in self.caches:
+            if hasattr(cache, "flush_cache"):
+                cache.flush_cache()
+
+    def delete_cache(self, key):
+        for cache in self.caches:
+            if hasattr(cache, "delete_cache"):
+                cache.delete_cache(key)
+
+    async def disconnect(self):
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        for cache in self.caches:
+            if hasattr(cache, "disconnect"):
+                await cache.disconnect()
@@ -39,6 +39,14 @@ DEFAULT_MAX_TOKENS = int(os.getenv("DEFAULT_MAX_TOKENS", 4096))
 DEFAULT_ALLOWED_FAILS = int(os.getenv("DEFAULT_ALLOWED_FAILS", 3))
 DEFAULT_REDIS_SYNC_INTERVAL = int(os.getenv("DEFAULT_REDIS_SYNC_INTERVAL", 1))
 DEFAULT_COOLDOWN_TIME_SECONDS = int(os.getenv("DEFAULT_COOLDOWN_TIME_SECONDS", 5))
+DEFAULT_COOLDOWN_INDEX_SYNC_INTERVAL_SECONDS = float(
+    os.getenv("DEFAULT_COOLDOWN_INDEX_SYNC_INTERVAL_SECONDS", 1)
+)  # how often the in-process cooldown index pulls cooldowns set by other instances from redis
+PREFIX_AFFINITY_MIN_PREFIX_CHARS = int(
+    os.getenv("PREFIX_AFFINITY_MIN_PREFIX_CHARS", 4096)
+)  # ~1024 tokens, the minimum cacheable prefix for most providers
+PREFIX_AFFINITY_LOAD_FACTOR = float(os.getenv("PREFIX_AFFINITY_LOAD_FACTOR", 1.25))
+PREFIX_AFFINITY_VIRTUAL_NODES = int(os.getenv("PREFIX_AFFINITY_VIRTUAL_NODES", 100))
 DEFAULT_REPLICATE_POLLING_RETRIES = int(
     os.getenv("DEFAULT_REPLICATE_POLLING_RETRIES", 5)
 )
@@ -221,6 +229,12 @@ REPEATED_STREAMING_CHUNK_LIMIT = int(
     os.getenv("REPEATED_STREAMING_CHUNK_LIMIT", 100)
 )  # catch if model starts looping the same chunk while streaming. Uses high default to prevent false positives.
 DEFAULT_MAX_LRU_CACHE_SIZE = int(os.getenv("DEFAULT_MAX_LRU_CACHE_SIZE", 16))
+TOKEN_COUNT_CACHE_SIZE = int(
+    os.getenv("TOKEN_COUNT_CACHE_SIZE", 1024)
+)  # max text segments (system prompts, tool schemas, long turns) with memoized token counts
+TOKEN_COUNT_CACHE_MIN_CHARS = int(
+    os.getenv("TOKEN_COUNT_CACHE_MIN_CHARS", 1000)
+)  # shorter segments are cheaper to re-tokenize than to hash
 _REALTIME_BODY_CACHE_SIZE = 1000  # Keep realtime helper caches bounded; workloads rarely exceed 1k models/intents
 INITIAL_RETRY_DELAY = float(os.getenv("INITIAL_RETRY_DELAY", 0.5))
 MAX_RETRY_DELAY = float(os.getenv("MAX_RETRY_DELAY", 8.0))
@@ -268,6 +282,56 @@ TOGETHER_AI_EMBEDDING_150_M = int(os.getenv("TOGETHER_AI_EMBEDDING_150_M", 150))
 TOGETHER_AI_EMBEDDING_350_M = int(os.getenv("TOGETHER_AI_EMBEDDING_350_M", 350))
 QDRANT_SCALAR_QUANTILE = float(os.getenv("QDRANT_SCALAR_QUANTILE", 0.99))
 QDRANT_VECTOR_SIZE = int(os.getenv("QDRANT_VECTOR_SIZE", 1536))
+LOCAL_SEMANTIC_CACHE_MAX_SIZE = int(
+    os.getenv("LOCAL_SEMANTIC_CACHE_MAX_SIZE", 100000)
+)  # max entries per namespace
+LOCAL_SEMANTIC_CACHE_IVF_MIN_SIZE = int(
+    os.getenv("LOCAL_SEMANTIC_CACHE_IVF_MIN_SIZE", 4096)
+)  # smaller namespaces are searched exhaustively
+LOCAL_SEMANTIC_CACHE_IVF_NPROBE = int(os.getenv("LOCAL_SEMANTIC_CACHE_IVF_NPROBE", 8))
+REDIS_CLIENT_SIDE_CACHE_TTL = int(
+    os.getenv("REDIS_CLIENT_SIDE_CACHE_TTL", 3600)
+)  # upper bound on how long an invalidation-tracked key is kept in memory
+CACHE_REFRESH_LOCK_TTL_SECONDS = int(os.getenv("CACHE_REFRESH_LOCK_TTL_SECONDS", 30))
+CACHE_REFRESH_LOCK_WAIT_SECONDS = float(
+    os.getenv("CACHE_REFRESH_LOCK_WAIT_SECONDS", 5)
+)
+REDIS_WRITE_COALESCER_FLUSH_INTERVAL_MS = float(
+    os.getenv("REDIS_WRITE_COALESCER_FLUSH_INTERVAL_MS", 1)
+)
+REDIS_WRITE_COALESCER_MAX_BATCH_SIZE = int(
+    os.getenv("REDIS_WRITE_COALESCER_MAX_BATCH_SIZE", 500)
+)
+DISK_CACHE_MAX_SIZE_BYTES = int(
+    os.getenv("DISK_CACHE_MAX_SIZE_BYTES", 1024 * 1024 * 1024)
+)  # "disk-mmap" cache - the oldest segment files are deleted past this
+DISK_CACHE_MAX_SEGMENT_BYTES = int(
+    os.getenv("DISK_CACHE_MAX_SEGMENT_BYTES", 64 * 1024 * 1024)
+)
+DISK_CACHE_FSYNC_INTERVAL_MS = float(
+    os.getenv("DISK_CACHE_FSYNC_INTERVAL_MS", 100)
+)  # 0 = fsync every write
+SEGMENT_CACHE_FLUSH_INTERVAL_MS = float(
+    os.getenv("SEGMENT_CACHE_FLUSH_INTERVAL_MS", 50)
+)
+SEGMENT_CACHE_MAX_SEGMENT_BYTES = int(
+    os.getenv("SEGMENT_CACHE_MAX_SEGMENT_BYTES", 8 * 1024 * 1024)
+)
+SEGMENT_CACHE_MAX_INDEX_SIZE = int(
+    os.getenv("SEGMENT_CACHE_MAX_INDEX_SIZE", 1000000)
+)  # max entries in the in-memory segment index
+SEGMENT_CACHE_RANGE_MERGE_GAP_BYTES = int(
+    os.getenv("SEGMENT_CACHE_RANGE_MERGE_GAP_BYTES", 64 * 1024)
+)  # batch lookups read ranges of a segment this close together in one GET
+TIERED_CACHE_STATS_EMIT_INTERVAL_SECONDS = float(
+    os.getenv("TIERED_CACHE_STATS_EMIT_INTERVAL_SECONDS", 10)
+)  # tiered cache hit ratios / lookup latency are emitted at most this often
+SEMANTIC_CACHE_EMBEDDING_BATCH_WINDOW_MS = float(
+    os.getenv("SEMANTIC_CACHE_EMBEDDING_BATCH_WINDOW_MS", 5)
+)
+SEMANTIC_CACHE_EMBEDDING_MAX_BATCH_SIZE = int(
+    os.getenv("SEMANTIC_CACHE_EMBEDDING_MAX_BATCH_SIZE", 256)
+)
 CACHED_STREAMING_CHUNK_DELAY = float(os.getenv("CACHED_STREAMING_CHUNK_DELAY", 0.02))
 AUDIO_SPEECH_CHUNK_SIZE = int(
     os.getenv("AUDIO_SPEECH_CHUNK_SIZE", 8192)
@@ -275,6 +339,13 @@ AUDIO_SPEECH_CHUNK_SIZE = int(
 MAX_SIZE_PER_ITEM_IN_MEMORY_CACHE_IN_KB = int(
     os.getenv("MAX_SIZE_PER_ITEM_IN_MEMORY_CACHE_IN_KB", 512)
 )
+MAX_SIZE_IN_MEMORY_CACHE_IN_KB = int(
+    os.getenv("MAX_SIZE_IN_MEMORY_CACHE_IN_KB", 102400)
+)  # total size budget per in-memory cache, least recently used items are evicted past it
+MAX_ITEMS_IN_MEMORY_CACHE = int(os.getenv("MAX_ITEMS_IN_MEMORY_CACHE", 50000))
+DEFAULT_CACHE_COMPRESSION_THRESHOLD_BYTES = int(
+    os.getenv("DEFAULT_CACHE_COMPRESSION_THRESHOLD_BYTES", 1024)
+)  # cache payloads larger than this are compressed, when a cache codec is set
 DEFAULT_MAX_TOKENS_FOR_TRITON = int(os.getenv("DEFAULT_MAX_TOKENS_FOR_TRITON", 2000))
 #### Networking settings ####
 request_timeout: float = float(os.getenv("REQUEST_TIMEOUT", 6000))  # time in seconds
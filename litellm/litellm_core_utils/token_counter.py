@@ -1,8 +1,11 @@
 # What is this?
 ## Helper utilities for token counting
 import base64
+import hashlib
 import io
 import struct
+import threading
+from collections import OrderedDict
 from typing import (
     Any,
     Callable,
@@ -27,6 +30,8 @@ from litellm.constants import (
     MAX_SHORT_SIDE_FOR_IMAGE_HIGH_RES,
     MAX_TILE_HEIGHT,
     MAX_TILE_WIDTH,
+    TOKEN_COUNT_CACHE_MIN_CHARS,
+    TOKEN_COUNT_CACHE_SIZE,
 )
 from litellm.litellm_core_utils.default_encoding import encoding as default_encoding
 from litellm.llms.custom_httpx.http_handler import _get_httpx_client
@@ -313,6 +318,60 @@ Type for a function that counts tokens in a string.
 """
 
 
+class _TokenCountCache:
+    """
+    LRU of token counts for long text segments, keyed by tokenizer + content hash.
+
+    Each consumer of a request (router context window checks, max tokens adjustment, cost estimation)
+    counts the same messages - and system prompts / tool schemas repeat across requests.
+    """
+
+    def __init__(self, max_size: int, min_chars: int):
+        self.max_size = max_size
+        self.min_chars = min_chars
+        # {(tokenizer key, content hash): (token count, tokenizer)} - holding the tokenizer keeps its id() unique
+        self._cache: "OrderedDict[Tuple[str, bytes], Tuple[int, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def count(
+        self,
+        tokenizer_key: str,
+        tokenizer: Any,
+        text: str,
+        count_function: TokenCounterFunction,
+    ) -> int:
+        if self.max_size <= 0 or len(text) < self.min_chars:
+            return count_function(text)
+
+        key = (
+            tokenizer_key,
+            hashlib.blake2b(
+                text.encode("utf-8", "surrogatepass"), digest_size=16
+            ).digest(),
+        )
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached[0]
+
+        num_tokens = count_function(text)
+        with self._lock:
+            self._cache[key] = (num_tokens, tokenizer)
+            if len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+        return num_tokens
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+token_count_cache = _TokenCountCache(
+    max_size=TOKEN_COUNT_CACHE_SIZE, min_chars=TOKEN_COUNT_CACHE_MIN_CHARS
+)
+
+
 class _MessageCountParams:
     """
     A class to hold the parameters for counting tokens in messages.
@@ -523,12 +582,15 @@ def _get_count_function(
     Get the function to count tokens based on the model and custom tokenizer."""
     from litellm.utils import _select_tokenizer, print_verbose
 
+    tokenizer: Any
     if model is not None or custom_tokenizer is not None:
         tokenizer_json = custom_tokenizer or _select_tokenizer(model)  # type: ignore
         if tokenizer_json["type"] == "huggingface_tokenizer":
+            tokenizer = tokenizer_json["tokenizer"]
+            tokenizer_key = f"huggingface_tokenizer:{id(tokenizer)}"
 
-            def count_tokens(text: str) -> int:
-                enc = tokenizer_json["tokenizer"].encode(text)
+            def _count_tokens(text: str) -> int:
+                enc = tokenizer.encode(text)
                 return len(enc.ids)
 
         elif tokenizer_json["type"] == "openai_tokenizer":
@@ -541,17 +603,29 @@ def _get_count_function(
             except KeyError:
                 print_verbose("Warning: model not found. Using cl100k_base encoding.")
                 encoding = tiktoken.get_encoding("cl100k_base")
+            tokenizer = encoding
+            tokenizer_key = f"openai_tokenizer:{encoding.name}"
 
-            def count_tokens(text: str) -> int:
+            def _count_tokens(text: str) -> int:
                 return len(encoding.encode(text, disallowed_special=()))
 
         else:
             raise ValueError("Unsupported tokenizer type")
     else:
+        tokenizer = default_encoding
+        tokenizer_key = f"openai_tokenizer:{default_encoding.name}"
 
-        def count_tokens(text: str) -> int:
+        def _count_tokens(text: str) -> int:
             return len(default_encoding.encode(text, disallowed_special=()))
 
+    def count_tokens(text: str) -> int:
+        return token_count_cache.count(
+            tokenizer_key=tokenizer_key,
+            tokenizer=tokenizer,
+            text=text,
+            count_function=_count_tokens,
+        )
+
     return count_tokens
 
 
@@ -23,8 +23,10 @@ from typing import (
     TYPE_CHECKING,
     Any,
     AsyncGenerator,
+    Awaitable,
     Callable,
     Dict,
+    Iterable,
     List,
     Literal,
     Optional,
@@ -69,8 +71,13 @@ from litellm.router_strategy.lowest_cost import LowestCostLoggingHandler
 from litellm.router_strategy.lowest_latency import LowestLatencyLoggingHandler
 from litellm.router_strategy.lowest_tpm_rpm import LowestTPMLoggingHandler
 from litellm.router_strategy.lowest_tpm_rpm_v2 import LowestTPMLoggingHandler_v2
+from litellm.router_strategy.shortest_queue import ShortestQueueLoggingHandler
 from litellm.router_strategy.simple_shuffle import simple_shuffle
 from litellm.router_strategy.tag_based_routing import get_deployments_for_tag
+from litellm.router_utils.adaptive_concurrency import (
+    AdaptiveConcurrencyLimiter,
+    filter_saturated_deployments,
+)
 from litellm.router_utils.add_retry_fallback_headers import (
     add_fallback_headers_to_response,
     add_retry_headers_to_response,
@@ -109,6 +116,9 @@ from litellm.router_utils.handle_error import (
     async_raise_no_deployment_exception,
     send_llm_exception_alert,
 )
+from litellm.router_utils.pre_call_checks.prefix_affinity_deployment_check import (
+    PrefixAffinityDeploymentCheck,
+)
 from litellm.router_utils.pre_call_checks.prompt_caching_deployment_check import (
     PromptCachingDeploymentCheck,
 )
@@ -119,6 +129,9 @@ from litellm.router_utils.router_callbacks.track_deployment_metrics import (
     increment_deployment_failures_for_current_minute,
     increment_deployment_successes_for_current_minute,
 )
+from litellm.router_utils.request_coalescing import RequestCoalescer
+from litellm.router_utils.request_hedging import RequestHedger
+from litellm.router_utils.routing_table import RouterRoutingTables
 from litellm.scheduler import FlowItem, Scheduler
 from litellm.types.llms.openai import (
     AllMessageValues,
@@ -129,6 +142,7 @@ from litellm.types.llms.openai import (
 from litellm.types.router import (
     CONFIGURABLE_CLIENTSIDE_AUTH_PARAMS,
     VALID_LITELLM_ENVIRONMENTS,
+    AdaptiveConcurrencyConfig,
     AlertingConfig,
     AllowedFailsPolicy,
     AssistantsTypedDict,
@@ -137,10 +151,12 @@ from litellm.types.router import (
     Deployment,
     DeploymentTypedDict,
     GuardrailTypedDict,
+    HedgingConfig,
     LiteLLM_Params,
     MockRouterTestingParams,
     ModelGroupInfo,
     OptionalPreCallChecks,
+    RequestCoalescingConfig,
     RetryPolicy,
     RouterCacheEnum,
     RouterGeneralSettings,
@@ -204,6 +220,7 @@ class Router:
     tenacity = None
     leastbusy_logger: Optional[LeastBusyLoggingHandler] = None
     lowesttpm_logger: Optional[LowestTPMLoggingHandler] = None
+    shortestqueue_logger: Optional[ShortestQueueLoggingHandler] = None
     optional_callbacks: Optional[List[Union[CustomLogger, Callable, str]]] = None
 
     def __init__(  # noqa: PLR0915
@@ -279,6 +296,8 @@ class Router:
             "latency-based-routing",
             "cost-based-routing",
             "usage-based-routing-v2",
+            "power-of-two-choices",
+            "join-shortest-queue",
         ] = "simple-shuffle",
         optional_pre_call_checks: Optional[OptionalPreCallChecks] = None,
         routing_strategy_args: dict = {},  # just for latency-based
@@ -288,6 +307,13 @@ class Router:
             RouterGeneralSettings
         ] = RouterGeneralSettings(),
         ignore_invalid_deployments: bool = False,
+        hedging_config: Optional[Union[HedgingConfig, dict]] = None,
+        adaptive_concurrency_config: Optional[
+            Union[AdaptiveConcurrencyConfig, dict]
+        ] = None,
+        request_coalescing_config: Optional[
+            Union[RequestCoalescingConfig, dict]
+        ] = None,
     ) -> None:
         """
         Initialize the Router class with the given parameters for caching, reliability, and routing strategy.
@@ -302,7 +328,7 @@ class Router:
             cache_kwargs (dict): Additional kwargs to pass to RedisCache. Defaults to {}.
             caching_groups (Optional[List[tuple]]): List of model groups for caching across model groups. Defaults to None.
             client_ttl (int): Time-to-live for cached clients in seconds. Defaults to 3600.
-            polling_interval: (Optional[float]): frequency of polling queue. Only for '.scheduler_acompletion()'. Default is 3ms.
+            polling_interval: (Optional[float]): with redis, how often the head of this instance's queue re-checks the redis queue. Only for '.scheduler_acompletion()'. Default is 30ms.
             default_priority: (Optional[int]): the default priority for a request. Only for '.scheduler_acompletion()'. Default is None.
             num_retries (Optional[int]): Number of retries for failed requests. Defaults to 2.
             timeout (Optional[float]): Timeout for requests. Defaults to None.
@@ -316,11 +342,14 @@ class Router:
             retry_after (int): Minimum time to wait before retrying a failed request. Defaults to 0.
             allowed_fails (Optional[int]): Number of allowed fails before adding to cooldown. Defaults to None.
             cooldown_time (float): Time to cooldown a deployment after failure in seconds. Defaults to 1.
-            routing_strategy (Literal["simple-shuffle", "least-busy", "usage-based-routing", "latency-based-routing", "cost-based-routing"]): Routing strategy. Defaults to "simple-shuffle".
+            routing_strategy (Literal["simple-shuffle", "least-busy", "usage-based-routing", "latency-based-routing", "cost-based-routing", "power-of-two-choices", "join-shortest-queue"]): Routing strategy. Defaults to "simple-shuffle".
             routing_strategy_args (dict): Additional args for latency-based routing. Defaults to {}.
             alerting_config (AlertingConfig): Slack alerting configuration. Defaults to None.
             provider_budget_config (ProviderBudgetConfig): Provider budget configuration. Use this to set llm_provider budget limits. example $100/day to OpenAI, $100/day to Azure, etc. Defaults to None.
             ignore_invalid_deployments (bool): Ignores invalid deployments, and continues with other deployments. Default is to raise an error.
+            hedging_config (Optional[HedgingConfig]): Send one backup request to a different deployment, when acompletion/aembedding calls are slower than the model group's p95 latency. Defaults to None (disabled).
+            adaptive_concurrency_config (Optional[AdaptiveConcurrencyConfig]): Discover each deployment's concurrency limit at runtime (AIMD on latency and 429s), instead of a fixed `max_parallel_requests`. Defaults to None (disabled).
+            request_coalescing_config (Optional[RequestCoalescingConfig]): Share one provider call between identical, concurrent acompletion/aembedding calls (same cache key). Defaults to None (disabled).
         Returns:
             Router: An instance of the litellm.Router class.
 
@@ -443,6 +472,33 @@ class Router:
         # Initialize model name to deployment indices mapping for O(1) lookups
         # Maps model_name -> list of indices in model_list
         self.model_name_to_deployment_indices: Dict[str, List[int]] = {}
+        # Precompiled per-model-group routing facts, invalidated on model list changes
+        self.routing_tables = RouterRoutingTables(llm_router_instance=self)
+        self.request_hedger: Optional[RequestHedger] = None
+        if hedging_config is not None:
+            self.request_hedger = RequestHedger(
+                llm_router_instance=self,
+                hedging_config=(
+                    HedgingConfig(**hedging_config)
+                    if isinstance(hedging_config, dict)
+                    else hedging_config
+                ),
+            )
+        self.adaptive_concurrency_config: Optional[AdaptiveConcurrencyConfig] = (
+            AdaptiveConcurrencyConfig(**adaptive_concurrency_config)
+            if isinstance(adaptive_concurrency_config, dict)
+            else adaptive_concurrency_config
+        )
+        self.adaptive_concurrency_limiters: Dict[str, AdaptiveConcurrencyLimiter] = {}
+        self.request_coalescer: Optional[RequestCoalescer] = None
+        if request_coalescing_config is not None:
+            self.request_coalescer = RequestCoalescer(
+                request_coalescing_config=(
+                    RequestCoalescingConfig(**request_coalescing_config)
+                    if isinstance(request_coalescing_config, dict)
+                    else request_coalescing_config
+                ),
+            )
 
         if model_list is not None:
             # set_model_list will build indices automatically
@@ -765,6 +821,19 @@ class Router:
             )
             if isinstance(litellm.callbacks, list):
                 litellm.logging_callback_manager.add_litellm_callback(self.lowestcost_logger)  # type: ignore
+        elif (
+            routing_strategy == RoutingStrategy.POWER_OF_TWO_CHOICES.value
+            or routing_strategy == RoutingStrategy.POWER_OF_TWO_CHOICES
+            or routing_strategy == RoutingStrategy.JOIN_SHORTEST_QUEUE.value
+            or routing_strategy == RoutingStrategy.JOIN_SHORTEST_QUEUE
+        ):
+            self.shortestqueue_logger = ShortestQueueLoggingHandler(
+                router_cache=self.cache,
+                routing_strategy=RoutingStrategy(routing_strategy).value,  # type: ignore
+                routing_args=routing_strategy_args,
+            )
+            if isinstance(litellm.callbacks, list):
+                litellm.logging_callback_manager.add_litellm_callback(self.shortestqueue_logger)  # type: ignore
         else:
             pass
 
@@ -1150,6 +1219,8 @@ class Router:
                     )
                 elif pre_call_check == "responses_api_deployment_check":
                     _callback = ResponsesApiDeploymentCheck()
+                elif pre_call_check == "prefix_affinity":
+                    _callback = PrefixAffinityDeploymentCheck()
                 if _callback is not None:
                     if self.optional_callbacks is None:
                         self.optional_callbacks = []
@@ -1318,7 +1389,9 @@ class Router:
             if request_priority is not None and isinstance(request_priority, int):
                 response = await self.schedule_acompletion(**kwargs)
             else:
-                response = await self.async_function_with_fallbacks(**kwargs)
+                response = await self._async_function_with_coalescing(
+                    call_type="acompletion", kwargs=kwargs
+                )
             end_time = time.time()
             _duration = end_time - start_time
             asyncio.create_task(
@@ -1568,7 +1641,7 @@ class Router:
                         logging_obj=logging_obj,
                         parent_otel_span=parent_otel_span,
                     )
-                    response = await _response
+                    response = await self._await_routed_call(_response, deployment)
             else:
                 await self.async_routing_strategy_pre_call_checks(
                     deployment=deployment,
@@ -1576,7 +1649,7 @@ class Router:
                     parent_otel_span=parent_otel_span,
                 )
 
-                response = await _response
+                response = await self._await_routed_call(_response, deployment)
 
             ## CHECK CONTENT FILTER ERROR ##
             if isinstance(response, ModelResponse):
@@ -2079,33 +2152,25 @@ class Router:
         item = FlowItem(
             priority=priority,  # 👈 SET PRIORITY FOR REQUEST
             request_id=_request_id,  # 👈 SET REQUEST ID
-            model_name="gpt-3.5-turbo",  # 👈 SAME as 'Router'
+            model_name=model,  # 👈 SAME as 'Router'
         )
         ### [fin] ###
 
         ## ADDS REQUEST TO QUEUE ##
         await self.scheduler.add_request(request=item)
 
-        ## POLL QUEUE
-        end_time = time.monotonic() + self.timeout
-        curr_time = time.monotonic()
-        poll_interval = self.scheduler.polling_interval  # poll every 3ms
-        make_request = False
-
-        while curr_time < end_time:
+        ## WAIT FOR TURN ## - returns 'True' if there's healthy deployments OR if request is at top of queue
+        async def _get_healthy_deployments() -> list:
             _healthy_deployments, _ = await self._async_get_healthy_deployments(
                 model=model, parent_otel_span=parent_otel_span
             )
-            make_request = await self.scheduler.poll(  ## POLL QUEUE ## - returns 'True' if there's healthy deployments OR if request is at top of queue
-                id=item.request_id,
-                model_name=item.model_name,
-                health_deployments=_healthy_deployments,
-            )
-            if make_request:  ## IF TRUE -> MAKE REQUEST
-                break
-            else:  ## ELSE -> loop till default_timeout
-                await asyncio.sleep(poll_interval)
-                curr_time = time.monotonic()
+            return _healthy_deployments
+
+        make_request = await self.scheduler.wait_for_turn(
+            request=item,
+            get_healthy_deployments=_get_healthy_deployments,
+            timeout=self.timeout,
+        )
 
         if make_request:
             try:
@@ -2120,9 +2185,12 @@ class Router:
             except Exception as e:
                 setattr(e, "priority", priority)
                 raise e
+            finally:
+                # deployment capacity freed up - wake up the next request in the queue
+                self.scheduler.notify(model_name=item.model_name)
         else:
             raise litellm.Timeout(
-                message="Request timed out while polling queue",
+                message="Request timed out while waiting in queue",
                 model=model,
                 llm_provider="openai",
             )
@@ -2148,26 +2216,18 @@ class Router:
         ## ADDS REQUEST TO QUEUE ##
         await self.scheduler.add_request(request=item)
 
-        ## POLL QUEUE
-        end_time = time.monotonic() + self.timeout
-        curr_time = time.monotonic()
-        poll_interval = self.scheduler.polling_interval  # poll every 3ms
-        make_request = False
-
-        while curr_time < end_time:
+        ## WAIT FOR TURN ## - returns 'True' if there's healthy deployments OR if request is at top of queue
+        async def _get_healthy_deployments() -> list:
             _healthy_deployments, _ = await self._async_get_healthy_deployments(
                 model=model, parent_otel_span=parent_otel_span
             )
-            make_request = await self.scheduler.poll(  ## POLL QUEUE ## - returns 'True' if there's healthy deployments OR if request is at top of queue
-                id=item.request_id,
-                model_name=item.model_name,
-                health_deployments=_healthy_deployments,
-            )
-            if make_request:  ## IF TRUE -> MAKE REQUEST
-                break
-            else:  ## ELSE -> loop till default_timeout
-                await asyncio.sleep(poll_interval)
-                curr_time = time.monotonic()
+            return _healthy_deployments
+
+        make_request = await self.scheduler.wait_for_turn(
+            request=item,
+            get_healthy_deployments=_get_healthy_deployments,
+            timeout=self.timeout,
+        )
 
         if make_request:
             try:
@@ -2181,9 +2241,12 @@ class Router:
             except Exception as e:
                 setattr(e, "priority", priority)
                 raise e
+            finally:
+                # deployment capacity freed up - wake up the next request in the queue
+                self.scheduler.notify(model_name=item.model_name)
         else:
             raise litellm.Timeout(
-                message="Request timed out while polling queue",
+                message="Request timed out while waiting in queue",
                 model=model,
                 llm_provider="openai",
             )
@@ -2424,12 +2487,12 @@ class Router:
                     await self.async_routing_strategy_pre_call_checks(
                         deployment=deployment, parent_otel_span=parent_otel_span
                     )
-                    response = await response
+                    response = await self._await_routed_call(response, deployment)
             else:
                 await self.async_routing_strategy_pre_call_checks(
                     deployment=deployment, parent_otel_span=parent_otel_span
                 )
-                response = await response
+                response = await self._await_routed_call(response, deployment)
 
             self.success_calls[model_name] += 1
             verbose_router_logger.info(
@@ -2536,12 +2599,12 @@ class Router:
                     await self.async_routing_strategy_pre_call_checks(
                         deployment=deployment, parent_otel_span=parent_otel_span
                     )
-                    response = await response
+                    response = await self._await_routed_call(response, deployment)
             else:
                 await self.async_routing_strategy_pre_call_checks(
                     deployment=deployment, parent_otel_span=parent_otel_span
                 )
-                response = await response
+                response = await self._await_routed_call(response, deployment)
 
             self.success_calls[model_name] += 1
             verbose_router_logger.info(
@@ -2830,12 +2893,12 @@ class Router:
                     await self.async_routing_strategy_pre_call_checks(
                         deployment=deployment, parent_otel_span=parent_otel_span
                     )
-                    response = await response
+                    response = await self._await_routed_call(response, deployment)
             else:
                 await self.async_routing_strategy_pre_call_checks(
                     deployment=deployment, parent_otel_span=parent_otel_span
                 )
-                response = await response
+                response = await self._await_routed_call(response, deployment)
 
             self.success_calls[model_name] += 1
             verbose_router_logger.info(
@@ -2929,12 +2992,12 @@ class Router:
                     await self.async_routing_strategy_pre_call_checks(
                         deployment=deployment, parent_otel_span=parent_otel_span
                     )
-                    response = await response  # type: ignore
+                    response = await self._await_routed_call(response, deployment)  # type: ignore
             else:
                 await self.async_routing_strategy_pre_call_checks(
                     deployment=deployment, parent_otel_span=parent_otel_span
                 )
-                response = await response  # type: ignore
+                response = await self._await_routed_call(response, deployment)  # type: ignore
 
             self.success_calls[model_name] += 1
             verbose_router_logger.info(
@@ -3193,12 +3256,12 @@ class Router:
                     await self.async_routing_strategy_pre_call_checks(
                         deployment=deployment, parent_otel_span=parent_otel_span
                     )
-                    response = await response  # type: ignore
+                    response = await self._await_routed_call(response, deployment)  # type: ignore
             else:
                 await self.async_routing_strategy_pre_call_checks(
                     deployment=deployment, parent_otel_span=parent_otel_span
                 )
-                response = await response  # type: ignore
+                response = await self._await_routed_call(response, deployment)  # type: ignore
 
             self.success_calls[model_name] += 1
             verbose_router_logger.info(
@@ -3367,7 +3430,9 @@ class Router:
             kwargs["input"] = input
             kwargs["original_function"] = self._aembedding
             self._update_kwargs_before_fallbacks(model=model, kwargs=kwargs)
-            response = await self.async_function_with_fallbacks(**kwargs)
+            response = await self._async_function_with_coalescing(
+                call_type="aembedding", kwargs=kwargs
+            )
             return response
         except Exception as e:
             asyncio.create_task(
@@ -3430,12 +3495,12 @@ class Router:
                     await self.async_routing_strategy_pre_call_checks(
                         deployment=deployment, parent_otel_span=parent_otel_span
                     )
-                    response = await response
+                    response = await self._await_routed_call(response, deployment)
             else:
                 await self.async_routing_strategy_pre_call_checks(
                     deployment=deployment, parent_otel_span=parent_otel_span
                 )
-                response = await response
+                response = await self._await_routed_call(response, deployment)
 
             self.success_calls[model_name] += 1
             verbose_router_logger.info(
@@ -3564,12 +3629,12 @@ class Router:
                         await self.async_routing_strategy_pre_call_checks(
                             deployment=deployment, parent_otel_span=parent_otel_span
                         )
-                        response = await response  # type: ignore
+                        response = await self._await_routed_call(response, deployment)  # type: ignore
                 else:
                     await self.async_routing_strategy_pre_call_checks(
                         deployment=deployment, parent_otel_span=parent_otel_span
                     )
-                    response = await response  # type: ignore
+                    response = await self._await_routed_call(response, deployment)  # type: ignore
 
                 self.success_calls[model_name] += 1
                 verbose_router_logger.info(
@@ -3697,12 +3762,12 @@ class Router:
                     await self.async_routing_strategy_pre_call_checks(
                         deployment=deployment, parent_otel_span=parent_otel_span
                     )
-                    response = await response  # type: ignore
+                    response = await self._await_routed_call(response, deployment)  # type: ignore
             else:
                 await self.async_routing_strategy_pre_call_checks(
                     deployment=deployment, parent_otel_span=parent_otel_span
                 )
-                response = await response  # type: ignore
+                response = await self._await_routed_call(response, deployment)  # type: ignore
 
             self.success_calls[model_name] += 1
             verbose_router_logger.info(
@@ -4471,6 +4536,20 @@ class Router:
 
         raise original_exception
 
+    async def _async_function_with_coalescing(self, call_type: str, kwargs: dict):
+        """
+        Call `async_function_with_fallbacks`, sharing the call with identical in-flight requests if request coalescing is enabled.
+        """
+        if self.request_coalescer is not None and self.request_coalescer.should_coalesce(
+            call_type=call_type, kwargs=kwargs
+        ):
+            return await self.request_coalescer.async_coalesced_call(
+                original_function=self.async_function_with_fallbacks,
+                call_type=call_type,
+                kwargs=kwargs,
+            )
+        return await self.async_function_with_fallbacks(**kwargs)
+
     @tracer.wrap()
     async def async_function_with_fallbacks(self, *args, **kwargs):
         """
@@ -4715,7 +4794,20 @@ class Router:
         Handler for making a call to the .completion()/.embeddings()/etc. functions.
         """
         model_group = kwargs.get("model")
-        response = original_function(*args, **kwargs)
+        if (
+            self.request_hedger is not None
+            and len(args) == 0
+            and original_function in (self._acompletion, self._aembedding)
+            and self.request_hedger.should_hedge(model_group=model_group, kwargs=kwargs)
+        ):
+            response = await self.request_hedger.async_hedged_call(
+                original_function=original_function,
+                model_group=model_group,  # type: ignore
+                metadata_variable_name="metadata",
+                kwargs=kwargs,
+            )
+        else:
+            response = original_function(*args, **kwargs)
         if coroutine_checker.is_async_callable(response) or inspect.isawaitable(
             response
         ):
@@ -5396,6 +5488,27 @@ class Router:
             if isinstance(_callback, CustomLogger):
                 _callback.pre_call_check(deployment)
 
+    async def _await_routed_call(self, response: Awaitable, deployment: dict):
+        """
+        Await the call made against `deployment`, after the routing strategy pre-call checks ran.
+
+        A cancelled call (e.g. a hedged call that lost, or a coalesced call no caller waits on anymore)
+        never reaches the success / failure callbacks, so the pre-call checks are released here instead.
+        """
+        try:
+            return await response
+        except asyncio.CancelledError:
+            self.routing_strategy_release_pre_call_checks(deployment=deployment)
+            raise
+
+    def routing_strategy_release_pre_call_checks(self, deployment: dict) -> None:
+        """
+        Undo the in-flight accounting of 'routing_strategy_pre_call_checks', for a call that ended without a
+        success / failure event.
+        """
+        if self.shortestqueue_logger is not None:
+            self.shortestqueue_logger.release_pre_call_check(deployment)
+
     async def async_routing_strategy_pre_call_checks(
         self,
         deployment: dict,
@@ -5718,6 +5831,7 @@ class Router:
         self.model_list = []
         self.model_id_to_deployment_index_map = {}  # Reset the index
         self.model_name_to_deployment_indices = {}  # Reset the model_name index
+        self.routing_tables.invalidate()
         # we add api_base/api_key each model so load balancing between azure/gpt on api_base1 and api_base2 works
 
         for model in original_model_list:
@@ -5984,6 +6098,7 @@ class Router:
         # Remove the deleted model from index
         if model_id in self.model_id_to_deployment_index_map:
             del self.model_id_to_deployment_index_map[model_id]
+        self.routing_tables.invalidate()
 
         # Update model_name_to_deployment_indices
         for model_name, indices in list(self.model_name_to_deployment_indices.items()):
@@ -6017,6 +6132,7 @@ class Router:
         """
         idx = len(self.model_list)
         self.model_list.append(model)
+        self.routing_tables.invalidate()
 
         # Update model_id index for O(1) lookup
         if model_id is not None:
@@ -6830,6 +6946,7 @@ class Router:
         """
         # First populate the model_list
         self.model_list = []
+        self.routing_tables.invalidate()
         for _, model in enumerate(model_list):
             # Extract model_info from the model dict
             model_info = model.get("model_info", {})
@@ -7410,41 +7527,65 @@ class Router:
             )
             or {}
         )  # check the in-memory cache used by lowest_latency and usage-based routing. Only check the local cache.
+        # precompiled context windows / regions / supported params for this model group
+        routing_table = self.routing_tables.get_table(model)
         for idx, deployment in enumerate(_returned_deployments):
             # Cache nested dict access to avoid repeated temporary dict allocations
             _litellm_params = deployment.get("litellm_params", {})
             _model_info = deployment.get("model_info", {})
+            table_position = (
+                routing_table.get_position(deployment)
+                if routing_table is not None
+                else None
+            )
 
             # see if we have the info for this model
             try:
-                base_model = _model_info.get("base_model", None)
-                if base_model is None:
-                    base_model = _litellm_params.get("base_model", None)
-                model_info = self.get_router_model_info(
-                    deployment=deployment, received_model_name=model
-                )
-                model = base_model or _litellm_params.get("model", None)
-
-                if (
-                    isinstance(model_info, dict)
-                    and model_info.get("max_input_tokens", None) is not None
-                ):
-                    if (
-                        isinstance(model_info["max_input_tokens"], int)
-                        and input_tokens > model_info["max_input_tokens"]
-                    ):
+                if routing_table is not None and table_position is not None:
+                    model = routing_table.resolved_models[table_position] or model
+                    max_input_tokens = routing_table.max_input_tokens[table_position]
+                    if max_input_tokens is not None and input_tokens > max_input_tokens:
                         invalid_model_indices.add(idx)
                         _context_window_error = True
                         _potential_error_str += (
                             "Model={}, Max Input Tokens={}, Got={}".format(
-                                model, model_info["max_input_tokens"], input_tokens
+                                model, max_input_tokens, input_tokens
                             )
                         )
                         continue
+                else:
+                    base_model = _model_info.get("base_model", None)
+                    if base_model is None:
+                        base_model = _litellm_params.get("base_model", None)
+                    model_info = self.get_router_model_info(
+                        deployment=deployment, received_model_name=model
+                    )
+                    model = base_model or _litellm_params.get("model", None)
+
+                    if (
+                        isinstance(model_info, dict)
+                        and model_info.get("max_input_tokens", None) is not None
+                    ):
+                        if (
+                            isinstance(model_info["max_input_tokens"], int)
+                            and input_tokens > model_info["max_input_tokens"]
+                        ):
+                            invalid_model_indices.add(idx)
+                            _context_window_error = True
+                            _potential_error_str += (
+                                "Model={}, Max Input Tokens={}, Got={}".format(
+                                    model, model_info["max_input_tokens"], input_tokens
+                                )
+                            )
+                            continue
             except Exception as e:
                 verbose_router_logger.exception("An error occurs - {}".format(str(e)))
 
-            model_id = _model_info.get("id", "")
+            model_id = (
+                routing_table.model_ids[table_position]
+                if routing_table is not None and table_position is not None
+                else _model_info.get("id", "")
+            )
             ## RPM CHECK ##
             ### get local router cache ###
             current_request_cache_local = (
@@ -7464,17 +7605,18 @@ class Router:
                     current_request_cache_local, model_group_cache[model_id]
                 )
 
-                if (
-                    isinstance(_litellm_params, dict)
-                    and _litellm_params.get("rpm", None) is not None
-                ):
-                    if (
-                        isinstance(_litellm_params["rpm"], int)
-                        and _litellm_params["rpm"] <= current_request
-                    ):
-                        invalid_model_indices.add(idx)
-                        _rate_limit_error = True
-                        continue
+                if routing_table is not None and table_position is not None:
+                    rpm_limit = routing_table.rpm_limits[table_position]
+                else:
+                    rpm_limit = (
+                        _litellm_params.get("rpm", None)
+                        if isinstance(_litellm_params, dict)
+                        else None
+                    )
+                if isinstance(rpm_limit, int) and rpm_limit <= current_request:
+                    invalid_model_indices.add(idx)
+                    _rate_limit_error = True
+                    continue
 
             ## REGION CHECK ##
             if (
@@ -7484,23 +7626,36 @@ class Router:
                 allowed_model_region = request_kwargs.get("allowed_model_region")
 
                 if allowed_model_region is not None:
-                    if not is_region_allowed(
-                        litellm_params=LiteLLM_Params(**_litellm_params),
-                        allowed_model_region=allowed_model_region,
-                    ):
+                    if routing_table is not None and table_position is not None:
+                        region_allowed = (
+                            routing_table.regions[table_position]
+                            == allowed_model_region
+                        )
+                    else:
+                        region_allowed = is_region_allowed(
+                            litellm_params=LiteLLM_Params(**_litellm_params),
+                            allowed_model_region=allowed_model_region,
+                        )
+                    if not region_allowed:
                         invalid_model_indices.add(idx)
                         continue
 
             ## INVALID PARAMS ## -> catch 'gpt-3.5-turbo-16k' not supporting 'response_format' param
             if request_kwargs is not None and litellm.drop_params is False:
                 # get supported params
-                model, custom_llm_provider, _, _ = litellm.get_llm_provider(
-                    model=model, litellm_params=LiteLLM_Params(**_litellm_params)
-                )
+                supported_openai_params: Optional[Iterable[str]]
+                if routing_table is not None and table_position is not None:
+                    supported_openai_params = (
+                        routing_table.get_supported_openai_params(table_position)
+                    )
+                else:
+                    model, custom_llm_provider, _, _ = litellm.get_llm_provider(
+                        model=model, litellm_params=LiteLLM_Params(**_litellm_params)
+                    )
 
-                supported_openai_params = litellm.get_supported_openai_params(
-                    model=model, custom_llm_provider=custom_llm_provider
-                )
+                    supported_openai_params = litellm.get_supported_openai_params(
+                        model=model, custom_llm_provider=custom_llm_provider
+                    )
 
                 if supported_openai_params is None:
                     continue
@@ -7758,6 +7913,15 @@ class Router:
             cooldown_deployments=cooldown_deployments,
         )
 
+        if (
+            self.adaptive_concurrency_config is not None
+            and self.adaptive_concurrency_config.reroute_when_saturated
+        ):
+            healthy_deployments = filter_saturated_deployments(
+                litellm_router_instance=self,
+                healthy_deployments=healthy_deployments,
+            )
+
         healthy_deployments = await self.async_callback_filter_deployments(
             model=model,
             healthy_deployments=healthy_deployments,
@@ -7907,6 +8071,16 @@ class Router:
                         healthy_deployments=healthy_deployments,  # type: ignore
                     )
                 )
+            elif (
+                self.routing_strategy in ("power-of-two-choices", "join-shortest-queue")
+                and self.shortestqueue_logger is not None
+            ):
+                deployment = (
+                    await self.shortestqueue_logger.async_get_available_deployments(
+                        model_group=model,
+                        healthy_deployments=healthy_deployments,  # type: ignore
+                    )
+                )
             else:
                 deployment = None
             if deployment is None:
@@ -8079,6 +8253,14 @@ class Router:
                 messages=messages,
                 input=input,
             )
+        elif (
+            self.routing_strategy in ("power-of-two-choices", "join-shortest-queue")
+            and self.shortestqueue_logger is not None
+        ):
+            deployment = self.shortestqueue_logger.get_available_deployments(
+                model_group=model,
+                healthy_deployments=healthy_deployments,  # type: ignore
+            )
         else:
             deployment = None
 
@@ -8243,6 +8425,7 @@ class Router:
     def flush_cache(self):
         litellm.cache = None
         self.cache.flush_cache()
+        self.cooldown_cache.cooldown_index.flush()
 
     def reset(self):
         ## clean up on close
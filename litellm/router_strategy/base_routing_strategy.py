@@ -29,6 +29,10 @@ class BaseRoutingStrategy(ABC):
             str
         ] = set()  # Set with max size of 1000 keys
 
+        # keys read by the routing hot path since the last sync -> ttl
+        # refreshed from redis in one batched read on every sync
+        self.keys_to_refresh: Dict[str, int] = {}
+
     def setup_sync_task(self, default_sync_interval: Optional[Union[int, float]]):
         """Setup the sync task in a way that's compatible with FastAPI"""
         try:
@@ -192,6 +196,62 @@ class BaseRoutingStrategy(ABC):
     def reset_in_memory_keys_to_update(self):
         self.in_memory_keys_to_update = set()
 
+    def add_to_keys_to_refresh(self, keys: List[str], ttl: int):
+        """
+        Register keys read from the local mirror, so the next sync refreshes them from redis.
+        """
+        for key in keys:
+            self.keys_to_refresh[key] = ttl
+
+    def get_and_reset_keys_to_refresh(self) -> Dict[str, int]:
+        """Atomic get and reset keys to refresh"""
+        keys = self.keys_to_refresh
+        self.keys_to_refresh = {}
+        return keys
+
+    async def _refresh_keys_from_redis(self, keys_to_skip: Set[str]):
+        """
+        Pull the latest redis values for all keys read since the last sync, in a single `mget`.
+
+        - Keys in `keys_to_skip` already got their redis value back from the increment pipeline
+        - Keys with increments still queued are skipped, the in-memory value is ahead of redis for those
+        - The in-memory value is only ever raised, never lowered, so concurrent local increments are kept
+        """
+        if self.dual_cache.redis_cache is None:
+            return
+
+        keys_to_refresh = self.get_and_reset_keys_to_refresh()
+        if len(keys_to_refresh) == 0:
+            return
+
+        pending_keys = {op["key"] for op in self.redis_increment_operation_queue}
+        key_list = [
+            key
+            for key in keys_to_refresh
+            if key not in keys_to_skip and key not in pending_keys
+        ]
+        if len(key_list) == 0:
+            return
+
+        redis_values = await self.dual_cache.redis_cache.async_batch_get_cache(
+            key_list=key_list
+        )
+        if not redis_values:
+            return
+
+        # increments may have been queued while waiting on redis
+        pending_keys = {op["key"] for op in self.redis_increment_operation_queue}
+        for key, redis_val in redis_values.items():
+            if redis_val is None or key in pending_keys:
+                continue
+            local_val = float(
+                await self.dual_cache.in_memory_cache.async_get_cache(key=key) or 0
+            )
+            if float(redis_val) > local_val:
+                await self.dual_cache.in_memory_cache.async_set_cache(
+                    key=key, value=float(redis_val), ttl=keys_to_refresh[key]
+                )
+
     async def _sync_in_memory_spend_with_redis(self):
         """
         Ensures in-memory cache is updated with latest Redis values for all provider spends.
@@ -203,6 +263,7 @@ class BaseRoutingStrategy(ABC):
         What this does:
         1. Push all provider spend increments to Redis
         2. Fetch all current provider spend from Redis to update in-memory cache
+        3. Refresh keys read by the routing hot path (see `add_to_keys_to_refresh`) in one batched read
         """
 
         try:
@@ -230,6 +291,7 @@ class BaseRoutingStrategy(ABC):
             # 1. Push all provider spend increments to Redis
             redis_values = await self._push_in_memory_increments_to_redis()
             if redis_values is None:
+                await self._refresh_keys_from_redis(keys_to_skip=set())
                 return
 
             # 4. Merge
@@ -255,6 +317,9 @@ class BaseRoutingStrategy(ABC):
                     key=key, value=merged
                 )
 
+            # 5. Refresh keys read since the last sync, that were not just pushed
+            await self._refresh_keys_from_redis(keys_to_skip=set(redis_values.keys()))
+
         except Exception as e:
             verbose_router_logger.exception(
                 f"Error syncing in-memory cache with Redis: {str(e)}"
@@ -1,8 +1,9 @@
 #### What this does ####
 #   picks based on response time (for streaming, this is time to first token)
 import random
+import time
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional, Tuple, Union
 
 import litellm
 from litellm import ModelResponse, token_counter, verbose_logger
@@ -24,6 +25,49 @@ class RoutingArgs(LiteLLMPydanticObjectBase):
     ttl: float = 1 * 60 * 60  # 1 hour
     lowest_latency_buffer: float = 0
     max_latency_list_size: int = 10
+    latency_statistic: Literal["mean", "ewma", "p50", "p90", "p95", "p99"] = "mean"
+    ewma_alpha: float = 0.3  # weight of the newest sample when latency_statistic="ewma"
+    latency_sync_interval: float = 0  # min seconds between writes of the latency map to redis. 0 = write on every request
+
+
+def _add_latency_sample(samples: list, value: Any, max_size: int) -> None:
+    """
+    Append to a fixed-size ring of samples in place - the oldest samples are dropped first.
+    """
+    samples.append(value)
+    overflow = len(samples) - max_size
+    if overflow > 0:
+        del samples[:overflow]
+
+
+def get_latency_statistic(
+    samples: List[Any],
+    statistic: str = "mean",
+    ewma_alpha: float = 0.3,
+) -> float:
+    """
+    Summarize a deployment's latency samples (oldest first).
+
+    - "mean": average over all samples (non-float samples count as 0)
+    - "ewma": exponentially weighted moving average, newest samples weigh most
+    - "p50"/"p90"/"p95"/"p99": nearest-rank percentile
+    """
+    if len(samples) == 0:
+        return 0.0
+    values = [v for v in samples if isinstance(v, float)]
+    if statistic == "mean":
+        return sum(values) / len(samples)
+    if len(values) == 0:
+        return 0.0
+    if statistic == "ewma":
+        ewma = values[0]
+        for value in values[1:]:
+            ewma = ewma_alpha * value + (1 - ewma_alpha) * ewma
+        return ewma
+    percentile = float(statistic[1:])
+    sorted_values = sorted(values)
+    rank = max(int(-(-percentile * len(sorted_values) // 100)), 1)  # ceil
+    return sorted_values[rank - 1]
 
 
 class LowestLatencyLoggingHandler(CustomLogger):
@@ -36,10 +80,125 @@ class LowestLatencyLoggingHandler(CustomLogger):
     ):
         self.router_cache = router_cache
         self.routing_args = RoutingArgs(**routing_args)
+        self._last_shared_cache_write: Dict[str, float] = {}
 
-    def log_success_event(  # noqa: PLR0915
-        self, kwargs, response_obj, start_time, end_time
-    ):
+    def _should_write_to_shared_cache(self, latency_key: str) -> bool:
+        """
+        Coalesce writes of the latency map to redis to at most one per `latency_sync_interval`.
+
+        In between, updates only land in the in-memory cache.
+        """
+        if self.routing_args.latency_sync_interval <= 0:
+            return True
+        current_time = time.time()
+        last_write = self._last_shared_cache_write.get(latency_key, 0.0)
+        if current_time - last_write >= self.routing_args.latency_sync_interval:
+            self._last_shared_cache_write[latency_key] = current_time
+            return True
+        return False
+
+    def _get_latency_values(
+        self, kwargs: dict, response_obj: Any, start_time: Any, end_time: Any
+    ) -> Tuple[Union[float, timedelta], Optional[float], int]:
+        """
+        Returns (latency per output token, time to first token per output token, total tokens).
+        """
+        response_ms = end_time - start_time
+        time_to_first_token_response_time = None
+
+        if kwargs.get("stream", None) is not None and kwargs["stream"] is True:
+            # only log ttft for streaming request
+            time_to_first_token_response_time = (
+                kwargs.get("completion_start_time", end_time) - start_time
+            )
+
+        final_value: Union[float, timedelta] = response_ms
+        time_to_first_token: Optional[float] = None
+        total_tokens = 0
+
+        if isinstance(response_obj, ModelResponse):
+            _usage = getattr(response_obj, "usage", None)
+            if _usage is not None:
+                completion_tokens = _usage.completion_tokens
+                total_tokens = _usage.total_tokens
+
+                # Handle both timedelta and float response times
+                if isinstance(response_ms, timedelta):
+                    response_seconds = response_ms.total_seconds()
+                else:
+                    response_seconds = response_ms
+
+                latency_per_token = safe_divide_seconds(
+                    response_seconds, completion_tokens
+                )
+                final_value = (
+                    float(latency_per_token)
+                    if latency_per_token is not None
+                    else response_seconds
+                )
+
+                if time_to_first_token_response_time is not None:
+                    if isinstance(time_to_first_token_response_time, timedelta):
+                        ttft_seconds = time_to_first_token_response_time.total_seconds()
+                    else:
+                        ttft_seconds = time_to_first_token_response_time
+                    time_to_first_token = safe_divide_seconds(
+                        ttft_seconds, completion_tokens
+                    )
+        return final_value, time_to_first_token, total_tokens
+
+    def _update_latency_map(
+        self,
+        request_count_dict: dict,
+        id: str,
+        final_value: Union[float, timedelta],
+        time_to_first_token: Optional[float],
+        total_tokens: int,
+    ) -> dict:
+        """
+        Record a successful call in the `{model_group}_map` dict (mutated in place).
+
+        {
+            id: {
+                "latency": [..],  # ring of the last `max_latency_list_size` samples
+                "time_to_first_token": [..],
+                f"{date:hour:minute}" : {"tpm": 34, "rpm": 3}
+            }
+        }
+        """
+        current_date = datetime.now().strftime("%Y-%m-%d")
+        current_hour = datetime.now().strftime("%H")
+        current_minute = datetime.now().strftime("%M")
+        precise_minute = f"{current_date}-{current_hour}-{current_minute}"
+
+        deployment_map = request_count_dict.setdefault(id, {})
+
+        ## Latency
+        _add_latency_sample(
+            samples=deployment_map.setdefault("latency", []),
+            value=final_value,
+            max_size=self.routing_args.max_latency_list_size,
+        )
+
+        ## Time to first token
+        if time_to_first_token is not None:
+            _add_latency_sample(
+                samples=deployment_map.setdefault("time_to_first_token", []),
+                value=time_to_first_token,
+                max_size=self.routing_args.max_latency_list_size,
+            )
+
+        minute_usage = deployment_map.setdefault(precise_minute, {})
+
+        ## TPM
+        minute_usage["tpm"] = minute_usage.get("tpm", 0) + total_tokens
+
+        ## RPM
+        minute_usage["rpm"] = minute_usage.get("rpm", 0) + 1
+
+        return request_count_dict
+
+    def log_success_event(self, kwargs, response_obj, start_time, end_time):
         try:
             """
             Update latency usage on success
@@ -58,65 +217,15 @@ class LowestLatencyLoggingHandler(CustomLogger):
                 elif isinstance(id, int):
                     id = str(id)
 
-                # ------------
-                # Setup values
-                # ------------
-                """
-                {
-                    {model_group}_map: {
-                        id: {
-                            "latency": [..]
-                            f"{date:hour:minute}" : {"tpm": 34, "rpm": 3}
-                        }
-                    }
-                }
-                """
                 latency_key = f"{model_group}_map"
-
-                current_date = datetime.now().strftime("%Y-%m-%d")
-                current_hour = datetime.now().strftime("%H")
-                current_minute = datetime.now().strftime("%M")
-                precise_minute = f"{current_date}-{current_hour}-{current_minute}"
-
-                response_ms = end_time - start_time
-                time_to_first_token_response_time = None
-
-                if kwargs.get("stream", None) is not None and kwargs["stream"] is True:
-                    # only log ttft for streaming request
-                    time_to_first_token_response_time = (
-                        kwargs.get("completion_start_time", end_time) - start_time
+                final_value, time_to_first_token, total_tokens = (
+                    self._get_latency_values(
+                        kwargs=kwargs,
+                        response_obj=response_obj,
+                        start_time=start_time,
+                        end_time=end_time,
                     )
-
-                final_value: Union[float, timedelta] = response_ms
-                time_to_first_token: Optional[float] = None
-                total_tokens = 0
-
-                if isinstance(response_obj, ModelResponse):
-                    _usage = getattr(response_obj, "usage", None)
-                    if _usage is not None:
-                        completion_tokens = _usage.completion_tokens
-                        total_tokens = _usage.total_tokens
-                        
-                        # Handle both timedelta and float response times
-                        if isinstance(response_ms, timedelta):
-                            response_seconds = response_ms.total_seconds()
-                        else:
-                            response_seconds = response_ms
-                            
-                        final_value = safe_divide_seconds(response_seconds, completion_tokens)
-                        if final_value is not None:
-                            final_value = float(final_value)
-                        else:
-                            final_value = response_seconds
-
-                        if time_to_first_token_response_time is not None:
-                            if isinstance(time_to_first_token_response_time, timedelta):
-                                ttft_seconds = time_to_first_token_response_time.total_seconds()
-                            else:
-                                ttft_seconds = time_to_first_token_response_time
-                            time_to_first_token = safe_divide_seconds(
-                                ttft_seconds, completion_tokens
-                            )
+                )
 
                 # ------------
                 # Update usage
@@ -128,54 +237,19 @@ class LowestLatencyLoggingHandler(CustomLogger):
                     )
                     or {}
                 )
-
-                if id not in request_count_dict:
-                    request_count_dict[id] = {}
-
-                ## Latency
-                if (
-                    len(request_count_dict[id].get("latency", []))
-                    < self.routing_args.max_latency_list_size
-                ):
-                    request_count_dict[id].setdefault("latency", []).append(final_value)
-                else:
-                    request_count_dict[id]["latency"] = request_count_dict[id][
-                        "latency"
-                    ][: self.routing_args.max_latency_list_size - 1] + [final_value]
-
-                ## Time to first token
-                if time_to_first_token is not None:
-                    if (
-                        len(request_count_dict[id].get("time_to_first_token", []))
-                        < self.routing_args.max_latency_list_size
-                    ):
-                        request_count_dict[id].setdefault(
-                            "time_to_first_token", []
-                        ).append(time_to_first_token)
-                    else:
-                        request_count_dict[id][
-                            "time_to_first_token"
-                        ] = request_count_dict[id]["time_to_first_token"][
-                            : self.routing_args.max_latency_list_size - 1
-                        ] + [
-                            time_to_first_token
-                        ]
-
-                if precise_minute not in request_count_dict[id]:
-                    request_count_dict[id][precise_minute] = {}
-
-                ## TPM
-                request_count_dict[id][precise_minute]["tpm"] = (
-                    request_count_dict[id][precise_minute].get("tpm", 0) + total_tokens
-                )
-
-                ## RPM
-                request_count_dict[id][precise_minute]["rpm"] = (
-                    request_count_dict[id][precise_minute].get("rpm", 0) + 1
+                self._update_latency_map(
+                    request_count_dict=request_count_dict,
+                    id=id,
+                    final_value=final_value,
+                    time_to_first_token=time_to_first_token,
+                    total_tokens=total_tokens,
                 )
 
                 self.router_cache.set_cache(
-                    key=latency_key, value=request_count_dict, ttl=self.routing_args.ttl
+                    key=latency_key,
+                    value=request_count_dict,
+                    ttl=self.routing_args.ttl,
+                    local_only=not self._should_write_to_shared_cache(latency_key),
                 )  # reset map within window
 
                 ### TESTING ###
@@ -183,7 +257,7 @@ class LowestLatencyLoggingHandler(CustomLogger):
                     self.logged_success += 1
         except Exception as e:
             verbose_logger.exception(
-                "litellm.proxy.hooks.prompt_injection_detection.py::async_pre_call_hook(): Exception occured - {}".format(
+                "litellm.router_strategy.lowest_latency.py::log_success_event(): Exception occured - {}".format(
                     str(e)
                 )
             )
@@ -232,15 +306,11 @@ class LowestLatencyLoggingHandler(CustomLogger):
                         request_count_dict[id] = {}
 
                     ## Latency - give 1000s penalty for failing
-                    if (
-                        len(request_count_dict[id].get("latency", []))
-                        < self.routing_args.max_latency_list_size
-                    ):
-                        request_count_dict[id].setdefault("latency", []).append(1000.0)
-                    else:
-                        request_count_dict[id]["latency"] = request_count_dict[id][
-                            "latency"
-                        ][: self.routing_args.max_latency_list_size - 1] + [1000.0]
+                    _add_latency_sample(
+                        samples=request_count_dict[id].setdefault("latency", []),
+                        value=1000.0,
+                        max_size=self.routing_args.max_latency_list_size,
+                    )
 
                     await self.router_cache.async_set_cache(
                         key=latency_key,
@@ -258,7 +328,7 @@ class LowestLatencyLoggingHandler(CustomLogger):
             )
             pass
 
-    async def async_log_success_event(  # noqa: PLR0915
+    async def async_log_success_event(
         self, kwargs, response_obj, start_time, end_time
     ):
         try:
@@ -279,65 +349,16 @@ class LowestLatencyLoggingHandler(CustomLogger):
                 elif isinstance(id, int):
                     id = str(id)
 
-                # ------------
-                # Setup values
-                # ------------
-                """
-                {
-                    {model_group}_map: {
-                        id: {
-                            "latency": [..]
-                            "time_to_first_token": [..]
-                            f"{date:hour:minute}" : {"tpm": 34, "rpm": 3}
-                        }
-                    }
-                }
-                """
                 latency_key = f"{model_group}_map"
-
-                current_date = datetime.now().strftime("%Y-%m-%d")
-                current_hour = datetime.now().strftime("%H")
-                current_minute = datetime.now().strftime("%M")
-                precise_minute = f"{current_date}-{current_hour}-{current_minute}"
-
-                response_ms = end_time - start_time
-                time_to_first_token_response_time = None
-                if kwargs.get("stream", None) is not None and kwargs["stream"] is True:
-                    # only log ttft for streaming request
-                    time_to_first_token_response_time = (
-                        kwargs.get("completion_start_time", end_time) - start_time
+                final_value, time_to_first_token, total_tokens = (
+                    self._get_latency_values(
+                        kwargs=kwargs,
+                        response_obj=response_obj,
+                        start_time=start_time,
+                        end_time=end_time,
                     )
+                )
 
-                final_value: Union[float, timedelta] = response_ms
-                total_tokens = 0
-                time_to_first_token: Optional[float] = None
-
-                if isinstance(response_obj, ModelResponse):
-                    _usage = getattr(response_obj, "usage", None)
-                    if _usage is not None:
-                        completion_tokens = _usage.completion_tokens
-                        total_tokens = _usage.total_tokens
-                        
-                        # Handle both timedelta and float response times
-                        if isinstance(response_ms, timedelta):
-                            response_seconds = response_ms.total_seconds()
-                        else:
-                            response_seconds = response_ms
-                            
-                        final_value = safe_divide_seconds(response_seconds, completion_tokens)
-                        if final_value is not None:
-                            final_value = float(final_value)
-                        else:
-                            final_value = response_ms
-
-                        if time_to_first_token_response_time is not None:
-                            if isinstance(time_to_first_token_response_time, timedelta):
-                                ttft_seconds = time_to_first_token_response_time.total_seconds()
-                            else:
-                                ttft_seconds = time_to_first_token_response_time
-                            time_to_first_token = safe_divide_seconds(
-                                ttft_seconds, completion_tokens
-                            )
                 # ------------
                 # Update usage
                 # ------------
@@ -350,54 +371,19 @@ class LowestLatencyLoggingHandler(CustomLogger):
                     )
                     or {}
                 )
-
-                if id not in request_count_dict:
-                    request_count_dict[id] = {}
-
-                ## Latency
-                if (
-                    len(request_count_dict[id].get("latency", []))
-                    < self.routing_args.max_latency_list_size
-                ):
-                    request_count_dict[id].setdefault("latency", []).append(final_value)
-                else:
-                    request_count_dict[id]["latency"] = request_count_dict[id][
-                        "latency"
-                    ][: self.routing_args.max_latency_list_size - 1] + [final_value]
-
-                ## Time to first token
-                if time_to_first_token is not None:
-                    if (
-                        len(request_count_dict[id].get("time_to_first_token", []))
-                        < self.routing_args.max_latency_list_size
-                    ):
-                        request_count_dict[id].setdefault(
-                            "time_to_first_token", []
-                        ).append(time_to_first_token)
-                    else:
-                        request_count_dict[id][
-                            "time_to_first_token"
-                        ] = request_count_dict[id]["time_to_first_token"][
-                            : self.routing_args.max_latency_list_size - 1
-                        ] + [
-                            time_to_first_token
-                        ]
-
-                if precise_minute not in request_count_dict[id]:
-                    request_count_dict[id][precise_minute] = {}
-
-                ## TPM
-                request_count_dict[id][precise_minute]["tpm"] = (
-                    request_count_dict[id][precise_minute].get("tpm", 0) + total_tokens
-                )
-
-                ## RPM
-                request_count_dict[id][precise_minute]["rpm"] = (
-                    request_count_dict[id][precise_minute].get("rpm", 0) + 1
+                self._update_latency_map(
+                    request_count_dict=request_count_dict,
+                    id=id,
+                    final_value=final_value,
+                    time_to_first_token=time_to_first_token,
+                    total_tokens=total_tokens,
                 )
 
                 await self.router_cache.async_set_cache(
-                    key=latency_key, value=request_count_dict, ttl=self.routing_args.ttl
+                    key=latency_key,
+                    value=request_count_dict,
+                    ttl=self.routing_args.ttl,
+                    local_only=not self._should_write_to_shared_cache(latency_key),
                 )  # reset map within window
 
                 ### TESTING ###
@@ -488,22 +474,24 @@ class LowestLatencyLoggingHandler(CustomLogger):
             item_rpm = item_map.get(precise_minute, {}).get("rpm", 0)
             item_tpm = item_map.get(precise_minute, {}).get("tpm", 0)
 
-            # get average latency or average ttft (depending on streaming/non-streaming)
-            total: float = 0.0
+            # get latency statistic of ttft or latency (depending on streaming/non-streaming)
             if (
                 request_kwargs is not None
                 and request_kwargs.get("stream", None) is not None
                 and request_kwargs["stream"] is True
                 and len(item_ttft_latency) > 0
             ):
-                for _call_latency in item_ttft_latency:
-                    if isinstance(_call_latency, float):
-                        total += _call_latency
+                item_latency = get_latency_statistic(
+                    samples=item_ttft_latency,
+                    statistic=self.routing_args.latency_statistic,
+                    ewma_alpha=self.routing_args.ewma_alpha,
+                )
             else:
-                for _call_latency in item_latency:
-                    if isinstance(_call_latency, float):
-                        total += _call_latency
-            item_latency = total / len(item_latency)
+                item_latency = get_latency_statistic(
+                    samples=item_latency,
+                    statistic=self.routing_args.latency_statistic,
+                    ewma_alpha=self.routing_args.ewma_alpha,
+                )
 
             # -------------- #
             # Debugging Logic
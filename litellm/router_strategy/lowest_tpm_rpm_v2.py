@@ -1,7 +1,7 @@
 #### What this does ####
 #   identifies lowest tpm deployment
 import random
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 
 import httpx
 
@@ -10,7 +10,6 @@ from litellm import token_counter
 from litellm._logging import verbose_logger, verbose_router_logger
 from litellm.caching.caching import DualCache
 from litellm.integrations.custom_logger import CustomLogger
-from litellm.litellm_core_utils.core_helpers import _get_parent_otel_span_from_kwargs
 from litellm.types.router import RouterErrors
 from litellm.types.utils import LiteLLMPydanticObjectBase, StandardLoggingPayload
 from litellm.utils import get_utc_datetime, print_verbose
@@ -37,9 +36,9 @@ class LowestTPMLoggingHandler_v2(BaseRoutingStrategy, CustomLogger):
 
     Caches individual models, not model_groups
 
-    Uses batch get (redis.mget)
+    Async routing reads tpm/rpm from the in-memory mirror, refreshed from redis via batch get (redis.mget) on every sync
 
-    Increments tpm/rpm limit using redis.incr
+    Async increments are coalesced in memory and pushed to redis in a single pipeline on every sync
     """
 
     test_flag: bool = False
@@ -306,13 +305,11 @@ class LowestTPMLoggingHandler_v2(BaseRoutingStrategy, CustomLogger):
             # Update usage
             # ------------
             # update cache
-            parent_otel_span = _get_parent_otel_span_from_kwargs(kwargs)
-            ## TPM
-            await self.router_cache.async_increment_cache(
+            ## TPM - incremented in memory, pushed to redis in the next batched sync
+            await self._increment_value_in_current_window(
                 key=tpm_key,
                 value=total_tokens,
                 ttl=self.routing_args.ttl,
-                parent_otel_span=parent_otel_span,
             )
 
             ### TESTING ###
@@ -442,6 +439,29 @@ class LowestTPMLoggingHandler_v2(BaseRoutingStrategy, CustomLogger):
         else:
             return None
 
+    async def _async_get_mirrored_tpm_rpm_values(
+        self, tpm_keys: List[str], rpm_keys: List[str]
+    ) -> Tuple[Optional[list], Optional[list]]:
+        """
+        Returns the (tpm values, rpm values) of the keys - [1, 2, None, ..], or (None, None).
+
+        Read from the local mirror only - no redis round-trip on the routing path. The periodic sync refreshes these
+        keys from redis in one batched read, so staleness is bounded by the sync interval.
+        """
+        combined_tpm_rpm_keys = tpm_keys + rpm_keys
+        combined_tpm_rpm_values = await self.router_cache.async_batch_get_cache(
+            keys=combined_tpm_rpm_keys, local_only=True
+        )
+        self.add_to_keys_to_refresh(
+            keys=combined_tpm_rpm_keys, ttl=self.routing_args.ttl
+        )
+        if combined_tpm_rpm_values is None:
+            return None, None
+        return (
+            combined_tpm_rpm_values[: len(tpm_keys)],
+            combined_tpm_rpm_values[len(tpm_keys) :],
+        )
+
     async def async_get_available_deployments(
         self,
         model_group: str,
@@ -476,18 +496,9 @@ class LowestTPMLoggingHandler_v2(BaseRoutingStrategy, CustomLogger):
                 tpm_keys.append(tpm_key)
                 rpm_keys.append(rpm_key)
 
-        combined_tpm_rpm_keys = tpm_keys + rpm_keys
-
-        combined_tpm_rpm_values = await self.router_cache.async_batch_get_cache(
-            keys=combined_tpm_rpm_keys
-        )  # [1, 2, None, ..]
-
-        if combined_tpm_rpm_values is not None:
-            tpm_values = combined_tpm_rpm_values[: len(tpm_keys)]
-            rpm_values = combined_tpm_rpm_values[len(tpm_keys) :]
-        else:
-            tpm_values = None
-            rpm_values = None
+        tpm_values, rpm_values = await self._async_get_mirrored_tpm_rpm_values(
+            tpm_keys=tpm_keys, rpm_keys=rpm_keys
+        )
 
         deployment = self._common_checks_available_deployment(
             model_group=model_group,
@@ -0,0 +1,264 @@
+#### What this does ####
+#   picks a deployment based on this instance's own queue of in-flight requests
+#   How is this achieved?
+#   - `pre_call_check` / `async_pre_call_check` increment the in-flight count of the picked deployment
+#   - success + failure callbacks decrement it, and update the deployment's observed service time (ewma)
+#   - cancelled calls get no callback - the router releases them via `release_pre_call_check`
+#   - "power-of-two-choices": sample 2 healthy deployments at random, pick the one with fewer in-flight requests
+#   - "join-shortest-queue": pick the deployment with the lowest expected wait - (in-flight + 1) * service time
+#
+#   All state is local to the instance - no redis reads or writes on the routing path.
+#   Across pods, each instance balances its own load, which keeps the fleet balanced as long as
+#   traffic is spread across pods (the usual case behind a load balancer).
+
+import random
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional, Union
+
+from litellm._logging import verbose_router_logger
+from litellm.caching.caching import DualCache
+from litellm.integrations.custom_logger import CustomLogger
+from litellm.types.utils import LiteLLMPydanticObjectBase
+
+from .base_routing_strategy import BaseRoutingStrategy
+
+
+class RoutingArgs(LiteLLMPydanticObjectBase):
+    ewma_alpha: float = 0.3  # weight of the newest sample in the service time ewma
+
+
+class ShortestQueueLoggingHandler(BaseRoutingStrategy, CustomLogger):
+    test_flag: bool = False
+    logged_success: int = 0
+    logged_failure: int = 0
+
+    def __init__(
+        self,
+        router_cache: DualCache,
+        routing_strategy: Literal[
+            "power-of-two-choices", "join-shortest-queue"
+        ] = "power-of-two-choices",
+        routing_args: dict = {},
+    ):
+        self.router_cache = router_cache
+        self.routing_strategy = routing_strategy
+        self.routing_args = RoutingArgs(**routing_args)
+        self.in_flight_requests: Dict[str, int] = {}  # {model_id: in-flight count}
+        self.service_times: Dict[str, float] = {}  # {model_id: ewma of seconds}
+        self._lock = threading.Lock()
+        BaseRoutingStrategy.__init__(
+            self,
+            dual_cache=router_cache,
+            should_batch_redis_writes=False,
+            default_sync_interval=None,
+        )
+
+    def _get_model_id(self, deployment: Dict) -> Optional[str]:
+        model_id = (deployment.get("model_info") or {}).get("id", None)
+        if model_id is None:
+            return None
+        return str(model_id)
+
+    def _get_model_id_from_kwargs(self, kwargs: dict) -> Optional[str]:
+        litellm_params = kwargs.get("litellm_params") or {}
+        model_id = (litellm_params.get("model_info") or {}).get("id", None)
+        if model_id is None:
+            return None
+        return str(model_id)
+
+    def _increment_in_flight_requests(self, model_id: str) -> None:
+        with self._lock:
+            self.in_flight_requests[model_id] = (
+                self.in_flight_requests.get(model_id, 0) + 1
+            )
+
+    def _decrement_in_flight_requests(self, model_id: str) -> None:
+        with self._lock:
+            # never go below 0 - e.g. calls made before this router picked the deployment
+            self.in_flight_requests[model_id] = max(
+                self.in_flight_requests.get(model_id, 0) - 1, 0
+            )
+
+    def _update_service_time(
+        self, model_id: str, start_time: Any, end_time: Any
+    ) -> None:
+        if isinstance(start_time, datetime) and isinstance(end_time, datetime):
+            service_time = (end_time - start_time).total_seconds()
+        elif isinstance(start_time, (int, float)) and isinstance(
+            end_time, (int, float)
+        ):
+            service_time = float(end_time - start_time)
+        else:
+            return
+        if service_time < 0:
+            return
+        alpha = self.routing_args.ewma_alpha
+        with self._lock:
+            previous = self.service_times.get(model_id, None)
+            if previous is None:
+                self.service_times[model_id] = service_time
+            else:
+                self.service_times[model_id] = (
+                    alpha * service_time + (1 - alpha) * previous
+                )
+
+    def _log_request_end(
+        self, kwargs: dict, start_time: Any, end_time: Any, success: bool
+    ) -> None:
+        model_id = self._get_model_id_from_kwargs(kwargs)
+        if model_id is None:
+            return
+        self._decrement_in_flight_requests(model_id)
+        if success:
+            self._update_service_time(
+                model_id=model_id, start_time=start_time, end_time=end_time
+            )
+
+    def pre_call_check(self, deployment: Dict) -> Optional[Dict]:
+        """
+        Count the request against the deployment, right before the call is made.
+        """
+        model_id = self._get_model_id(deployment)
+        if model_id is not None:
+            self._increment_in_flight_requests(model_id)
+        return deployment
+
+    async def async_pre_call_check(
+        self, deployment: Dict, parent_otel_span: Optional[Any]
+    ) -> Optional[Dict]:
+        return self.pre_call_check(deployment)
+
+    def release_pre_call_check(self, deployment: Dict) -> None:
+        """
+        Stop counting a request that ended without a success / failure event - e.g. it was cancelled.
+        """
+        model_id = self._get_model_id(deployment)
+        if model_id is not None:
+            self._decrement_in_flight_requests(model_id)
+
+    def log_success_event(self, kwargs, response_obj, start_time, end_time):
+        try:
+            self._log_request_end(
+                kwargs=kwargs, start_time=start_time, end_time=end_time, success=True
+            )
+            ### TESTING ###
+            if self.test_flag:
+                self.logged_success += 1
+        except Exception as e:
+            verbose_router_logger.debug(
+                f"ShortestQueueLoggingHandler: error logging success event - {str(e)}"
+            )
+
+    def log_failure_event(self, kwargs, response_obj, start_time, end_time):
+        try:
+            self._log_request_end(
+                kwargs=kwargs, start_time=start_time, end_time=end_time, success=False
+            )
+            ### TESTING ###
+            if self.test_flag:
+                self.logged_failure += 1
+        except Exception as e:
+            verbose_router_logger.debug(
+                f"ShortestQueueLoggingHandler: error logging failure event - {str(e)}"
+            )
+
+    async def async_log_success_event(self, kwargs, response_obj, start_time, end_time):
+        self.log_success_event(kwargs, response_obj, start_time, end_time)
+
+    async def async_log_failure_event(self, kwargs, response_obj, start_time, end_time):
+        self.log_failure_event(kwargs, response_obj, start_time, end_time)
+
+    def _get_expected_wait(
+        self, deployment: Dict, default_service_time: float
+    ) -> float:
+        model_id = self._get_model_id(deployment) or ""
+        in_flight = self.in_flight_requests.get(model_id, 0)
+        service_time = self.service_times.get(model_id, default_service_time)
+        return (in_flight + 1) * service_time
+
+    def _power_of_two_choices(self, healthy_deployments: List[Dict]) -> Dict:
+        """
+        O(1) - compare the in-flight count of 2 randomly sampled deployments.
+
+        Ties are broken by the lower observed service time.
+        """
+        first, second = random.sample(healthy_deployments, 2)
+        first_id = self._get_model_id(first) or ""
+        second_id = self._get_model_id(second) or ""
+        first_in_flight = self.in_flight_requests.get(first_id, 0)
+        second_in_flight = self.in_flight_requests.get(second_id, 0)
+        if first_in_flight != second_in_flight:
+            return first if first_in_flight < second_in_flight else second
+        first_service_time = self.service_times.get(first_id, None)
+        second_service_time = self.service_times.get(second_id, None)
+        if (
+            first_service_time is not None
+            and second_service_time is not None
+            and first_service_time != second_service_time
+        ):
+            return first if first_service_time < second_service_time else second
+        return first
+
+    def _join_shortest_queue(self, healthy_deployments: List[Dict]) -> Dict:
+        """
+        Pick the deployment with the lowest expected wait, weighting the queue length by the
+        deployment's observed service time.
+
+        Deployments without an observed service time use the group average, so a new deployment
+        gets its fair share instead of all traffic.
+        """
+        known_service_times = [
+            self.service_times[model_id]
+            for model_id in (self._get_model_id(d) for d in healthy_deployments)
+            if model_id is not None and model_id in self.service_times
+        ]
+        default_service_time = (
+            sum(known_service_times) / len(known_service_times)
+            if len(known_service_times) > 0
+            else 1.0
+        )
+
+        lowest_wait = float("inf")
+        potential_deployments: List[Dict] = []
+        for deployment in healthy_deployments:
+            expected_wait = self._get_expected_wait(
+                deployment=deployment, default_service_time=default_service_time
+            )
+            if expected_wait < lowest_wait:
+                lowest_wait = expected_wait
+                potential_deployments = [deployment]
+            elif expected_wait == lowest_wait:
+                potential_deployments.append(deployment)
+        return random.choice(potential_deployments)
+
+    def get_available_deployments(
+        self,
+        model_group: str,
+        healthy_deployments: Union[List[Any], Dict[Any, Any]],
+    ) -> Optional[Dict]:
+        if isinstance(healthy_deployments, dict):
+            return healthy_deployments
+        _healthy_deployments = [d for d in healthy_deployments if isinstance(d, dict)]
+        if len(_healthy_deployments) == 0:
+            return None
+        if len(_healthy_deployments) == 1:
+            return _healthy_deployments[0]
+
+        if self.routing_strategy == "join-shortest-queue":
+            deployment = self._join_shortest_queue(_healthy_deployments)
+        else:
+            deployment = self._power_of_two_choices(_healthy_deployments)
+        verbose_router_logger.debug(
+            f"{self.routing_strategy}: model_group={model_group}, picked deployment={self._get_model_id(deployment)}, in_flight_requests={self.in_flight_requests}"
+        )
+        return deployment
+
+    async def async_get_available_deployments(
+        self,
+        model_group: str,
+        healthy_deployments: Union[List[Any], Dict[Any, Any]],
+    ) -> Optional[Dict]:
+        return self.get_available_deployments(
+            model_group=model_group, healthy_deployments=healthy_deployments
+        )
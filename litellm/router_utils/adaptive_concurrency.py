@@ -0,0 +1,170 @@
+"""
+Adaptive concurrency limits per deployment.
+
+Drop-in replacement for the deployment's `max_parallel_requests` semaphore, whose limit is discovered at runtime:
+
+- Additive increase: while latency stays near the deployment's baseline, and the limit is in use, the limit grows by ~1 per `limit` successful calls.
+- Multiplicative decrease: on 429s / timeouts the limit is multiplied by `backoff_ratio`, and when latency rises above
+  `latency_tolerance` x the baseline (a latency gradient - the deployment is queueing), by `latency_backoff_ratio`.
+
+Requests over the limit wait for a slot. If `reroute_when_saturated` is set, the router first routes to deployments
+of the model group which are below their limit.
+
+For streaming requests, a call is complete once the stream is opened - same as `max_parallel_requests`.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Literal, Optional
+
+import litellm
+from litellm._logging import verbose_router_logger
+from litellm.types.router import AdaptiveConcurrencyConfig
+
+if TYPE_CHECKING:
+    from litellm.router import Router as _Router
+
+    LitellmRouter = _Router
+else:
+    LitellmRouter = Any
+
+SHORT_LATENCY_EWMA_ALPHA = 0.5
+BASELINE_LATENCY_EWMA_ALPHA = 0.05
+
+
+def _is_overload_error(exception: Optional[BaseException]) -> bool:
+    if exception is None:
+        return False
+    if isinstance(exception, (litellm.RateLimitError, litellm.Timeout)):
+        return True
+    return getattr(exception, "status_code", None) == 429
+
+
+class AdaptiveConcurrencyLimiter(asyncio.Semaphore):
+    """
+    `asyncio.Semaphore` with an AIMD limit, driven by the outcome of each `async with` block.
+    """
+
+    def __init__(
+        self,
+        model_id: str,
+        adaptive_concurrency_config: AdaptiveConcurrencyConfig,
+        max_limit: Optional[int] = None,
+    ):
+        self.model_id = model_id
+        self.config = adaptive_concurrency_config
+        self.max_limit = adaptive_concurrency_config.max_limit
+        if max_limit is not None:
+            self.max_limit = min(self.max_limit, max_limit)
+        self.min_limit = min(adaptive_concurrency_config.min_limit, self.max_limit)
+        self.limit: float = max(
+            self.min_limit,
+            min(adaptive_concurrency_config.initial_limit, self.max_limit),
+        )
+        self.in_flight = 0
+        self.baseline_latency: Optional[float] = None
+        self.short_latency: Optional[float] = None
+        self._limit_waiters: Deque["asyncio.Future[None]"] = deque()
+        self._start_times: Dict[Any, float] = {}
+        super().__init__(value=int(self.limit))
+
+    def locked(self) -> bool:
+        return self.in_flight >= int(self.limit)
+
+    async def acquire(self) -> Literal[True]:
+        while self.locked():
+            waiter: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+            self._limit_waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._limit_waiters:
+                    self._limit_waiters.remove(waiter)
+                # pass on a wake-up this waiter received, but can no longer use
+                if waiter.done() and not waiter.cancelled():
+                    self._wake_up_waiters()
+                raise
+        self.in_flight += 1
+        return True
+
+    def release(self) -> None:
+        self.in_flight = max(self.in_flight - 1, 0)
+        self._wake_up_waiters()
+
+    def _wake_up_waiters(self) -> None:
+        available = int(self.limit) - self.in_flight
+        while available > 0 and self._limit_waiters:
+            waiter = self._limit_waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                available -= 1
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+        self._start_times[asyncio.current_task()] = time.monotonic()
+        return None
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        start_time = self._start_times.pop(asyncio.current_task(), None)
+        try:
+            if exc is None and start_time is not None:
+                self.on_success(latency=time.monotonic() - start_time)
+            elif _is_overload_error(exc):
+                self.on_overload()
+        finally:
+            self.release()
+
+    def on_success(self, latency: float) -> None:
+        if self.baseline_latency is None or self.short_latency is None:
+            self.baseline_latency = latency
+            self.short_latency = latency
+        else:
+            self.short_latency += SHORT_LATENCY_EWMA_ALPHA * (
+                latency - self.short_latency
+            )
+            self.baseline_latency += BASELINE_LATENCY_EWMA_ALPHA * (
+                latency - self.baseline_latency
+            )
+
+        if self.short_latency > self.config.latency_tolerance * self.baseline_latency:
+            self._set_limit(self.limit * self.config.latency_backoff_ratio)
+        elif self.in_flight >= self.limit / 2:
+            # only grow a limit that's in use
+            self._set_limit(self.limit + 1 / self.limit)
+
+    def on_overload(self) -> None:
+        self._set_limit(self.limit * self.config.backoff_ratio)
+
+    def _set_limit(self, new_limit: float) -> None:
+        new_limit = max(self.min_limit, min(new_limit, self.max_limit))
+        if int(new_limit) != int(self.limit):
+            verbose_router_logger.debug(
+                f"adaptive concurrency: deployment={self.model_id}, limit {int(self.limit)} -> {int(new_limit)}"
+            )
+        self.limit = new_limit
+        self._wake_up_waiters()
+
+
+def filter_saturated_deployments(
+    litellm_router_instance: LitellmRouter, healthy_deployments: List[Dict]
+) -> List[Dict]:
+    """
+    Filter out deployments at their adaptive concurrency limit.
+
+    If every deployment is at its limit, all are returned - the request waits for a slot on the one it's routed to.
+    """
+    available_deployments = []
+    for deployment in healthy_deployments:
+        model_id = (deployment.get("model_info") or {}).get("id")
+        limiter = (
+            litellm_router_instance.adaptive_concurrency_limiters.get(model_id)
+            if model_id is not None
+            else None
+        )
+        if limiter is not None and limiter.locked():
+            continue
+        available_deployments.append(deployment)
+    if len(available_deployments) == 0:
+        return healthy_deployments
+    return available_deployments
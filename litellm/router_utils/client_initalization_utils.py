@@ -1,6 +1,7 @@
 import asyncio
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Optional
 
+from litellm.router_utils.adaptive_concurrency import AdaptiveConcurrencyLimiter
 from litellm.utils import calculate_max_parallel_requests
 
 if TYPE_CHECKING:
@@ -27,8 +28,25 @@ class InitalizeCachedClient:
             tpm=tpm,
             default_max_parallel_requests=litellm_router_instance.default_max_parallel_requests,
         )
-        if calculated_max_parallel_requests:
+        semaphore: Optional[asyncio.Semaphore] = None
+        if litellm_router_instance.adaptive_concurrency_config is not None:
+            # kept on the router, so the discovered limit survives the cache ttl
+            semaphore = litellm_router_instance.adaptive_concurrency_limiters.get(
+                model_id
+            )
+            if semaphore is None:
+                # the configured limit, if any, caps the discovered limit
+                semaphore = AdaptiveConcurrencyLimiter(
+                    model_id=model_id,
+                    adaptive_concurrency_config=litellm_router_instance.adaptive_concurrency_config,
+                    max_limit=calculated_max_parallel_requests,
+                )
+                litellm_router_instance.adaptive_concurrency_limiters[
+                    model_id
+                ] = semaphore
+        elif calculated_max_parallel_requests:
             semaphore = asyncio.Semaphore(calculated_max_parallel_requests)
+        if semaphore is not None:
             cache_key = f"{model_id}_max_parallel_requests_client"
             litellm_router_instance.cache.set_cache(
                 key=cache_key,
@@ -3,14 +3,17 @@ Wrapper around router cache. Meant to handle model cooldown logic
 """
 
 import functools
+import heapq
+import threading
 import time
-from typing import TYPE_CHECKING, Any, List, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 
 from typing_extensions import TypedDict
 
 from litellm import verbose_logger
 from litellm.caching.caching import DualCache
 from litellm.caching.in_memory_cache import InMemoryCache
+from litellm.constants import DEFAULT_COOLDOWN_INDEX_SYNC_INTERVAL_SECONDS
 from litellm.litellm_core_utils.sensitive_data_masker import SensitiveDataMasker
 
 if TYPE_CHECKING:
@@ -28,11 +31,91 @@ class CooldownCacheValue(TypedDict):
     cooldown_time: float
 
 
+class CooldownIndex:
+    """
+    In-process index of the deployments currently cooling down.
+
+    Entries are keyed by model id and expire through a min-heap of expiry times,
+    so reading the active cooldowns is O(1) when nothing is cooling down and
+    O(active cooldowns) otherwise - no cache round-trips and no per-deployment
+    key lookups on the request path.
+    """
+
+    def __init__(self):
+        self._cooldowns: Dict[str, CooldownCacheValue] = {}
+        self._expiries: Dict[str, float] = {}
+        self._expiration_heap: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._expiries)
+
+    def add(self, model_id: str, cooldown_value: CooldownCacheValue) -> None:
+        expires_at = cooldown_value["timestamp"] + cooldown_value["cooldown_time"]
+        with self._lock:
+            if self._expiries.get(model_id, 0.0) >= expires_at:
+                # keep the longer cooldown if another instance already reported one
+                return
+            self._cooldowns[model_id] = cooldown_value
+            self._expiries[model_id] = expires_at
+            heapq.heappush(self._expiration_heap, (expires_at, model_id))
+
+    def _evict_expired(self, current_time: float) -> None:
+        with self._lock:
+            while (
+                self._expiration_heap and self._expiration_heap[0][0] <= current_time
+            ):
+                expires_at, model_id = heapq.heappop(self._expiration_heap)
+                # skip stale heap entries for cooldowns that were extended
+                if self._expiries.get(model_id) == expires_at:
+                    del self._expiries[model_id]
+                    del self._cooldowns[model_id]
+
+    def get_active_cooldowns(
+        self, model_ids: Optional[List[str]] = None
+    ) -> List[Tuple[str, CooldownCacheValue]]:
+        """
+        Return (model_id, cooldown value) for every active cooldown.
+
+        If `model_ids` is given, only cooldowns for those deployments are returned.
+        """
+        if self._expiration_heap:
+            self._evict_expired(time.time())
+        if not self._cooldowns:
+            return []
+        active_cooldowns = list(self._cooldowns.items())
+        if model_ids is None:
+            return active_cooldowns
+        if len(active_cooldowns) < len(model_ids):
+            model_id_set = set(model_ids)
+            return [item for item in active_cooldowns if item[0] in model_id_set]
+        return [
+            (model_id, self._cooldowns[model_id])
+            for model_id in model_ids
+            if model_id in self._cooldowns
+        ]
+
+    def flush(self) -> None:
+        with self._lock:
+            self._cooldowns = {}
+            self._expiries = {}
+            self._expiration_heap = []
+
+
 class CooldownCache:
-    def __init__(self, cache: DualCache, default_cooldown_time: float):
+    def __init__(
+        self,
+        cache: DualCache,
+        default_cooldown_time: float,
+        index_sync_interval: float = DEFAULT_COOLDOWN_INDEX_SYNC_INTERVAL_SECONDS,
+    ):
         self.cache = cache
         self.default_cooldown_time = default_cooldown_time
         self.in_memory_cache = InMemoryCache()
+        # in-process view of active cooldowns, reconciled with redis every `index_sync_interval` seconds
+        self.cooldown_index = CooldownIndex()
+        self.index_sync_interval = index_sync_interval
+        self._last_index_sync_time: float = 0.0
         # Initialize the masker with custom settings for exception strings
         self.exception_masker = SensitiveDataMasker(
             visible_prefix=50,  # Show first 50 characters
@@ -90,6 +173,8 @@ class CooldownCache:
                 cooldown_time=_cooldown_time,
             )
 
+            self.cooldown_index.add(model_id=model_id, cooldown_value=cooldown_data)
+
             # Set the cache with a TTL equal to the cooldown time
             self.cache.set_cache(
                 value=cooldown_data,
@@ -109,54 +194,59 @@ class CooldownCache:
     def get_cooldown_cache_key(model_id: str) -> str:
         return "deployment:" + model_id + ":cooldown"
 
-    async def async_get_active_cooldowns(
-        self, model_ids: List[str], parent_otel_span: Optional[Span]
-    ) -> List[Tuple[str, CooldownCacheValue]]:
-        # Generate the keys for the deployments
-        keys = [
-            CooldownCache.get_cooldown_cache_key(model_id) for model_id in model_ids
-        ]
-
-        # Retrieve the values for the keys using mget
-        ## more likely to be none if no models ratelimited. So just check redis every 1s
-        ## each redis call adds ~100ms latency.
-
-        ## check in memory cache first
-        results = await self.cache.async_batch_get_cache(
-            keys=keys, parent_otel_span=parent_otel_span
-        )
-        active_cooldowns: List[Tuple[str, CooldownCacheValue]] = []
+    def _should_sync_index(self, current_time: float) -> bool:
+        """
+        Cooldowns written by this instance land in `cooldown_index` directly. Only
+        cooldowns set by other instances need a read from the shared (redis) cache.
+        """
+        if getattr(self.cache, "redis_cache", None) is None:
+            return False
+        return current_time - self._last_index_sync_time >= self.index_sync_interval
 
-        if results is None or all(v is None for v in results):
-            return active_cooldowns
-        
-        # Process the results
+    def _sync_index_from_results(
+        self, model_ids: List[str], results: Optional[List[Any]]
+    ) -> None:
+        self._last_index_sync_time = time.time()
+        if results is None:
+            return
         for model_id, result in zip(model_ids, results):
             if result and isinstance(result, dict):
                 cooldown_cache_value = CooldownCacheValue(**result)  # type: ignore
-                active_cooldowns.append((model_id, cooldown_cache_value))
+                self.cooldown_index.add(
+                    model_id=model_id, cooldown_value=cooldown_cache_value
+                )
 
-        return active_cooldowns
+    async def async_get_active_cooldowns(
+        self, model_ids: List[str], parent_otel_span: Optional[Span]
+    ) -> List[Tuple[str, CooldownCacheValue]]:
+        if self._should_sync_index(current_time=time.time()):
+            # Generate the keys for the deployments
+            keys = [
+                CooldownCache.get_cooldown_cache_key(model_id)
+                for model_id in model_ids
+            ]
+            results = await self.cache.async_batch_get_cache(
+                keys=keys, parent_otel_span=parent_otel_span
+            )
+            self._sync_index_from_results(model_ids=model_ids, results=results)
+
+        return self.cooldown_index.get_active_cooldowns(model_ids=model_ids)
 
     def get_active_cooldowns(
         self, model_ids: List[str], parent_otel_span: Optional[Span]
     ) -> List[Tuple[str, CooldownCacheValue]]:
-        # Generate the keys for the deployments
-        keys = [CooldownCache.get_cooldown_cache_key(model_id) for model_id in model_ids]
-        # Retrieve the values for the keys using mget
-        results = (
-            self.cache.batch_get_cache(keys=keys, parent_otel_span=parent_otel_span)
-            or []
-        )
-
-        active_cooldowns = []
-        # Process the results
-        for model_id, result in zip(model_ids, results):
-            if result and isinstance(result, dict):
-                cooldown_cache_value = CooldownCacheValue(**result)  # type: ignore
-                active_cooldowns.append((model_id, cooldown_cache_value))
+        if self._should_sync_index(current_time=time.time()):
+            # Generate the keys for the deployments
+            keys = [
+                CooldownCache.get_cooldown_cache_key(model_id)
+                for model_id in model_ids
+            ]
+            results = self.cache.batch_get_cache(
+                keys=keys, parent_otel_span=parent_otel_span
+            )
+            self._sync_index_from_results(model_ids=model_ids, results=results)
 
-        return active_cooldowns
+        return self.cooldown_index.get_active_cooldowns(model_ids=model_ids)
 
     def get_min_cooldown(
         self, model_ids: List[str], parent_otel_span: Optional[Span]
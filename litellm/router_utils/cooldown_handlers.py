@@ -327,7 +327,7 @@ async def _async_get_cooldown_deployments(
     """
     Async implementation of '_get_cooldown_deployments'
     """
-    model_ids = litellm_router_instance.get_model_ids()
+    model_ids = litellm_router_instance.routing_tables.get_model_ids()
     cooldown_models = (
         await litellm_router_instance.cooldown_cache.async_get_active_cooldowns(
             model_ids=model_ids,
@@ -355,7 +355,7 @@ async def _async_get_cooldown_deployments_with_debug_info(
     """
     Async implementation of '_get_cooldown_deployments'
     """
-    model_ids = litellm_router_instance.get_model_ids()
+    model_ids = litellm_router_instance.routing_tables.get_model_ids()
     cooldown_models = (
         await litellm_router_instance.cooldown_cache.async_get_active_cooldowns(
             model_ids=model_ids, parent_otel_span=parent_otel_span
@@ -377,7 +377,7 @@ def _get_cooldown_deployments(
     # ----------------------
     # Return cooldown models
     # ----------------------
-    model_ids = litellm_router_instance.get_model_ids()
+    model_ids = litellm_router_instance.routing_tables.get_model_ids()
 
     cooldown_models = litellm_router_instance.cooldown_cache.get_active_cooldowns(
         model_ids=model_ids, parent_otel_span=parent_otel_span
@@ -10,6 +10,10 @@ from typing import Dict, List, Optional, Tuple
 from litellm.litellm_core_utils.get_llm_provider_logic import get_llm_provider
 from litellm._logging import verbose_router_logger
 
+_MAX_CACHED_ROUTES = 10000
+_REGEX_SPECIAL_CHARS = frozenset(".^$*+?{}[]|()")
+_REGEX_QUANTIFIERS = frozenset("*+?{")
+
 
 class PatternUtils:
     @staticmethod
@@ -49,6 +53,100 @@ class PatternUtils:
         )
 
 
+class _TrieNode:
+    __slots__ = ("children", "patterns")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.patterns: List[str] = []
+
+
+class CompiledPatternMatcher:
+    """
+    All patterns of a PatternMatchRouter, compiled into a prefix trie on their literal prefix
+    (the part before the first wildcard).
+
+    A request only runs the regexes of patterns whose literal prefix it starts with,
+    so matching doesn't scale with the number of patterns. Results are memoized per model name.
+    """
+
+    def __init__(self, patterns: Dict[str, List[Dict]]):
+        self.num_patterns = len(patterns)
+        self.ranks: Dict[str, int] = {
+            pattern: rank
+            for rank, (pattern, _) in enumerate(PatternUtils.sorted_patterns(patterns))
+        }
+        self.compiled_patterns = {pattern: re.compile(pattern) for pattern in patterns}
+        self.root = _TrieNode()
+        for pattern in patterns:
+            node = self.root
+            for char in CompiledPatternMatcher.get_literal_prefix(pattern):
+                node = node.children.setdefault(char, _TrieNode())
+            node.patterns.append(pattern)
+        self._matching_patterns_cache: Dict[str, List[str]] = {}
+
+    @staticmethod
+    def get_literal_prefix(regex: str) -> str:
+        """
+        Characters every match of `regex` starts with.
+
+        example:
+        regex: openai/fo::(.*)::static::(.*)
+        literal prefix: openai/fo::
+        """
+        if re.search(r"(?<!\\)(?:\\\\)*\|", regex):
+            return ""  # alternation - matches don't share a prefix
+
+        prefix: List[str] = []
+        idx = 0
+        while idx < len(regex):
+            char = regex[idx]
+            if char == "\\":
+                if idx + 1 >= len(regex) or regex[idx + 1].isalnum():
+                    break  # character class, e.g. \d
+                prefix.append(regex[idx + 1])
+                idx += 2
+                continue
+            if char in _REGEX_SPECIAL_CHARS:
+                if char in _REGEX_QUANTIFIERS and prefix:
+                    prefix.pop()  # the previous character is optional / repeated
+                break
+            prefix.append(char)
+            idx += 1
+        return "".join(prefix)
+
+    def get_matching_patterns(self, request: str) -> List[str]:
+        """
+        Patterns matching the request, most specific first.
+        """
+        matching_patterns = self._matching_patterns_cache.get(request)
+        if matching_patterns is not None:
+            return matching_patterns
+
+        candidates: List[str] = list(self.root.patterns)
+        node = self.root
+        for char in request:
+            next_node = node.children.get(char)
+            if next_node is None:
+                break
+            node = next_node
+            candidates.extend(node.patterns)
+        candidates.sort(key=self.ranks.__getitem__)
+        matching_patterns = [
+            pattern
+            for pattern in candidates
+            if self.compiled_patterns[pattern].match(request)
+        ]
+
+        if len(self._matching_patterns_cache) >= _MAX_CACHED_ROUTES:
+            self._matching_patterns_cache = {}
+        self._matching_patterns_cache[request] = matching_patterns
+        return matching_patterns
+
+    def match(self, pattern: str, request: str) -> Optional[Match]:
+        return self.compiled_patterns[pattern].match(request)
+
+
 class PatternMatchRouter:
     """
     Class to handle llm wildcard routing and regex pattern matching
@@ -60,6 +158,8 @@ class PatternMatchRouter:
 
     def __init__(self):
         self.patterns: Dict[str, List] = {}
+        self._compiled_patterns: Optional[CompiledPatternMatcher] = None
+        self._compiled_patterns_source: Optional[Dict[str, List]] = None
 
     def add_pattern(self, pattern: str, llm_deployment: Dict):
         """
@@ -73,8 +173,22 @@ class PatternMatchRouter:
         regex = self._pattern_to_regex(pattern)
         if regex not in self.patterns:
             self.patterns[regex] = []
+            self._compiled_patterns = None
         self.patterns[regex].append(llm_deployment)
 
+    def _get_compiled_patterns(self) -> CompiledPatternMatcher:
+        """
+        Compile the patterns on first use, and again if they're changed.
+        """
+        if (
+            self._compiled_patterns is None
+            or self._compiled_patterns_source is not self.patterns
+            or self._compiled_patterns.num_patterns != len(self.patterns)
+        ):
+            self._compiled_patterns = CompiledPatternMatcher(self.patterns)
+            self._compiled_patterns_source = self.patterns
+        return self._compiled_patterns
+
     def _pattern_to_regex(self, pattern: str) -> str:
         """
         Convert a wildcard pattern to a regex pattern
@@ -121,7 +235,7 @@ class PatternMatchRouter:
         """
         Route a requested model to the corresponding llm deployments based on the regex pattern
 
-        loop through all the patterns and find the matching pattern
+        find the most specific matching pattern, using the compiled patterns
         if a pattern is found, return the corresponding llm deployments
         if no pattern is found, return None
 
@@ -135,22 +249,23 @@ class PatternMatchRouter:
             if request is None:
                 return None
 
-            sorted_patterns = PatternUtils.sorted_patterns(self.patterns)
+            compiled_patterns = self._get_compiled_patterns()
             regex_filtered_model_names = (
                 [self._pattern_to_regex(m) for m in filtered_model_names]
                 if filtered_model_names is not None
                 else []
             )
-            for pattern, llm_deployments in sorted_patterns:
+            for pattern in compiled_patterns.get_matching_patterns(request):
                 if (
                     filtered_model_names is not None
                     and pattern not in regex_filtered_model_names
                 ):
                     continue
-                pattern_match = re.match(pattern, request)
+                pattern_match = compiled_patterns.match(pattern, request)
                 if pattern_match:
                     return self._return_pattern_matched_deployments(
-                        matched_pattern=pattern_match, deployments=llm_deployments
+                        matched_pattern=pattern_match,
+                        deployments=self.patterns[pattern],
                     )
         except Exception as e:
             verbose_router_logger.debug(f"Error in PatternMatchRouter.route: {str(e)}")
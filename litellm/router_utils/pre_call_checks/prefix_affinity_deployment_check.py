@@ -0,0 +1,223 @@
+"""
+Route requests that share a long prompt prefix to the same deployment, to maximize provider-side prompt cache hits.
+
+Unlike `PromptCachingDeploymentCheck` (which only remembers the deployment that served an exact cacheable prefix),
+this places deployments on a consistent-hash ring and routes on a hash of the prompt prefix - so requests sharing
+a prefix land on the same deployment even the first time the prefix is seen, on every instance.
+
+- The prefix is hashed at breakpoints: tools + system prompt, then the first 1, 2, 4, 8 turns.
+  The first breakpoint at least `PREFIX_AFFINITY_MIN_PREFIX_CHARS` long is used, so short prompts aren't pinned.
+- Bounded loads: a deployment with more than `PREFIX_AFFINITY_LOAD_FACTOR` x the average in-flight requests
+  on this instance is skipped, and the request spills over to the next deployment on the ring.
+"""
+
+import hashlib
+import json
+import math
+import threading
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+
+from litellm._logging import verbose_router_logger
+from litellm.constants import (
+    PREFIX_AFFINITY_LOAD_FACTOR,
+    PREFIX_AFFINITY_MIN_PREFIX_CHARS,
+    PREFIX_AFFINITY_VIRTUAL_NODES,
+)
+from litellm.integrations.custom_logger import CustomLogger, Span
+from litellm.types.llms.openai import AllMessageValues
+
+PREFIX_AFFINITY_TURN_BREAKPOINTS = (1, 2, 4, 8)
+_MAX_CACHED_RINGS = 128
+
+
+def _hash_to_point(value: bytes) -> int:
+    return int.from_bytes(hashlib.sha256(value).digest()[:8], "big")
+
+
+def _serialize(obj: Any) -> bytes:
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str).encode()
+
+
+def get_prefix_hash(
+    messages: Optional[List[AllMessageValues]],
+    tools: Optional[List[Any]],
+    min_prefix_chars: int = PREFIX_AFFINITY_MIN_PREFIX_CHARS,
+) -> Optional[int]:
+    """
+    Hash the shortest breakpoint prefix that is at least `min_prefix_chars` long.
+
+    The prefix is hashed incrementally, so each message is serialized once.
+
+    Returns None if no breakpoint prefix is long enough.
+    """
+    if not messages:
+        return None
+
+    hasher = hashlib.sha256()
+    prefix_chars = 0
+    if tools:
+        serialized_tools = _serialize(tools)
+        hasher.update(serialized_tools)
+        prefix_chars += len(serialized_tools)
+
+    turn_idx = 0
+    while turn_idx < len(messages) and messages[turn_idx].get("role") in (
+        "system",
+        "developer",
+    ):
+        serialized_message = _serialize(messages[turn_idx])
+        hasher.update(serialized_message)
+        prefix_chars += len(serialized_message)
+        turn_idx += 1
+
+    if prefix_chars >= min_prefix_chars:
+        return int.from_bytes(hasher.digest()[:8], "big")
+
+    turns = 0
+    for message in messages[turn_idx : turn_idx + PREFIX_AFFINITY_TURN_BREAKPOINTS[-1]]:
+        serialized_message = _serialize(message)
+        hasher.update(serialized_message)
+        prefix_chars += len(serialized_message)
+        turns += 1
+        if (
+            turns in PREFIX_AFFINITY_TURN_BREAKPOINTS
+            and prefix_chars >= min_prefix_chars
+        ):
+            return int.from_bytes(hasher.digest()[:8], "big")
+    return None
+
+
+class ConsistentHashRing:
+    """
+    Consistent-hash ring over deployment ids, with `virtual_nodes` points per deployment.
+
+    Adding / removing a deployment only moves the prefixes that hashed to its points.
+    """
+
+    def __init__(self, model_ids: Tuple[str, ...], virtual_nodes: int):
+        points: List[Tuple[int, str]] = []
+        for model_id in model_ids:
+            for i in range(virtual_nodes):
+                points.append((_hash_to_point(f"{model_id}:{i}".encode()), model_id))
+        points.sort()
+        self.points = [point for point, _ in points]
+        self.model_ids = [model_id for _, model_id in points]
+        self.num_deployments = len(model_ids)
+
+    def iter_model_ids(self, key: int):
+        """Distinct deployment ids, walking clockwise from `key`."""
+        seen = set()
+        start = bisect_left(self.points, key)
+        for i in range(len(self.points)):
+            model_id = self.model_ids[(start + i) % len(self.points)]
+            if model_id not in seen:
+                seen.add(model_id)
+                yield model_id
+                if len(seen) == self.num_deployments:
+                    return
+
+
+class PrefixAffinityDeploymentCheck(CustomLogger):
+    def __init__(
+        self,
+        min_prefix_chars: int = PREFIX_AFFINITY_MIN_PREFIX_CHARS,
+        load_factor: float = PREFIX_AFFINITY_LOAD_FACTOR,
+        virtual_nodes: int = PREFIX_AFFINITY_VIRTUAL_NODES,
+    ):
+        self.min_prefix_chars = min_prefix_chars
+        self.load_factor = load_factor
+        self.virtual_nodes = virtual_nodes
+        self.in_flight_requests: Dict[str, int] = {}  # {model_id: in-flight count}
+        self._rings: Dict[Tuple[str, ...], ConsistentHashRing] = {}
+        self._lock = threading.Lock()
+
+    def _get_ring(self, model_ids: Tuple[str, ...]) -> ConsistentHashRing:
+        ring = self._rings.get(model_ids)
+        if ring is None:
+            ring = ConsistentHashRing(
+                model_ids=model_ids, virtual_nodes=self.virtual_nodes
+            )
+            if len(self._rings) >= _MAX_CACHED_RINGS:
+                self._rings = {}
+            self._rings[model_ids] = ring
+        return ring
+
+    def get_deployment_for_prefix(
+        self, prefix_hash: int, healthy_deployments: List[dict]
+    ) -> Optional[dict]:
+        deployments_by_id: Dict[str, dict] = {}
+        for deployment in healthy_deployments:
+            model_id = (deployment.get("model_info") or {}).get("id")
+            if model_id is not None:
+                deployments_by_id[str(model_id)] = deployment
+        if len(deployments_by_id) == 0:
+            return None
+
+        ring = self._get_ring(tuple(sorted(deployments_by_id)))
+        total_in_flight = sum(
+            self.in_flight_requests.get(model_id, 0) for model_id in deployments_by_id
+        )
+        capacity = math.ceil(
+            self.load_factor * (total_in_flight + 1) / len(deployments_by_id)
+        )
+        for model_id in ring.iter_model_ids(prefix_hash):
+            if self.in_flight_requests.get(model_id, 0) < capacity:
+                return deployments_by_id[model_id]
+        return None
+
+    async def async_filter_deployments(
+        self,
+        model: str,
+        healthy_deployments: List,
+        messages: Optional[List[AllMessageValues]],
+        request_kwargs: Optional[dict] = None,
+        parent_otel_span: Optional[Span] = None,
+    ) -> List[dict]:
+        if len(healthy_deployments) <= 1:
+            return healthy_deployments
+
+        prefix_hash = get_prefix_hash(
+            messages=messages,
+            tools=(request_kwargs or {}).get("tools", None),
+            min_prefix_chars=self.min_prefix_chars,
+        )
+        if prefix_hash is None:
+            return healthy_deployments
+
+        deployment = self.get_deployment_for_prefix(
+            prefix_hash=prefix_hash, healthy_deployments=healthy_deployments
+        )
+        if deployment is None:
+            return healthy_deployments
+        verbose_router_logger.debug(
+            f"prefix_affinity: model={model}, routing to deployment={deployment.get('model_info', {}).get('id')}"
+        )
+        return [deployment]
+
+    async def async_pre_call_check(
+        self, deployment: dict, parent_otel_span: Optional[Span]
+    ) -> Optional[dict]:
+        model_id = (deployment.get("model_info") or {}).get("id")
+        if model_id is not None:
+            with self._lock:
+                self.in_flight_requests[str(model_id)] = (
+                    self.in_flight_requests.get(str(model_id), 0) + 1
+                )
+        return deployment
+
+    def _decrement_in_flight_requests(self, kwargs: dict) -> None:
+        litellm_params = kwargs.get("litellm_params") or {}
+        model_id = (litellm_params.get("model_info") or {}).get("id")
+        if model_id is None:
+            return
+        with self._lock:
+            self.in_flight_requests[str(model_id)] = max(
+                self.in_flight_requests.get(str(model_id), 0) - 1, 0
+            )
+
+    async def async_log_success_event(self, kwargs, response_obj, start_time, end_time):
+        self._decrement_in_flight_requests(kwargs)
+
+    async def async_log_failure_event(self, kwargs, response_obj, start_time, end_time):
+        self._decrement_in_flight_requests(kwargs)
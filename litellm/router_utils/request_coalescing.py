@@ -0,0 +1,247 @@
+"""
+Request coalescing (singleflight) for the Router.
+
+Concurrent `acompletion` / `aembedding` calls with the same cache key share one call to the provider - the first call
+runs, and identical calls made while it's in flight wait for its response, instead of each reaching the provider
+before the response cache is filled.
+
+- Each caller gets its own copy of the response. Coalesced callers' responses have `_hidden_params["coalesced_request"] = True`.
+- Streams fan out: each caller gets its own iterator over the one provider stream, replayed from the first chunk.
+- Coalesced callers are not sent to the provider, so they're not logged as separate LLM calls. Only requests of the same
+  caller (api key + end user) are coalesced - one caller's requests are never answered by another caller's call.
+- The provider call is cancelled once every caller waiting on it is cancelled.
+"""
+
+import asyncio
+import copy
+from typing import Any, Callable, Dict, List, Optional
+
+from litellm._logging import verbose_router_logger
+from litellm.caching.caching import Cache
+from litellm.types.router import RequestCoalescingConfig
+
+
+class _StreamBroadcaster:
+    """
+    Reads the provider stream once, on demand of the fastest subscriber, and keeps the chunks for the others.
+    """
+
+    def __init__(self, stream: Any, on_done: Callable[[], None]):
+        self.stream = stream
+        self.chunks: List[Any] = []
+        self.done = False
+        self.exception: Optional[Exception] = None
+        self._on_done = on_done
+        self._lock = asyncio.Lock()
+
+    async def get_chunk(self, idx: int) -> Any:
+        while idx >= len(self.chunks):
+            if self.exception is not None:
+                raise self.exception
+            if self.done:
+                raise StopAsyncIteration
+            async with self._lock:
+                if idx < len(self.chunks) or self.done or self.exception is not None:
+                    continue
+                try:
+                    self.chunks.append(await self.stream.__anext__())
+                except StopAsyncIteration:
+                    self.done = True
+                    self._on_done()
+                except Exception as e:
+                    self.exception = e
+                    self._on_done()
+        return self.chunks[idx]
+
+
+class CoalescedStream:
+    """
+    One subscriber's iterator over a shared provider stream. Other attributes are read from the provider stream.
+    """
+
+    def __init__(self, broadcaster: _StreamBroadcaster, copy_chunks: bool):
+        self._broadcaster = broadcaster
+        self._copy_chunks = copy_chunks
+        self._idx = 0
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Any:
+        chunk = await self._broadcaster.get_chunk(self._idx)
+        self._idx += 1
+        if self._copy_chunks:
+            return copy.deepcopy(chunk)
+        return chunk
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._broadcaster.stream, name)
+
+
+class _InFlightRequest:
+    __slots__ = ("task", "broadcaster", "callers")
+
+    def __init__(self):
+        self.task: Optional["asyncio.Future[Any]"] = None
+        self.broadcaster: Optional[_StreamBroadcaster] = None
+        # callers waiting on the task - the task is cancelled when the last one leaves
+        self.callers = 0
+
+
+class RequestCoalescer:
+    def __init__(self, request_coalescing_config: RequestCoalescingConfig):
+        self.request_coalescing_config = request_coalescing_config
+        self.in_flight_requests: Dict[str, _InFlightRequest] = {}
+
+    def should_coalesce(self, call_type: str, kwargs: dict) -> bool:
+        if call_type not in self.request_coalescing_config.call_types:
+            return False
+        cache_control = kwargs.get("cache") or {}
+        if isinstance(cache_control, dict) and cache_control.get("no-cache") is True:
+            return False
+        if (
+            call_type == "acompletion"
+            and self.request_coalescing_config.deterministic_only
+            and kwargs.get("temperature") != 0
+        ):
+            return False
+        return True
+
+    @staticmethod
+    def _get_caller_identity(kwargs: dict) -> str:
+        """
+        The (hashed) api key + end user a request is billed to - requests of different callers are never coalesced.
+        """
+        metadata = kwargs.get("litellm_metadata") or kwargs.get("metadata") or {}
+        if not isinstance(metadata, dict):
+            return ""
+        return "{}:{}".format(
+            metadata.get("user_api_key") or "",
+            metadata.get("user_api_key_end_user_id") or "",
+        )
+
+    @staticmethod
+    def get_coalescing_key(call_type: str, kwargs: dict) -> str:
+        """
+        Same hash as the response cache key - without its namespace / preset key, so it's stable whether or not caching is on.
+
+        Scoped to the caller, so requests of different api keys / end users are never merged.
+        """
+        return "{}:{}:{}".format(
+            call_type,
+            RequestCoalescer._get_caller_identity(kwargs),
+            Cache._get_hashed_cache_key(Cache._get_unhashed_cache_key(**kwargs)),
+        )
+
+    async def async_coalesced_call(
+        self, original_function: Callable, call_type: str, kwargs: dict
+    ) -> Any:
+        """
+        Run `original_function(**kwargs)`, or wait for an identical in-flight call.
+        """
+        coalescing_key = self.get_coalescing_key(call_type=call_type, kwargs=kwargs)
+        in_flight_request = self.in_flight_requests.get(coalescing_key)
+        if in_flight_request is None:
+            if (
+                len(self.in_flight_requests)
+                >= self.request_coalescing_config.max_in_flight_keys
+            ):
+                return await original_function(**kwargs)
+            in_flight_request = self._start_in_flight_request(
+                original_function=original_function,
+                coalescing_key=coalescing_key,
+                kwargs=kwargs,
+            )
+            is_leader = True
+        else:
+            verbose_router_logger.debug(
+                f"Coalescing {call_type} request with in-flight request, key={coalescing_key}"
+            )
+            is_leader = False
+
+        response = await self._wait_for_in_flight_request(
+            in_flight_request=in_flight_request, coalescing_key=coalescing_key
+        )
+        if in_flight_request.broadcaster is not None:
+            return CoalescedStream(
+                broadcaster=in_flight_request.broadcaster, copy_chunks=not is_leader
+            )
+        if is_leader:
+            return response
+        response = copy.deepcopy(response)
+        if hasattr(response, "_hidden_params"):
+            response._hidden_params["coalesced_request"] = True
+        return response
+
+    def _start_in_flight_request(
+        self, original_function: Callable, coalescing_key: str, kwargs: dict
+    ) -> _InFlightRequest:
+        in_flight_request = _InFlightRequest()
+
+        def _remove_in_flight_request() -> None:
+            if self.in_flight_requests.get(coalescing_key) is in_flight_request:
+                self.in_flight_requests.pop(coalescing_key, None)
+
+        async def _call() -> Any:
+            try:
+                response = await original_function(**kwargs)
+            except BaseException:
+                _remove_in_flight_request()
+                raise
+            if kwargs.get("stream", False) is True and hasattr(response, "__anext__"):
+                # set before any caller wakes up - keep accepting subscribers until the stream ends
+                in_flight_request.broadcaster = _StreamBroadcaster(
+                    stream=response, on_done=_remove_in_flight_request
+                )
+            else:
+                _remove_in_flight_request()
+            return response
+
+        in_flight_request.task = asyncio.ensure_future(_call())
+        self.in_flight_requests[coalescing_key] = in_flight_request
+        return in_flight_request
+
+    async def _wait_for_in_flight_request(
+        self, in_flight_request: _InFlightRequest, coalescing_key: str
+    ) -> Any:
+        """
+        Wait for the shared call. A cancelled caller doesn't cancel the call for the others - the last one to leave does.
+        """
+        task = in_flight_request.task
+        assert task is not None
+        in_flight_request.callers += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            in_flight_request.callers -= 1
+            if in_flight_request.callers == 0:
+                await self._abandon_in_flight_request(
+                    in_flight_request=in_flight_request, coalescing_key=coalescing_key
+                )
+            raise
+
+    async def _abandon_in_flight_request(
+        self, in_flight_request: _InFlightRequest, coalescing_key: str
+    ) -> None:
+        """
+        No caller is left to read the response - cancel the provider call, or close a stream nobody consumes.
+        """
+        if self.in_flight_requests.get(coalescing_key) is in_flight_request:
+            self.in_flight_requests.pop(coalescing_key, None)
+        task = in_flight_request.task
+        if task is None:
+            return
+        if not task.done():
+            task.cancel()
+            return
+        if task.cancelled() or task.exception() is not None:
+            return
+        if in_flight_request.broadcaster is not None:
+            aclose = getattr(in_flight_request.broadcaster.stream, "aclose", None)
+            if aclose is not None:
+                try:
+                    await aclose()
+                except Exception as e:
+                    verbose_router_logger.debug(
+                        f"Error closing abandoned coalesced stream: {str(e)}"
+                    )
@@ -0,0 +1,247 @@
+"""
+Hedged requests for the Router.
+
+If the first deployment hasn't responded by the model group's observed p95 (configurable), send one backup
+request to a different deployment in the group, return whichever responds first, and cancel the other.
+
+Unlike `abatch_completion_fastest_response`, which always pays for every call, this only sends a backup
+for the slowest requests - and the number of backups per model group is capped at `max_hedge_ratio`
+of its requests, per minute.
+
+For streaming requests, a deployment has "responded" once the stream is opened.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+from litellm._logging import verbose_router_logger
+from litellm.router_strategy.lowest_latency import (
+    _add_latency_sample,
+    get_latency_statistic,
+)
+from litellm.router_utils.cooldown_handlers import _async_get_cooldown_deployments
+from litellm.types.router import HedgingConfig
+
+if TYPE_CHECKING:
+    from litellm.router import Router as _Router
+
+    LitellmRouter = _Router
+else:
+    LitellmRouter = Any
+
+HEDGE_BUDGET_WINDOW_SECONDS = 60
+
+
+class _HedgeBudget:
+    __slots__ = ("window_start", "requests", "hedges")
+
+    def __init__(self, window_start: float):
+        self.window_start = window_start
+        self.requests = 0
+        self.hedges = 0
+
+
+class RequestHedger:
+    def __init__(
+        self, llm_router_instance: LitellmRouter, hedging_config: HedgingConfig
+    ):
+        self.llm_router_instance = llm_router_instance
+        self.hedging_config = hedging_config
+        self.latency_samples: Dict[str, List[float]] = {}  # {model_group: [seconds]}
+        self.budgets: Dict[str, _HedgeBudget] = {}
+        self._lock = threading.Lock()
+
+    def should_hedge(self, model_group: Optional[str], kwargs: dict) -> bool:
+        if model_group is None:
+            return False
+        if (
+            self.hedging_config.model_groups is not None
+            and model_group not in self.hedging_config.model_groups
+        ):
+            return False
+        if kwargs.get("specific_deployment", None) is True:
+            return False
+        return len(self._get_deployment_ids(model_group)) > 1
+
+    def _get_deployment_ids(self, model_group: str) -> List[str]:
+        return [
+            deployment["model_info"]["id"]
+            for deployment in self.llm_router_instance._get_all_deployments(
+                model_name=model_group
+            )
+            if (deployment.get("model_info") or {}).get("id") is not None
+        ]
+
+    def record_latency(self, model_group: str, latency: float) -> None:
+        with self._lock:
+            samples = self.latency_samples.setdefault(model_group, [])
+            _add_latency_sample(
+                samples=samples,
+                value=float(latency),
+                max_size=self.hedging_config.max_latency_samples,
+            )
+
+    def get_hedge_delay(self, model_group: str) -> Optional[float]:
+        """
+        Seconds to wait on the first deployment before sending a backup request.
+
+        None until the model group has `min_latency_samples` samples.
+        """
+        samples = self.latency_samples.get(model_group)
+        if samples is None or len(samples) < self.hedging_config.min_latency_samples:
+            return None
+        return get_latency_statistic(
+            samples=samples, statistic=self.hedging_config.latency_statistic
+        )
+
+    def _record_request(self, model_group: str) -> None:
+        current_time = time.monotonic()
+        with self._lock:
+            budget = self.budgets.get(model_group)
+            if (
+                budget is None
+                or current_time - budget.window_start >= HEDGE_BUDGET_WINDOW_SECONDS
+            ):
+                budget = _HedgeBudget(window_start=current_time)
+                self.budgets[model_group] = budget
+            budget.requests += 1
+
+    def _try_acquire_hedge(self, model_group: str) -> bool:
+        with self._lock:
+            budget = self.budgets.get(model_group)
+            if budget is None:
+                return False
+            if (
+                budget.hedges + 1
+                > self.hedging_config.max_hedge_ratio * budget.requests
+            ):
+                return False
+            budget.hedges += 1
+            return True
+
+    async def _get_backup_deployment_id(
+        self, model_group: str, primary_deployment_id: Optional[str]
+    ) -> Optional[str]:
+        cooldown_deployments = await _async_get_cooldown_deployments(
+            litellm_router_instance=self.llm_router_instance, parent_otel_span=None
+        )
+        candidates = [
+            model_id
+            for model_id in self._get_deployment_ids(model_group)
+            if model_id != primary_deployment_id
+            and model_id not in cooldown_deployments
+        ]
+        if len(candidates) == 0:
+            return None
+        return random.choice(candidates)
+
+    async def async_hedged_call(
+        self,
+        original_function: Callable,
+        model_group: str,
+        metadata_variable_name: str,
+        kwargs: dict,
+    ) -> Any:
+        """
+        Run `original_function(**kwargs)`, sending one backup request to a different deployment
+        if it's slower than the model group's hedge delay.
+        """
+        self._record_request(model_group)
+
+        # own metadata dict, to read back which deployment the router picked
+        primary_kwargs = {
+            **kwargs,
+            metadata_variable_name: dict(kwargs.get(metadata_variable_name) or {}),
+        }
+        primary_start_time = time.monotonic()
+        primary_task = asyncio.ensure_future(original_function(**primary_kwargs))
+
+        hedge_delay = self.get_hedge_delay(model_group)
+        if hedge_delay is not None:
+            try:
+                done, _ = await asyncio.wait({primary_task}, timeout=hedge_delay)
+            except asyncio.CancelledError:
+                primary_task.cancel()
+                raise
+            if len(done) == 0 and self._try_acquire_hedge(model_group):
+                primary_deployment_id = (
+                    primary_kwargs[metadata_variable_name].get("model_info") or {}
+                ).get("id")
+                backup_deployment_id = await self._get_backup_deployment_id(
+                    model_group=model_group,
+                    primary_deployment_id=primary_deployment_id,
+                )
+                if backup_deployment_id is not None:
+                    return await self._race(
+                        original_function=original_function,
+                        model_group=model_group,
+                        metadata_variable_name=metadata_variable_name,
+                        kwargs=kwargs,
+                        primary_task=primary_task,
+                        primary_start_time=primary_start_time,
+                        backup_deployment_id=backup_deployment_id,
+                    )
+
+        response = await primary_task
+        self.record_latency(model_group, time.monotonic() - primary_start_time)
+        return response
+
+    async def _race(
+        self,
+        original_function: Callable,
+        model_group: str,
+        metadata_variable_name: str,
+        kwargs: dict,
+        primary_task: "asyncio.Future[Any]",
+        primary_start_time: float,
+        backup_deployment_id: str,
+    ) -> Any:
+        verbose_router_logger.debug(
+            f"Hedging request for model_group={model_group}, backup deployment={backup_deployment_id}"
+        )
+        backup_kwargs = {
+            **kwargs,
+            "model": backup_deployment_id,  # route straight to the backup deployment
+            metadata_variable_name: dict(kwargs.get(metadata_variable_name) or {}),
+        }
+        backup_start_time = time.monotonic()
+        backup_task = asyncio.ensure_future(original_function(**backup_kwargs))
+
+        pending = {primary_task, backup_task}
+        primary_exception: Optional[BaseException] = None
+        backup_exception: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    exception = task.exception()
+                    if exception is not None:
+                        if task is primary_task:
+                            primary_exception = exception
+                        else:
+                            backup_exception = exception
+                        continue
+
+                    current_time = time.monotonic()
+                    # the primary is always recorded - if it lost, its elapsed time is a lower bound of its latency
+                    self.record_latency(model_group, current_time - primary_start_time)
+                    if task is backup_task:
+                        self.record_latency(
+                            model_group, current_time - backup_start_time
+                        )
+                    response = task.result()
+                    if hasattr(response, "_hidden_params"):
+                        response._hidden_params["hedged_request"] = True
+                    return response
+        finally:
+            # cancel the slower call
+            for task in (primary_task, backup_task):
+                if not task.done():
+                    task.cancel()
+
+        raise primary_exception or backup_exception  # type: ignore
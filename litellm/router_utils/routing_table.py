@@ -0,0 +1,250 @@
+"""
+Precompiled per-model-group routing tables for the Router.
+
+The router's hot path (`_common_checks_available_deployment` -> `_pre_call_checks`)
+used to re-derive the same facts from plain deployment dicts on every request:
+context windows (via `get_router_model_info`), regions (via `LiteLLM_Params(**...)`),
+rpm limits and supported openai params.
+
+A `ModelGroupRoutingTable` holds those facts as compact, position-aligned lists,
+compiled once per model-list version. `RouterRoutingTables` owns the tables and is
+invalidated by the Router whenever `set_model_list` / `upsert_deployment` /
+`delete_deployment` change the model list, and recompiled when `litellm.model_cost`
+is replaced or `register_model` changes it.
+"""
+
+import threading
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, List, Optional, Tuple
+
+import litellm
+from litellm._logging import verbose_router_logger
+from litellm.types.router import LiteLLM_Params
+
+if TYPE_CHECKING:
+    from litellm.router import Router as _Router
+
+    LitellmRouter = _Router
+else:
+    LitellmRouter = Any
+
+
+class ModelGroupRoutingTable:
+    """
+    Compiled routing facts for a single model group.
+
+    All lists are aligned with `deployments` - position `i` describes `deployments[i]`.
+    Entries that could not be resolved at compile time are `None`, and callers should
+    treat them the same way `_pre_call_checks` treats a missing value (no filtering).
+    """
+
+    __slots__ = (
+        "model_group",
+        "deployments",
+        "model_ids",
+        "id_to_position",
+        "resolved_models",
+        "provider_models",
+        "custom_llm_providers",
+        "max_input_tokens",
+        "regions",
+        "rpm_limits",
+        "_supported_openai_params",
+        "_supported_openai_params_compiled",
+    )
+
+    def __init__(self, model_group: str, deployments: List[Dict]):
+        self.model_group = model_group
+        self.deployments: List[Dict] = deployments
+        self.model_ids: List[str] = []
+        self.id_to_position: Dict[str, int] = {}
+        self.resolved_models: List[Optional[str]] = []
+        self.provider_models: List[Optional[str]] = []
+        self.custom_llm_providers: List[Optional[str]] = []
+        self.max_input_tokens: List[Optional[int]] = []
+        self.regions: List[Optional[str]] = []
+        self.rpm_limits: List[Optional[int]] = []
+        self._supported_openai_params: List[Optional[FrozenSet[str]]] = []
+        self._supported_openai_params_compiled: List[bool] = []
+
+    def compile(self, llm_router_instance: LitellmRouter) -> "ModelGroupRoutingTable":
+        for position, deployment in enumerate(self.deployments):
+            _litellm_params: dict = deployment.get("litellm_params", {}) or {}
+            _model_info: dict = deployment.get("model_info", {}) or {}
+
+            model_id = _model_info.get("id", "")
+            self.model_ids.append(model_id)
+            self.id_to_position[model_id] = position
+
+            base_model = _model_info.get("base_model", None) or _litellm_params.get(
+                "base_model", None
+            )
+            self.resolved_models.append(base_model or _litellm_params.get("model"))
+
+            self.max_input_tokens.append(
+                self._get_max_input_tokens(
+                    llm_router_instance=llm_router_instance, deployment=deployment
+                )
+            )
+
+            rpm = _litellm_params.get("rpm", None)
+            self.rpm_limits.append(rpm if isinstance(rpm, int) else None)
+
+            region_name: Optional[str] = None
+            provider_model: Optional[str] = None
+            custom_llm_provider: Optional[str] = None
+            try:
+                _typed_params = LiteLLM_Params(**_litellm_params)
+                region_name = _typed_params.region_name
+                provider_model, custom_llm_provider, _, _ = litellm.get_llm_provider(
+                    model=self.resolved_models[-1] or "",
+                    litellm_params=_typed_params,
+                )
+            except Exception as e:
+                verbose_router_logger.debug(
+                    "routing_table: unable to resolve provider for deployment={}. Got - {}".format(
+                        model_id, str(e)
+                    )
+                )
+            self.regions.append(region_name)
+            self.provider_models.append(provider_model)
+            self.custom_llm_providers.append(custom_llm_provider)
+
+            self._supported_openai_params.append(None)
+            self._supported_openai_params_compiled.append(False)
+        return self
+
+    def _get_max_input_tokens(
+        self, llm_router_instance: LitellmRouter, deployment: Dict
+    ) -> Optional[int]:
+        try:
+            model_info = llm_router_instance.get_router_model_info(
+                deployment=deployment, received_model_name=self.model_group
+            )
+        except Exception:
+            return None
+        max_input_tokens = model_info.get("max_input_tokens", None)
+        if isinstance(max_input_tokens, int):
+            return max_input_tokens
+        return None
+
+    def get_position(self, deployment: Dict) -> Optional[int]:
+        """
+        Return the table position of a deployment dict, if it was compiled into this table.
+
+        Only the exact dict objects held by the router are matched - copies produced by
+        wildcard routing or model-group aliases carry a rewritten `litellm_params.model`,
+        so they fall back to the uncompiled path.
+        """
+        model_id = (deployment.get("model_info") or {}).get("id")
+        if model_id is None:
+            return None
+        position = self.id_to_position.get(model_id)
+        if position is None or self.deployments[position] is not deployment:
+            return None
+        return position
+
+    def get_supported_openai_params(self, position: int) -> Optional[FrozenSet[str]]:
+        """
+        Supported openai params are only needed when `litellm.drop_params` is False,
+        so they are resolved on first use and memoized for the life of the table.
+        """
+        if not self._supported_openai_params_compiled[position]:
+            supported: Optional[FrozenSet[str]] = None
+            model = self.provider_models[position]
+            custom_llm_provider = self.custom_llm_providers[position]
+            if model is not None and custom_llm_provider is not None:
+                try:
+                    _params = litellm.get_supported_openai_params(
+                        model=model, custom_llm_provider=custom_llm_provider
+                    )
+                    if _params is not None:
+                        supported = frozenset(_params)
+                except Exception:
+                    supported = None
+            self._supported_openai_params[position] = supported
+            self._supported_openai_params_compiled[position] = True
+        return self._supported_openai_params[position]
+
+
+class RouterRoutingTables:
+    """
+    Holds one `ModelGroupRoutingTable` per model group.
+
+    Tables are compiled on first use after each model-list change and reused until
+    `invalidate()` is called, so the cost of parsing deployment dicts is paid once
+    per model-list version instead of once per request.
+
+    Context windows come from `litellm.model_cost` - tables are also dropped when it is
+    replaced (e.g. a proxy model cost map reload) or `register_model` updates it.
+    """
+
+    def __init__(self, llm_router_instance: LitellmRouter):
+        self.llm_router_instance = llm_router_instance
+        self._tables: Dict[str, ModelGroupRoutingTable] = {}
+        self._model_ids: Optional[List[str]] = None
+        self._version = 0
+        self._model_cost_fingerprint = self._get_model_cost_fingerprint()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_model_cost_fingerprint() -> Tuple[int, int]:
+        return id(litellm.model_cost), litellm.model_cost_version
+
+    def _check_model_cost_map(self) -> None:
+        model_cost_fingerprint = self._get_model_cost_fingerprint()
+        if model_cost_fingerprint == self._model_cost_fingerprint:
+            return
+        with self._lock:
+            self._tables = {}
+            self._version += 1
+            self._model_cost_fingerprint = model_cost_fingerprint
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._tables = {}
+            self._model_ids = None
+            self._version += 1
+
+    def get_model_ids(self) -> List[str]:
+        """
+        All deployment ids on the router, memoized per model-list version.
+
+        Callers must not mutate the returned list.
+        """
+        model_ids = self._model_ids
+        if model_ids is not None:
+            return model_ids
+        with self._lock:
+            version = self._version
+        model_ids = self.llm_router_instance.get_model_ids()
+        with self._lock:
+            if version == self._version:
+                self._model_ids = model_ids
+        return model_ids
+
+    def get_table(self, model_group: str) -> Optional[ModelGroupRoutingTable]:
+        self._check_model_cost_map()
+        table = self._tables.get(model_group)
+        if table is not None:
+            return table
+
+        with self._lock:
+            version = self._version
+        deployments = self.llm_router_instance._get_all_deployments(
+            model_name=model_group
+        )
+        if len(deployments) == 0:
+            return None
+        table = ModelGroupRoutingTable(
+            model_group=model_group, deployments=list(deployments)  # type: ignore
+        ).compile(llm_router_instance=self.llm_router_instance)
+
+        with self._lock:
+            # skip caching a table compiled against a model list that changed mid-compile
+            if version == self._version:
+                self._tables[model_group] = table
+        return table
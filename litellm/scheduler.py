@@ -1,19 +1,49 @@
+import asyncio
 import enum
 import heapq
-from typing import Optional
+import itertools
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
 
 from pydantic import BaseModel
 
+import litellm
 from litellm import print_verbose
-from litellm.caching.caching import DualCache, RedisCache
-from litellm.constants import DEFAULT_IN_MEMORY_TTL, DEFAULT_POLLING_INTERVAL
+from litellm._logging import verbose_router_logger
+from litellm.caching.caching import RedisCache
+from litellm.constants import DEFAULT_POLLING_INTERVAL
+
+# Scores order by priority, then enqueue time (ms) - fits in a double's 53 bit mantissa for priorities <= 255
+_PRIORITY_SCORE_MULTIPLIER = 10**13
+
+# Pop the request if it's at the head of the queue (or no longer queued). Heads enqueued more than
+# `stale_after_ms` ago (e.g. their instance died) are dropped, so they can't block the queue.
+POP_IF_HEAD_SCRIPT = """
+local key = KEYS[1]
+local member = ARGV[1]
+local now_ms = tonumber(ARGV[2])
+local stale_after_ms = tonumber(ARGV[3])
+if not redis.call('ZSCORE', key, member) then
+    return 1
+end
+while true do
+    local head = redis.call('ZRANGE', key, 0, 0)[1]
+    if head == member then
+        redis.call('ZREM', key, member)
+        return 1
+    end
+    local enqueued_ms = tonumber(string.match(head, '^(%d+):'))
+    if enqueued_ms ~= nil and now_ms - enqueued_ms > stale_after_ms then
+        redis.call('ZREM', key, head)
+    else
+        return 0
+    end
+end
+"""
 
 
 class SchedulerCacheKeys(enum.Enum):
     queue = "scheduler:queue"
-    default_in_memory_ttl = (
-        DEFAULT_IN_MEMORY_TTL  # cache queue in-memory for 5s when redis cache available
-    )
 
 
 class FlowItem(BaseModel):
@@ -23,7 +53,14 @@ class FlowItem(BaseModel):
 
 
 class Scheduler:
-    cache: DualCache
+    """
+    Event-driven priority queue, per model group.
+
+    - Waiting requests block on their own asyncio.Event - nothing runs while the queue is idle.
+    - When the head of the queue is popped / removed, or deployment capacity frees up, only the next head is woken.
+    - With a redis cache, requests are also added to a redis sorted set per model group, to order them across instances.
+      Only each instance's local head checks the sorted set (every `polling_interval`), and pops itself atomically.
+    """
 
     def __init__(
         self,
@@ -31,33 +68,132 @@ class Scheduler:
         redis_cache: Optional[RedisCache] = None,
     ):
         """
-        polling_interval: float or null - frequency of polling queue. Default is 3ms.
+        polling_interval: float or null - how often an instance's head of the queue re-checks the redis queue, for requests on other instances. Default is 30ms.
         """
-        self.queue: list = []
-        default_in_memory_ttl: Optional[float] = None
-        if redis_cache is not None:
-            # if redis-cache available frequently poll that instead of using in-memory.
-            default_in_memory_ttl = SchedulerCacheKeys.default_in_memory_ttl.value
-        self.cache = DualCache(
-            redis_cache=redis_cache, default_in_memory_ttl=default_in_memory_ttl
-        )
-        self.polling_interval = (
-            polling_interval or DEFAULT_POLLING_INTERVAL
-        )  # default to 3ms
+        self.redis_cache = redis_cache
+        self.polling_interval = polling_interval or DEFAULT_POLLING_INTERVAL
+        # {model_name: heap of (priority, sequence, request_id)}. Removed requests are dropped lazily.
+        self.queues: Dict[str, List[Tuple[int, int, str]]] = {}
+        self.queued_request_ids: Set[str] = set()
+        self._waiters: Dict[str, asyncio.Event] = {}
+        self._redis_members: Dict[str, str] = {}
+        self._sequence = itertools.count()
+        self._pop_if_head_script: Optional[Any] = None
+
+    def _get_redis_key(self, model_name: str) -> str:
+        _cache_key = "{}:{}".format(SchedulerCacheKeys.queue.value, model_name)
+        if self.redis_cache is not None:
+            return self.redis_cache.check_and_fix_namespace(key=_cache_key)
+        return _cache_key
 
     async def add_request(self, request: FlowItem):
         # We use the priority directly, as lower values indicate higher priority
-        # get the queue
-        queue = await self.get_queue(model_name=request.model_name)
-        # update the queue
-        heapq.heappush(queue, (request.priority, request.request_id))
+        heapq.heappush(
+            self.queues.setdefault(request.model_name, []),
+            (request.priority, next(self._sequence), request.request_id),
+        )
+        self.queued_request_ids.add(request.request_id)
+        self._waiters[request.request_id] = asyncio.Event()
+
+        if self.redis_cache is not None:
+            enqueued_ms = int(time.time() * 1000)
+            member = "{}:{}".format(enqueued_ms, request.request_id)
+            try:
+                _redis_client: Any = self.redis_cache.init_async_client()
+                await _redis_client.zadd(
+                    self._get_redis_key(request.model_name),
+                    {
+                        member: request.priority * _PRIORITY_SCORE_MULTIPLIER
+                        + enqueued_ms
+                    },
+                )
+                self._redis_members[request.request_id] = member
+            except Exception as e:
+                verbose_router_logger.warning(
+                    f"Scheduler: failed to add request to redis queue, ordering locally. Error: {str(e)}"
+                )
+
+    def _get_local_head(self, model_name: str) -> Optional[str]:
+        queue = self.queues.get(model_name)
+        while queue:
+            request_id = queue[0][2]
+            if request_id in self.queued_request_ids:
+                return request_id
+            heapq.heappop(queue)
+        return None
+
+    def _wake_up_head(self, model_name: str) -> None:
+        head = self._get_local_head(model_name)
+        if head is not None:
+            self._waiters[head].set()
+
+    def notify(self, model_name: str) -> None:
+        """Wake up the head of the model group's queue, e.g. when deployment capacity frees up."""
+        self._wake_up_head(model_name)
 
-        # save the queue
-        await self.save_queue(queue=queue, model_name=request.model_name)
+    async def _remove_request(
+        self, id: str, model_name: str, remove_from_redis: bool = True
+    ) -> None:
+        if id not in self.queued_request_ids:
+            return
+        self.queued_request_ids.discard(id)
+        self._waiters.pop(id, None)
+        member = self._redis_members.pop(id, None)
+        self._wake_up_head(model_name)
 
-    async def poll(self, id: str, model_name: str, health_deployments: list) -> bool:
+        if member is not None and remove_from_redis and self.redis_cache is not None:
+            try:
+                _redis_client: Any = self.redis_cache.init_async_client()
+                await _redis_client.zrem(self._get_redis_key(model_name), member)
+            except Exception as e:
+                verbose_router_logger.warning(
+                    f"Scheduler: failed to remove request from redis queue. Error: {str(e)}"
+                )
+
+    async def _pop_if_head(
+        self, id: str, model_name: str, stale_after: Optional[float] = None
+    ) -> bool:
+        if self._get_local_head(model_name) != id:
+            return False
+
+        member = self._redis_members.get(id)
+        if member is not None and self.redis_cache is not None:
+            try:
+                if self._pop_if_head_script is None:
+                    self._pop_if_head_script = self.redis_cache.async_register_script(
+                        POP_IF_HEAD_SCRIPT
+                    )
+                popped = await self._pop_if_head_script(
+                    keys=[self._get_redis_key(model_name)],
+                    args=[
+                        member,
+                        int(time.time() * 1000),
+                        int((stale_after or litellm.request_timeout) * 1000),
+                    ],
+                )
+                if not popped:
+                    return False
+            except Exception as e:
+                verbose_router_logger.warning(
+                    f"Scheduler: failed to pop request from redis queue, ordering locally. Error: {str(e)}"
+                )
+
+        await self._remove_request(
+            id=id, model_name=model_name, remove_from_redis=False
+        )
+        return True
+
+    async def poll(
+        self,
+        id: str,
+        model_name: str,
+        health_deployments: list,
+        stale_after: Optional[float] = None,
+    ) -> bool:
         """
-        Return if request can be processed.
+        Return if request can be processed. Pops the request from the queue, if True.
+
+        stale_after: seconds after which requests at the head of the redis queue are dropped. Defaults to `litellm.request_timeout`.
 
         Returns:
         - True:
@@ -67,70 +203,102 @@ class Scheduler:
             * If no healthy deployments available
             * AND request not at the top of queue
         """
-        queue = await self.get_queue(model_name=model_name)
-        if not queue:
-            raise Exception(
-                "Incorrectly setup. Queue is invalid. Queue={}".format(queue)
-            )
-
-        # ------------
-        # Setup values
-        # ------------
-
         print_verbose(f"len(health_deployments): {len(health_deployments)}")
-        if len(health_deployments) == 0:
-            print_verbose(f"queue: {queue}, seeking id={id}")
-            # Check if the id is at the top of the heap
-            if queue[0][1] == id:
-                # Remove the item from the queue
-                heapq.heappop(queue)
-                print_verbose(f"Popped id: {id}")
-                return True
-            else:
-                return False
+        if len(health_deployments) > 0:
+            await self._remove_request(id=id, model_name=model_name)
+            return True
 
-        return True
+        if await self._pop_if_head(
+            id=id, model_name=model_name, stale_after=stale_after
+        ):
+            print_verbose(f"Popped id: {id}")
+            return True
+        return False
 
-    async def peek(self, id: str, model_name: str, health_deployments: list) -> bool:
-        """Return if the id is at the top of the queue. Don't pop the value from heap."""
-        queue = await self.get_queue(model_name=model_name)
-        if not queue:
+    async def wait_for_turn(
+        self,
+        request: FlowItem,
+        get_healthy_deployments: Callable[[], Awaitable[list]],
+        timeout: float,
+    ) -> bool:
+        """
+        Block until the request can be processed (see `poll`), or `timeout` seconds pass.
+
+        Returns False on timeout. The request is removed from the queue either way.
+        """
+        end_time = time.monotonic() + timeout
+        waiter = self._waiters.get(request.request_id)
+        if waiter is None:
             raise Exception(
-                "Incorrectly setup. Queue is invalid. Queue={}".format(queue)
+                "Incorrectly setup. Request={} was not added to the queue".format(
+                    request.request_id
+                )
             )
+        try:
+            while True:
+                # clear before checking, so a wake up during the check isn't lost
+                waiter.clear()
+                healthy_deployments = await get_healthy_deployments()
+                if await self.poll(
+                    id=request.request_id,
+                    model_name=request.model_name,
+                    health_deployments=healthy_deployments,
+                    stale_after=timeout,  # no request waits longer
+                ):
+                    return True
 
-        # ------------
-        # Setup values
-        # ------------
+                remaining = end_time - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait_timeout = remaining
+                if (
+                    request.request_id in self._redis_members
+                    and self._get_local_head(request.model_name) == request.request_id
+                ):
+                    # the requests ahead of this one are on other instances - re-check the redis queue
+                    wait_timeout = min(remaining, self.polling_interval)
+                try:
+                    await asyncio.wait_for(waiter.wait(), timeout=wait_timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            await self._remove_request(
+                id=request.request_id, model_name=request.model_name
+            )
 
-        # Check if the id is at the top of the heap
-        if queue[0][1] == id:
-            return True
+    async def peek(self, id: str, model_name: str, health_deployments: list) -> bool:
+        """Return if the id is at the top of the queue. Don't pop the value from heap."""
+        if self._get_local_head(model_name) != id:
+            return False
 
-        return False
+        member = self._redis_members.get(id)
+        if member is not None and self.redis_cache is not None:
+            try:
+                _redis_client: Any = self.redis_cache.init_async_client()
+                head = await _redis_client.zrange(self._get_redis_key(model_name), 0, 0)
+                if head and head[0] not in (member, member.encode()):
+                    return False
+            except Exception as e:
+                verbose_router_logger.warning(
+                    f"Scheduler: failed to read redis queue, ordering locally. Error: {str(e)}"
+                )
+        return True
+
+    def get_queue_status(self) -> Dict[str, List[Tuple[int, str]]]:
+        """Get the status of items in the queue, on this instance"""
+        return {
+            model_name: self._get_sorted_queue(model_name) for model_name in self.queues
+        }
 
-    def get_queue_status(self):
-        """Get the status of items in the queue"""
-        return self.queue
+    def _get_sorted_queue(self, model_name: str) -> List[Tuple[int, str]]:
+        return [
+            (priority, request_id)
+            for priority, _, request_id in sorted(self.queues.get(model_name, []))
+            if request_id in self.queued_request_ids
+        ]
 
     async def get_queue(self, model_name: str) -> list:
         """
-        Return a queue for that specific model group
-        """
-        if self.cache is not None:
-            _cache_key = "{}:{}".format(SchedulerCacheKeys.queue.value, model_name)
-            response = await self.cache.async_get_cache(key=_cache_key)
-            if response is None or not isinstance(response, list):
-                return []
-            elif isinstance(response, list):
-                return response
-        return self.queue
-
-    async def save_queue(self, queue: list, model_name: str) -> None:
+        Return the queue of (priority, request_id) for that specific model group, on this instance
         """
-        Save the updated queue of the model group
-        """
-        if self.cache is not None:
-            _cache_key = "{}:{}".format(SchedulerCacheKeys.queue.value, model_name)
-            await self.cache.async_set_cache(key=_cache_key, value=queue)
-        return None
+        return self._get_sorted_queue(model_name)
@@ -11,9 +11,14 @@ class LiteLLMCacheType(str, Enum):
     REDIS_SEMANTIC = "redis-semantic"
     S3 = "s3"
     DISK = "disk"
+    DISK_MMAP = "disk-mmap"
     QDRANT_SEMANTIC = "qdrant-semantic"
     AZURE_BLOB = "azure-blob"
     GCS = "gcs"
+    TIERED = "tiered"
+    LOCAL_SEMANTIC = "local-semantic"
+    S3_SEGMENTS = "s3-segments"
+    GCS_SEGMENTS = "gcs-segments"
 
 
 CachingSupportedCallTypes = Literal[
@@ -26,6 +26,8 @@ ROUTING_STRATEGY_DESCRIPTIONS: Dict[str, str] = {
     "cost-based-routing": "Routes to the deployment with the lowest cost per token.",
     "usage-based-routing": "Routes to the deployment with the lowest TPM (Tokens Per Minute) usage. (deprecated)",
     "usage-based-routing-v2": "Improved version of usage-based routing with better tracking.",
+    "power-of-two-choices": "Samples two deployments at random and routes to the one with fewer ongoing requests on this instance.",
+    "join-shortest-queue": "Routes to the deployment with the lowest expected wait, based on ongoing requests and observed response time on this instance.",
 }
 
 
@@ -723,6 +723,53 @@ class RouterGeneralSettings(BaseModel):
     )  # if passed a model not llm_router model list, pass through the request to litellm.acompletion/embedding
 
 
+class HedgingConfig(BaseModel):
+    """
+    Hedged requests for `acompletion` / `aembedding`.
+
+    If the first deployment hasn't responded by the model group's observed `latency_statistic`,
+    one backup request is sent to a different deployment in the group, and the slower call is cancelled.
+    """
+
+    model_groups: Optional[List[str]] = None  # model groups to hedge. None = all model groups
+    max_hedge_ratio: float = 0.05  # max extra requests per model group, as a ratio of requests, per minute
+    latency_statistic: Literal["p50", "p90", "p95", "p99"] = "p95"
+    min_latency_samples: int = 20  # don't hedge until a model group has this many latency samples
+    max_latency_samples: int = 200
+
+
+class AdaptiveConcurrencyConfig(BaseModel):
+    """
+    Discover each deployment's concurrency limit at runtime, instead of hand-tuning `max_parallel_requests`.
+
+    The limit grows additively while latency stays near the deployment's baseline, and shrinks
+    multiplicatively on 429s / timeouts, or when latency rises above `latency_tolerance` x the baseline.
+    """
+
+    initial_limit: int = 10
+    min_limit: int = 1
+    max_limit: int = 1000  # a deployment's `max_parallel_requests` / rpm / tpm, if set, caps this
+    backoff_ratio: float = 0.5  # multiply the limit by this on 429s / timeouts
+    latency_backoff_ratio: float = 0.9  # multiply the limit by this when latency rises above tolerance
+    latency_tolerance: float = 2.0  # back off when latency > tolerance x baseline latency
+    reroute_when_saturated: bool = True  # route to deployments below their limit, before queueing
+
+
+class RequestCoalescingConfig(BaseModel):
+    """
+    Coalesce identical, concurrent `acompletion` / `aembedding` calls into one call to the provider.
+
+    Requests are identical if they have the same cache key (`litellm.Cache.get_cache_key`).
+    """
+
+    call_types: List[Literal["acompletion", "aembedding"]] = [
+        "acompletion",
+        "aembedding",
+    ]
+    deterministic_only: bool = True  # only coalesce acompletion calls with temperature=0
+    max_in_flight_keys: int = 1000  # calls beyond this many distinct in-flight requests are not coalesced
+
+
 class RouterRateLimitErrorBasic(ValueError):
     """
     Raise a basic error inside helper functions.
@@ -772,6 +819,8 @@ class RoutingStrategy(enum.Enum):
     USAGE_BASED_ROUTING_V2 = "usage-based-routing-v2"
     USAGE_BASED_ROUTING = "usage-based-routing"
     PROVIDER_BUDGET_LIMITING = "provider-budget-routing"
+    POWER_OF_TWO_CHOICES = "power-of-two-choices"
+    JOIN_SHORTEST_QUEUE = "join-shortest-queue"
 
 
 class RouterCacheEnum(enum.Enum):
@@ -794,6 +843,7 @@ OptionalPreCallChecks = List[
         "router_budget_limiting",
         "responses_api_deployment_check",
         "forward_client_headers_by_model_group",
+        "prefix_affinity",
     ]
 ]
 
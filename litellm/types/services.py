@@ -27,6 +27,7 @@ class ServiceTypes(str, enum.Enum):
     AUTH = "auth"
     PROXY_PRE_CALL = "proxy_pre_call"
     POD_LOCK_MANAGER = "pod_lock_manager"
+    TIERED_CACHE = "tiered_cache"
 
     """
     Operational metrics for DB Transaction Queues
@@ -83,6 +84,10 @@ DEFAULT_SERVICE_CONFIGS = {
     ServiceTypes.PROXY_PRE_CALL.value: {
         "metrics": [ServiceMetrics.COUNTER, ServiceMetrics.HISTOGRAM]
     },
+    # lookup latency + hit ratio per tier (gauge labelled by tier)
+    ServiceTypes.TIERED_CACHE.value: {
+        "metrics": [ServiceMetrics.HISTOGRAM, ServiceMetrics.GAUGE]
+    },
     # Operational metrics for DB Transaction Queues
     ServiceTypes.POD_LOCK_MANAGER.value: {"metrics": [ServiceMetrics.GAUGE]},
     ServiceTypes.IN_MEMORY_DAILY_SPEND_UPDATE_QUEUE.value: {
@@ -1584,6 +1584,14 @@ def client(original_function):  # noqa: PLR0915
             return result
         except Exception as e:
             call_type = original_function.__name__
+            if (
+                logging_obj is not None
+                and logging_obj._llm_caching_handler is not None
+                and not _is_async_request(kwargs)
+            ):  # async requests are negative-cached by the async wrapper
+                logging_obj._llm_caching_handler.sync_set_error_cache(
+                    exception=e, kwargs=kwargs, args=args
+                )
             if call_type == CallTypes.completion.value:
                 num_retries = (
                     kwargs.get("num_retries", None) or litellm.num_retries or None
@@ -1636,6 +1644,16 @@ def client(original_function):  # noqa: PLR0915
                     e, traceback_exception, start_time, end_time
                 )  # DO NOT MAKE THREADED - router retry fallback relies on this!
             raise e
+        finally:
+            # don't leave the request's cache refresh lock held until it expires - e.g. its response wasn't stored
+            if (
+                logging_obj is not None
+                and logging_obj._llm_caching_handler is not None
+                and not _is_async_request(kwargs)
+            ):
+                logging_obj._llm_caching_handler.sync_release_refresh_locks(
+                    kwargs=kwargs, result=result
+                )
 
     @wraps(original_function)
     async def wrapper_async(*args, **kwargs):  # noqa: PLR0915
@@ -1837,6 +1855,12 @@ def client(original_function):  # noqa: PLR0915
         except Exception as e:
             traceback_exception = traceback.format_exc()
             end_time = datetime.datetime.now()
+            await _llm_caching_handler.async_set_error_cache(
+                exception=e,
+                original_function=original_function,
+                kwargs=kwargs,
+                args=args,
+            )
             if logging_obj:
                 try:
                     logging_obj.failure_handler(
@@ -1898,6 +1922,9 @@ def client(original_function):  # noqa: PLR0915
             timeout = _get_wrapper_timeout(kwargs=kwargs, exception=e)
             setattr(e, "timeout", timeout)
             raise e
+        finally:
+            # also runs when the request is cancelled - don't leave its cache refresh lock held until it expires
+            _llm_caching_handler.release_refresh_locks(kwargs=kwargs, result=result)
 
     is_coroutine = get_coroutine_checker().is_async_callable(original_function)
 
@@ -2622,6 +2649,7 @@ def register_model(model_cost: Union[str, dict]):  # noqa: PLR0915
         ## override / add new keys to the existing model cost dictionary
         updated_dictionary = _update_dictionary(existing_model, value)
         litellm.model_cost.setdefault(model_cost_key, {}).update(updated_dictionary)
+        litellm.model_cost_version += 1
         verbose_logger.debug(
             f"added/updated model={model_cost_key} in litellm.model_cost: {model_cost_key}"
         )
@@ -0,0 +1,123 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(
+    0, os.path.abspath("../../..")
+)  # Adds the parent directory to the system path
+
+import litellm
+from litellm.caching.cache_codec import CacheCodec
+from litellm.caching.caching import Cache
+
+
+@pytest.mark.parametrize("serializer", ["json", "orjson"])
+def test_cache_codec_round_trip(serializer):
+    pytest.importorskip(serializer)
+    codec = CacheCodec(serializer=serializer, compression_threshold_bytes=256)
+    embedding = [0.5, -0.25, 0.125] * 100
+    value = {
+        "timestamp": 1.5,
+        "response": {"embedding": embedding, "index": 0, "model": "m"},
+        "messages": [{"content": "hi " * 200, "embedding": [1, 2]}],
+    }
+
+    encoded = codec.encode(value)
+    assert CacheCodec.is_encoded(encoded)
+    assert encoded[5] == 1  # compressed
+    # packed float32, instead of ~600 chars of json floats
+    assert len(encoded) < len(str(embedding))
+    assert CacheCodec.decode(encoded) == value
+
+    # small payloads aren't compressed
+    small = codec.encode({"response": "hi"})
+    assert small[5] == 0
+    assert CacheCodec.decode(small) == {"response": "hi"}
+
+
+def test_cache_codec_float16_embeddings():
+    embedding = [0.1] * 1024
+    float32_codec = CacheCodec(compression=None)
+    float16_codec = CacheCodec(compression=None, embedding_dtype="float16")
+    float16_payload = float16_codec.encode({"embedding": embedding})
+    float32_payload = float32_codec.encode({"embedding": embedding})
+    assert len(float16_payload) < len(float32_payload) * 0.6
+    assert CacheCodec.decode(float16_payload)["embedding"] == pytest.approx(
+        embedding, rel=1e-3
+    )
+    # values out of float16 range are kept as float32
+    assert CacheCodec.decode(float16_codec.encode({"embedding": [1e6, 0.5]})) == {
+        "embedding": [1e6, 0.5]
+    }
+
+
+def test_cache_codec_rejects_unknown_payloads():
+    assert CacheCodec.is_encoded(b'{"timestamp": 1}') is False
+    assert CacheCodec.is_encoded({"timestamp": 1}) is False
+    encoded = bytearray(CacheCodec(compression=None).encode({"a": 1}))
+    encoded[3] = 99  # version
+    with pytest.raises(ValueError):
+        CacheCodec.decode(bytes(encoded))
+    with pytest.raises(ValueError):
+        CacheCodec(compression="brotli")  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_response_cache_with_codec():
+    litellm.cache = Cache(type="local", cache_codec={"compression_threshold_bytes": 0})
+    try:
+        messages = [{"role": "user", "content": "cache codec test"}]
+        response1 = await litellm.acompletion(
+            model="gpt-3.5-turbo",
+            messages=messages,
+            mock_response="hello",
+            caching=True,
+        )
+        await asyncio.sleep(0.5)
+        cached_values = list(litellm.cache.cache.cache_dict.values())
+        assert len(cached_values) == 1
+        assert CacheCodec.is_encoded(cached_values[0])
+
+        response2 = await litellm.acompletion(
+            model="gpt-3.5-turbo",
+            messages=messages,
+            mock_response="hello",
+            caching=True,
+        )
+        assert response2.id == response1.id
+        assert response2.choices[0].message.content == "hello"
+
+        # entries written before the codec was set are still read
+        litellm.cache.cache.set_cache(
+            "legacy-key", {"timestamp": 1, "response": '{"id": "legacy"}'}
+        )
+        assert litellm.cache.get_cache(cache_key="legacy-key") == {"id": "legacy"}
+    finally:
+        litellm.cache = None
+
+
+@pytest.mark.asyncio
+async def test_embedding_cache_with_codec():
+    litellm.cache = Cache(type="local", cache_codec={})
+    try:
+        for _ in range(2):
+            response = await litellm.aembedding(
+                model="text-embedding-ada-002",
+                input=["cache codec test"],
+                mock_response=[0.5, 0.25],
+                caching=True,
+            )
+            await asyncio.sleep(0.5)
+        assert response._hidden_params.get("cache_hit") is True
+        assert response.data[0]["embedding"] == [0.5, 0.25]
+    finally:
+        litellm.cache = None
+
+
+def test_cache_codec_unsupported_cache_type():
+    with pytest.raises(ValueError):
+        Cache(type="s3", s3_bucket_name="bucket", cache_codec={})
+    with pytest.raises(ValueError):
+        Cache(type="tiered", cache_tiers=["local", "gcs"], cache_codec={})
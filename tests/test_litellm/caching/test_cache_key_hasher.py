@@ -0,0 +1,120 @@
+import os
+import sys
+import timeit
+
+import pytest
+
+sys.path.insert(
+    0, os.path.abspath("../../..")
+)  # Adds the parent directory to the system path
+
+from litellm.caching.cache_key_hasher import CacheKeyHasher
+from litellm.caching.caching import Cache
+from litellm.types.utils import Message
+
+
+def _kwargs(**overrides):
+    kwargs = {
+        "model": "gpt-4o",
+        "messages": [
+            {"role": "system", "content": "you are a helpful assistant"},
+            {"role": "user", "content": [{"type": "text", "text": "hello " * 1000}]},
+        ],
+        "temperature": 0.2,
+        "litellm_params": {},
+    }
+    kwargs.update(overrides)
+    return kwargs
+
+
+def test_cache_key_hasher_is_canonical():
+    hasher = CacheKeyHasher()
+    params = [("messages", [{"role": "user", "content": "hi"}]), ("max_tokens", 1)]
+
+    digest = hasher.hash_params(params)
+    assert len(digest) == 32
+    # dict key order doesn't matter
+    assert digest == hasher.hash_params(
+        [("messages", [{"content": "hi", "role": "user"}]), ("max_tokens", 1)]
+    )
+    # types and boundaries do
+    assert digest != hasher.hash_params(
+        [("messages", [{"role": "user", "content": "hi"}]), ("max_tokens", "1")]
+    )
+    assert hasher.hash_params([("a", ["bc"])]) != hasher.hash_params(
+        [("a", ["b", "c"])]
+    )
+    # pydantic messages hash like their dicts
+    assert hasher.hash_params(
+        [("messages", [Message(role="user", content="hi")])]
+    ) == hasher.hash_params(
+        [("messages", [Message(role="user", content="hi").model_dump()])]
+    )
+
+
+def test_cache_get_cache_key_with_hash_algorithm():
+    cache = Cache(cache_key_hash_algorithm="blake2b", namespace="team-a")
+    kwargs = _kwargs()
+
+    cache_key = cache.get_cache_key(**kwargs)
+    namespace, digest = cache_key.split(":")
+    assert namespace == "team-a" and len(digest) == 32
+    # memoized on the request
+    assert kwargs["litellm_params"]["preset_cache_key"] == cache_key
+
+    assert cache.get_cache_key(**_kwargs()) == cache_key
+    assert cache.get_cache_key(**_kwargs(temperature=0.3)) != cache_key
+    # not the default, sha256 cache key
+    assert Cache(namespace="team-a").get_cache_key(**_kwargs()) != cache_key
+    assert cache.get_cache_key(**_kwargs(litellm_call_id="other")) == cache_key
+
+
+@pytest.mark.parametrize(
+    "messages",
+    [
+        # long conversation
+        [{"role": "user", "content": "hello world " * 500} for _ in range(200)],
+        # many small text parts
+        [
+            {
+                "role": "user",
+                "content": [{"type": "text", "text": f"part {i}"} for i in range(5)],
+            }
+            for _ in range(2000)
+        ],
+    ],
+    ids=["long_messages", "many_text_parts"],
+)
+def test_cache_key_hasher_faster_than_cache_key_string(messages):
+    """
+    Benchmark against the default key path - SHA-256 of the cache key string.
+    """
+    hasher = CacheKeyHasher(algorithm="blake2b")
+    kwargs = _kwargs(messages=messages)
+
+    def _baseline_cache_key():
+        return Cache._get_hashed_cache_key(Cache._get_unhashed_cache_key(**kwargs))
+
+    def _hashed_cache_key():
+        return hasher.hash_params(Cache._get_cache_key_params(**kwargs))
+
+    baseline_time = min(timeit.repeat(_baseline_cache_key, number=3, repeat=5))
+    hashed_time = min(timeit.repeat(_hashed_cache_key, number=3, repeat=5))
+    assert hashed_time < baseline_time
+
+
+@pytest.mark.parametrize("algorithm", ["xxh3_128", "blake3"])
+def test_cache_key_hash_algorithm_optional_packages(algorithm):
+    package = {"xxh3_128": "xxhash", "blake3": "blake3"}[algorithm]
+    try:
+        __import__(package)
+    except ModuleNotFoundError:
+        with pytest.raises(ModuleNotFoundError, match=f"pip install {package}"):
+            CacheKeyHasher(algorithm=algorithm)
+    else:
+        assert len(CacheKeyHasher(algorithm=algorithm).hash_params([("a", 1)])) == 32
+
+
+def test_cache_key_hash_algorithm_unsupported():
+    with pytest.raises(ValueError):
+        Cache(cache_key_hash_algorithm="md5")  # type: ignore
@@ -0,0 +1,213 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(
+    0, os.path.abspath("../../..")
+)  # Adds the parent directory to the system path
+
+import litellm
+from litellm.caching.cache_stampede_protection import should_refresh_early
+from litellm.caching.caching import Cache
+
+
+@pytest.fixture
+def restore_cache():
+    original_cache = litellm.cache
+    yield
+    litellm.cache = original_cache
+
+
+def _context_window_error():
+    return litellm.ContextWindowExceededError(
+        message="This model's maximum context length is 8192 tokens",
+        model="gpt-4o",
+        llm_provider="openai",
+    )
+
+
+def _kwargs():
+    return {
+        "model": "gpt-4o",
+        "messages": [{"role": "user", "content": "hello"}],
+    }
+
+
+@pytest.mark.asyncio
+async def test_negative_cache_deterministic_errors(restore_cache):
+    litellm.cache = Cache(type="local", negative_cache_ttl=60)
+
+    with pytest.raises(litellm.ContextWindowExceededError):
+        await litellm.acompletion(
+            **_kwargs(), mock_response=_context_window_error(), caching=True
+        )
+    await asyncio.sleep(0.1)
+
+    # served from the cache - the provider isn't called again
+    with pytest.raises(litellm.ContextWindowExceededError) as exc_info:
+        await litellm.acompletion(**_kwargs(), mock_response="hi", caching=True)
+    assert "maximum context length is 8192 tokens" in str(exc_info.value)
+    assert getattr(exc_info.value, "litellm_negative_cache_hit", False) is True
+
+    # other requests aren't affected
+    response = await litellm.acompletion(
+        model="gpt-4o",
+        messages=[{"role": "user", "content": "hi"}],
+        mock_response="hi",
+        caching=True,
+    )
+    assert response.choices[0].message.content == "hi"
+
+
+def test_negative_cache_skips_transient_errors(restore_cache):
+    litellm.cache = Cache(type="local", negative_cache_ttl=60)
+
+    with pytest.raises(litellm.RateLimitError):
+        litellm.completion(
+            **_kwargs(), mock_response="litellm.RateLimitError", caching=True
+        )
+    response = litellm.completion(**_kwargs(), mock_response="hi", caching=True)
+    assert response.choices[0].message.content == "hi"
+
+    kwargs = {**_kwargs(), "messages": [{"role": "user", "content": "long"}]}
+    with pytest.raises(litellm.ContextWindowExceededError):
+        litellm.completion(
+            **kwargs, mock_response=_context_window_error(), caching=True
+        )
+    with pytest.raises(litellm.ContextWindowExceededError):
+        litellm.completion(**kwargs, mock_response="hi", caching=True)
+
+
+@pytest.mark.asyncio
+async def test_stale_while_revalidate_refreshes_once():
+    cache = Cache(type="local", stale_while_revalidate=60)
+    await cache.async_add_cache({"id": "old"}, **_kwargs(), ttl=0.05)
+    await asyncio.sleep(0.1)
+
+    # the first request refreshes the stale entry, the others are served it
+    assert await cache.async_get_cache(**_kwargs()) is None
+    assert await cache.async_get_cache(**_kwargs()) == {"id": "old"}
+
+    await cache.async_add_cache({"id": "new"}, **_kwargs(), ttl=60)
+    assert await cache.async_get_cache(**_kwargs()) == {"id": "new"}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_wait_for_one_request():
+    cache = Cache(type="local", stale_while_revalidate=60)
+    calls = []
+
+    async def _get_or_compute():
+        cached_result = await cache.async_get_cache(**_kwargs())
+        if cached_result is not None:
+            return cached_result
+        calls.append(1)
+        await asyncio.sleep(0.2)
+        await cache.async_add_cache({"id": "computed"}, **_kwargs(), ttl=60)
+        return {"id": "computed"}
+
+    results = await asyncio.gather(*[_get_or_compute() for _ in range(5)])
+    assert results == [{"id": "computed"}] * 5
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_refresh_lock_released_by_its_request_only():
+    cache = Cache(type="local", stale_while_revalidate=60)
+    stampede_protection = cache.stampede_protection
+    assert await cache.async_get_cache(**_kwargs(), litellm_call_id="a") is None
+    # re-entrant for the request holding it
+    assert await stampede_protection.async_acquire_lock(
+        cache.get_cache_key(**_kwargs()), owner="a"
+    )
+
+    await cache.async_release_refresh_locks("b")
+    assert len(stampede_protection._held_locks) == 1
+    await cache.async_release_refresh_locks("a")
+    assert stampede_protection._held_locks == {}
+
+
+@pytest.mark.asyncio
+async def test_refresh_lock_released_when_request_cancelled(restore_cache):
+    litellm.cache = Cache(type="local", stale_while_revalidate=60)
+    request = asyncio.create_task(
+        litellm.acompletion(
+            **_kwargs(), mock_response="hi", mock_delay=10, caching=True
+        )
+    )
+    await asyncio.sleep(0.1)
+    assert len(litellm.cache.stampede_protection._held_locks) == 1
+
+    request.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await request
+    await asyncio.sleep(0.05)
+    assert litellm.cache.stampede_protection._held_locks == {}
+
+
+def test_should_refresh_early():
+    # never before expiry when the response was free to compute
+    assert should_refresh_early(expires_at=100, compute_time=0, beta=1, now=99) is False
+    assert should_refresh_early(expires_at=100, compute_time=0, beta=1, now=100) is True
+    # expensive responses are refreshed well ahead of expiring
+    refreshes = [
+        should_refresh_early(expires_at=100, compute_time=1000, beta=1, now=99)
+        for _ in range(100)
+    ]
+    assert sum(refreshes) > 90
+
+
+def test_sync_refresh_lock_released_when_request_ends(restore_cache):
+    litellm.cache = Cache(type="local", stale_while_revalidate=60)
+    # embedding errors aren't negative-cached - nothing writes the entry
+    with pytest.raises(litellm.InternalServerError):
+        litellm.embedding(
+            model="text-embedding-ada-002",
+            input="hello",
+            caching=True,
+            api_key="fake-key",
+            api_base="http://127.0.0.1:9",
+            max_retries=0,
+        )
+    assert litellm.cache.stampede_protection._held_locks == {}
+
+
+@pytest.mark.asyncio
+async def test_stream_holds_refresh_lock_until_consumed(restore_cache):
+    litellm.cache = Cache(type="local", stale_while_revalidate=60)
+    response = await litellm.acompletion(
+        **_kwargs(), mock_response="hi", stream=True, caching=True
+    )
+    await asyncio.sleep(0.05)
+    # identical requests keep waiting for the stream's entry
+    assert len(litellm.cache.stampede_protection._held_locks) == 1
+
+    async for _ in response:
+        pass
+    await asyncio.sleep(0.1)
+    assert litellm.cache.stampede_protection._held_locks == {}
+    assert await litellm.cache.async_get_cache(**_kwargs(), stream=True) is not None
+
+
+@pytest.mark.asyncio
+async def test_stampede_protection_through_dual_cache():
+    from litellm.caching.dual_cache import DualCache
+    from litellm.caching.in_memory_cache import InMemoryCache
+
+    # redis response caches are read through a DualCache - see LLMCachingHandler
+    cache = Cache(type="local", stale_while_revalidate=60)
+    dual_cache = DualCache(in_memory_cache=InMemoryCache())
+    await cache.async_add_cache(
+        {"id": "old"}, dynamic_cache_object=dual_cache, **_kwargs(), ttl=0.05
+    )
+    await asyncio.sleep(0.1)
+
+    assert (
+        await cache.async_get_cache(dynamic_cache_object=dual_cache, **_kwargs())
+        is None
+    )
+    assert await cache.async_get_cache(
+        dynamic_cache_object=dual_cache, **_kwargs()
+    ) == {"id": "old"}
@@ -52,3 +52,83 @@ async def test_process_async_embedding_cached_response():
 
     print(f"response: {response}")
     assert len(response.data) == 1
+
+
+@pytest.mark.asyncio
+async def test_embedding_partial_cache_hits_use_one_batch_read():
+    import litellm
+    from litellm.caching.caching import Cache
+
+    litellm.cache = Cache(type="local", cache_codec={"embedding_dtype": "float16"})
+    try:
+        for input in ["a", "b"]:
+            await litellm.aembedding(
+                model="text-embedding-ada-002",
+                input=[input],
+                mock_response=[0.5, 0.25],
+                caching=True,
+            )
+        await asyncio.sleep(0.5)
+
+        with patch.object(
+            litellm.cache.cache,
+            "async_batch_get_cache",
+            wraps=litellm.cache.cache.async_batch_get_cache,
+        ) as mock_batch_get, patch.object(
+            litellm.cache.cache, "async_get_cache"
+        ) as mock_get:
+            response = await litellm.aembedding(
+                model="text-embedding-ada-002",
+                input=["b", "c", "a"],
+                mock_response=[0.75, 0.125],
+                caching=True,
+            )
+        assert mock_batch_get.call_count == 1
+        assert mock_get.call_count == 0
+        # only the miss is sent to the provider, and merged in order
+        assert [item["embedding"] for item in response.data] == [
+            [0.5, 0.25],
+            [0.75, 0.125],
+            [0.5, 0.25],
+        ]
+        assert response._hidden_params["cache_hit"] is True
+    finally:
+        litellm.cache = None
+
+
+@pytest.mark.asyncio
+async def test_embedding_lookup_waits_for_background_cache_write():
+    import litellm
+    from litellm.caching.caching import Cache
+
+    litellm.cache = Cache(type="local")
+    set_cache_pipeline = litellm.cache.cache.async_set_cache_pipeline
+
+    async def slow_set_cache_pipeline(*args, **kwargs):
+        await asyncio.sleep(0.2)
+        return await set_cache_pipeline(*args, **kwargs)
+
+    try:
+        with patch.object(
+            litellm.cache.cache,
+            "async_set_cache_pipeline",
+            side_effect=slow_set_cache_pipeline,
+        ):
+            await litellm.aembedding(
+                model="text-embedding-ada-002",
+                input=["a"],
+                mock_response=[0.5, 0.25],
+                caching=True,
+            )
+            # read right after the call - the write is still in the background
+            response = await litellm.aembedding(
+                model="text-embedding-ada-002",
+                input=["a"],
+                mock_response=[0.75, 0.125],
+                caching=True,
+            )
+        assert response.data[0]["embedding"] == [0.5, 0.25]
+        assert response._hidden_params["cache_hit"] is True
+        assert litellm.cache._pending_writes == {}
+    finally:
+        litellm.cache = None
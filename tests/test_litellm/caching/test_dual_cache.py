@@ -0,0 +1,111 @@
+import asyncio
+import os
+import sys
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+sys.path.insert(
+    0, os.path.abspath("../../..")
+)  # Adds the parent directory to the system path
+
+from litellm.caching.dual_cache import DualCache
+from litellm.caching.in_memory_cache import InMemoryCache
+
+
+def _mock_redis_cache(values: dict):
+    """
+    A redis cache whose client tracking invalidations are fed from a queue
+    """
+    invalidations: asyncio.Queue = asyncio.Queue()
+
+    async def async_client_tracking_invalidations(prefixes):
+        yield None
+        while True:
+            keys = await invalidations.get()
+            if isinstance(keys, Exception):
+                raise keys
+            yield keys
+
+    redis_cache = MagicMock()
+    redis_cache.async_get_cache = AsyncMock(
+        side_effect=lambda key, **kwargs: values.get(key)
+    )
+    redis_cache.async_client_tracking_invalidations = (
+        async_client_tracking_invalidations
+    )
+    return redis_cache, invalidations
+
+
+@pytest.mark.asyncio
+async def test_dual_cache_client_side_caching():
+    values = {"team_id:1": {"spend": 1}, "other:1": "value"}
+    redis_cache, invalidations = _mock_redis_cache(values)
+    dual_cache = DualCache(
+        in_memory_cache=InMemoryCache(),
+        redis_cache=redis_cache,
+        client_side_caching_prefixes=["team_id:"],
+    )
+
+    # the first read starts tracking, it isn't client-side cached - tracking wasn't on yet
+    assert await dual_cache.async_get_cache("team_id:1") == {"spend": 1}
+    await asyncio.sleep(0)
+    assert dual_cache._client_side_caching_active is True
+    assert dual_cache._client_side_cached_keys == set()
+
+    dual_cache.in_memory_cache.flush_cache()
+    assert await dual_cache.async_get_cache("team_id:1") == {"spend": 1}
+    assert await dual_cache.async_get_cache("other:1") == "value"
+    assert dual_cache._client_side_cached_keys == {"team_id:1"}
+    assert redis_cache.async_get_cache.call_count == 3
+
+    # tracked keys are read from memory until redis invalidates them
+    assert await dual_cache.async_get_cache("team_id:1") == {"spend": 1}
+    assert redis_cache.async_get_cache.call_count == 3
+    values["team_id:1"] = {"spend": 2}
+    await invalidations.put(["team_id:1"])
+    await asyncio.sleep(0)
+    assert await dual_cache.async_get_cache("team_id:1") == {"spend": 2}
+    assert redis_cache.async_get_cache.call_count == 4
+
+    # a lost connection drops every client-side cached key
+    await invalidations.put(ConnectionError("connection lost"))
+    await asyncio.sleep(0)
+    assert dual_cache._client_side_caching_active is False
+    assert dual_cache.in_memory_cache.get_cache("team_id:1") is None
+    assert dual_cache.in_memory_cache.get_cache("other:1") == "value"
+    dual_cache._client_side_caching_task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_dual_cache_client_side_caching_skips_values_invalidated_during_read():
+    values = {"team_id:1": "stale"}
+    redis_cache, invalidations = _mock_redis_cache(values)
+    dual_cache = DualCache(
+        in_memory_cache=InMemoryCache(),
+        redis_cache=redis_cache,
+        client_side_caching_prefixes=["team_id:"],
+    )
+    dual_cache._start_client_side_caching()
+    await asyncio.sleep(0)
+
+    async def slow_read(key, **kwargs):
+        value = values[key]
+        dual_cache._invalidate_client_side_cache(keys=[key])  # changed mid-read
+        return value
+
+    redis_cache.async_get_cache = AsyncMock(side_effect=slow_read)
+    assert await dual_cache.async_get_cache("team_id:1") == "stale"
+    # kept for the usual in-memory ttl only
+    assert dual_cache._client_side_cached_keys == set()
+    assert dual_cache._client_side_reads == {}
+    dual_cache._client_side_caching_task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_dual_cache_without_client_side_caching_prefixes():
+    redis_cache, _ = _mock_redis_cache({"team_id:1": "value"})
+    dual_cache = DualCache(in_memory_cache=InMemoryCache(), redis_cache=redis_cache)
+    assert await dual_cache.async_get_cache("team_id:1") == "value"
+    assert dual_cache._client_side_caching_task is None
+    assert dual_cache._client_side_cached_keys == set()
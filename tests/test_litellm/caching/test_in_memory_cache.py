@@ -199,3 +199,84 @@ def test_in_memory_cache_heap_size_staus_bounded():
 
     # Expiration heap should only have 1 entry
     assert len(in_memory_cache.expiration_heap) == 1
+
+
+def test_in_memory_cache_evicts_least_recently_used():
+    """
+    Test that reading an item keeps it in the cache, when the cache is full.
+    """
+    in_memory_cache = InMemoryCache(max_size_in_memory=2)
+    in_memory_cache.set_cache(key="key_0", value="value_0", ttl=100)
+    in_memory_cache.set_cache(key="key_1", value="value_1", ttl=200)
+
+    assert in_memory_cache.get_cache(key="key_0") == "value_0"
+    in_memory_cache.set_cache(key="key_2", value="value_2", ttl=300)
+
+    assert "key_0" in in_memory_cache.cache_dict
+    assert "key_1" not in in_memory_cache.cache_dict
+    assert "key_1" not in in_memory_cache.ttl_dict
+
+
+def test_in_memory_cache_size_budget():
+    """
+    Test that the total size of the items stays within max_size_in_memory_in_kb.
+    """
+    in_memory_cache = InMemoryCache(max_size_in_memory_in_kb=10)
+    value = "a" * 3000  # ~3KB
+
+    for i in range(10):
+        in_memory_cache.set_cache(key=f"key_{i}", value=value)
+        assert in_memory_cache.total_size_in_kb <= 10
+
+    assert list(in_memory_cache.cache_dict.keys()) == ["key_7", "key_8", "key_9"]
+    assert in_memory_cache.total_size_in_kb == pytest.approx(
+        sum(in_memory_cache.item_size_dict.values())
+    )
+
+    # replacing an item doesn't double count it
+    in_memory_cache.set_cache(key="key_9", value=value)
+    assert len(in_memory_cache.cache_dict) == 3
+
+    in_memory_cache.delete_cache(key="key_9")
+    in_memory_cache.flush_cache()
+    assert in_memory_cache.total_size_in_kb == 0
+
+
+def test_in_memory_cache_expiration_heap_is_compacted():
+    """
+    Test that outdated expiration_heap entries are compacted, when keys are re-set with new ttls.
+    """
+    in_memory_cache = InMemoryCache()
+
+    for i in range(20_000):
+        in_memory_cache.delete_cache(key=f"key_{i % 100}")
+        in_memory_cache.set_cache(key=f"key_{i % 100}", value=i, ttl=60)
+
+    assert len(in_memory_cache.cache_dict) == 100
+    assert len(in_memory_cache.expiration_heap) <= 2 * 100 + 64
+
+
+def test_in_memory_cache_value_size_estimate():
+    """
+    Test that nested values / pydantic models are sized without serializing them.
+    """
+    from litellm.types.utils import ModelResponse
+
+    in_memory_cache = InMemoryCache()
+    response = ModelResponse(
+        choices=[{"message": {"role": "assistant", "content": "a" * 100_000}}]
+    )
+    embedding = {"timestamp": time.time(), "response": {"embedding": [0.1] * 1536}}
+
+    with patch.object(ModelResponse, "model_dump") as mock_model_dump, patch.object(
+        json, "dumps"
+    ) as mock_json_dumps:
+        response_size = in_memory_cache.get_value_size_in_kb(response)
+        embedding_size = in_memory_cache.get_value_size_in_kb(embedding)
+        mock_model_dump.assert_not_called()
+        mock_json_dumps.assert_not_called()
+
+    assert 90 <= response_size <= 200
+    assert 1536 * 24 / 1024 <= embedding_size <= 2 * 1536 * 24 / 1024
+    assert in_memory_cache.check_value_size(response) is True
+    assert InMemoryCache(max_size_per_item=50).check_value_size(response) is False
@@ -0,0 +1,255 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(
+    0, os.path.abspath("../../..")
+)  # Adds the parent directory to the system path
+
+pytest.importorskip("numpy")
+
+import litellm
+from litellm.caching.caching import Cache
+from litellm.caching.local_semantic_cache import LocalSemanticCache
+
+EMBEDDINGS = {
+    "what is the capital of france?": [1.0, 0.0, 0.0],
+    "what's the capital of france?": [0.95, 0.1, 0.0],
+    "write a poem about the sea": [0.0, 1.0, 0.0],
+    "what is 2 + 2?": [0.0, 0.0, 1.0],
+}
+
+
+def _messages(prompt):
+    return [{"role": "user", "content": prompt}]
+
+
+def _embedding(prompt, **kwargs):
+    return EMBEDDINGS[prompt]
+
+
+async def _async_embedding(prompt, **kwargs):
+    return EMBEDDINGS[prompt]
+
+
+@pytest.fixture
+def patched_embeddings():
+    with patch.object(
+        LocalSemanticCache, "_get_embedding", side_effect=_embedding
+    ), patch.object(
+        LocalSemanticCache, "_get_async_embedding", side_effect=_async_embedding
+    ):
+        yield
+
+
+def test_local_semantic_cache_hit_and_miss(patched_embeddings):
+    cache = LocalSemanticCache(similarity_threshold=0.9)
+    cache.set_cache(
+        "key", "paris", messages=_messages("what is the capital of france?")
+    )
+
+    assert (
+        cache.get_cache(
+            "other-key", messages=_messages("what's the capital of france?")
+        )
+        == "paris"
+    )
+    assert (
+        cache.get_cache("key", messages=_messages("write a poem about the sea")) is None
+    )
+    assert cache.get_cache("key") is None
+
+
+@pytest.mark.asyncio
+async def test_local_semantic_cache_async_sets_similarity(patched_embeddings):
+    cache = LocalSemanticCache(similarity_threshold=0.9)
+    await cache.async_set_cache_pipeline(
+        [("key-1", "paris"), ("key-2", "4")],
+        messages=_messages("what is the capital of france?"),
+    )
+    metadata = {}
+    result = await cache.async_get_cache(
+        "key", messages=_messages("what's the capital of france?"), metadata=metadata
+    )
+    assert result in ("paris", "4")
+    assert metadata["semantic-similarity"] == pytest.approx(0.994, abs=1e-3)
+
+
+def test_local_semantic_cache_ttl_and_namespaces(patched_embeddings):
+    cache = LocalSemanticCache(similarity_threshold=0.9)
+    prompt = "what is the capital of france?"
+    cache.set_cache("team-a:key", "paris", messages=_messages(prompt))
+    cache.set_cache("team-b:key", "expired", messages=_messages(prompt), ttl=-1)
+
+    assert cache.get_cache("team-a:key", messages=_messages(prompt)) == "paris"
+    assert cache.get_cache("team-b:key", messages=_messages(prompt)) is None
+    # no namespace is its own partition
+    assert cache.get_cache("key", messages=_messages(prompt)) is None
+
+
+def test_local_semantic_cache_ivf_search():
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(42)
+    vectors = rng.normal(size=(600, 32)).astype(np.float32)
+    cache = LocalSemanticCache(
+        similarity_threshold=0.99, ivf_min_size=256, ivf_nprobe=4
+    )
+    for i, vector in enumerate(vectors):
+        partition = cache._add(
+            f"key-{i}", f"prompt-{i}", vector.tolist(), f"response-{i}"
+        )
+        if partition is not None:
+            cache._rebuild_ivf(partition)
+
+    partition = cache.partitions[None]
+    assert partition.centroids is not None
+    # a row is always in the cluster nearest its own vector, so exact matches are found
+    for i in range(0, 600, 37):
+        assert cache._search("key", "prompt", vectors[i].tolist()) == (
+            f"response-{i}",
+            pytest.approx(1.0, abs=1e-5),
+        )
+
+
+@pytest.mark.asyncio
+async def test_local_semantic_cache_ivf_rebuild_runs_off_the_event_loop():
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(42)
+    vectors = rng.normal(size=(300, 16)).astype(np.float32)
+    cache = LocalSemanticCache(similarity_threshold=0.99, ivf_min_size=256)
+    embeddings = {f"prompt-{i}": vector.tolist() for i, vector in enumerate(vectors)}
+
+    async def _async_embedding(prompt, **kwargs):
+        return embeddings[prompt]
+
+    rebuild_threads = []
+    rebuild_ivf = cache._rebuild_ivf
+
+    def _rebuild_ivf(partition):
+        rebuild_threads.append(threading.current_thread())
+        rebuild_ivf(partition)
+
+    with patch.object(
+        cache, "_get_async_embedding", side_effect=_async_embedding
+    ), patch.object(cache, "_rebuild_ivf", side_effect=_rebuild_ivf):
+        for i in range(300):
+            await cache.async_set_cache(
+                f"key-{i}", f"response-{i}", messages=_messages(f"prompt-{i}")
+            )
+
+    assert len(rebuild_threads) == 1
+    assert rebuild_threads[0] is not threading.main_thread()
+    partition = cache.partitions[None]
+    assert partition.centroids is not None and partition.indexed_size == 256
+    # rows added after the snapshot are assigned too
+    assert (partition.cluster_ids[: partition.size] >= 0).all()
+
+
+def test_local_semantic_cache_ivf_rebuild_dropped_after_compaction():
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(42)
+    cache = LocalSemanticCache(similarity_threshold=0.99, ivf_min_size=8)
+    for i in range(8):
+        partition = cache._add(
+            f"key-{i}", f"prompt-{i}", rng.normal(size=8).tolist(), "r", ttl=-1
+        )
+    assert partition is not None
+
+    vectors, generation = partition.start_ivf_rebuild()
+    assert partition.start_ivf_rebuild() is None  # one rebuild at a time
+    partition.compact(now=time.time())
+    partition.finish_ivf_rebuild(
+        centroids=vectors[:2],
+        cluster_ids=np.zeros(8, dtype=np.int32),
+        generation=generation,
+    )
+    assert partition.centroids is None and partition.ivf_rebuilding is False
+
+
+def test_local_semantic_cache_max_size_evicts_oldest():
+    cache = LocalSemanticCache(similarity_threshold=0.99, max_size=10)
+    for i in range(25):
+        embedding = [0.0] * 32
+        embedding[i % 32] = 1.0
+        cache._add("key", f"prompt-{i}", embedding, f"response-{i}")
+
+    partition = cache.partitions[None]
+    assert partition.size <= 10
+    assert partition.prompts[-1] == "prompt-24"
+    assert cache._search("key", "prompt", [1.0] + [0.0] * 31)[0] is None
+
+
+@pytest.mark.asyncio
+async def test_local_semantic_cache_persist_round_trip(patched_embeddings, tmp_path):
+    cache = LocalSemanticCache(similarity_threshold=0.9, persist_dir=str(tmp_path))
+    cache.set_cache(
+        "team-a:key", "paris", messages=_messages("what is the capital of france?")
+    )
+    cache.set_cache("key", "4", messages=_messages("what is 2 + 2?"))
+    await cache.disconnect()
+
+    loaded = LocalSemanticCache(similarity_threshold=0.9, persist_dir=str(tmp_path))
+    assert (
+        loaded.get_cache(
+            "team-a:key", messages=_messages("what's the capital of france?")
+        )
+        == "paris"
+    )
+    assert loaded.get_cache("key", messages=_messages("what is 2 + 2?")) == "4"
+
+    # memory-mapped vectors are copied on write, and saving over them is safe
+    loaded.set_cache("key", "sea", messages=_messages("write a poem about the sea"))
+    loaded.save()
+    assert (
+        loaded.get_cache("key", messages=_messages("write a poem about the sea"))
+        == "sea"
+    )
+    assert loaded.get_cache("key", messages=_messages("what is 2 + 2?")) == "4"
+
+
+@pytest.mark.asyncio
+async def test_local_semantic_cache_response_caching(patched_embeddings):
+    litellm.cache = Cache(type="local-semantic", similarity_threshold=0.9)
+    try:
+        assert isinstance(litellm.cache.cache, LocalSemanticCache)
+        response1 = await litellm.acompletion(
+            model="gpt-3.5-turbo",
+            messages=_messages("what is the capital of france?"),
+            mock_response="paris",
+            caching=True,
+        )
+        await asyncio.sleep(0.5)
+        response2 = await litellm.acompletion(
+            model="gpt-3.5-turbo",
+            messages=_messages("what's the capital of france?"),
+            mock_response="paris",
+            caching=True,
+        )
+        assert response2.id == response1.id
+    finally:
+        litellm.cache = None
+
+
+def test_local_semantic_cache_requires_similarity_threshold():
+    with pytest.raises(ValueError):
+        Cache(type="local-semantic")
+
+
+@pytest.mark.asyncio
+async def test_local_semantic_cache_lookup_then_set_embeds_once():
+    cache = LocalSemanticCache(similarity_threshold=0.9)
+    messages = _messages("what is the capital of france?")
+
+    async def aembedding(model, input, **kwargs):
+        return {"data": [{"index": 0, "embedding": [1.0, 0.0, 0.0]}]}
+
+    with patch("litellm.aembedding", side_effect=aembedding) as mock_aembedding:
+        assert await cache.async_get_cache("key", messages=messages) is None
+        await cache.async_set_cache("key", "paris", messages=messages)
+        assert await cache.async_get_cache("key", messages=messages) == "paris"
+    assert mock_aembedding.call_count == 1
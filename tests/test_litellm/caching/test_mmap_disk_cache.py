@@ -0,0 +1,154 @@
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(
+    0, os.path.abspath("../../..")
+)  # Adds the parent directory to the system path
+
+import litellm.caching.mmap_disk_cache as mmap_disk_cache
+from litellm.caching.caching import Cache
+from litellm.caching.mmap_disk_cache import MmapDiskCache
+
+
+def _segment_files(cache_dir, suffix=".seg"):
+    return sorted(name for name in os.listdir(cache_dir) if name.endswith(suffix))
+
+
+@pytest.mark.asyncio
+async def test_mmap_disk_cache_set_get_delete(tmp_path):
+    cache = MmapDiskCache(disk_cache_dir=str(tmp_path), fsync_interval_ms=0)
+
+    await cache.async_set_cache_pipeline(
+        [("a", {"response": "1"}), ("b", b"\x00binary")]
+    )
+    await cache.async_set_cache("c", '{"response": "3"}')
+    assert await cache.async_batch_get_cache(["a", "missing", "b", "c"]) == [
+        {"response": "1"},
+        None,
+        b"\x00binary",
+        {"response": "3"},
+    ]
+
+    await cache.async_delete_cache("a")
+    assert await cache.async_get_cache("a") is None
+    assert await cache.async_increment("counter", 2) == 2
+    assert await cache.async_increment("counter", 3) == 5
+    await cache.disconnect()
+
+
+def test_mmap_disk_cache_ttl(tmp_path):
+    cache = MmapDiskCache(disk_cache_dir=str(tmp_path))
+    cache.set_cache("a", "value", ttl=0.01)
+    cache.set_cache("b", "value")
+    time.sleep(0.02)
+    assert cache.get_cache("a") is None
+    assert cache.get_cache("b") == "value"
+
+
+@pytest.mark.asyncio
+async def test_mmap_disk_cache_batches_fsyncs(tmp_path, monkeypatch):
+    fsyncs = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(
+        mmap_disk_cache.os,
+        "fsync",
+        lambda fd: fsyncs.append(fd) or real_fsync(fd),
+    )
+    cache = MmapDiskCache(disk_cache_dir=str(tmp_path), fsync_interval_ms=200)
+
+    await asyncio.gather(*[cache.async_set_cache(f"key-{i}", i) for i in range(10)])
+    # os.fsync is patched process-wide - only count this cache's segment file
+    assert fsyncs.count(cache._active_fd) == 0
+    await asyncio.sleep(0.5)
+    assert fsyncs.count(cache._active_fd) == 1
+
+
+def test_mmap_disk_cache_warm_start(tmp_path):
+    cache = MmapDiskCache(disk_cache_dir=str(tmp_path), max_segment_bytes=256)
+    for i in range(20):
+        cache.set_cache(f"key-{i}", {"i": i})
+    cache.delete_cache("key-0")
+    asyncio.run(cache.disconnect())
+    # every segment has an index file
+    assert len(_segment_files(str(tmp_path))) > 1
+    assert _segment_files(str(tmp_path), ".idx") == [
+        name.replace(".seg", ".idx") for name in _segment_files(str(tmp_path))
+    ]
+
+    reopened = MmapDiskCache(disk_cache_dir=str(tmp_path), max_segment_bytes=256)
+    assert reopened.get_cache("key-0") is None
+    assert reopened.batch_get_cache([f"key-{i}" for i in range(1, 20)]) == [
+        {"i": i} for i in range(1, 20)
+    ]
+
+
+def test_mmap_disk_cache_truncates_torn_write(tmp_path):
+    cache = MmapDiskCache(disk_cache_dir=str(tmp_path))
+    cache.set_cache("a", "value")
+    cache.set_cache("b", "value")
+    # simulate a crash mid-write - no index file, half a record
+    segment_path = os.path.join(str(tmp_path), _segment_files(str(tmp_path))[0])
+    valid_size = os.path.getsize(segment_path)
+    with open(segment_path, "ab") as f:
+        f.write(b"\x01\x02\x03\x04\x05")
+
+    reopened = MmapDiskCache(disk_cache_dir=str(tmp_path))
+    assert reopened.batch_get_cache(["a", "b"]) == ["value", "value"]
+    assert os.path.getsize(segment_path) == valid_size
+    reopened.set_cache("c", "value")
+    assert MmapDiskCache(disk_cache_dir=str(tmp_path)).get_cache("c") == "value"
+
+
+def test_mmap_disk_cache_evicts_oldest_segments(tmp_path):
+    cache = MmapDiskCache(
+        disk_cache_dir=str(tmp_path), max_size_bytes=1024, max_segment_bytes=256
+    )
+    for i in range(50):
+        cache.set_cache(f"key-{i}", "x" * 32)
+
+    assert sum(cache._segment_sizes.values()) <= 1024 + 256
+    assert cache.get_cache("key-0") is None
+    assert cache.get_cache("key-49") == "x" * 32
+    assert len(_segment_files(str(tmp_path))) == len(cache._segment_sizes)
+    # the per-segment key sets match the index
+    assert {key for keys in cache._segment_keys.values() for key in keys} == set(
+        cache._index
+    )
+    assert all(
+        cache._index[key][0] == segment_id
+        for segment_id, keys in cache._segment_keys.items()
+        for key in keys
+    )
+
+
+def test_mmap_disk_cache_warns_once_on_writes_after_close(tmp_path, monkeypatch):
+    cache = MmapDiskCache(disk_cache_dir=str(tmp_path))
+    cache._close()
+    warnings = []
+    monkeypatch.setattr(
+        mmap_disk_cache.verbose_logger,
+        "warning",
+        lambda message, *args: warnings.append(message % args),
+    )
+
+    cache.set_cache("a", "value")
+    cache.set_cache("b", "value")
+    assert warnings == [f"MmapDiskCache: {tmp_path} is closed, dropping writes"]
+    assert cache.get_cache("a") is None
+
+
+def test_cache_init_disk_mmap(tmp_path):
+    cache = Cache(
+        type="disk-mmap",
+        disk_cache_dir=str(tmp_path),
+        disk_cache_max_size_bytes=4096,
+        disk_cache_fsync_interval_ms=0,
+        cache_codec={"serializer": "json"},
+    )
+    assert isinstance(cache.cache, MmapDiskCache)
+    assert cache.cache.max_size_bytes == 4096
+    assert cache.cache.fsync_interval_ms == 0
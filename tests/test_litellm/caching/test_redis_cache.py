@@ -199,3 +199,61 @@ async def test_async_lpop_with_float_redis_version(
             
             # Verify the method completed without error
             assert result is not None
+
+
+def test_redis_cache_get_cache_logic_keeps_encoded_payloads():
+    from litellm.caching.cache_codec import CacheCodec
+
+    with patch.object(RedisCache, "__init__", return_value=None):
+        redis_cache = RedisCache()
+    encoded = CacheCodec().encode({"timestamp": 1, "response": "hi"})
+    # decoded by the response cache
+    assert redis_cache._get_cache_logic(encoded) is encoded
+    assert redis_cache._get_cache_logic(b'{"a": 1}') == {"a": 1}
+
+
+@pytest.mark.asyncio
+async def test_redis_cache_client_tracking_invalidations():
+    from redis.asyncio import Redis
+
+    with patch.object(RedisCache, "__init__", return_value=None):
+        redis_cache = RedisCache()
+    redis_cache.namespace = "litellm"
+    redis_client = Redis()
+
+    pubsub = MagicMock()
+    pubsub.execute_command = AsyncMock()
+    pubsub.parse_response = AsyncMock(return_value=42)
+    pubsub.subscribe = AsyncMock()
+    pubsub.aclose = AsyncMock()
+    pubsub.get_message = AsyncMock(
+        side_effect=[
+            {"type": "message", "data": [b"litellm:team_id:1", b"other"]},
+            {"type": "message", "data": None},  # FLUSHALL
+            None,  # idle - checks the tracking connection
+        ]
+    )
+    tracking_info = [b"flags", [b"off"], b"redirect", -1, b"prefixes", []]
+
+    with patch.object(
+        redis_cache, "init_async_client", return_value=redis_client
+    ), patch.object(redis_client, "pubsub", return_value=pubsub), patch.object(
+        Redis, "client_tracking_on", new_callable=AsyncMock
+    ) as mock_tracking_on, patch.object(
+        Redis, "client_tracking_off", new_callable=AsyncMock
+    ), patch.object(
+        Redis, "execute_command", new_callable=AsyncMock, return_value=tracking_info
+    ):
+        received = []
+        with pytest.raises(ConnectionError):
+            async for keys in redis_cache.async_client_tracking_invalidations(
+                prefixes=["team_id:"]
+            ):
+                received.append(keys)
+
+    assert received == [None, ["team_id:1", "other"], None]
+    mock_tracking_on.assert_awaited_once_with(
+        clientid=42, bcast=True, prefix=["litellm:team_id:"]
+    )
+    pubsub.subscribe.assert_awaited_once_with("__redis__:invalidate")
+    pubsub.aclose.assert_awaited_once()
@@ -0,0 +1,211 @@
+import asyncio
+import os
+import sys
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.insert(
+    0, os.path.abspath("../../..")
+)  # Adds the parent directory to the system path
+
+from litellm.caching.dual_cache import DualCache
+from litellm.caching.redis_cache import RedisCache
+from litellm.caching.redis_write_coalescer import RedisWriteCoalescer
+
+
+class _FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    def set(self, name, value, nx=False, ex=None):
+        self.commands.append(("set", name, value, nx, ex))
+
+    def incrbyfloat(self, name, amount):
+        self.commands.append(("incrbyfloat", name, amount))
+
+    def ttl(self, name):
+        self.commands.append(("ttl", name))
+
+    def expire(self, name, time):
+        self.commands.append(("expire", name, time.total_seconds()))
+
+    async def execute(self):
+        self.client.executed.append(self.commands)
+        if self.client.error is not None:
+            raise self.client.error
+        results = []
+        for command in self.commands:
+            if command[0] == "set":
+                self.client.values[command[1]] = command[2]
+                results.append(True)
+            elif command[0] == "incrbyfloat":
+                value = float(self.client.values.get(command[1], 0)) + command[2]
+                self.client.values[command[1]] = value
+                results.append(value)
+            elif command[0] == "ttl":
+                results.append(self.client.ttls.get(command[1], -1))
+            else:
+                self.client.ttls[command[1]] = command[2]
+                results.append(True)
+        return results
+
+
+class _FakeRedisClient:
+    def __init__(self):
+        self.values = {}
+        self.ttls = {}
+        self.executed = []
+        self.error = None
+
+    def pipeline(self, transaction=False):
+        return _FakePipeline(self)
+
+
+@pytest.fixture
+def redis_cache(monkeypatch):
+    monkeypatch.setattr(RedisCache, "_setup_health_pings", lambda self: None)
+    monkeypatch.setattr("litellm._redis.get_redis_client", lambda **kwargs: MagicMock())
+    redis_cache = RedisCache(host="localhost", port=6379, namespace="ns")
+    client = _FakeRedisClient()
+    monkeypatch.setattr(redis_cache, "init_async_client", lambda: client)
+    redis_cache.service_logger_obj = MagicMock()
+    redis_cache.service_logger_obj.async_service_success_hook = MagicMock(
+        side_effect=lambda **kwargs: asyncio.sleep(0)
+    )
+    redis_cache.service_logger_obj.async_service_failure_hook = MagicMock(
+        side_effect=lambda **kwargs: asyncio.sleep(0)
+    )
+    return redis_cache, client
+
+
+@pytest.mark.asyncio
+async def test_coalescer_merges_increments_into_one_pipeline(redis_cache):
+    redis_cache, client = redis_cache
+    coalescer = RedisWriteCoalescer(redis_cache=redis_cache)
+
+    results = await asyncio.gather(
+        coalescer.async_increment("a", 1, ttl=60),
+        coalescer.async_increment("a", 2, ttl=60),
+        coalescer.async_set("b", {"x": 1}, ttl=10),
+        coalescer.async_increment("a", 3, ttl=60),
+    )
+
+    # each caller sees the counter right after its own increment
+    assert results[:2] == [1.0, 3.0]
+    assert results[3] == 6.0
+    assert client.executed[0] == [
+        ("incrbyfloat", "ns:a", 6),
+        ("ttl", "ns:a"),
+        ("set", "ns:b", '{"x": 1}', False, timedelta(seconds=10)),
+    ]
+    # new key - expired in a second pipeline, like RedisCache.async_increment
+    assert client.executed[1] == [("expire", "ns:a", 60)]
+
+    # the key already has an expiry, it isn't reset
+    assert await coalescer.async_increment("a", 1, ttl=60) == 7.0
+    assert len(client.executed) == 3
+
+
+@pytest.mark.asyncio
+async def test_coalescer_keeps_increments_around_a_set_ordered(redis_cache):
+    redis_cache, client = redis_cache
+    coalescer = RedisWriteCoalescer(redis_cache=redis_cache)
+
+    results = await asyncio.gather(
+        coalescer.async_increment("a", 1),
+        coalescer.async_set("a", 5),
+        coalescer.async_increment("a", 2),
+        coalescer.async_expire("a", 30),
+    )
+
+    assert results == [1.0, True, 7.0, True]
+    assert [command[0] for command in client.executed[0]] == [
+        "incrbyfloat",
+        "set",
+        "incrbyfloat",
+        "expire",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_coalescer_flushes_at_max_batch_size(redis_cache):
+    redis_cache, client = redis_cache
+    coalescer = RedisWriteCoalescer(
+        redis_cache=redis_cache, flush_interval_ms=1000, max_batch_size=2
+    )
+
+    await asyncio.wait_for(
+        asyncio.gather(coalescer.async_set("a", 1), coalescer.async_set("b", 2)),
+        timeout=0.5,
+    )
+    assert len(client.executed) == 1
+    # the early flush is held until it's done
+    await asyncio.sleep(0)
+    assert coalescer._background_tasks == set()
+
+
+@pytest.mark.asyncio
+async def test_coalescer_failure_is_raised_to_every_caller(redis_cache):
+    redis_cache, client = redis_cache
+    client.error = ConnectionError("connection lost")
+    coalescer = RedisWriteCoalescer(redis_cache=redis_cache)
+
+    results = await asyncio.gather(
+        coalescer.async_increment("a", 1),
+        coalescer.async_increment("a", 2),
+        coalescer.async_set("b", 1),
+        return_exceptions=True,
+    )
+    assert [str(result) for result in results] == ["connection lost"] * 3
+    assert coalescer._pending == []
+
+
+@pytest.mark.asyncio
+async def test_dual_cache_coalesces_redis_writes(redis_cache):
+    redis_cache, client = redis_cache
+    dual_cache = DualCache(redis_cache=redis_cache, coalesce_redis_writes=True)
+
+    await asyncio.gather(
+        dual_cache.async_set_cache_pipeline([("a", 1), ("b", 2)], ttl=10),
+        dual_cache.async_increment_cache("c", 1, ttl=60),
+        dual_cache.async_increment_cache_pipeline(
+            [{"key": "c", "increment_value": 2, "ttl": 60}]
+        ),
+    )
+    assert len(client.executed[0]) == 6
+    assert client.values == {"ns:a": "1", "ns:b": "2", "ns:c": 3.0}
+    # the pipeline increment refreshes its ttl, it isn't merged with the other increment
+    assert ("expire", "ns:c", 60) in client.executed[0]
+    assert redis_cache.get_write_coalescer() is redis_cache.get_write_coalescer()
+
+
+@pytest.mark.asyncio
+async def test_dual_cache_coalesced_writes_keep_parent_otel_span(redis_cache):
+    redis_cache, client = redis_cache
+    dual_cache = DualCache(redis_cache=redis_cache, coalesce_redis_writes=True)
+    set_span, increment_span = MagicMock(), MagicMock()
+
+    await asyncio.gather(
+        dual_cache.async_set_cache("a", 1, litellm_parent_otel_span=set_span),
+        dual_cache.async_increment_cache("c", 1, parent_otel_span=increment_span),
+        dual_cache.async_increment_cache("c", 2, parent_otel_span=increment_span),
+    )
+    await asyncio.sleep(0)
+
+    success_hook = redis_cache.service_logger_obj.async_service_success_hook
+    # one event per caller span
+    assert [
+        call.kwargs["parent_otel_span"] for call in success_hook.call_args_list
+    ] == [
+        set_span,
+        increment_span,
+    ]
@@ -0,0 +1,237 @@
+import asyncio
+import os
+import sys
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+sys.path.insert(
+    0, os.path.abspath("../../..")
+)  # Adds the parent directory to the system path
+
+from litellm.caching.caching import Cache
+from litellm.caching.segment_object_cache import (
+    S3SegmentStore,
+    SegmentObjectCache,
+    SegmentObjectStore,
+)
+
+
+class _FakeSegmentStore(SegmentObjectStore):
+    def __init__(self):
+        self.segments = {}
+        self.range_reads = []
+        self.error = None
+        # set to hold uploads until it's set
+        self.upload_gate = None
+
+    def put_segment(self, name, data):
+        self.segments[name] = data
+
+    async def async_put_segment(self, name, data):
+        await asyncio.sleep(0)
+        if self.upload_gate is not None:
+            await self.upload_gate.wait()
+        if self.error is not None:
+            raise self.error
+        self.segments[name] = data
+
+    def get_range(self, name, start, end):
+        self.range_reads.append((name, start, end))
+        return self.segments[name][start:end]
+
+    async def async_get_range(self, name, start, end):
+        return self.get_range(name, start, end)
+
+    def get_object(self, name):
+        return self.segments[name]
+
+    async def async_get_object(self, name):
+        return self.get_object(name)
+
+    def list_objects(self, prefix):
+        return sorted(name for name in self.segments if name.startswith(prefix))
+
+    async def async_list_objects(self, prefix):
+        return self.list_objects(prefix)
+
+
+@pytest.mark.asyncio
+async def test_segment_cache_batches_writes_into_one_segment():
+    store = _FakeSegmentStore()
+    cache = SegmentObjectCache(store=store, key_prefix="cache")
+
+    await asyncio.gather(
+        cache.async_set_cache("a", {"response": "1"}, ttl=60),
+        cache.async_set_cache("b", {"response": "2"}),
+        cache.async_set_cache("c", b"\x00binary"),
+    )
+    # one segment, and its index object
+    assert sorted(name.split("/")[1] for name in store.segments) == [
+        "index",
+        "segments",
+    ]
+
+    # one ranged GET for nearby entries of a segment
+    assert await cache.async_batch_get_cache(["c", "missing", "a", "b"]) == [
+        b"\x00binary",
+        None,
+        {"response": "1"},
+        {"response": "2"},
+    ]
+    assert len(store.range_reads) == 1
+
+    assert await cache.async_get_cache("a") == {"response": "1"}
+    assert cache.get_cache("b") == {"response": "2"}
+
+
+@pytest.mark.asyncio
+async def test_segment_cache_reads_buffered_writes():
+    store = _FakeSegmentStore()
+    cache = SegmentObjectCache(store=store, flush_interval_ms=1000)
+
+    write = asyncio.create_task(cache.async_set_cache("a", {"response": "1"}))
+    await asyncio.sleep(0)
+    assert store.segments == {}
+    assert await cache.async_get_cache("a") == {"response": "1"}
+
+    await cache.async_flush()
+    await write
+    assert len(store.list_objects("segments/")) == 1
+
+
+@pytest.mark.asyncio
+async def test_segment_cache_flushes_at_max_segment_bytes():
+    store = _FakeSegmentStore()
+    cache = SegmentObjectCache(
+        store=store, flush_interval_ms=1000, max_segment_bytes=10
+    )
+
+    await asyncio.wait_for(
+        cache.async_set_cache_pipeline([("a", "x" * 10), ("b", "y")]), timeout=0.5
+    )
+    assert len(store.list_objects("segments/")) == 1
+    # the early flush is held until it's done
+    await asyncio.sleep(0)
+    assert cache._background_tasks == set()
+
+
+@pytest.mark.asyncio
+async def test_segment_cache_delete_during_upload_is_not_reindexed():
+    store = _FakeSegmentStore()
+    store.upload_gate = asyncio.Event()
+    cache = SegmentObjectCache(store=store)
+
+    write = asyncio.create_task(cache.async_set_cache("a", {"response": "1"}))
+    flush = asyncio.create_task(cache.async_flush())
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert cache._uploading != {}
+
+    cache.delete_cache("a")
+    assert await cache.async_get_cache("a") is None
+    store.upload_gate.set()
+    await asyncio.gather(write, flush)
+
+    assert await cache.async_get_cache("a") is None
+    # nor when the index is rebuilt from the bucket
+    restarted_cache = SegmentObjectCache(store=store)
+    assert await restarted_cache.async_get_cache("a") is None
+
+
+@pytest.mark.asyncio
+async def test_segment_cache_failed_upload_is_not_indexed():
+    store = _FakeSegmentStore()
+    store.error = ConnectionError("connection lost")
+    cache = SegmentObjectCache(store=store)
+
+    await cache.async_set_cache("a", {"response": "1"})
+    assert await cache.async_get_cache("a") is None
+
+
+@pytest.mark.asyncio
+async def test_segment_cache_rebuilds_local_index_from_bucket():
+    store = _FakeSegmentStore()
+    cache = SegmentObjectCache(store=store, key_prefix="cache")
+    await cache.async_set_cache_pipeline([("a", "1"), ("b", "2"), ("c", "3")])
+    await cache.async_set_cache("expired", "4", ttl=0.01)
+    cache.set_cache("a", "updated")
+    cache.delete_cache("b")
+    await asyncio.sleep(0.02)
+
+    # a restarted instance - same bucket, empty in-memory index
+    restarted = SegmentObjectCache(store=store, key_prefix="cache")
+    assert await restarted.async_batch_get_cache(["a", "b", "c", "expired"]) == [
+        "updated",
+        None,
+        "3",
+        None,
+    ]
+    # entries without a ttl don't expire
+    _, expires_at = restarted.index_cache.entries[restarted._get_index_key("c")]
+    assert expires_at is None
+
+    restarted.flush_cache()
+    assert SegmentObjectCache(store=store, key_prefix="cache").get_cache("c") is None
+
+
+def test_segment_cache_merge_ranges():
+    ranges = SegmentObjectCache._merge_ranges(
+        [(0, 10_000_000, 10), (1, 0, 100), (2, 150, 50)]
+    )
+    assert [(start, end) for start, end, _ in ranges] == [
+        (0, 200),
+        (10_000_000, 10_000_010),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_s3_segment_store_signs_ranged_gets(monkeypatch):
+    from botocore.credentials import Credentials
+
+    store = S3SegmentStore(s3_bucket_name="bucket", s3_region_name="us-east-1")
+    monkeypatch.setattr(
+        store, "_get_aws_credentials", lambda: Credentials("key", "secret")
+    )
+    response = MagicMock(status_code=206, content=b"data")
+    store.async_client = MagicMock(get=AsyncMock(return_value=response))
+
+    assert await store.async_get_range("segments/abc", 10, 14) == b"data"
+    kwargs = store.async_client.get.call_args.kwargs
+    assert kwargs["url"] == "https://bucket.s3.us-east-1.amazonaws.com/segments/abc"
+    assert kwargs["headers"]["Range"] == "bytes=10-13"
+    assert kwargs["headers"]["Authorization"].startswith("AWS4-HMAC-SHA256")
+
+
+def test_s3_segment_store_lists_all_pages(monkeypatch):
+    from botocore.credentials import Credentials
+
+    store = S3SegmentStore(s3_bucket_name="bucket", s3_region_name="us-east-1")
+    monkeypatch.setattr(
+        store, "_get_aws_credentials", lambda: Credentials("key", "secret")
+    )
+    pages = [
+        b'<ListBucketResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/"><Contents><Key>index/1</Key></Contents><NextContinuationToken>a b</NextContinuationToken></ListBucketResult>',
+        b'<ListBucketResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/"><Contents><Key>index/2</Key></Contents></ListBucketResult>',
+    ]
+    store.sync_client = MagicMock(
+        get=MagicMock(
+            side_effect=[MagicMock(status_code=200, content=page) for page in pages]
+        )
+    )
+
+    assert store.list_objects("index/") == ["index/1", "index/2"]
+    urls = [call.kwargs["url"] for call in store.sync_client.get.call_args_list]
+    assert urls[1].endswith("?list-type=2&prefix=index%2F&continuation-token=a%20b")
+
+
+def test_segment_cache_init_from_cache_params():
+    cache = Cache(
+        type="s3-segments",
+        s3_bucket_name="bucket",
+        s3_region_name="us-east-1",
+        s3_path="llm",
+    )
+    assert isinstance(cache.cache, SegmentObjectCache)
+    assert isinstance(cache.cache.store, S3SegmentStore)
+    assert cache.cache.key_prefix == "llm/"
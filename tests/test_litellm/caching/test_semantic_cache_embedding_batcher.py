@@ -0,0 +1,91 @@
+import asyncio
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(
+    0, os.path.abspath("../../..")
+)  # Adds the parent directory to the system path
+
+from litellm.caching.semantic_cache_embedding_batcher import (
+    SemanticCacheEmbeddingBatcher,
+)
+
+
+def _mock_aembedding(calls):
+    async def aembedding(model, input, **kwargs):
+        calls.append(list(input))
+        # out of order, like some providers return them
+        return {
+            "data": [
+                {"index": i, "embedding": [float(len(prompt)), float(i)]}
+                for i, prompt in reversed(list(enumerate(input)))
+            ]
+        }
+
+    return aembedding
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_share_one_embedding_request():
+    calls = []
+    batcher = SemanticCacheEmbeddingBatcher(embedding_model="text-embedding-ada-002")
+    with patch("litellm.aembedding", side_effect=_mock_aembedding(calls)):
+        embeddings = await asyncio.gather(
+            batcher.get_embedding("a"),
+            batcher.get_embedding("bb"),
+            batcher.get_embedding("a"),
+        )
+        assert calls == [["a", "bb"]]
+        assert embeddings == [[1.0, 0.0], [2.0, 1.0], [1.0, 0.0]]
+
+        # the set after a lookup reuses its embedding
+        assert await batcher.get_embedding("bb", metadata={}) == [2.0, 1.0]
+        assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_embedding_batches_are_split_by_max_batch_size():
+    calls = []
+    batcher = SemanticCacheEmbeddingBatcher(
+        embedding_model="text-embedding-ada-002", batch_window_ms=50, max_batch_size=2
+    )
+    with patch("litellm.aembedding", side_effect=_mock_aembedding(calls)):
+        await asyncio.gather(*[batcher.get_embedding(str(i)) for i in range(5)])
+    assert sorted(len(call) for call in calls) == [1, 2, 2]
+    # the early flushes are held until they're done
+    await asyncio.sleep(0)
+    assert batcher._background_tasks == set()
+
+
+@pytest.mark.asyncio
+async def test_embedding_batch_failure_is_raised_to_every_lookup():
+    batcher = SemanticCacheEmbeddingBatcher(embedding_model="text-embedding-ada-002")
+    with patch("litellm.aembedding", side_effect=Exception("rate limited")):
+        results = await asyncio.gather(
+            batcher.get_embedding("a"),
+            batcher.get_embedding("b"),
+            return_exceptions=True,
+        )
+    assert [str(result) for result in results] == ["rate limited", "rate limited"]
+    assert batcher._in_flight == {}
+    assert len(batcher._recent_embeddings) == 0
+
+
+@pytest.mark.asyncio
+async def test_embeddings_are_not_shared_across_api_keys():
+    calls = []
+    batcher = SemanticCacheEmbeddingBatcher(embedding_model="text-embedding-ada-002")
+    with patch("litellm.aembedding", side_effect=_mock_aembedding(calls)):
+        await asyncio.gather(
+            batcher.get_embedding("a", metadata={"user_api_key": "key-a"}),
+            batcher.get_embedding("a", metadata={"user_api_key": "key-b"}),
+        )
+        assert calls == [["a"], ["a"]]
+
+        # key-b's recent embedding isn't reused for key-c
+        await batcher.get_embedding("a", metadata={"user_api_key": "key-b"})
+        await batcher.get_embedding("a", metadata={"user_api_key": "key-c"})
+        assert len(calls) == 3
@@ -0,0 +1,120 @@
+import asyncio
+import os
+import sys
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+sys.path.insert(
+    0, os.path.abspath("../../..")
+)  # Adds the parent directory to the system path
+
+import litellm
+from litellm.caching.caching import Cache
+from litellm.caching.in_memory_cache import InMemoryCache
+from litellm.caching.tiered_cache import TieredCache
+
+
+def test_tiered_cache_get_falls_through_and_promotes():
+    l1, l2, l3 = InMemoryCache(), InMemoryCache(), InMemoryCache()
+    cache = TieredCache(caches=[l1, l2, l3], tier_ttls=[10, None, None])
+    l3.set_cache("key", "value")
+
+    assert cache.get_cache("key") == "value"
+    assert l1.get_cache("key") == "value"
+    assert l2.get_cache("key") == "value"
+    # promoted values get the tier's ttl
+    assert l1.ttl_dict["key"] - l2.ttl_dict["key"] < 0
+
+    assert cache.get_cache("key") == "value"
+    assert cache.get_cache("missing") is None
+    stats = cache.get_tier_stats()
+    assert stats["L1:InMemoryCache"]["hits"] == 1
+    assert stats["L1:InMemoryCache"]["misses"] == 2
+    assert stats["L1:InMemoryCache"]["hit_ratio"] == pytest.approx(1 / 3)
+    assert stats["L3:InMemoryCache"]["hits"] == 1
+    assert stats["L3:InMemoryCache"]["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_tiered_cache_async_write_back():
+    l1, l2 = InMemoryCache(), InMemoryCache()
+    cache = TieredCache(caches=[l1, l2], tier_ttls=[5, None])
+
+    await cache.async_set_cache("key", "value", ttl=60)
+    assert l1.get_cache("key") == "value"
+    # slower tiers are written in the background
+    await asyncio.gather(*cache._background_tasks)
+    assert l2.get_cache("key") == "value"
+    # ttl is capped by the tier's ttl
+    assert l2.ttl_dict["key"] - l1.ttl_dict["key"] == pytest.approx(55, abs=1)
+
+    l1.flush_cache()
+    assert await cache.async_get_cache("key") == "value"
+    assert l1.get_cache("key") == "value"
+    assert cache.get_tier_stats()["L2:InMemoryCache"]["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_tiered_cache_promotes_with_remaining_ttl():
+    l1, l2, l3 = InMemoryCache(), InMemoryCache(), InMemoryCache()
+    cache = TieredCache(caches=[l1, l2, l3], tier_ttls=[None, None, 30])
+    await l3.async_set_cache("key", "value", ttl=20)
+
+    assert await cache.async_get_cache("key") == "value"
+    await asyncio.gather(*cache._background_tasks)
+    # promoted values expire with the value they were promoted from - not after the default ttl
+    assert l1.ttl_dict["key"] == pytest.approx(l3.ttl_dict["key"], abs=1)
+    assert l2.ttl_dict["key"] == pytest.approx(l3.ttl_dict["key"], abs=1)
+
+
+@pytest.mark.asyncio
+async def test_tiered_cache_emits_stats_once_per_interval():
+    cache = TieredCache(caches=[InMemoryCache(), InMemoryCache()])
+    cache.service_logger_obj = MagicMock(async_service_success_hook=AsyncMock())
+
+    for _ in range(10):
+        await cache.async_get_cache("missing")
+    await asyncio.gather(*cache._background_tasks)
+    # one gauge per tier - not one per tier per lookup
+    assert cache.service_logger_obj.async_service_success_hook.await_count == 2
+    assert cache.get_tier_stats()["L2:InMemoryCache"]["misses"] == 10
+
+
+@pytest.mark.asyncio
+async def test_tiered_cache_response_caching():
+    litellm.cache = Cache(
+        type="tiered", cache_tiers=["local", {"type": "local", "ttl": 600}]
+    )
+    try:
+        assert isinstance(litellm.cache.cache, TieredCache)
+        assert litellm.cache.cache.tier_ttls == [None, 600]
+
+        messages = [{"role": "user", "content": "tiered cache test"}]
+        response1 = await litellm.acompletion(
+            model="gpt-3.5-turbo",
+            messages=messages,
+            mock_response="hello",
+            caching=True,
+        )
+        await asyncio.sleep(0.5)
+        await asyncio.gather(*litellm.cache.cache._background_tasks)
+        litellm.cache.cache.caches[0].flush_cache()
+
+        response2 = await litellm.acompletion(
+            model="gpt-3.5-turbo",
+            messages=messages,
+            mock_response="hello",
+            caching=True,
+        )
+        assert response2.id == response1.id
+        assert litellm.cache.cache.get_tier_stats()["L2:InMemoryCache"]["hits"] == 1
+    finally:
+        litellm.cache = None
+
+
+def test_tiered_cache_requires_tiers():
+    with pytest.raises(ValueError):
+        Cache(type="tiered")
+    with pytest.raises(ValueError):
+        Cache(type="tiered", cache_tiers=["local", "tiered"])
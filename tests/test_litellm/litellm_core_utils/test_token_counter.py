@@ -897,3 +897,39 @@ def test_token_counter_with_image_url():
     except ValueError as e:
         assert "Invalid detail value" in str(e), f"Expected detail validation error, got: {e}"
 
+
+
+def test_token_count_cache_reuses_long_segments():
+    from litellm.litellm_core_utils.token_counter import token_count_cache
+
+    token_count_cache.clear()
+    system_prompt = "You are a helpful assistant. " * 200
+    tokenized_texts = []
+
+    def _count_function(text: str) -> int:
+        tokenized_texts.append(text)
+        return len(text.split())
+
+    for user_message in ["hi", "hello"]:
+        for tokenizer_key in ["openai_tokenizer:cl100k_base", "openai_tokenizer:o200k_base"]:
+            for text in [system_prompt, user_message]:
+                token_count_cache.count(
+                    tokenizer_key=tokenizer_key,
+                    tokenizer=None,
+                    text=text,
+                    count_function=_count_function,
+                )
+
+    # the long system prompt is tokenized once per tokenizer, short texts every time
+    assert tokenized_texts.count(system_prompt) == 2
+    assert tokenized_texts.count("hi") == 2
+
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": "hi"},
+    ]
+    assert token_counter(model="gpt-4o", messages=messages) == token_counter(
+        model="gpt-4o", messages=messages
+    )
+    token_count_cache.clear()
+    assert token_counter(model="gpt-4o", messages=messages) > 1000
@@ -151,3 +151,46 @@ def test_cache_keys_management(base_strategy):
     # Test resetting cache keys
     base_strategy.reset_in_memory_keys_to_update()
     assert len(base_strategy.get_in_memory_keys_to_update()) == 0
+
+
+@pytest.mark.asyncio
+async def test_sync_refreshes_keys_read_since_last_sync():
+    from unittest.mock import AsyncMock
+
+    from litellm.caching.in_memory_cache import InMemoryCache
+
+    dual_cache = DualCache(in_memory_cache=InMemoryCache())
+    dual_cache.redis_cache = MagicMock()
+    dual_cache.redis_cache.async_increment_pipeline = AsyncMock(return_value=[3.0])
+    dual_cache.redis_cache.async_batch_get_cache = AsyncMock(
+        return_value={"stale_key": "12", "ahead_key": "1", "missing_key": None}
+    )
+    strategy = BaseRoutingStrategy(
+        dual_cache=dual_cache,
+        should_batch_redis_writes=False,
+        default_sync_interval=1,
+    )
+    await dual_cache.in_memory_cache.async_set_cache(key="ahead_key", value=5)
+
+    strategy.add_to_keys_to_refresh(
+        keys=["stale_key", "ahead_key", "missing_key"], ttl=60
+    )
+    # keys just pushed to redis already have the latest value, no need to read them back
+    await strategy._increment_value_in_current_window(key="pushed_key", value=3, ttl=60)
+    strategy.add_to_keys_to_refresh(keys=["pushed_key"], ttl=60)
+
+    await strategy._sync_in_memory_spend_with_redis()
+
+    dual_cache.redis_cache.async_batch_get_cache.assert_called_once()
+    assert set(
+        dual_cache.redis_cache.async_batch_get_cache.call_args.kwargs["key_list"]
+    ) == {"stale_key", "ahead_key", "missing_key"}
+    assert await dual_cache.in_memory_cache.async_get_cache(key="stale_key") == 12
+    assert await dual_cache.in_memory_cache.async_get_cache(key="ahead_key") == 5
+    assert await dual_cache.in_memory_cache.async_get_cache(key="missing_key") is None
+    assert await dual_cache.in_memory_cache.async_get_cache(key="pushed_key") == 3
+    assert strategy.keys_to_refresh == {}
+
+    # nothing read since the last sync -> no redis read
+    await strategy._sync_in_memory_spend_with_redis()
+    dual_cache.redis_cache.async_batch_get_cache.assert_called_once()
@@ -0,0 +1,120 @@
+import os
+import sys
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.insert(
+    0, os.path.abspath("../../..")
+)  # Adds the parent directory to the system path
+
+from litellm.caching.caching import DualCache
+from litellm.router_strategy.lowest_latency import (
+    LowestLatencyLoggingHandler,
+    get_latency_statistic,
+)
+
+
+def _kwargs(deployment_id: str) -> dict:
+    return {
+        "litellm_params": {
+            "metadata": {"model_group": "gpt-3.5-turbo"},
+            "model_info": {"id": deployment_id},
+        }
+    }
+
+
+def _log_latency(handler: LowestLatencyLoggingHandler, deployment_id: str, latency):
+    start_time = time.time()
+    handler.log_success_event(
+        kwargs=_kwargs(deployment_id),
+        response_obj={},
+        start_time=start_time,
+        end_time=start_time + latency,
+    )
+
+
+@pytest.mark.parametrize(
+    "statistic, expected",
+    [
+        ("mean", 23.0),
+        ("p50", 3.0),
+        ("p90", 100.0),
+        ("p99", 100.0),
+    ],
+)
+def test_get_latency_statistic(statistic, expected):
+    samples = [1.0, 2.0, 3.0, 9.0, 100.0]
+    assert get_latency_statistic(samples, statistic=statistic) == pytest.approx(
+        expected
+    )
+
+
+def test_get_latency_statistic_ewma_weighs_recent_samples():
+    assert get_latency_statistic(
+        [1.0, 1.0, 10.0], statistic="ewma", ewma_alpha=0.5
+    ) == (pytest.approx(5.5))
+    assert get_latency_statistic([], statistic="p90") == 0.0
+
+
+def test_latency_samples_are_a_ring_buffer():
+    test_cache = DualCache()
+    handler = LowestLatencyLoggingHandler(
+        router_cache=test_cache, routing_args={"max_latency_list_size": 3}
+    )
+    for latency in [1.0, 2.0, 3.0, 4.0, 5.0]:
+        _log_latency(handler, "1234", latency)
+
+    latencies = test_cache.get_cache(key="gpt-3.5-turbo_map")["1234"]["latency"]
+    assert latencies == pytest.approx([3.0, 4.0, 5.0])
+
+
+def test_routing_by_percentile_avoids_tail_latency():
+    """
+    Deployment 1 is usually fast with a slow outlier, deployment 2 is consistently mid.
+    Mean prefers deployment 2, p50 prefers deployment 1.
+    """
+    healthy_deployments = [
+        {"model_name": "gpt-3.5-turbo", "model_info": {"id": "1"}},
+        {"model_name": "gpt-3.5-turbo", "model_info": {"id": "2"}},
+    ]
+    for statistic, expected_id in [("mean", "2"), ("p50", "1")]:
+        handler = LowestLatencyLoggingHandler(
+            router_cache=DualCache(), routing_args={"latency_statistic": statistic}
+        )
+        for latency in [0.1, 0.1, 0.1, 0.1, 10.0]:
+            _log_latency(handler, "1", latency)
+        for _ in range(5):
+            _log_latency(handler, "2", 1.0)
+
+        deployment = handler.get_available_deployments(
+            model_group="gpt-3.5-turbo", healthy_deployments=healthy_deployments
+        )
+        assert deployment["model_info"]["id"] == expected_id
+
+
+@pytest.mark.asyncio
+async def test_latency_sync_interval_coalesces_shared_cache_writes():
+    redis_cache = MagicMock()
+    test_cache = DualCache(redis_cache=redis_cache)
+    redis_cache.async_set_cache = MagicMock(side_effect=_noop_async)
+    handler = LowestLatencyLoggingHandler(
+        router_cache=test_cache, routing_args={"latency_sync_interval": 60}
+    )
+    for _ in range(5):
+        start_time = time.time()
+        await handler.async_log_success_event(
+            kwargs=_kwargs("1234"),
+            response_obj={},
+            start_time=start_time,
+            end_time=start_time + 1.0,
+        )
+
+    assert redis_cache.async_set_cache.call_count == 1
+    latency_map = test_cache.in_memory_cache.get_cache(key="gpt-3.5-turbo_map")
+    assert len(latency_map["1234"]["latency"]) == 5
+
+
+async def _noop_async(*args, **kwargs):
+    return None
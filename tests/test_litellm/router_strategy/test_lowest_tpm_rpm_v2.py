@@ -0,0 +1,96 @@
+import os
+import sys
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+sys.path.insert(
+    0, os.path.abspath("../../..")
+)  # Adds the parent directory to the system path
+
+from litellm.caching.caching import DualCache
+from litellm.caching.in_memory_cache import InMemoryCache
+from litellm.router_strategy.lowest_tpm_rpm_v2 import LowestTPMLoggingHandler_v2
+from litellm.utils import get_utc_datetime
+
+
+def _get_handler():
+    dual_cache = DualCache(in_memory_cache=InMemoryCache())
+    dual_cache.redis_cache = MagicMock()
+    dual_cache.redis_cache.async_batch_get_cache = AsyncMock(return_value={})
+    dual_cache.redis_cache.async_increment = AsyncMock()
+    dual_cache.redis_cache.async_increment_pipeline = AsyncMock(return_value=None)
+    handler = LowestTPMLoggingHandler_v2(router_cache=dual_cache)
+    if handler._sync_task is not None:
+        handler._sync_task.cancel()
+    return handler
+
+
+def _get_deployments():
+    return [
+        {
+            "model_name": "gpt-3.5-turbo",
+            "litellm_params": {"model": "azure/chatgpt-v-2", "tpm": 1000},
+            "model_info": {"id": str(i)},
+        }
+        for i in range(5)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_async_routing_reads_local_mirror_only():
+    handler = _get_handler()
+    deployments = _get_deployments()
+    current_minute = get_utc_datetime().strftime("%H-%M")
+    await handler.router_cache.in_memory_cache.async_set_cache(
+        key=f"0:azure/chatgpt-v-2:tpm:{current_minute}", value=500
+    )
+
+    for _ in range(3):
+        deployment = await handler.async_get_available_deployments(
+            model_group="gpt-3.5-turbo",
+            healthy_deployments=deployments,
+            messages=[{"role": "user", "content": "hi"}],
+        )
+        assert deployment["model_info"]["id"] != "0"
+
+    handler.router_cache.redis_cache.async_batch_get_cache.assert_not_called()
+    # every candidate counter is refreshed on the next sync, in one batched read
+    assert len(handler.keys_to_refresh) == 2 * len(deployments)
+
+    await handler._sync_in_memory_spend_with_redis()
+    handler.router_cache.redis_cache.async_batch_get_cache.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_async_tpm_increments_are_coalesced():
+    handler = _get_handler()
+    kwargs = {
+        "standard_logging_object": {
+            "model_group": "gpt-3.5-turbo",
+            "model_id": "1",
+            "hidden_params": {"litellm_model_name": "azure/chatgpt-v-2"},
+            "total_tokens": 10,
+        }
+    }
+    for _ in range(3):
+        await handler.async_log_success_event(
+            kwargs=kwargs, response_obj=None, start_time=None, end_time=None
+        )
+
+    handler.router_cache.redis_cache.async_increment.assert_not_called()
+    current_minute = get_utc_datetime().strftime("%H-%M")
+    tpm_key = f"1:azure/chatgpt-v-2:tpm:{current_minute}"
+    assert (
+        await handler.router_cache.async_get_cache(key=tpm_key, local_only=True) == 30
+    )
+
+    await handler._sync_in_memory_spend_with_redis()
+    increment_list = (
+        handler.router_cache.redis_cache.async_increment_pipeline.call_args.kwargs[
+            "increment_list"
+        ]
+    )
+    assert len(increment_list) == 1
+    assert increment_list[0]["key"] == tpm_key
+    assert increment_list[0]["increment_value"] == 30
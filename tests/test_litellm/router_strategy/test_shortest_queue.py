@@ -0,0 +1,170 @@
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(
+    0, os.path.abspath("../../..")
+)  # Adds the parent directory to the system path
+
+import litellm
+from litellm import Router
+from litellm.caching.caching import DualCache
+from litellm.router_strategy.shortest_queue import ShortestQueueLoggingHandler
+
+
+def _get_deployments(n: int = 3):
+    return [
+        {
+            "model_name": "gpt-3.5-turbo",
+            "litellm_params": {"model": "gpt-3.5-turbo", "api_key": "fake-key"},
+            "model_info": {"id": str(i)},
+        }
+        for i in range(n)
+    ]
+
+
+def _get_kwargs(model_id: str) -> dict:
+    return {"litellm_params": {"model_info": {"id": model_id}}}
+
+
+def test_in_flight_requests_tracked_per_deployment():
+    handler = ShortestQueueLoggingHandler(router_cache=DualCache())
+    deployments = _get_deployments()
+
+    handler.pre_call_check(deployments[0])
+    handler.pre_call_check(deployments[0])
+    handler.pre_call_check(deployments[1])
+    assert handler.in_flight_requests == {"0": 2, "1": 1}
+
+    start_time = datetime.now()
+    handler.log_success_event(
+        kwargs=_get_kwargs("0"),
+        response_obj=None,
+        start_time=start_time,
+        end_time=start_time + timedelta(seconds=2),
+    )
+    handler.log_failure_event(
+        kwargs=_get_kwargs("1"),
+        response_obj=None,
+        start_time=start_time,
+        end_time=start_time + timedelta(seconds=5),
+    )
+    # a completion without a matching pre call check does not go negative
+    handler.log_failure_event(
+        kwargs=_get_kwargs("1"),
+        response_obj=None,
+        start_time=start_time,
+        end_time=start_time,
+    )
+    assert handler.in_flight_requests == {"0": 1, "1": 0}
+    # only successful calls update the service time
+    assert handler.service_times == {"0": 2.0}
+
+
+def test_power_of_two_choices_picks_less_loaded_of_sampled_pair():
+    handler = ShortestQueueLoggingHandler(
+        router_cache=DualCache(), routing_strategy="power-of-two-choices"
+    )
+    deployments = _get_deployments()
+    for _ in range(3):
+        handler.pre_call_check(deployments[0])
+
+    with patch(
+        "litellm.router_strategy.shortest_queue.random.sample",
+        return_value=[deployments[0], deployments[2]],
+    ):
+        deployment = handler.get_available_deployments(
+            model_group="gpt-3.5-turbo", healthy_deployments=deployments
+        )
+    assert deployment["model_info"]["id"] == "2"
+
+    # never picks the busiest deployment when all others are idle
+    for _ in range(50):
+        deployment = handler.get_available_deployments(
+            model_group="gpt-3.5-turbo", healthy_deployments=deployments
+        )
+        assert deployment["model_info"]["id"] != "0"
+
+
+def test_join_shortest_queue_weights_queue_by_service_time():
+    handler = ShortestQueueLoggingHandler(
+        router_cache=DualCache(), routing_strategy="join-shortest-queue"
+    )
+    deployments = _get_deployments(2)
+    handler.service_times = {"0": 1.0, "1": 10.0}
+
+    # 0 has 3 queued requests at 1s, 1 is idle at 10s -> 4s vs 10s expected wait
+    for _ in range(3):
+        handler.pre_call_check(deployments[0])
+    deployment = handler.get_available_deployments(
+        model_group="gpt-3.5-turbo", healthy_deployments=deployments
+    )
+    assert deployment["model_info"]["id"] == "0"
+
+    # 10 queued requests at 1s -> 11s vs 10s expected wait
+    for _ in range(7):
+        handler.pre_call_check(deployments[0])
+    deployment = handler.get_available_deployments(
+        model_group="gpt-3.5-turbo", healthy_deployments=deployments
+    )
+    assert deployment["model_info"]["id"] == "1"
+
+
+@pytest.mark.parametrize(
+    "routing_strategy", ["power-of-two-choices", "join-shortest-queue"]
+)
+@pytest.mark.asyncio
+async def test_router_with_shortest_queue_strategies(routing_strategy):
+    router = Router(
+        model_list=_get_deployments(),
+        routing_strategy=routing_strategy,
+    )
+    assert isinstance(router.shortestqueue_logger, ShortestQueueLoggingHandler)
+    assert router.shortestqueue_logger.routing_strategy == routing_strategy
+
+    for _ in range(6):
+        deployment = await router.async_get_available_deployment(
+            model="gpt-3.5-turbo",
+            messages=[{"role": "user", "content": "hi"}],
+            request_kwargs={},
+        )
+        await router.async_routing_strategy_pre_call_checks(
+            deployment=deployment, parent_otel_span=None
+        )
+
+    # 6 requests in flight across 3 deployments, spread evenly by jsq
+    in_flight = router.shortestqueue_logger.in_flight_requests
+    assert sum(in_flight.values()) == 6
+    if routing_strategy == "join-shortest-queue":
+        assert in_flight == {"0": 2, "1": 2, "2": 2}
+
+
+@pytest.mark.asyncio
+async def test_cancelled_call_is_no_longer_in_flight(monkeypatch):
+    monkeypatch.setattr(litellm, "callbacks", [])
+    router = Router(
+        model_list=_get_deployments(n=1),
+        routing_strategy="join-shortest-queue",
+    )
+    task = asyncio.create_task(
+        router.acompletion(
+            model="gpt-3.5-turbo",
+            messages=[{"role": "user", "content": "hi"}],
+            mock_response="hello",
+            mock_delay=10,
+        )
+    )
+    for _ in range(100):
+        await asyncio.sleep(0.01)
+        if router.shortestqueue_logger.in_flight_requests.get("0", 0) == 1:
+            break
+    assert router.shortestqueue_logger.in_flight_requests == {"0": 1}
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert router.shortestqueue_logger.in_flight_requests == {"0": 0}
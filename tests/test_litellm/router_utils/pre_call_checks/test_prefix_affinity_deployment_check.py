@@ -0,0 +1,134 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath("../../../.."))
+
+from litellm import Router
+from litellm.router_utils.pre_call_checks.prefix_affinity_deployment_check import (
+    ConsistentHashRing,
+    PrefixAffinityDeploymentCheck,
+    get_prefix_hash,
+)
+
+SYSTEM_PROMPT = "You are a helpful agent. " * 200
+
+
+def _get_deployments(n: int = 4):
+    return [
+        {
+            "model_name": "claude",
+            "litellm_params": {"model": "anthropic/claude-3-5-sonnet", "api_key": "x"},
+            "model_info": {"id": f"deployment-{i}"},
+        }
+        for i in range(n)
+    ]
+
+
+def _get_messages(system_prompt: str, user_message: str):
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_message},
+    ]
+
+
+def test_get_prefix_hash_breakpoints():
+    # shared system prompt -> same hash, regardless of the user turn
+    assert get_prefix_hash(
+        messages=_get_messages(SYSTEM_PROMPT, "hi"), tools=None
+    ) == get_prefix_hash(messages=_get_messages(SYSTEM_PROMPT, "hello"), tools=None)
+    # tools are part of the prefix
+    assert get_prefix_hash(
+        messages=_get_messages(SYSTEM_PROMPT, "hi"), tools=None
+    ) != get_prefix_hash(
+        messages=_get_messages(SYSTEM_PROMPT, "hi"),
+        tools=[{"type": "function", "function": {"name": "search"}}],
+    )
+    # short prompts are not pinned to a deployment
+    assert get_prefix_hash(messages=_get_messages("be brief", "hi"), tools=None) is None
+
+    # short system prompt -> falls through to the turn breakpoints
+    long_turn = "context " * 1000
+    assert get_prefix_hash(
+        messages=_get_messages("be brief", long_turn), tools=None
+    ) == get_prefix_hash(
+        messages=_get_messages("be brief", long_turn)
+        + [{"role": "assistant", "content": "ok"}],
+        tools=None,
+    )
+
+
+def test_consistent_hash_ring_only_moves_removed_deployment_keys():
+    model_ids = tuple(f"deployment-{i}" for i in range(4))
+    ring = ConsistentHashRing(model_ids=model_ids, virtual_nodes=100)
+    smaller_ring = ConsistentHashRing(model_ids=model_ids[:3], virtual_nodes=100)
+
+    for key in range(0, 2**64, 2**58):
+        owner = next(ring.iter_model_ids(key))
+        if owner != "deployment-3":
+            assert next(smaller_ring.iter_model_ids(key)) == owner
+    assert sorted(ring.iter_model_ids(12345)) == sorted(model_ids)
+
+
+@pytest.mark.asyncio
+async def test_prefix_affinity_bounded_load_spillover():
+    check = PrefixAffinityDeploymentCheck(load_factor=1.25)
+    deployments = _get_deployments()
+    messages = _get_messages(SYSTEM_PROMPT, "hi")
+
+    picked = await check.async_filter_deployments(
+        model="claude", healthy_deployments=deployments, messages=messages
+    )
+    assert len(picked) == 1
+    target_id = picked[0]["model_info"]["id"]
+
+    # same prefix -> same deployment, while it's within its load bound
+    other_id = next(
+        d["model_info"]["id"] for d in deployments if d["model_info"]["id"] != target_id
+    )
+    for _ in range(3):
+        await check.async_pre_call_check(
+            {"model_info": {"id": other_id}}, parent_otel_span=None
+        )
+    await check.async_pre_call_check(picked[0], parent_otel_span=None)
+    picked = await check.async_filter_deployments(
+        model="claude", healthy_deployments=deployments, messages=messages
+    )
+    assert picked[0]["model_info"]["id"] == target_id
+
+    # capacity = ceil(1.25 * (5 + 1) / 4) = 2 -> target is full, spill over to the next deployment
+    await check.async_pre_call_check(picked[0], parent_otel_span=None)
+    picked = await check.async_filter_deployments(
+        model="claude", healthy_deployments=deployments, messages=messages
+    )
+    assert picked[0]["model_info"]["id"] != target_id
+
+    # completion frees up capacity again
+    await check.async_log_success_event(
+        kwargs={"litellm_params": {"model_info": {"id": target_id}}},
+        response_obj=None,
+        start_time=None,
+        end_time=None,
+    )
+    picked = await check.async_filter_deployments(
+        model="claude", healthy_deployments=deployments, messages=messages
+    )
+    assert picked[0]["model_info"]["id"] == target_id
+
+
+@pytest.mark.asyncio
+async def test_router_prefix_affinity_routes_shared_prefix_to_same_deployment():
+    router = Router(
+        model_list=_get_deployments(),
+        optional_pre_call_checks=["prefix_affinity"],
+    )
+    picked_ids = set()
+    for i in range(5):
+        deployment = await router.async_get_available_deployment(
+            model="claude",
+            messages=_get_messages(SYSTEM_PROMPT, f"question {i}"),
+            request_kwargs={},
+        )
+        picked_ids.add(deployment["model_info"]["id"])
+    assert len(picked_ids) == 1
@@ -0,0 +1,121 @@
+"""
+Unit tests for adaptive concurrency limits in the Router
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath("../../.."))
+
+import litellm
+from litellm import Router
+from litellm.router_utils.adaptive_concurrency import AdaptiveConcurrencyLimiter
+from litellm.types.router import AdaptiveConcurrencyConfig
+
+
+def _get_limiter(**config) -> AdaptiveConcurrencyLimiter:
+    return AdaptiveConcurrencyLimiter(
+        model_id="1", adaptive_concurrency_config=AdaptiveConcurrencyConfig(**config)
+    )
+
+
+def test_limit_grows_while_latency_is_flat():
+    limiter = _get_limiter(initial_limit=4, max_limit=6)
+    limiter.in_flight = 4
+    for _ in range(4):
+        limiter.on_success(latency=1.0)
+    assert limiter.limit == pytest.approx(5, abs=0.1)
+
+    # an unused limit doesn't grow
+    limiter.in_flight = 1
+    limit = limiter.limit
+    limiter.on_success(latency=1.0)
+    assert limiter.limit == limit
+
+    limiter.in_flight = 6
+    for _ in range(100):
+        limiter.on_success(latency=1.0)
+    assert limiter.limit == 6
+
+
+def test_limit_backs_off_on_overload_and_latency_gradient():
+    limiter = _get_limiter(initial_limit=40, latency_tolerance=2.0)
+    limiter.on_overload()
+    assert limiter.limit == 20
+
+    limiter.in_flight = 20
+    limiter.on_success(latency=1.0)  # 20 -> 20.05
+    limiter.on_success(latency=10.0)  # deployment is queueing
+    assert limiter.limit == pytest.approx(20.05 * 0.9)
+
+    for _ in range(20):
+        limiter.on_overload()
+    assert limiter.limit == 1
+
+
+@pytest.mark.asyncio
+async def test_limiter_queues_requests_over_the_limit():
+    limiter = _get_limiter(initial_limit=2, max_limit=2)
+    max_in_flight = 0
+
+    async def _call(exception=None):
+        nonlocal max_in_flight
+        async with limiter:
+            max_in_flight = max(max_in_flight, limiter.in_flight)
+            await asyncio.sleep(0.01)
+            if exception is not None:
+                raise exception
+
+    await asyncio.gather(*[_call() for _ in range(6)])
+    assert max_in_flight == 2
+    assert limiter.in_flight == 0
+
+    with pytest.raises(litellm.RateLimitError):
+        await _call(
+            litellm.RateLimitError(
+                message="rate limited", llm_provider="openai", model="gpt-3.5-turbo"
+            )
+        )
+    assert limiter.limit == 1
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_router_routes_to_deployments_below_their_limit():
+    router = Router(
+        model_list=[
+            {
+                "model_name": "gpt-3.5-turbo",
+                "litellm_params": {
+                    "model": "gpt-3.5-turbo",
+                    "api_key": "fake-key",
+                    "mock_response": "hi",
+                    "max_parallel_requests": 1,
+                },
+                "model_info": {"id": str(i)},
+            }
+            for i in range(2)
+        ],
+        adaptive_concurrency_config={"initial_limit": 5},
+    )
+    response = await router.acompletion(
+        model="gpt-3.5-turbo", messages=[{"role": "user", "content": "hi"}]
+    )
+    model_id = response._hidden_params["model_id"]
+    limiter = router.adaptive_concurrency_limiters[model_id]
+    assert isinstance(limiter, AdaptiveConcurrencyLimiter)
+    # max_parallel_requests caps the limit
+    assert limiter.limit == 1
+
+    await limiter.acquire()
+    for _ in range(5):
+        deployment = await router.async_get_available_deployment(
+            model="gpt-3.5-turbo",
+            messages=[{"role": "user", "content": "hi"}],
+            request_kwargs={},
+        )
+        assert deployment["model_info"]["id"] != model_id
+    limiter.release()
@@ -4,7 +4,8 @@ Unit tests for CooldownCache exception masking functionality
 
 import os
 import sys
-from unittest.mock import MagicMock
+import time
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
@@ -14,7 +15,11 @@ sys.path.insert(0, os.path.abspath("../../.."))
 from litellm.caching.dual_cache import DualCache
 from litellm.caching.in_memory_cache import InMemoryCache
 from litellm.litellm_core_utils.sensitive_data_masker import SensitiveDataMasker
-from litellm.router_utils.cooldown_cache import CooldownCache, CooldownCacheValue
+from litellm.router_utils.cooldown_cache import (
+    CooldownCache,
+    CooldownCacheValue,
+    CooldownIndex,
+)
 
 
 class TestCooldownCacheExceptionMasking:
@@ -255,3 +260,85 @@ class TestCooldownCacheExceptionMasking:
         # Should show first 50 characters, then all asterisks
         expected = "A" * 50 + "*" * 50
         assert masked == expected
+
+
+class TestCooldownIndex:
+    """Test suite for the in-process cooldown index"""
+
+    @staticmethod
+    def _cooldown_value(timestamp: float, cooldown_time: float) -> CooldownCacheValue:
+        return CooldownCacheValue(
+            exception_received="error",
+            status_code="429",
+            timestamp=timestamp,
+            cooldown_time=cooldown_time,
+        )
+
+    def test_index_expires_entries(self):
+        index = CooldownIndex()
+        now = time.time()
+        index.add("expired", self._cooldown_value(timestamp=now - 10, cooldown_time=5))
+        index.add("active", self._cooldown_value(timestamp=now, cooldown_time=60))
+
+        active = index.get_active_cooldowns()
+        assert [model_id for model_id, _ in active] == ["active"]
+        assert len(index) == 1
+
+    def test_index_filters_by_model_ids(self):
+        index = CooldownIndex()
+        now = time.time()
+        for model_id in ["a", "b", "c"]:
+            index.add(model_id, self._cooldown_value(timestamp=now, cooldown_time=60))
+
+        assert [m for m, _ in index.get_active_cooldowns(model_ids=["c", "a"])] == [
+            "c",
+            "a",
+        ]
+        assert [m for m, _ in index.get_active_cooldowns(model_ids=["b"])] == ["b"]
+
+    def test_index_keeps_longest_cooldown(self):
+        index = CooldownIndex()
+        now = time.time()
+        index.add("a", self._cooldown_value(timestamp=now, cooldown_time=60))
+        index.add("a", self._cooldown_value(timestamp=now, cooldown_time=1))
+
+        assert index.get_active_cooldowns()[0][1]["cooldown_time"] == 60
+
+    @pytest.mark.asyncio
+    async def test_local_cooldowns_read_without_cache_round_trip(self):
+        dual_cache = DualCache()
+        dual_cache.async_batch_get_cache = AsyncMock()  # type: ignore
+        cooldown_cache = CooldownCache(cache=dual_cache, default_cooldown_time=60.0)
+
+        cooldown_cache.add_deployment_to_cooldown(
+            model_id="model-1",
+            original_exception=Exception("rate limited"),
+            exception_status=429,
+            cooldown_time=None,
+        )
+        active = await cooldown_cache.async_get_active_cooldowns(
+            model_ids=["model-1", "model-2"], parent_otel_span=None
+        )
+
+        assert [model_id for model_id, _ in active] == ["model-1"]
+        dual_cache.async_batch_get_cache.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_index_syncs_cooldowns_from_redis(self):
+        dual_cache = DualCache(redis_cache=MagicMock())
+        remote_cooldown = self._cooldown_value(timestamp=time.time(), cooldown_time=60)
+        dual_cache.async_batch_get_cache = AsyncMock(  # type: ignore
+            return_value=[None, remote_cooldown]
+        )
+        cooldown_cache = CooldownCache(
+            cache=dual_cache, default_cooldown_time=60.0, index_sync_interval=60
+        )
+
+        for _ in range(3):
+            active = await cooldown_cache.async_get_active_cooldowns(
+                model_ids=["model-1", "model-2"], parent_otel_span=None
+            )
+            assert [model_id for model_id, _ in active] == ["model-2"]
+
+        # synced once, then served from the index until the sync interval elapses
+        dual_cache.async_batch_get_cache.assert_called_once()
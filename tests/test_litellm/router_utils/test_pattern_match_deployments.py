@@ -0,0 +1,93 @@
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.abspath("../../.."))
+
+from litellm.router_utils.pattern_match_deployments import (
+    CompiledPatternMatcher,
+    PatternMatchRouter,
+    PatternUtils,
+)
+
+
+def _get_deployment(model_name: str, model: str) -> dict:
+    return {"model_name": model_name, "litellm_params": {"model": model}}
+
+
+def test_get_literal_prefix():
+    router = PatternMatchRouter()
+    assert (
+        CompiledPatternMatcher.get_literal_prefix(
+            router._pattern_to_regex("openai/fo::*::static::*")
+        )
+        == "openai/fo::"
+    )
+    assert (
+        CompiledPatternMatcher.get_literal_prefix(
+            router._pattern_to_regex("bedrock/meta.llama3*")
+        )
+        == "bedrock/meta.llama3"
+    )
+    assert (
+        CompiledPatternMatcher.get_literal_prefix(router._pattern_to_regex("*")) == ""
+    )
+    assert CompiledPatternMatcher.get_literal_prefix("gpt-4o?") == "gpt-4"
+    assert CompiledPatternMatcher.get_literal_prefix("openai/.*|azure/.*") == ""
+
+
+def test_compiled_patterns_match_linear_scan():
+    router = PatternMatchRouter()
+    wildcards = [
+        "*",
+        "*meta.llama3*",
+        "openai/*",
+        "openai/gpt-*",
+        "openai/fo::*::static::*",
+    ]
+    wildcards += [f"provider-{i}/*" for i in range(200)]
+    for wildcard in wildcards:
+        router.add_pattern(wildcard, _get_deployment(wildcard, "openai/*"))
+
+    requests = [
+        "openai/gpt-4o",
+        "openai/o1",
+        "openai/fo::hi::static::hello",
+        "bedrock/meta.llama3-70b",
+        "provider-42/my-model",
+        "provider-4/my-model",
+        "unknown-model",
+    ]
+    for request in requests:
+        # first match, scanning every pattern in specificity order
+        expected_pattern = next(
+            pattern
+            for pattern, _ in PatternUtils.sorted_patterns(router.patterns)
+            if re.match(pattern, request)
+        )
+        deployments = router.route(request)
+        assert deployments is not None
+        assert (
+            router._pattern_to_regex(deployments[0]["model_name"]) == expected_pattern
+        )
+
+
+def test_compiled_patterns_are_memoized_and_recompiled_on_change():
+    router = PatternMatchRouter()
+    router.add_pattern("openai/*", _get_deployment("openai/*", "openai/*"))
+
+    deployments = router.route("openai/gpt-4o")
+    assert deployments[0]["litellm_params"]["model"] == "openai/gpt-4o"
+    compiled_patterns = router._get_compiled_patterns()
+    assert compiled_patterns.get_matching_patterns("openai/gpt-4o") == ["openai/(.*)"]
+    assert "openai/gpt-4o" in compiled_patterns._matching_patterns_cache
+
+    # more specific pattern is picked up after it's added
+    router.add_pattern("openai/gpt-*", _get_deployment("openai/gpt-*", "azure/gpt-*"))
+    deployments = router.route("openai/gpt-4o")
+    assert deployments[0]["litellm_params"]["model"] == "azure/gpt-4o"
+
+    # filtered_model_names skips patterns not in the filter
+    deployments = router.route("openai/gpt-4o", filtered_model_names=["openai/*"])
+    assert deployments[0]["litellm_params"]["model"] == "openai/gpt-4o"
+    assert router.route("anthropic/claude") is None
@@ -0,0 +1,244 @@
+"""
+Unit tests for request coalescing in the Router
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath("../../.."))
+
+from litellm import Router
+from litellm.router_utils.request_coalescing import CoalescedStream
+from litellm.types.router import RequestCoalescingConfig
+
+
+def _get_router(request_coalescing_config: dict) -> Router:
+    router = Router(
+        model_list=[
+            {
+                "model_name": "gpt-3.5-turbo",
+                "litellm_params": {
+                    "model": "gpt-3.5-turbo",
+                    "api_key": "fake-key",
+                    "mock_response": "hello world",
+                    "mock_delay": 0.2,
+                },
+            },
+            {
+                "model_name": "text-embedding-ada-002",
+                "litellm_params": {
+                    "model": "text-embedding-ada-002",
+                    "api_key": "fake-key",
+                    "mock_response": [0.1, 0.2],
+                },
+            },
+        ],
+        request_coalescing_config=request_coalescing_config,
+    )
+    router.provider_calls = 0
+    _acompletion = router._acompletion
+
+    async def _counting_acompletion(*args, **kwargs):
+        router.provider_calls += 1
+        return await _acompletion(*args, **kwargs)
+
+    router._acompletion = _counting_acompletion
+    return router
+
+
+@pytest.mark.asyncio
+async def test_identical_requests_share_one_call():
+    router = _get_router({})
+    assert isinstance(
+        router.request_coalescer.request_coalescing_config, RequestCoalescingConfig
+    )
+
+    responses = await asyncio.gather(
+        *[
+            router.acompletion(
+                model="gpt-3.5-turbo",
+                messages=[{"role": "user", "content": "hi"}],
+                temperature=0,
+            )
+            for _ in range(5)
+        ]
+    )
+    assert router.provider_calls == 1
+    assert len({id(response) for response in responses}) == 5
+    for response in responses:
+        assert response.choices[0].message.content == "hello world"
+    assert (
+        sum(
+            response._hidden_params.get("coalesced_request", False) is True
+            for response in responses
+        )
+        == 4
+    )
+    assert router.request_coalescer.in_flight_requests == {}
+
+    # different messages aren't coalesced
+    await asyncio.gather(
+        *[
+            router.acompletion(
+                model="gpt-3.5-turbo",
+                messages=[{"role": "user", "content": f"hi {i}"}],
+                temperature=0,
+            )
+            for i in range(2)
+        ]
+    )
+    assert router.provider_calls == 3
+
+
+@pytest.mark.asyncio
+async def test_non_deterministic_and_no_cache_requests_are_not_coalesced():
+    router = _get_router({"max_in_flight_keys": 1})
+    await asyncio.gather(
+        *[
+            router.acompletion(
+                model="gpt-3.5-turbo",
+                messages=[{"role": "user", "content": "hi"}],
+            )
+            for _ in range(2)
+        ],
+        *[
+            router.acompletion(
+                model="gpt-3.5-turbo",
+                messages=[{"role": "user", "content": "hi"}],
+                temperature=0,
+                cache={"no-cache": True},
+            )
+            for _ in range(2)
+        ],
+    )
+    assert router.provider_calls == 4
+
+    # requests past max_in_flight_keys are sent on their own
+    await asyncio.gather(
+        *[
+            router.acompletion(
+                model="gpt-3.5-turbo",
+                messages=[{"role": "user", "content": f"hi {i % 2}"}],
+                temperature=0,
+            )
+            for i in range(4)
+        ]
+    )
+    assert router.provider_calls == 4 + 3
+
+
+@pytest.mark.asyncio
+async def test_streaming_requests_fan_out():
+    router = _get_router({})
+
+    async def _read_stream():
+        response = await router.acompletion(
+            model="gpt-3.5-turbo",
+            messages=[{"role": "user", "content": "hi"}],
+            temperature=0,
+            stream=True,
+        )
+        assert isinstance(response, CoalescedStream)
+        content = ""
+        async for chunk in response:
+            content += chunk.choices[0].delta.content or ""
+        return content
+
+    contents = await asyncio.gather(*[_read_stream() for _ in range(3)])
+    assert router.provider_calls == 1
+    assert contents == ["hello world"] * 3
+    assert router.request_coalescer.in_flight_requests == {}
+
+
+@pytest.mark.asyncio
+async def test_embedding_requests_share_one_call():
+    router = _get_router({"call_types": ["aembedding"]})
+    calls = 0
+    _aembedding = router._aembedding
+
+    async def _counting_aembedding(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.1)
+        return await _aembedding(*args, **kwargs)
+
+    router._aembedding = _counting_aembedding
+    responses = await asyncio.gather(
+        *[
+            router.aembedding(model="text-embedding-ada-002", input=["hello"])
+            for _ in range(3)
+        ]
+    )
+    assert calls == 1
+    for response in responses:
+        assert response.data[0]["embedding"] == [0.1, 0.2]
+
+    # acompletion isn't in call_types
+    await asyncio.gather(
+        *[
+            router.acompletion(
+                model="gpt-3.5-turbo",
+                messages=[{"role": "user", "content": "hi"}],
+                temperature=0,
+            )
+            for _ in range(2)
+        ]
+    )
+    assert router.provider_calls == 2
+
+
+@pytest.mark.asyncio
+async def test_requests_of_different_callers_are_not_coalesced():
+    router = _get_router({})
+    await asyncio.gather(
+        *[
+            router.acompletion(
+                model="gpt-3.5-turbo",
+                messages=[{"role": "user", "content": "hi"}],
+                temperature=0,
+                metadata={"user_api_key": user_api_key},
+            )
+            for user_api_key in ["hashed-key-a", "hashed-key-b", "hashed-key-a"]
+        ]
+    )
+    assert router.provider_calls == 2
+
+
+@pytest.mark.asyncio
+async def test_provider_call_cancelled_when_all_callers_cancelled():
+    router = _get_router({})
+    provider_call_cancelled = asyncio.Event()
+    _acompletion = router._acompletion
+
+    async def _slow_acompletion(*args, **kwargs):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            provider_call_cancelled.set()
+            raise
+        return await _acompletion(*args, **kwargs)
+
+    router._acompletion = _slow_acompletion
+    callers = [
+        asyncio.create_task(
+            router.acompletion(
+                model="gpt-3.5-turbo",
+                messages=[{"role": "user", "content": "hi"}],
+                temperature=0,
+            )
+        )
+        for _ in range(2)
+    ]
+    await asyncio.sleep(0.1)
+
+    # the call keeps running while a caller is still waiting on it
+    callers[0].cancel()
+    await asyncio.sleep(0.1)
+    assert not provider_call_cancelled.is_set()
+
+    callers[1].cancel()
+    await asyncio.wait_for(provider_call_cancelled.wait(), timeout=1)
+    assert router.request_coalescer.in_flight_requests == {}
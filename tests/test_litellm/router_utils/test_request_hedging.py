@@ -0,0 +1,104 @@
+"""
+Unit tests for hedged requests in the Router
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath("../../.."))
+
+from litellm import Router
+from litellm.types.router import HedgingConfig
+
+
+def _get_router(hedging_config: dict) -> Router:
+    return Router(
+        model_list=[
+            {
+                "model_name": "gpt-3.5-turbo",
+                "litellm_params": {
+                    "model": "gpt-3.5-turbo",
+                    "api_key": "fake-key",
+                    "mock_response": "slow",
+                    "mock_delay": 1,
+                    "weight": 1000,  # almost always picked first
+                },
+                "model_info": {"id": "slow"},
+            },
+            {
+                "model_name": "gpt-3.5-turbo",
+                "litellm_params": {
+                    "model": "gpt-3.5-turbo",
+                    "api_key": "fake-key",
+                    "mock_response": "fast",
+                    "weight": 1,
+                },
+                "model_info": {"id": "fast"},
+            },
+        ],
+        hedging_config=hedging_config,
+    )
+
+
+def _warm_up(router: Router, model_group: str, latency: float, n: int):
+    for _ in range(n):
+        router.request_hedger._record_request(model_group)
+        router.request_hedger.record_latency(model_group, latency)
+
+
+def test_hedge_delay_requires_min_samples():
+    router = _get_router({"min_latency_samples": 3})
+    hedger = router.request_hedger
+    assert isinstance(hedger.hedging_config, HedgingConfig)
+
+    _warm_up(router, "gpt-3.5-turbo", latency=0.1, n=2)
+    assert hedger.get_hedge_delay("gpt-3.5-turbo") is None
+    _warm_up(router, "gpt-3.5-turbo", latency=0.5, n=1)
+    assert hedger.get_hedge_delay("gpt-3.5-turbo") == 0.5
+
+
+def test_hedge_budget_caps_extra_requests():
+    router = _get_router({"max_hedge_ratio": 0.1})
+    hedger = router.request_hedger
+
+    _warm_up(router, "gpt-3.5-turbo", latency=0.1, n=9)
+    assert hedger._try_acquire_hedge("gpt-3.5-turbo") is False
+    _warm_up(router, "gpt-3.5-turbo", latency=0.1, n=1)
+    assert hedger._try_acquire_hedge("gpt-3.5-turbo") is True
+    assert hedger._try_acquire_hedge("gpt-3.5-turbo") is False
+
+
+@pytest.mark.asyncio
+async def test_slow_request_is_hedged_to_another_deployment():
+    router = _get_router({"min_latency_samples": 5, "max_hedge_ratio": 1})
+    _warm_up(router, "gpt-3.5-turbo", latency=0.05, n=5)
+
+    start_time = asyncio.get_running_loop().time()
+    response = await router.acompletion(
+        model="gpt-3.5-turbo",
+        messages=[{"role": "user", "content": "hi"}],
+    )
+
+    # the call on the slow deployment is hedged to the fast one, and returns well before the slow one
+    assert asyncio.get_running_loop().time() - start_time < 0.9
+    assert response.choices[0].message.content == "fast"
+    assert response._hidden_params["hedged_request"] is True
+    assert router.request_hedger.budgets["gpt-3.5-turbo"].hedges == 1
+    # the cancelled slow call is recorded as a lower bound of its latency
+    assert len(router.request_hedger.latency_samples["gpt-3.5-turbo"]) == 7
+
+
+@pytest.mark.asyncio
+async def test_no_hedging_for_unlisted_model_groups():
+    router = _get_router({"model_groups": ["other-group"], "min_latency_samples": 1})
+    assert (
+        router.request_hedger.should_hedge(model_group="gpt-3.5-turbo", kwargs={})
+        is False
+    )
+    assert (
+        router.request_hedger.should_hedge(model_group="other-group", kwargs={})
+        is False  # not on the router
+    )
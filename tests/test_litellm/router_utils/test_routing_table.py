@@ -0,0 +1,142 @@
+"""
+Unit tests for the precompiled per-model-group routing tables
+"""
+
+import copy
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.abspath("../../.."))
+
+import litellm
+from litellm import Router
+from litellm.router_utils.routing_table import ModelGroupRoutingTable
+
+
+@pytest.fixture(autouse=True)
+def isolated_model_cost(monkeypatch):
+    """
+    register_model() - also called for the router's deployments - updates litellm.model_cost in place. Give each test a copy.
+    """
+    monkeypatch.setattr(litellm, "model_cost", copy.deepcopy(litellm.model_cost))
+    monkeypatch.setattr(litellm, "model_cost_version", litellm.model_cost_version)
+
+
+def _get_router() -> Router:
+    return Router(
+        model_list=[
+            {
+                "model_name": "gpt-3.5-turbo",
+                "litellm_params": {
+                    "model": "gpt-3.5-turbo",
+                    "api_key": "fake-key",
+                    "region_name": "eu",
+                    "rpm": 10,
+                },
+                "model_info": {"id": "small-context", "max_input_tokens": 5},
+            },
+            {
+                "model_name": "gpt-3.5-turbo",
+                "litellm_params": {
+                    "model": "gpt-3.5-turbo",
+                    "api_key": "fake-key",
+                    "region_name": "us",
+                    "weight": 2,
+                },
+                "model_info": {"id": "large-context", "max_input_tokens": 100000},
+            },
+        ],
+        enable_pre_call_checks=True,
+    )
+
+
+def test_routing_table_compiles_deployment_facts():
+    router = _get_router()
+    table = router.routing_tables.get_table("gpt-3.5-turbo")
+
+    assert isinstance(table, ModelGroupRoutingTable)
+    assert table.model_ids == ["small-context", "large-context"]
+    assert table.max_input_tokens == [5, 100000]
+    assert table.regions == ["eu", "us"]
+    assert table.rpm_limits == [10, None]
+    assert table.custom_llm_providers == ["openai", "openai"]
+    assert "response_format" in table.get_supported_openai_params(0)
+
+    # compiled once, reused until the model list changes
+    assert router.routing_tables.get_table("gpt-3.5-turbo") is table
+    assert router.routing_tables.get_table("unknown-model") is None
+
+
+def test_routing_table_invalidated_on_model_list_changes():
+    router = _get_router()
+    table = router.routing_tables.get_table("gpt-3.5-turbo")
+
+    router.delete_deployment(id="small-context")
+    new_table = router.routing_tables.get_table("gpt-3.5-turbo")
+    assert new_table is not table
+    assert new_table.model_ids == ["large-context"]
+
+    router.add_deployment(
+        deployment=litellm.types.router.Deployment(
+            model_name="gpt-3.5-turbo",
+            litellm_params=litellm.types.router.LiteLLM_Params(
+                model="gpt-3.5-turbo", api_key="fake-key"
+            ),
+            model_info={"id": "added"},
+        )
+    )
+    assert router.routing_tables.get_table("gpt-3.5-turbo").model_ids == [
+        "large-context",
+        "added",
+    ]
+
+
+def test_routing_table_recompiled_on_model_cost_changes(monkeypatch):
+    router = _get_router()
+    table = router.routing_tables.get_table("gpt-3.5-turbo")
+
+    litellm.register_model(
+        {"gpt-3.5-turbo": {"litellm_provider": "openai", "mode": "chat"}}
+    )
+    new_table = router.routing_tables.get_table("gpt-3.5-turbo")
+    assert new_table is not table
+
+    monkeypatch.setattr(litellm, "model_cost", dict(litellm.model_cost))
+    assert router.routing_tables.get_table("gpt-3.5-turbo") is not new_table
+
+
+def test_pre_call_checks_use_routing_table():
+    router = _get_router()
+    healthy_deployments = router._get_all_deployments(model_name="gpt-3.5-turbo")
+    messages = [{"role": "user", "content": "this message is longer than 5 tokens"}]
+
+    with patch.object(
+        router, "get_router_model_info", wraps=router.get_router_model_info
+    ) as mock_get_router_model_info:
+        for _ in range(3):
+            deployments = router._pre_call_checks(
+                model="gpt-3.5-turbo",
+                healthy_deployments=healthy_deployments,
+                messages=messages,
+                request_kwargs={"allowed_model_region": "us"},
+            )
+            assert [d["model_info"]["id"] for d in deployments] == ["large-context"]
+
+    # model info is resolved once, at compile time
+    assert mock_get_router_model_info.call_count == 2
+
+
+def test_pre_call_checks_context_window_exceeded_with_routing_table():
+    router = _get_router()
+    healthy_deployments = router._get_all_deployments(model_name="gpt-3.5-turbo")
+
+    with pytest.raises(litellm.ContextWindowExceededError):
+        router._pre_call_checks(
+            model="gpt-3.5-turbo",
+            healthy_deployments=healthy_deployments,
+            messages=[{"role": "user", "content": "this message is too long " * 10}],
+            request_kwargs={"allowed_model_region": "eu"},
+        )
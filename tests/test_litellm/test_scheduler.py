@@ -0,0 +1,118 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(
+    0, os.path.abspath("../..")
+)  # Adds the parent directory to the system path
+
+from litellm import Router
+from litellm.scheduler import FlowItem, Scheduler
+
+
+@pytest.mark.asyncio
+async def test_waiting_requests_run_in_priority_order():
+    scheduler = Scheduler()
+    items = [
+        FlowItem(priority=priority, request_id=str(i), model_name="gpt-3.5-turbo")
+        for i, priority in enumerate([2, 0, 1, 0])
+    ]
+    for item in items:
+        await scheduler.add_request(item)
+    assert await scheduler.get_queue(model_name="gpt-3.5-turbo") == [
+        (0, "1"),
+        (0, "3"),
+        (1, "2"),
+        (2, "0"),
+    ]
+
+    order = []
+    health_checks = 0
+
+    async def _get_healthy_deployments() -> list:
+        nonlocal health_checks
+        health_checks += 1
+        return []
+
+    async def _wait(item: FlowItem):
+        assert await scheduler.wait_for_turn(
+            request=item,
+            get_healthy_deployments=_get_healthy_deployments,
+            timeout=5,
+        )
+        order.append(item.request_id)
+
+    await asyncio.gather(*[_wait(item) for item in items])
+    assert order == ["1", "3", "2", "0"]
+    assert await scheduler.get_queue(model_name="gpt-3.5-turbo") == []
+    # waiters are woken once, when they reach the head of the queue - not polled
+    assert health_checks <= 2 * len(items)
+
+
+@pytest.mark.asyncio
+async def test_healthy_deployments_skip_the_queue():
+    scheduler = Scheduler()
+    head = FlowItem(priority=0, request_id="head", model_name="gpt-4")
+    item = FlowItem(priority=1, request_id="item", model_name="gpt-4")
+    await scheduler.add_request(head)
+    await scheduler.add_request(item)
+
+    async def _get_healthy_deployments() -> list:
+        return [{"model_info": {"id": "1"}}]
+
+    assert await scheduler.wait_for_turn(
+        request=item, get_healthy_deployments=_get_healthy_deployments, timeout=1
+    )
+    assert await scheduler.get_queue(model_name="gpt-4") == [(0, "head")]
+
+
+@pytest.mark.asyncio
+async def test_timed_out_request_leaves_the_queue():
+    scheduler = Scheduler()
+    head = FlowItem(priority=0, request_id="head", model_name="gpt-4")
+    item = FlowItem(priority=1, request_id="item", model_name="gpt-4")
+    await scheduler.add_request(head)
+    await scheduler.add_request(item)
+
+    async def _get_healthy_deployments() -> list:
+        return []
+
+    assert (
+        await scheduler.wait_for_turn(
+            request=item, get_healthy_deployments=_get_healthy_deployments, timeout=0.05
+        )
+        is False
+    )
+    assert await scheduler.get_queue(model_name="gpt-4") == [(0, "head")]
+    assert "item" not in scheduler._waiters
+
+
+@pytest.mark.asyncio
+async def test_router_prioritized_request():
+    router = Router(
+        model_list=[
+            {
+                "model_name": "gpt-3.5-turbo",
+                "litellm_params": {
+                    "model": "gpt-3.5-turbo",
+                    "mock_response": "hello world",
+                },
+            }
+        ],
+        timeout=2,
+    )
+    responses = await asyncio.gather(
+        *[
+            router.acompletion(
+                model="gpt-3.5-turbo",
+                messages=[{"role": "user", "content": "hi"}],
+                priority=priority,
+            )
+            for priority in [1, 0]
+        ]
+    )
+    for response in responses:
+        assert response.choices[0].message.content == "hello world"
+    assert router.scheduler.get_queue_status() == {"gpt-3.5-turbo": []}